@@ -14,12 +14,19 @@ import {
   message
 } from "antd";
 import { DownloadOutlined, PauseCircleOutlined, PlayCircleOutlined, UploadOutlined } from "@ant-design/icons";
+import Hls from "hls.js";
 import styles from "./Upload.module.scss";
 
 import { useAnnihilatorStore } from "../../../../store";
 
 const { Text, Title } = Typography;
 
+const formatEta = (seconds: number): string => {
+  const rounded = Math.max(Math.ceil(seconds), 1);
+  const minutes = Math.floor(rounded / 60);
+  return minutes > 0 ? `${minutes} мин ${rounded % 60} сек` : `${rounded} сек`;
+};
+
 const UploadComponent: React.FC = () => {
   const fileList = useAnnihilatorStore(state => state.fileList);
   const isUploading = useAnnihilatorStore(state => state.isUploading);
@@ -35,46 +42,13 @@ const UploadComponent: React.FC = () => {
   const [resultUrl, setResultUrl] = useState<string>('');
   const [error, setError] = useState<string | null>(null);
   const [processingTime, setProcessingTime] = useState<number>(0);
+  const [etaSeconds, setEtaSeconds] = useState<number | null>(null);
+  const [streamUrl, setStreamUrl] = useState<string>('');
 
   const audioRef = useRef<HTMLAudioElement>(null);
+  const previewRef = useRef<HTMLAudioElement>(null);
   const processingStartTime = useRef<number>(0);
 
-  const progressIntervalRef = useRef<NodeJS.Timeout | null>(null);
-  const progressTimeoutRef = useRef<NodeJS.Timeout | null>(null);
-
-  // Добавляем симуляцию прогресса только при старте обработки
-  useEffect(() => {
-    if ((isUploading || isProcessing) && progress < 100) {
-      // Очищаем предыдущие таймеры
-      if (progressIntervalRef.current) clearInterval(progressIntervalRef.current);
-      if (progressTimeoutRef.current) clearTimeout(progressTimeoutRef.current);
-
-      // Запускаем новый интервал
-      progressIntervalRef.current = setInterval(() => {
-        setProgress((prev) => {
-          if (prev >= 100) {
-            if (progressIntervalRef.current) clearInterval(progressIntervalRef.current);
-            return 100;
-          }
-          return prev + 1;
-        });
-      }, 3000);
-
-      // Останавливаем через 30 секунд
-      progressTimeoutRef.current = setTimeout(() => {
-        if (progressIntervalRef.current) {
-          clearInterval(progressIntervalRef.current);
-          progressIntervalRef.current = null;
-        }
-      }, 45000);
-
-      return () => {
-        if (progressIntervalRef.current) clearInterval(progressIntervalRef.current);
-        if (progressTimeoutRef.current) clearTimeout(progressTimeoutRef.current);
-      };
-    }
-  }, [isUploading, isProcessing]);
-
   const handleUpload: UploadProps['onChange'] = (info) => {
     let newFileList = [...info.fileList];
 
@@ -99,8 +73,10 @@ const UploadComponent: React.FC = () => {
     setIsUploading(true);
     setIsProcessing(true);
     setProgress(10);
+    setEtaSeconds(null);
     setError(null);
     setResultUrl('');
+    setStreamUrl('');
     processingStartTime.current = Date.now();
 
     try {
@@ -123,6 +99,9 @@ const UploadComponent: React.FC = () => {
 
       const reader = response.body.getReader();
       const decoder = new TextDecoder();
+      let jobId = '';
+      // Stem played while the separation is still running, the first one streamed
+      let previewStem = '';
 
       const readStream = async () => {
         try {
@@ -131,7 +110,9 @@ const UploadComponent: React.FC = () => {
             if (done) break;
 
             const chunk = decoder.decode(value);
-            const lines = chunk.split('\n\n').filter(line => line.trim() !== '');
+            const lines = chunk
+              .split('\n')
+              .filter(line => line.trim() !== '');
 
             for (const line of lines) {
               if (line.startsWith('data: ')) {
@@ -142,22 +123,32 @@ const UploadComponent: React.FC = () => {
                   return;
                 }
 
+                if (data.job_id) {
+                  jobId = data.job_id;
+                }
+
+                if (data.segment !== undefined) {
+                  if (!previewStem && data.segment === 0 && jobId) {
+                    previewStem = data.stem;
+                    // @ts-ignore
+                    setStreamUrl(`${window.CONSTS.HOST}/api/v1/files/stream/${jobId}/${data.playlist}`);
+                  }
+                  continue;
+                }
+
                 if (data.progress !== undefined) {
                   if (data.progress >= 50) {
                     setIsProcessing(true);
                     setIsUploading(false);
                   }
-                  // Clear the simulated progress when we get real progress updates
-                  if (progressIntervalRef.current) {
-                    clearInterval(progressIntervalRef.current);
-                    progressIntervalRef.current = null;
-                  }
-                  setProgress(data.progress);
+                  setProgress(Math.round(data.percent ?? data.progress));
+                  setEtaSeconds(data.eta_seconds ?? null);
                 }
 
                 if (data.result) {
                   const result = data.result;
                   if (result) {
+                    setStreamUrl('');
                     setResultUrl(result);
                     setProcessingTime(Math.round((Date.now() - processingStartTime.current) / 1000));
                   }
@@ -185,10 +176,7 @@ const UploadComponent: React.FC = () => {
     setIsUploading(false);
     setIsProcessing(false);
     setProgress(0);
-    if (progressIntervalRef.current) {
-      clearInterval(progressIntervalRef.current);
-      progressIntervalRef.current = null;
-    }
+    setEtaSeconds(null);
     message.error(`Ошибка обработки: ${error}`);
   };
 
@@ -209,15 +197,32 @@ const UploadComponent: React.FC = () => {
     }
   };
 
+  useEffect(() => {
+    const preview = previewRef.current;
+    if (!streamUrl || !preview) return;
+
+    if (preview.canPlayType('application/vnd.apple.mpegurl')) {
+      preview.src = streamUrl;
+      return () => {
+        preview.removeAttribute('src');
+        preview.load();
+      };
+    }
+
+    if (!Hls.isSupported()) return;
+
+    const hls = new Hls();
+    hls.loadSource(streamUrl);
+    hls.attachMedia(preview);
+    return () => hls.destroy();
+  }, [streamUrl]);
+
   useEffect(() => {
     return () => {
       if (audioRef.current) {
         audioRef.current.pause();
         setIsPlaying(false);
       }
-      if (progressIntervalRef.current) {
-        clearInterval(progressIntervalRef.current);
-      }
     };
   }, [resultUrl]);
 
@@ -309,8 +314,15 @@ const UploadComponent: React.FC = () => {
                 />
                 <Text type="secondary" className={styles.progressTip}>
                   {isUploading ? 'Пожалуйста, подождите...' :
-                    'Обычно обработка занимает 1-2 минуты в зависимости от длины файла'}
+                    etaSeconds !== null ? `Осталось примерно ${formatEta(etaSeconds)}` :
+                      'Обычно обработка занимает 1-2 минуты в зависимости от длины файла'}
                 </Text>
+                {streamUrl && (
+                  <>
+                    <Text type="secondary">Начало уже готово, его можно прослушать:</Text>
+                    <audio ref={previewRef} controls preload="none"/>
+                  </>
+                )}
               </div>
             )}
 
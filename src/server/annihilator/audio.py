@@ -0,0 +1,297 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import ffmpeg  # type: ignore[import-untyped]
+import numpy as np
+
+# Sample rate expected by every Spleeter model
+SAMPLE_RATE = 44100
+
+# Number of channels fed to and produced by Spleeter models
+CHANNELS = 2
+
+# ffmpeg encoder names for codecs whose name differs from the encoder
+_FFMPEG_ENCODERS = {
+    "mp3": "libmp3lame",
+    "ogg": "libvorbis",
+    "wma": "wmav2",
+    "m4a": "aac",
+}
+
+
+def source_name(source: Union[str, Path]) -> str:
+    """
+    Describe an audio source for logs without the query string of URLs, which holds signatures.
+
+    Parameters:
+        source (Union[str, Path]): Local path or URL of the audio
+
+    Returns:
+        str: The path, or the URL up to its query string
+    """
+    return str(source).split("?", 1)[0]
+
+
+def probe_duration(source: Union[str, Path]) -> float:
+    """
+    Read the duration of an audio file or URL with ffprobe.
+
+    Parameters:
+        source (Union[str, Path]): Local path or URL of the audio
+
+    Returns:
+        float: Duration in seconds
+
+    Raises:
+        ffmpeg.Error: If ffprobe cannot read the input
+    """
+    info = ffmpeg.probe(str(source))
+    return float(info["format"]["duration"])
+
+
+def decode_audio(
+    source: Union[str, Path],
+    *,
+    offset: float = 0.0,
+    duration: Optional[float] = None,
+    sample_rate: int = SAMPLE_RATE,
+) -> np.ndarray:
+    """
+    Decode audio into a float32 stereo waveform with ffmpeg.
+
+    Parameters:
+        source (Union[str, Path]): Local path or URL of the audio
+        offset (float): Start position in seconds (default: 0.0)
+        duration (float, optional): Length to decode in seconds, None for the remainder
+        sample_rate (int): Output sample rate (default: 44100)
+
+    Returns:
+        np.ndarray: Waveform with shape (samples, 2)
+
+    Raises:
+        ffmpeg.Error: If ffmpeg fails to decode the input
+    """
+    input_kwargs = {}
+    if offset:
+        input_kwargs["ss"] = offset
+    if duration is not None:
+        input_kwargs["t"] = duration
+
+    buffer, _ = (
+        ffmpeg
+        .input(str(source), **input_kwargs)
+        .output("pipe:", format="f32le", ac=CHANNELS, ar=sample_rate)
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    return np.frombuffer(buffer, dtype=np.float32).reshape(-1, CHANNELS)
+
+
+class AudioEncoder:
+    """
+    Incrementally encode a float32 stereo waveform to a file through an ffmpeg pipe.
+
+    Waveform pieces written with `write` are streamed to ffmpeg's stdin, so the full
+    stem never has to be held in memory.
+
+    Parameters:
+        output_path (Path): Destination audio file
+        codec (str): Output audio codec
+        bitrate (str, optional): Output audio bitrate, ignored for lossless codecs
+        sample_rate (int): Sample rate of the written waveform (default: 44100)
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        codec: str,
+        bitrate: Optional[str] = None,
+        sample_rate: int = SAMPLE_RATE,
+    ):
+        """Start the ffmpeg encoder process."""
+        self.output_path = output_path
+
+        output_kwargs = {"ar": sample_rate, "ac": CHANNELS}
+        if codec != "wav":
+            output_kwargs["acodec"] = _FFMPEG_ENCODERS.get(codec, codec)
+        if bitrate and codec not in ("wav", "flac"):
+            output_kwargs["audio_bitrate"] = bitrate
+
+        self._process = (
+            ffmpeg
+            .input("pipe:", format="f32le", ac=CHANNELS, ar=sample_rate)
+            .output(str(output_path), **output_kwargs)
+            .global_args("-loglevel", "error")
+            .overwrite_output()
+            .run_async(pipe_stdin=True)
+        )
+
+    def write(self, waveform: np.ndarray) -> None:
+        """
+        Stream a piece of waveform to the encoder.
+
+        Parameters:
+            waveform (np.ndarray): Samples with shape (samples, 2)
+        """
+        # Written straight from the array's buffer, without an intermediate bytes copy
+        self._process.stdin.write(memoryview(np.ascontiguousarray(waveform, dtype=np.float32)).cast("B"))
+
+    def close(self) -> int:
+        """
+        Finish encoding and wait for ffmpeg to exit.
+
+        Returns:
+            int: ffmpeg exit code (0 for success)
+        """
+        self._process.stdin.close()
+        return self._process.wait()
+
+    def kill(self) -> None:
+        """Abort encoding without waiting for the output to be finalized."""
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+
+
+def transcode(
+    input_path: Path,
+    output_path: Path,
+    codec: str,
+    bitrate: Optional[str] = None,
+) -> None:
+    """
+    Convert an audio file to another codec with ffmpeg.
+
+    Parameters:
+        input_path (Path): Source audio file
+        output_path (Path): Destination audio file
+        codec (str): Output audio codec
+        bitrate (str, optional): Output audio bitrate, ignored for lossless codecs
+
+    Raises:
+        ffmpeg.Error: If ffmpeg fails to convert the input
+    """
+    output_kwargs = {}
+    if codec != "wav":
+        output_kwargs["acodec"] = _FFMPEG_ENCODERS.get(codec, codec)
+    if bitrate and codec not in ("wav", "flac"):
+        output_kwargs["audio_bitrate"] = bitrate
+
+    (
+        ffmpeg
+        .input(str(input_path))
+        .output(str(output_path), **output_kwargs)
+        .global_args("-loglevel", "error")
+        .overwrite_output()
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+
+
+def encode_stems(
+    stems: Dict[str, np.ndarray],
+    output_dir: Path,
+    codec: str,
+    bitrate: Optional[str] = None,
+) -> Dict[str, Path]:
+    """
+    Encode separated stems concurrently, streaming each into its own ffmpeg process.
+
+    Parameters:
+        stems (Dict[str, np.ndarray]): Mapping of stem names to waveforms with shape (samples, 2)
+        output_dir (Path): Directory for the encoded files, named "{stem}.{codec}"
+        codec (str): Output audio codec
+        bitrate (str, optional): Output audio bitrate, ignored for lossless codecs
+
+    Returns:
+        Dict[str, Path]: Mapping of stem names to encoded files
+
+    Raises:
+        RuntimeError: If ffmpeg fails to encode any stem
+    """
+    encoders: Dict[str, AudioEncoder] = {}
+
+    def encode(stem: str) -> int:
+        encoders[stem].write(stems[stem])
+        return encoders[stem].close()
+
+    try:
+        for stem in stems:
+            encoders[stem] = AudioEncoder(output_dir / f"{stem}.{codec}", codec, bitrate)
+        with ThreadPoolExecutor(max_workers=max(len(encoders), 1)) as executor:
+            return_codes = dict(zip(encoders, executor.map(encode, encoders)))
+    except BaseException:
+        for encoder in encoders.values():
+            encoder.kill()
+        raise
+
+    failed = [stem for stem, return_code in return_codes.items() if return_code != 0]
+    if failed:
+        raise RuntimeError(f"ffmpeg failed to encode stems: {', '.join(failed)}")
+
+    return {stem: encoder.output_path for stem, encoder in encoders.items()}
+
+
+class HlsEncoder(AudioEncoder):
+    """
+    Incrementally encode a float32 stereo waveform into an HLS event playlist of AAC segments.
+
+    ffmpeg cuts the stream into MPEG-TS segments named "{playlist stem}_NNNNN.ts" next to
+    the playlist and lists each segment in the playlist once it is complete, so the
+    playlist grows while waveform pieces are written.
+
+    Parameters:
+        playlist_path (Path): Destination playlist file
+        segment_seconds (float): Target segment length in seconds
+        bitrate (str, optional): AAC bitrate
+        sample_rate (int): Sample rate of the written waveform (default: 44100)
+    """
+
+    def __init__(
+        self,
+        playlist_path: Path,
+        segment_seconds: float,
+        bitrate: Optional[str] = None,
+        sample_rate: int = SAMPLE_RATE,
+    ):
+        """Start the ffmpeg HLS muxer process."""
+        self.output_path = playlist_path
+
+        output_kwargs = {
+            "format": "hls",
+            "acodec": "aac",
+            "ar": sample_rate,
+            "ac": CHANNELS,
+            "hls_time": segment_seconds,
+            "hls_list_size": 0,
+            "hls_playlist_type": "event",
+            "hls_segment_filename": str(playlist_path.with_name(f"{playlist_path.stem}_%05d.ts")),
+        }
+        if bitrate:
+            output_kwargs["audio_bitrate"] = bitrate
+
+        self._process = (
+            ffmpeg
+            .input("pipe:", format="f32le", ac=CHANNELS, ar=sample_rate)
+            .output(str(playlist_path), **output_kwargs)
+            .global_args("-loglevel", "error")
+            .overwrite_output()
+            .run_async(pipe_stdin=True)
+        )
+
+
+def fit_length(waveform: np.ndarray, length: int) -> np.ndarray:
+    """
+    Crop or zero-pad a waveform to an exact number of samples.
+
+    Parameters:
+        waveform (np.ndarray): Samples with shape (samples, channels)
+        length (int): Required number of samples
+
+    Returns:
+        np.ndarray: Waveform with exactly `length` samples
+    """
+    if waveform.shape[0] >= length:
+        return waveform[:length]
+    padding = np.zeros((length - waveform.shape[0], waveform.shape[1]), dtype=waveform.dtype)
+    return np.concatenate([waveform, padding])
+
@@ -0,0 +1,168 @@
+import gc
+import os
+import resource
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Set
+
+
+def current_rss() -> int:
+    """
+    Resident memory of the current process.
+
+    Returns:
+        int: Resident set size in bytes. Falls back to the peak size where the current
+            size cannot be read.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@dataclass
+class ModelStats:
+    """
+    Load cost and usage of a loaded model.
+
+    Attributes:
+        load_seconds (float): Wall time it took to load the model
+        memory_bytes (int): Growth of resident memory caused by loading the model
+        uses (int): Number of separations served by the model since it was loaded
+        pinned (bool): Whether the model is kept warm and never evicted
+    """
+
+    load_seconds: float
+    memory_bytes: int
+    uses: int = 0
+    pinned: bool = False
+
+
+class ModelRegistry:
+    """
+    Keep separation models in memory, loading them on first use and evicting the least recently used.
+
+    Pinned models are loaded as they are pinned and stay loaded. Other models are loaded
+    when a job needs them; once the summed footprint of the loaded models exceeds the
+    memory budget, the least recently used unpinned models are dropped. Footprints are
+    measured as the growth of resident memory during loading, so they are approximate.
+
+    Parameters:
+        loader (Callable[[str], Any]): Loads a model by name and returns it ready to use
+        memory_budget (int): Memory in bytes the loaded models may use together
+        unloader (Callable[[Any], None], optional): Releases what an evicted model holds beyond
+            its Python objects, such as a TensorFlow session (default: none)
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Any],
+        memory_budget: int,
+        unloader: Optional[Callable[[Any], None]] = None,
+    ):
+        """Initialize an empty registry."""
+        self.loader = loader
+        self.memory_budget = memory_budget
+        self.unloader = unloader
+        self.pinned: Set[str] = set()
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._stats: Dict[str, ModelStats] = {}
+
+    @property
+    def loaded(self) -> List[str]:
+        """
+        Names of the loaded models.
+
+        Returns:
+            List[str]: Loaded models, least recently used first
+        """
+        return list(self._models)
+
+    @property
+    def memory_bytes(self) -> int:
+        """
+        Summed footprint of the loaded models.
+
+        Returns:
+            int: Bytes of resident memory attributed to loaded models
+        """
+        return sum(stats.memory_bytes for stats in self._stats.values())
+
+    def pin(self, model: str) -> None:
+        """
+        Load a model now, unless it is loaded already, and never evict it.
+
+        Parameters:
+            model (str): Model name
+
+        Raises:
+            Exception: Whatever the loader raises, the model is then not pinned
+        """
+        if model not in self._models:
+            self._load(model)
+        self.pinned.add(model)
+        self._stats[model].pinned = True
+
+    def get(self, model: str) -> Any:
+        """
+        Get a loaded model, loading it and evicting others if needed.
+
+        Parameters:
+            model (str): Model name
+
+        Returns:
+            Any: The model returned by the loader
+        """
+        if model not in self._models:
+            self._load(model)
+            self._evict(keep=model)
+
+        self._models.move_to_end(model)
+        self._stats[model].uses += 1
+        return self._models[model]
+
+    def _load(self, model: str) -> None:
+        """
+        Load a model and measure its cost.
+
+        Parameters:
+            model (str): Model name
+        """
+        rss_before = current_rss()
+        started = time.perf_counter()
+        self._models[model] = self.loader(model)
+        self._stats[model] = ModelStats(
+            load_seconds=time.perf_counter() - started,
+            memory_bytes=max(current_rss() - rss_before, 0),
+        )
+
+    def _evict(self, keep: str) -> None:
+        """
+        Drop least recently used unpinned models until the footprint fits the budget, releasing them with the unloader.
+
+        Parameters:
+            keep (str): Model that must stay loaded, the one just requested
+        """
+        for model in list(self._models):
+            if self.memory_bytes <= self.memory_budget:
+                return
+            if model == keep or model in self.pinned:
+                continue
+
+            evicted = self._models.pop(model)
+            del self._stats[model]
+            if self.unloader is not None:
+                self.unloader(evicted)
+            del evicted
+            gc.collect()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load time, footprint and usage of every loaded model.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Picklable statistics by model name
+        """
+        return {model: asdict(stats) for model, stats in self._stats.items()}
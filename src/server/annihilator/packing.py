@@ -0,0 +1,333 @@
+import asyncio
+from dataclasses import dataclass, field
+from logging import Logger
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.server.annihilator.audio import CHANNELS, probe_duration, source_name
+from src.server.annihilator.separator_pool import SeparationError, SeparatorPool
+from src.server.annihilator.timings import StageTimings
+from src.server.enums.logging import LoggingLevelsEnum
+
+# Spleeter frames the waveform 1024 samples apart over 4096 samples, after a frame of leading
+# silence, and runs the model on chunks of 512 frames independently of each other
+MODEL_FRAME_SAMPLES = 4096
+MODEL_CHUNK_SAMPLES = 512 * 1024
+
+
+def pack_waveforms(
+    waveforms: Sequence[np.ndarray],
+    chunk_samples: int = MODEL_CHUNK_SAMPLES,
+    frame_samples: int = MODEL_FRAME_SAMPLES,
+) -> Tuple[np.ndarray, List[int]]:
+    """
+    Lay tracks end to end, each starting on a model chunk, to separate them in one model run.
+
+    Every track is followed by at least one frame of silence and padded to whole chunks, so
+    no model chunk or frame spans two tracks and every track is separated exactly as alone.
+
+    Parameters:
+        waveforms (Sequence[np.ndarray]): Track waveforms with shape (samples, 2)
+        chunk_samples (int): Samples of the waveform covered by one model chunk
+        frame_samples (int): Samples covered by one STFT frame
+
+    Returns:
+        Tuple[np.ndarray, List[int]]: Packed waveform, and the start sample of every track
+    """
+    pieces = []
+    offsets = []
+    position = 0
+    for waveform in waveforms:
+        length = waveform.shape[0]
+        slot = -(-(length + frame_samples) // chunk_samples) * chunk_samples
+        offsets.append(position)
+        pieces.append(np.asarray(waveform, dtype=np.float32))
+        pieces.append(np.zeros((slot - length, CHANNELS), dtype=np.float32))
+        position += slot
+    return np.concatenate(pieces), offsets
+
+
+def unpack_stems(
+    stems: Dict[str, np.ndarray],
+    offsets: Sequence[int],
+    lengths: Sequence[int],
+) -> List[Dict[str, np.ndarray]]:
+    """
+    Split the stems of a packed waveform back into the stems of every track.
+
+    Parameters:
+        stems (Dict[str, np.ndarray]): Stems separated from the packed waveform
+        offsets (Sequence[int]): Start sample of every track in the packed waveform
+        lengths (Sequence[int]): Number of samples of every track
+
+    Returns:
+        List[Dict[str, np.ndarray]]: Mapping of stem names to waveforms, per track in order
+    """
+    return [
+        {stem: waveform[offset:offset + length] for stem, waveform in stems.items()}
+        for offset, length in zip(offsets, lengths)
+    ]
+
+
+@dataclass
+class _PackedTrack:
+    """
+    A short track waiting to be separated together with others.
+
+    Attributes:
+        input_path (Union[Path, str]): Path or URL of the input audio
+        output_dir (Path): Directory for the track's stems
+        timings (Optional[StageTimings]): Receives the track's stage times
+        future (asyncio.Future): Resolved with the track's return code
+    """
+
+    input_path: Union[Path, str]
+    output_dir: Path
+    timings: Optional[StageTimings]
+    future: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+
+def _resolve(track: _PackedTrack, return_code: int = 0, exception: Optional[BaseException] = None) -> None:
+    """
+    Resolve the future of a packed track, unless its caller was cancelled meanwhile.
+
+    Parameters:
+        track (_PackedTrack): Separated track
+        return_code (int): Job return code (0 for success)
+        exception (BaseException, optional): Failure raised to the caller instead
+    """
+    if track.future.done():
+        return
+    if exception is not None:
+        track.future.set_exception(exception)
+    else:
+        track.future.set_result(return_code)
+
+
+@dataclass
+class _Pack:
+    """
+    Tracks with the same separation parameters collected for one worker job.
+
+    Attributes:
+        tracks (List[_PackedTrack]): Collected tracks
+        seconds (float): Summed duration of the tracks
+        flush (Optional[asyncio.TimerHandle]): Sends the pack when the collection window ends
+        task (Optional[asyncio.Task]): Separates the pack once it is sent
+    """
+
+    tracks: List[_PackedTrack] = field(default_factory=list)
+    seconds: float = 0.0
+    flush: Optional[asyncio.TimerHandle] = None
+    task: Optional[asyncio.Task] = None
+
+
+class SeparationPacker:
+    """
+    Pack short tracks that are separated at about the same time into shared worker jobs.
+
+    Separating a short track costs about as much fixed per-call overhead (queueing,
+    session run setup, STFT framing) as it costs model time. Tracks up to half the
+    pack size that arrive within the collection window with the same model, codec,
+    bitrate and stems are sent to one worker as a single packed job. Longer tracks, and
+    tracks whose duration cannot be read, are passed to the pool unchanged. The packer
+    is a drop-in replacement for the pool's `separate`.
+
+    Parameters:
+        separator_pool (SeparatorPool): Running worker pool
+        max_seconds (float): Maximum summed duration of the tracks in one pack
+        linger_seconds (float): How long a pack collects tracks before it is sent (default: 0.1)
+        logger (Logger, optional): Python logger instance for operation tracking
+    """
+
+    def __init__(
+        self,
+        separator_pool: SeparatorPool,
+        max_seconds: float,
+        linger_seconds: float = 0.1,
+        logger: Optional[Logger] = None,
+    ):
+        """Initialize the packer with no open packs."""
+        self.separator_pool = separator_pool
+        self.max_seconds = max_seconds
+        self.linger_seconds = linger_seconds
+        self.logger = logger
+        self._packs: Dict[Tuple, _Pack] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def _log(
+        self,
+        message: str,
+        *args: Any,
+        level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
+        exc_info: bool = False,
+    ) -> None:
+        """
+        Internal logging helper with class name prefix.
+
+        Parameters:
+            message (str): Message to log
+            *args (Any): Values %-formatted into the message, only if the level is enabled
+            level (LoggingLevelsEnum): Logging level (default: INFO)
+            exc_info (bool): Whether to include exception info (default: False)
+        """
+        if self.logger and self.logger.isEnabledFor(level.levelno):
+            getattr(self.logger, level.value)(
+                f"{self.__class__.__name__}: {message % args if args else message}",
+                exc_info=exc_info,
+                stacklevel=2,
+            )
+
+    async def separate(
+        self,
+        input_path: Union[Path, str],
+        output_dir: Path,
+        model: str,
+        codec: str,
+        bitrate: str,
+        timings: Optional[StageTimings] = None,
+        stems: Optional[List[str]] = None,
+    ) -> int:
+        """
+        Separate a whole file, packed with other short files when possible.
+
+        Parameters:
+            input_path (Union[Path, str]): Path or URL of the input audio
+            output_dir (Path): Directory to save output stems
+            model (str): Spleeter model to use
+            codec (str): Output audio codec
+            bitrate (str): Output audio bitrate
+            timings (StageTimings, optional): Receives the decode, inference and encode times
+            stems (List[str], optional): Stems to separate and write, None for every stem
+
+        Returns:
+            int: Job return code (0 for success)
+
+        Raises:
+            SeparationError: If the track failed in its worker, with the reason
+
+        Note:
+            Cancelling the caller withdraws its track from the pack. Once every track of a sent
+            pack is withdrawn, the pack's separation is cancelled, which stops its worker.
+        """
+        try:
+            duration = await asyncio.to_thread(probe_duration, input_path)
+        except Exception:
+            duration = None
+
+        if duration is None or duration > self.max_seconds / 2:
+            return await self.separator_pool.separate(
+                input_path, output_dir, model, codec, bitrate, timings=timings, stems=stems,
+            )
+
+        key = (model, codec, bitrate, tuple(stems) if stems is not None else None)
+        pack = self._packs.get(key)
+        if pack is not None and pack.seconds + duration > self.max_seconds:
+            self._send(key)
+            pack = None
+        if pack is None:
+            pack = self._packs[key] = _Pack()
+            pack.flush = asyncio.get_running_loop().call_later(self.linger_seconds, self._send, key)
+
+        track = _PackedTrack(input_path=input_path, output_dir=output_dir, timings=timings)
+        pack.tracks.append(track)
+        pack.seconds += duration
+        try:
+            # Shielded so one cancelled track does not cancel the separation of the others
+            return await asyncio.shield(track.future)
+        except asyncio.CancelledError:
+            self._withdraw(key, pack, track, duration)
+            raise
+
+    def _withdraw(self, key: Tuple, pack: _Pack, track: _PackedTrack, duration: float) -> None:
+        """
+        Remove the track of a cancelled caller from its pack.
+
+        Parameters:
+            key (Tuple): Model, codec, bitrate and stems of the pack
+            pack (_Pack): Pack the track was added to
+            track (_PackedTrack): Track of the cancelled caller
+            duration (float): Duration of the track in seconds
+        """
+        track.future.cancel()
+        if pack.task is None:
+            # Not sent yet, the track is left out of the pack
+            pack.tracks.remove(track)
+            pack.seconds -= duration
+            if not pack.tracks and self._packs.get(key) is pack:
+                pack.flush.cancel()
+                del self._packs[key]
+        elif all(packed.future.cancelled() for packed in pack.tracks):
+            self._log("Every track of a pack was cancelled, cancelling its separation")
+            pack.task.cancel()
+
+    def _send(self, key: Tuple) -> None:
+        """
+        Close the open pack of a parameter set and separate it in the background.
+
+        Parameters:
+            key (Tuple): Model, codec, bitrate and stems of the pack
+        """
+        pack = self._packs.pop(key, None)
+        if pack is None:
+            return
+        pack.flush.cancel()
+
+        pack.task = asyncio.create_task(self._separate_pack(key, pack))
+        self._tasks.append(pack.task)
+        pack.task.add_done_callback(self._tasks.remove)
+
+    async def _separate_pack(self, key: Tuple, pack: _Pack) -> None:
+        """
+        Separate a closed pack and resolve the futures of its tracks.
+
+        Parameters:
+            key (Tuple): Model, codec, bitrate and stems of the pack
+            pack (_Pack): Tracks to separate
+        """
+        model, codec, bitrate, stems = key
+        # Tracks cancelled since the pack was sent are not separated
+        tracks = [track for track in pack.tracks if not track.future.cancelled()]
+        if len(tracks) == 1:
+            track = tracks[0]
+            try:
+                return_code = await self.separator_pool.separate(
+                    track.input_path, track.output_dir, model, codec, bitrate,
+                    timings=track.timings, stems=list(stems) if stems is not None else None,
+                )
+            except Exception as e:
+                _resolve(track, exception=e)
+            else:
+                _resolve(track, return_code)
+            return
+        if not tracks:
+            return
+
+        self._log("Separating %s tracks (%.1fs) as one pack", len(tracks), pack.seconds)
+        try:
+            outcomes = await self.separator_pool.separate_packed(
+                items=[(track.input_path, track.output_dir) for track in tracks],
+                model=model,
+                codec=codec,
+                bitrate=bitrate,
+                stems=list(stems) if stems is not None else None,
+            )
+        except Exception as e:
+            self._log("Packed separation failed: %s", e, level=LoggingLevelsEnum.ERROR)
+            outcomes = [(None, str(e))] * len(tracks)
+
+        for track, (stage_timings, error) in zip(tracks, outcomes):
+            if error is not None:
+                self._log(
+                    "Packed track %s failed: %s",
+                    source_name(track.input_path),
+                    error,
+                    level=LoggingLevelsEnum.ERROR,
+                )
+                _resolve(track, exception=SeparationError(error))
+                continue
+            if track.timings is not None:
+                track.timings.merge(stage_timings)
+            _resolve(track, 0)
@@ -1,9 +1,48 @@
+import time
+from dataclasses import dataclass
 from logging import Logger
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, TypeVar
 
 from src.server.enums.logging import LoggingLevelsEnum
 from src.server.enums.progress import AnnihilationProgressEnum
-from src.server.schemas.annihilator_sse import ResultSSESchema, ErrorSSESchema, ProgressSSESchema
+from src.server.schemas.annihilator_sse import (
+    BatchItemSSESchema,
+    BatchSummarySSESchema,
+    ResultSSESchema,
+    ErrorSSESchema,
+    ProgressSSESchema,
+    QueuedSSESchema,
+    SegmentSSESchema,
+    UploadSSESchema,
+)
+from src.server.tracing import current_span, current_trace_id
+
+_EventT = TypeVar("_EventT", bound=ProgressSSESchema)
+
+
+@dataclass
+class JobEvent:
+    """
+    An entry of a job's event log.
+
+    Attributes:
+        job_id (str): Job the event belongs to
+        event_id (int): Sequence number of the event within the job, starting at 1
+        data (str): JSON-serialized SSE schema
+    """
+
+    job_id: str
+    event_id: int
+    data: str
+
+    def to_sse(self) -> str:
+        """
+        Format the event as a Server-Sent Events message.
+
+        Returns:
+            str: SSE message with `id` and `data` fields
+        """
+        return f"id: {self.event_id}\ndata: {self.data}\n\n"
 
 
 class ProgressTracker:
@@ -11,32 +50,81 @@ class ProgressTracker:
     A class to track and log operation progress and generate SSE schemas for client communication.
 
     This class provides methods to update progress, report results, and handle errors while
-    maintaining consistent logging and SSE event generation.
+    maintaining consistent logging and SSE event generation. When tracking a job, it is the
+    job's event log: every generated event is numbered and passed to `on_event`, so clients
+    can resume the stream from the last event they received.
 
     Parameters:
         logger (Logger): Optional logger instance for tracking progress and errors.
+        job_id (str, optional): Job whose events are tracked.
+        on_event (Callable[[JobEvent], None], optional): Receives every numbered event.
+        last_event_id (int): Id of the last event already logged for the job.
+        min_interval (float): Minimum seconds between two separation progress events.
     """
 
-    def __init__(self, logger: Optional[Logger] = None) -> None:
+    def __init__(
+        self,
+        logger: Optional[Logger] = None,
+        job_id: Optional[str] = None,
+        on_event: Optional[Callable[[JobEvent], None]] = None,
+        last_event_id: int = 0,
+        min_interval: float = 0.0,
+    ) -> None:
         """
-        Initialize the ProgressTracker with an optional logger.
+        Initialize the ProgressTracker with an optional logger and event sink.
 
         Parameters:
             logger (Logger, optional): Python logger instance for progress tracking.
                                       Defaults to None (no logging).
+            job_id (str, optional): Job whose events are tracked. Defaults to None.
+            on_event (Callable[[JobEvent], None], optional): Receives every numbered event.
+                                      Defaults to None (events are not logged).
+            last_event_id (int): Id of the last event already logged for the job,
+                                      so numbering continues after a restart. Defaults to 0.
+            min_interval (float): Minimum seconds between two separation progress events,
+                                      so long separations do not flood the stream. Defaults to 0.0.
         """
         self.logger = logger
+        self.job_id = job_id
+        self.on_event = on_event
+        self.last_event_id = last_event_id
+        self.min_interval = min_interval
+        self._last_separation_update = 0.0
 
-    def _log(self, message: str, *, level: LoggingLevelsEnum = LoggingLevelsEnum.INFO, exc_info=False):
+    def _log(self, message: str, *args: Any, level: LoggingLevelsEnum = LoggingLevelsEnum.INFO, exc_info=False):
         """
         Internal method for consistent logging with class name prefix.
 
         Parameters:
             message (str): The message to log.
+            *args (Any): Values %-formatted into the message, only if the level is enabled.
             level (LoggerLevelsEnum, optional): Logging level. Defaults to INFO.
         """
-        if self.logger:
-            getattr(self.logger, level.value)(f"{self.__class__.__name__}: {message}", exc_info=exc_info)
+        if self.logger and self.logger.isEnabledFor(level.levelno):
+            getattr(self.logger, level.value)(
+                f"{self.__class__.__name__}: {message % args if args else message}",
+                exc_info=exc_info,
+                stacklevel=2,
+            )
+
+    def _emit(self, event: _EventT) -> _EventT:
+        """
+        Number an event and append it to the job's event log.
+
+        Parameters:
+            event (ProgressSSESchema): Generated event.
+
+        Returns:
+            ProgressSSESchema: The same event.
+        """
+        if self.on_event is not None and self.job_id is not None:
+            self.last_event_id += 1
+            self.on_event(JobEvent(
+                job_id=self.job_id,
+                event_id=self.last_event_id,
+                data=event.model_dump_json(exclude_none=True),
+            ))
+        return event
 
     def update_progress(self, progress: AnnihilationProgressEnum, message: Optional[str] = "") -> ProgressSSESchema:
         """
@@ -49,26 +137,172 @@ class ProgressTracker:
         Returns:
             ProgressSSESchema: SSE-compatible progress update schema.
         """
-        self._log(f"Progress: {progress} - {message}")
-        return ProgressSSESchema(progress=progress, message=message)
+        self._log("Progress: %s - %s", progress, message)
+        return self._emit(ProgressSSESchema(progress=progress, message=message, percent=float(progress.value)))
+
+    def separation_update(
+        self,
+        fraction: float,
+        eta_seconds: Optional[float] = None,
+        message: Optional[str] = "Processing in progress",
+    ) -> Optional[ProgressSSESchema]:
+        """
+        Generate a fractional progress event for the separation stage, rate limited.
+
+        The overall percent is interpolated between WORK_STARTED and WORK_COMPLETED.
+
+        Parameters:
+            fraction (float): Completed fraction of the separation, between 0 and 1.
+            eta_seconds (float, optional): Estimated seconds until the separation finishes.
+            message (str, optional): Additional progress details.
+
+        Returns:
+            Optional[ProgressSSESchema]: The event, or None if it was dropped by the rate limit.
+        """
+        now = time.monotonic()
+        if fraction < 1.0 and now - self._last_separation_update < self.min_interval:
+            return None
+        self._last_separation_update = now
+
+        fraction = min(max(fraction, 0.0), 1.0)
+        start = AnnihilationProgressEnum.WORK_STARTED.value
+        end = AnnihilationProgressEnum.WORK_COMPLETED.value
+        percent = round(start + fraction * (end - start), 1)
+        if eta_seconds is not None:
+            eta_seconds = round(eta_seconds, 1)
+
+        self._log("Separation progress: %s%%, ETA %ss", percent, eta_seconds, level=LoggingLevelsEnum.DEBUG)
+        return self._emit(ProgressSSESchema(
+            progress=AnnihilationProgressEnum.WORK_STARTED,
+            message=message,
+            percent=percent,
+            eta_seconds=eta_seconds,
+        ))
+
+    def queued_update(self, job_id: str, position: int) -> QueuedSSESchema:
+        """
+        Generate a queue position event with logging.
+
+        Parameters:
+            job_id (str): Identifier of the queued job.
+            position (int): 1-based position of the job in the queue.
+
+        Returns:
+            QueuedSSESchema: SSE-compatible queue position schema.
+        """
+        message = f"Queued, position {position}"
+        self._log("Job %s: %s", job_id, message)
+        return self._emit(QueuedSSESchema(job_id=job_id, position=position, message=message))
 
-    def result_update(self, result: str, message: Optional[str] = "") -> ResultSSESchema:
+    def result_update(
+        self,
+        result: str,
+        message: Optional[str] = "",
+        timings: Optional[Dict[str, float]] = None,
+    ) -> ResultSSESchema:
         """
-        Generate a result event with logging.
+        Generate a result event with logging, carrying the id of the current trace.
 
         Parameters:
             result (str): The actual result data.
             message (str): Message or details related to the result.
+            timings (Dict[str, float], optional): Seconds spent in each processing stage.
 
         Returns:
             ResultSSESchema: SSE-compatible result schema.
         """
-        self._log(f"Result progress: {message}")
-        return ResultSSESchema(result=result, message=message)
+        self._log("Result progress: %s", message)
+        return self._emit(ResultSSESchema(
+            result=result, message=message, timings=timings, trace_id=current_trace_id(),
+        ))
+
+    def upload_update(self, stem: str, success: bool, completed: int, total: int) -> UploadSSESchema:
+        """
+        Generate a per-stem upload event with logging.
+
+        Parameters:
+            stem (str): Name of the uploaded stem.
+            success (bool): Whether the upload succeeded.
+            completed (int): Number of finished uploads, including this one.
+            total (int): Number of stems being uploaded.
+
+        Returns:
+            UploadSSESchema: SSE-compatible upload result schema.
+        """
+        status = "uploaded" if success else "upload failed"
+        message = f"{stem} {status} ({completed}/{total})"
+        self._log(
+            "Upload: %s",
+            message,
+            level=LoggingLevelsEnum.INFO if success else LoggingLevelsEnum.WARNING,
+        )
+        return self._emit(UploadSSESchema(
+            stem=stem,
+            success=success,
+            completed=completed,
+            total=total,
+            message=message,
+        ))
+
+    def segment_update(self, stem: str, segment: int, duration: float) -> SegmentSSESchema:
+        """
+        Generate an event for a stem segment that is ready for playback.
+
+        Parameters:
+            stem (str): Name of the stem.
+            segment (int): 0-based index of the segment.
+            duration (float): Length of the segment in seconds.
+
+        Returns:
+            SegmentSSESchema: SSE-compatible segment schema.
+        """
+        self._log("Segment %s of %s ready (%.1fs)", segment, stem, duration, level=LoggingLevelsEnum.DEBUG)
+        return self._emit(SegmentSSESchema(
+            stem=stem,
+            segment=segment,
+            duration=duration,
+            playlist=f"{stem}.m3u8",
+        ))
+
+    def batch_summary_update(
+        self,
+        result: str,
+        items: int,
+        succeeded: int,
+        audio_seconds: float,
+        wall_seconds: float,
+    ) -> BatchSummarySSESchema:
+        """
+        Generate the final result event of a batch with its throughput.
+
+        Parameters:
+            result (str): Identifier of the batch job.
+            items (int): Number of items in the batch.
+            succeeded (int): Number of items separated and stored.
+            audio_seconds (float): Summed duration of the items separated, cached results excluded.
+            wall_seconds (float): Time the batch took.
+
+        Returns:
+            BatchSummarySSESchema: SSE-compatible batch result schema.
+        """
+        wall_seconds = max(wall_seconds, 1e-6)
+        message = f"Batch complete: {succeeded}/{items} items separated"
+        self._log("%s, %.1fs of audio in %.1fs", message, audio_seconds, wall_seconds)
+        return self._emit(BatchSummarySSESchema(
+            result=result,
+            message=message,
+            items=items,
+            succeeded=succeeded,
+            failed=items - succeeded,
+            audio_seconds=round(audio_seconds, 1),
+            wall_seconds=round(wall_seconds, 1),
+            realtime_factor=round(audio_seconds / wall_seconds, 2),
+            items_per_hour=round(succeeded * 3600 / wall_seconds, 1),
+        ))
 
     def error_update(self, error: str) -> ErrorSSESchema:
         """
-        Generate an error event with error-level logging.
+        Generate an error event with error-level logging, marking the current span as failed.
 
         Parameters:
             error (str): Error description or message.
@@ -76,5 +310,45 @@ class ProgressTracker:
         Returns:
             ErrorSSESchema: SSE-compatible error schema.
         """
-        self._log(f"Error: {error}", level=LoggingLevelsEnum.ERROR)
-        return ErrorSSESchema(error=error)
+        self._log("Error: %s", error, level=LoggingLevelsEnum.ERROR)
+        current_span().set_error(error)
+        return self._emit(ErrorSSESchema(error=error))
+
+
+class BatchItemTracker(ProgressTracker):
+    """
+    Progress tracker of one item of a batch.
+
+    Events generated for the item are tagged with the item's index and name and appended
+    to the batch job's event log, so all items share one numbered event stream.
+
+    Parameters:
+        batch_tracker (ProgressTracker): Event log of the batch job.
+        item (int): 0-based index of the item in the batch.
+        name (str): Uploaded filename or S3 key of the item.
+        min_interval (float): Minimum seconds between two separation progress events of the item.
+    """
+
+    def __init__(self, batch_tracker: ProgressTracker, item: int, name: str, min_interval: float = 0.0) -> None:
+        """Initialize the item tracker on top of the batch's event log."""
+        super().__init__(batch_tracker.logger, min_interval=min_interval)
+        self.batch_tracker = batch_tracker
+        self.item = item
+        self.name = name
+
+    def _emit(self, event: _EventT) -> _EventT:
+        """
+        Append an item event to the batch's event log.
+
+        Parameters:
+            event (ProgressSSESchema): Generated item event.
+
+        Returns:
+            ProgressSSESchema: The same event.
+        """
+        self.batch_tracker._emit(BatchItemSSESchema(
+            item=self.item,
+            name=self.name,
+            **event.model_dump(exclude_none=True),
+        ))
+        return event
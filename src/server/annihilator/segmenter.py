@@ -0,0 +1,397 @@
+import asyncio
+from dataclasses import dataclass
+from logging import Logger
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.server.annihilator.audio import SAMPLE_RATE, AudioEncoder, fit_length, source_name
+from src.server.annihilator.separator_pool import SeparatorPool
+from src.server.annihilator.timings import ENCODE, StageTimings
+from src.server.enums.logging import LoggingLevelsEnum
+
+
+@dataclass(frozen=True)
+class SegmentWindow:
+    """
+    A window of the input track, in samples.
+
+    Attributes:
+        index (int): Position of the window in the track
+        start (int): First sample of the window
+        end (int): Sample after the last sample of the window
+    """
+
+    index: int
+    start: int
+    end: int
+
+    @property
+    def samples(self) -> int:
+        """
+        Number of samples covered by the window.
+
+        Returns:
+            int: Window length in samples
+        """
+        return self.end - self.start
+
+
+def plan_windows(total_samples: int, window_samples: int, overlap_samples: int) -> List[SegmentWindow]:
+    """
+    Split a track into fixed-length windows where consecutive windows overlap.
+
+    Parameters:
+        total_samples (int): Length of the track in samples
+        window_samples (int): Length of each window in samples
+        overlap_samples (int): Number of samples shared by consecutive windows
+
+    Returns:
+        List[SegmentWindow]: Windows covering the whole track. The last window may be shorter.
+
+    Raises:
+        ValueError: If the overlap is not smaller than the window
+    """
+    if not 0 <= overlap_samples < window_samples:
+        raise ValueError("Segment overlap must be non-negative and shorter than the window")
+
+    hop = window_samples - overlap_samples
+    windows = []
+    start = 0
+    while True:
+        end = min(start + window_samples, total_samples)
+        windows.append(SegmentWindow(index=len(windows), start=start, end=end))
+        if end >= total_samples:
+            return windows
+        start += hop
+
+
+def crossfade_curves(length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build complementary raised-cosine fade curves for an overlap region.
+
+    The curves sum to one at every sample, so overlap-adding two separations of the
+    same audio keeps the original level without a seam.
+
+    Parameters:
+        length (int): Number of samples in the overlap
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (fade_in, fade_out) arrays with shape (length, 1)
+    """
+    position = (np.arange(length, dtype=np.float32) + 0.5) / max(length, 1)
+    fade_in = np.sin(0.5 * np.pi * position) ** 2
+    return fade_in[:, None], (1.0 - fade_in)[:, None]
+
+
+class OverlapAddStitcher:
+    """
+    Reassemble separated windows into continuous stems with crossfaded overlap-add.
+
+    Windows may be added in any order. As soon as a contiguous run of windows is
+    available, the finalized part of the stems is returned, so only the overlap tail
+    and out-of-order windows are kept in memory.
+
+    Parameters:
+        windows (List[SegmentWindow]): Windows produced by `plan_windows`
+    """
+
+    def __init__(self, windows: List[SegmentWindow]):
+        """Initialize the stitcher for the given window layout."""
+        self.windows = windows
+        self._ready: Dict[int, Dict[str, np.ndarray]] = {}
+        self._next_index = 0
+        self._carry: Optional[Dict[str, np.ndarray]] = None
+
+    @property
+    def is_complete(self) -> bool:
+        """
+        Check if every window has been stitched.
+
+        Returns:
+            bool: True once all windows have been emitted
+        """
+        return self._next_index >= len(self.windows)
+
+    def add(self, index: int, stems: Dict[str, np.ndarray]) -> List[Dict[str, np.ndarray]]:
+        """
+        Add a separated window and return every stem piece that is now final.
+
+        Parameters:
+            index (int): Index of the separated window
+            stems (Dict[str, np.ndarray]): Mapping of stem names to window waveforms
+
+        Returns:
+            List[Dict[str, np.ndarray]]: Consecutive stem pieces in track order
+        """
+        self._ready[index] = stems
+        pieces = []
+        while self._next_index in self._ready:
+            pieces.append(self._stitch(self._next_index, self._ready.pop(self._next_index)))
+            self._next_index += 1
+        return pieces
+
+    def _stitch(self, index: int, stems: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Crossfade a window with the previous tail and split off its own tail.
+
+        Parameters:
+            index (int): Index of the window being stitched
+            stems (Dict[str, np.ndarray]): Mapping of stem names to window waveforms
+
+        Returns:
+            Dict[str, np.ndarray]: Final samples from the window start to the next window start
+        """
+        window = self.windows[index]
+        is_last = index == len(self.windows) - 1
+        next_overlap = 0 if is_last else window.end - self.windows[index + 1].start
+
+        piece = {}
+        carry = {}
+        for stem, waveform in stems.items():
+            waveform = fit_length(np.asarray(waveform, dtype=np.float32), window.samples).copy()
+
+            if self._carry is not None:
+                overlap = self._carry[stem].shape[0]
+                fade_in, _ = crossfade_curves(overlap)
+                waveform[:overlap] = waveform[:overlap] * fade_in + self._carry[stem]
+
+            if next_overlap:
+                _, fade_out = crossfade_curves(next_overlap)
+                carry[stem] = waveform[-next_overlap:] * fade_out
+                waveform = waveform[:-next_overlap]
+
+            piece[stem] = waveform
+
+        self._carry = carry or None
+        return piece
+
+
+class SegmentedSeparator:
+    """
+    Separate long tracks as overlapping windows spread across the separator pool.
+
+    Each window is decoded and separated inside a pool worker, and the resulting stems
+    are crossfaded back together and streamed into one encoder per stem. This bounds
+    memory by the window size instead of the track length and uses several workers
+    for a single track.
+
+    Parameters:
+        separator_pool (SeparatorPool): Running worker pool used for window separation
+        window_seconds (float): Length of each window in seconds
+        overlap_seconds (float): Overlap between consecutive windows in seconds
+        parallelism (int): Maximum number of windows of one track separated at once
+        min_duration (float): Tracks longer than this many seconds are segmented
+        logger (Logger, optional): Python logger instance for operation tracking
+    """
+
+    def __init__(
+        self,
+        separator_pool: SeparatorPool,
+        window_seconds: float,
+        overlap_seconds: float,
+        parallelism: int,
+        min_duration: float,
+        logger: Optional[Logger] = None,
+    ):
+        """Initialize the segmented separator with window layout and parallelism."""
+        self.separator_pool = separator_pool
+        self.window_samples = int(window_seconds * SAMPLE_RATE)
+        self.overlap_samples = int(overlap_seconds * SAMPLE_RATE)
+        self.parallelism = max(parallelism, 1)
+        self.min_duration = min_duration
+        self.logger = logger
+
+    def _log(
+        self,
+        message: str,
+        *args: Any,
+        level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
+        exc_info: bool = False,
+    ) -> None:
+        """
+        Internal logging helper with class name prefix.
+
+        Parameters:
+            message (str): Message to log
+            *args (Any): Values %-formatted into the message, only if the level is enabled
+            level (LoggingLevelsEnum): Logging level (default: INFO)
+            exc_info (bool): Whether to include exception info (default: False)
+        """
+        if self.logger and self.logger.isEnabledFor(level.levelno):
+            getattr(self.logger, level.value)(
+                f"{self.__class__.__name__}: {message % args if args else message}",
+                exc_info=exc_info,
+                stacklevel=2,
+            )
+
+    def should_segment(self, duration: float, streaming: bool = False) -> bool:
+        """
+        Decide whether a track is long enough to be separated in windows.
+
+        Parameters:
+            duration (float): Track duration in seconds
+            streaming (bool): Whether stems are streamed while they are separated. Any track
+                longer than one window is then segmented, so its first part is ready early.
+
+        Returns:
+            bool: True if the track should be segmented
+        """
+        if streaming:
+            return duration * SAMPLE_RATE > self.window_samples
+        return duration > self.min_duration
+
+    async def _separate_window(
+        self,
+        semaphore: asyncio.Semaphore,
+        source: str,
+        window: SegmentWindow,
+        model: str,
+        timings: Optional[StageTimings] = None,
+        stems: Optional[List[str]] = None,
+    ) -> Tuple[int, Dict[str, np.ndarray]]:
+        """
+        Separate one window in the pool once a parallelism slot is free.
+
+        Parameters:
+            semaphore (asyncio.Semaphore): Limits windows in flight for this track
+            source (str): Local path or URL of the input audio
+            window (SegmentWindow): Window to separate
+            model (str): Spleeter model to use
+            timings (StageTimings, optional): Receives the window's decode and inference times
+            stems (List[str], optional): Stems to separate, None for every stem of the model
+
+        Returns:
+            Tuple[int, Dict[str, np.ndarray]]: Window index and mapping of stem names to waveforms
+        """
+        async with semaphore:
+            separated = await self.separator_pool.separate_segment(
+                source=source,
+                model=model,
+                offset=window.start / SAMPLE_RATE,
+                duration=window.samples / SAMPLE_RATE,
+                samples=window.samples,
+                timings=timings,
+                stems=stems,
+            )
+        return window.index, separated
+
+    @staticmethod
+    async def _write_piece(
+        encoders: Dict[str, AudioEncoder],
+        piece: Dict[str, np.ndarray],
+        output_dir: Path,
+        codec: str,
+        bitrate: str,
+    ) -> None:
+        """
+        Stream a stitched piece to the per-stem encoders concurrently, starting them on first use.
+
+        Parameters:
+            encoders (Dict[str, AudioEncoder]): Running encoders by stem name
+            piece (Dict[str, np.ndarray]): Final stem samples to write
+            output_dir (Path): Directory for encoded stems
+            codec (str): Output audio codec
+            bitrate (str): Output audio bitrate
+        """
+        for stem in piece:
+            if stem not in encoders:
+                encoders[stem] = AudioEncoder(output_dir / f"{stem}.{codec}", codec, bitrate)
+        await asyncio.gather(
+            *(asyncio.to_thread(encoders[stem].write, waveform) for stem, waveform in piece.items())
+        )
+
+    async def separate_to_files(
+        self,
+        input_path: Union[Path, str],
+        output_dir: Path,
+        model: str,
+        codec: str,
+        bitrate: str,
+        duration: float,
+        on_progress: Optional[Callable[[float], None]] = None,
+        timings: Optional[StageTimings] = None,
+        on_piece: Optional[Callable[[Dict[str, np.ndarray]], Awaitable[None]]] = None,
+        stems: Optional[List[str]] = None,
+    ) -> int:
+        """
+        Separate a track window by window and write one encoded file per stem.
+
+        Parameters:
+            input_path (Union[Path, str]): Path or URL of the input audio. Every window
+                decodes only its own range, so URLs are read with ranged requests.
+            output_dir (Path): Directory to save output stems
+            model (str): Spleeter model to use
+            codec (str): Output audio codec
+            bitrate (str): Output audio bitrate
+            duration (float): Track duration in seconds
+            on_progress (Callable[[float], None], optional): Called with the audio seconds
+                separated so far each time a window finishes
+            timings (StageTimings, optional): Receives the decode and inference times summed
+                over all windows, and the encode time
+            on_piece (Callable[[Dict[str, np.ndarray]], Awaitable[None]], optional): Awaited with
+                every stitched stem piece, in track order, as soon as it is final
+            stems (List[str], optional): Stems to separate and write, optionally including the
+                residual. None writes every stem of the model.
+
+        Returns:
+            int: Return code (0 for success)
+
+        Raises:
+            SeparationError: If a window failed in its worker, with the reason
+        """
+        windows = plan_windows(
+            total_samples=int(duration * SAMPLE_RATE),
+            window_samples=self.window_samples,
+            overlap_samples=self.overlap_samples,
+        )
+        self._log(
+            "Separating %s in %s windows, parallelism=%s",
+            source_name(input_path),
+            len(windows),
+            self.parallelism,
+        )
+
+        timings = timings if timings is not None else StageTimings()
+        stitcher = OverlapAddStitcher(windows)
+        encoders: Dict[str, AudioEncoder] = {}
+        semaphore = asyncio.Semaphore(self.parallelism)
+        tasks = [
+            asyncio.create_task(self._separate_window(semaphore, str(input_path), window, model, timings, stems))
+            for window in windows
+        ]
+
+        # Overlaps are separated twice, so progress is scaled to the summed window length
+        window_samples_total = sum(window.samples for window in windows)
+        separated_samples = 0
+        try:
+            for next_window in asyncio.as_completed(tasks):
+                index, window_stems = await next_window
+                separated_samples += windows[index].samples
+                if on_progress is not None:
+                    on_progress(duration * separated_samples / window_samples_total)
+                self._log(
+                    "Window %s/%s separated",
+                    index + 1,
+                    len(windows),
+                    level=LoggingLevelsEnum.DEBUG,
+                )
+                with timings.stage(ENCODE):
+                    for piece in stitcher.add(index, window_stems):
+                        await self._write_piece(encoders, piece, output_dir, codec, bitrate)
+                        if on_piece is not None:
+                            await on_piece(piece)
+
+            with timings.stage(ENCODE):
+                return_codes = await asyncio.gather(
+                    *(asyncio.to_thread(encoder.close) for encoder in encoders.values())
+                )
+            encoders.clear()
+            return max(return_codes, default=1)
+
+        finally:
+            for task in tasks:
+                task.cancel()
+            for encoder in encoders.values():
+                encoder.kill()
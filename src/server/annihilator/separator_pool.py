@@ -0,0 +1,821 @@
+import asyncio
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from logging import Logger
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Set, Tuple, Any, Union
+from uuid import uuid4
+
+from src.server.annihilator.timings import StageTimings
+from src.server.enums.logging import LoggingLevelsEnum
+
+# Message kinds sent from workers to the pool over the shared result queue, as
+# (kind, index, generation, job_id, payload, error) tuples
+_READY = "ready"
+_DONE = "done"
+_MODELS = "models"
+
+# Sentinel sent to a worker's task queue to ask it to exit
+_STOP = None
+
+# Spleeter downloads the weights of every model whose directory lacks this marker
+_MODEL_PROBE = ".probe"
+
+# Job kinds understood by workers
+_FILE_JOB = "file"
+_SEGMENT_JOB = "segment"
+_PACKED_JOB = "packed"
+
+
+class SeparationError(RuntimeError):
+    """Raised when a worker fails to separate a job."""
+
+
+@dataclass
+class _SeparationJob:
+    """
+    A single separation request waiting for, or assigned to, a pool worker.
+
+    Attributes:
+        job_id (str): Unique identifier used to match worker replies
+        kind (str): Job kind, either a whole file or a waveform segment
+        params (Dict[str, Any]): Picklable job parameters sent to the worker
+        future (Future): Resolved with the worker's payload, or a SeparationError
+    """
+
+    job_id: str
+    kind: str
+    params: Dict[str, Any]
+    future: Future = field(default_factory=Future)
+
+    def to_message(self) -> Dict[str, Any]:
+        """
+        Build the picklable payload sent to a worker process.
+
+        Returns:
+            Dict[str, Any]: Job parameters without the parent-side future
+        """
+        return {"job_id": self.job_id, "kind": self.kind, **self.params}
+
+
+def _marked_model_path(model_path: str, index: int) -> str:
+    """
+    Get a weights directory in which every model carries spleeter's download marker.
+
+    Missing markers are created in place where a model directory is writable. If one
+    cannot be created, as on a read-only mount, the models are mirrored as symlinks
+    into a temporary directory of the worker slot and the markers are added there.
+
+    Parameters:
+        model_path (str): Directory holding one subdirectory of weights per model
+        index (int): Worker slot index, naming the slot's mirror
+
+    Returns:
+        str: Directory to read the weights from
+    """
+    root = Path(model_path)
+    models = [path for path in root.iterdir() if path.is_dir()] if root.is_dir() else []
+    for weights in models:
+        if not (weights / _MODEL_PROBE).exists() and os.access(weights, os.W_OK):
+            (weights / _MODEL_PROBE).touch()
+    if all((weights / _MODEL_PROBE).exists() for weights in models):
+        return model_path
+
+    # Rebuilt on every start, a restarted worker replaces the mirror of its predecessor
+    mirror = Path(tempfile.gettempdir()) / f"spleeter-models-{os.getppid()}-{index}"
+    shutil.rmtree(mirror, ignore_errors=True)
+    for weights in models:
+        (mirror / weights.name).mkdir(parents=True)
+        for path in weights.iterdir():
+            if path.name != _MODEL_PROBE:
+                (mirror / weights.name / path.name).symlink_to(path)
+        (mirror / weights.name / _MODEL_PROBE).touch()
+    return str(mirror)
+
+
+def _worker_main(
+    index: int,
+    generation: int,
+    models: List[str],
+    model_path: str,
+    memory_budget: int,
+    task_queue,
+    result_queue,
+) -> None:
+    """
+    Entry point of a separator worker process.
+
+    Loads the pinned Spleeter models from the local weights directory, reports
+    readiness, and then serves separation jobs from its task queue until it receives
+    the stop sentinel. Other models are loaded on first use and evicted under the
+    memory budget. Model statistics are reported after startup and after every job.
+
+    Parameters:
+        index (int): Worker slot index inside the pool
+        generation (int): Number of the process started for the slot, sent with every reply
+        models (List[str]): Models to load before accepting jobs and keep loaded
+        model_path (str): Directory holding one subdirectory of weights per model
+        memory_budget (int): Memory in bytes the loaded models may use together
+        task_queue: Queue with jobs assigned to this worker
+        result_queue: Queue shared by all workers for replies to the pool
+    """
+    # Spleeter reads the weights location from the environment when it is imported
+    os.environ["MODEL_PATH"] = _marked_model_path(model_path, index)
+
+    # Imported here so that TensorFlow is only ever loaded inside worker processes
+    import numpy as np
+    from spleeter.separator import Separator
+
+    from src.server.annihilator.audio import decode_audio, encode_stems, fit_length
+    from src.server.annihilator.model_registry import ModelRegistry
+    from src.server.annihilator.packing import pack_waveforms, unpack_stems
+    from src.server.annihilator.stems import separate_stems
+    from src.server.annihilator.timings import DECODE, ENCODE, INFERENCE, StageTimings
+
+    def load_separator(model: str) -> Separator:
+        weights = Path(model_path) / model
+        if not weights.is_dir():
+            # Never fall back to spleeter's download from the network
+            raise FileNotFoundError(f"Weights of model {model} not found in {weights}")
+
+        separator = Separator(f"spleeter:{model}", multiprocess=False)
+        # Run a short silent waveform through the model to build the graph and load weights
+        separator.separate(np.zeros((44100, 2), dtype=np.float32))
+        return separator
+
+    def unload_separator(separator: Separator) -> None:
+        # Dropping the separator alone leaves its session open, holding the weights and graph buffers
+        session = getattr(separator, "_session", None)
+        if session is not None:
+            session.close()
+            separator._session = None
+        separator._tf_graph = None
+
+    def separate_file(job: Dict[str, Any]) -> Dict[str, float]:
+        # Decoded once into memory, separated in place and encoded with one ffmpeg pipe per stem
+        timings = StageTimings()
+        with timings.stage(DECODE):
+            waveform = decode_audio(job["input_path"])
+        with timings.stage(INFERENCE):
+            stems = separate_stems(registry.get(job["model"]), waveform, job["stems"])
+        with timings.stage(ENCODE):
+            encode_stems(stems, Path(job["output_dir"]), job["codec"], job["bitrate"])
+        return timings.as_dict()
+
+    def separate_segment(job: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        timings = StageTimings()
+        with timings.stage(DECODE):
+            waveform = decode_audio(job["source"], offset=job["offset"], duration=job["duration"])
+            waveform = fit_length(waveform, job["samples"])
+        with timings.stage(INFERENCE):
+            stems = separate_stems(registry.get(job["model"]), waveform, job["stems"])
+        return stems, timings.as_dict()
+
+    def separate_packed(job: Dict[str, Any]) -> List[Tuple[Optional[Dict[str, float]], Optional[str]]]:
+        # Short tracks share one model run, failures of one track do not affect the others
+        outcomes: List[Tuple[Optional[Dict[str, float]], Optional[str]]] = []
+        waveforms = []
+        item_timings = []
+        for item in job["items"]:
+            timings = StageTimings()
+            try:
+                with timings.stage(DECODE):
+                    waveforms.append(decode_audio(item["input_path"]))
+                item_timings.append(timings)
+                outcomes.append((None, None))
+            except Exception as e:
+                outcomes.append((None, str(e)))
+
+        if not waveforms:
+            return outcomes
+
+        mixture, offsets = pack_waveforms(waveforms)
+        started = time.perf_counter()
+        stems = separate_stems(registry.get(job["model"]), mixture, job["stems"])
+        inference_seconds = time.perf_counter() - started
+        lengths = [waveform.shape[0] for waveform in waveforms]
+        pieces = unpack_stems(stems, offsets, lengths)
+
+        decoded = [position for position, (_, error) in enumerate(outcomes) if error is None]
+        for position, timings, item_stems, waveform in zip(decoded, item_timings, pieces, waveforms):
+            # The shared model run is attributed to the tracks by their length
+            timings.add(INFERENCE, inference_seconds * waveform.shape[0] / sum(lengths))
+            try:
+                with timings.stage(ENCODE):
+                    encode_stems(item_stems, Path(job["items"][position]["output_dir"]), job["codec"], job["bitrate"])
+                outcomes[position] = (timings.as_dict(), None)
+            except Exception as e:
+                outcomes[position] = (None, str(e))
+        return outcomes
+
+    handlers = {
+        _FILE_JOB: separate_file,
+        _SEGMENT_JOB: separate_segment,
+        _PACKED_JOB: separate_packed,
+    }
+
+    registry = ModelRegistry(load_separator, memory_budget, unloader=unload_separator)
+    load_errors = []
+    for model in models:
+        try:
+            registry.pin(model)
+        except Exception as e:
+            # Keep serving, models that fail to load up front are retried by the jobs needing them
+            load_errors.append(f"{model}: {e}")
+    load_error = "; ".join(load_errors) or None
+
+    result_queue.put((_READY, index, generation, None, None, None))
+    result_queue.put((_MODELS, index, generation, None, registry.stats(), load_error))
+
+    while True:
+        job = task_queue.get()
+        if job is _STOP:
+            break
+
+        try:
+            payload = handlers[job["kind"]](job)
+            result_queue.put((_DONE, index, generation, job["job_id"], payload, None))
+        except Exception as e:
+            result_queue.put((_DONE, index, generation, job["job_id"], None, str(e)))
+        result_queue.put((_MODELS, index, generation, None, registry.stats(), None))
+
+
+class SeparatorPool:
+    """
+    A pool of long-lived worker processes that keep Spleeter models loaded in memory.
+
+    Spawning the `spleeter` CLI per request re-imports TensorFlow and reloads the model
+    weights every time. The pool starts N workers once, each loading the configured
+    models at startup, and dispatches separation jobs to idle workers over queues,
+    preferring a worker that already has the job's model loaded. Other models are
+    loaded by workers on demand and evicted under a memory budget.
+    A background monitor restarts crashed workers and fails the job they were running.
+    Replies still queued by a worker that was replaced are recognized by its generation
+    and dropped, so they cannot resolve or free the job of its replacement.
+
+    Parameters:
+        logger (Logger, optional): Python logger instance for operation tracking.
+                                  Defaults to None.
+
+    Attributes:
+        _size (int): Number of worker processes
+        _models (List[str]): Models loaded by every worker at startup
+        _model_stats (Dict[int, Dict[str, Dict[str, Any]]]): Models loaded per worker
+        _processes (Dict[int, Process]): Worker processes by slot index
+        _generations (Dict[int, int]): Number of the current process of each slot
+        _pending (Deque[_SeparationJob]): Jobs waiting for an idle worker
+        _assignments (Dict[int, _SeparationJob]): Jobs currently running per worker
+    """
+
+    def __init__(self, logger: Optional[Logger] = None):
+        """Initialize the separator pool in unconfigured state."""
+        self._logger = logger
+        self._context = multiprocessing.get_context("spawn")
+        self._size = 0
+        self._models: List[str] = []
+        self._model_path = ""
+        self._memory_budget = 0
+        self._healthcheck_interval = 5.0
+
+        self._lock = threading.Lock()
+        self._processes: Dict[int, Any] = {}
+        self._generations: Dict[int, int] = {}
+        self._task_queues: Dict[int, Any] = {}
+        self._result_queue: Optional[Any] = None
+        self._idle: Set[int] = set()
+        self._pending: Deque[_SeparationJob] = deque()
+        self._assignments: Dict[int, _SeparationJob] = {}
+        self._restarts: Dict[int, int] = {}
+        self._model_stats: Dict[int, Dict[str, Dict[str, Any]]] = {}
+
+        self._running = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def _log(
+        self,
+        message: str,
+        *args: Any,
+        level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
+        exc_info: bool = False,
+    ) -> None:
+        """
+        Internal logging helper with class name prefix.
+
+        Parameters:
+            message (str): Message to log
+            *args (Any): Values %-formatted into the message, only if the level is enabled
+            level (LoggingLevelsEnum): Logging level (default: INFO)
+            exc_info (bool): Whether to include exception info (default: False)
+        """
+        if self._logger and self._logger.isEnabledFor(level.levelno):
+            getattr(self._logger, level.value)(
+                f"{self.__class__.__name__}: {message % args if args else message}",
+                exc_info=exc_info,
+                stacklevel=2,
+            )
+
+    @property
+    def is_initialized(self) -> bool:
+        """
+        Check if the pool has been started.
+
+        Returns:
+            bool: True if worker processes are running, False otherwise
+        """
+        return self._running.is_set()
+
+    @property
+    def is_healthy(self) -> bool:
+        """
+        Check if at least one worker is alive and able to accept jobs.
+
+        Returns:
+            bool: True if any worker process is alive, False otherwise
+        """
+        with self._lock:
+            return any(process.is_alive() for process in self._processes.values())
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Describe the current state of the pool.
+
+        Returns:
+            Dict[str, Any]: Worker liveness, restart counts, queue sizes and the load time
+                and memory footprint of the models loaded by each worker
+        """
+        with self._lock:
+            return {
+                "size": self._size,
+                "models": list(self._models),
+                "alive": sum(process.is_alive() for process in self._processes.values()),
+                "idle": len(self._idle),
+                "busy": len(self._assignments),
+                "pending": len(self._pending),
+                "restarts": dict(self._restarts),
+                "loaded_models": {index: dict(stats) for index, stats in self._model_stats.items()},
+            }
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every worker has loaded its models.
+
+        Parameters:
+            timeout (float, optional): Maximum seconds to wait, None to wait forever
+
+        Returns:
+            bool: True if all workers are ready, False if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            with self._lock:
+                if len(self._idle) + len(self._assignments) >= self._size:
+                    return True
+            time.sleep(0.1)
+        return False
+
+    def initialize(
+        self,
+        size: int,
+        models: List[str],
+        model_path: Path,
+        memory_budget: int,
+        healthcheck_interval: float = 5.0,
+    ) -> None:
+        """
+        Start the worker processes and the background dispatcher threads.
+
+        Parameters:
+            size (int): Number of worker processes to start
+            models (List[str]): Models every worker loads at startup and keeps loaded
+            model_path (Path): Local directory with the pretrained weights of every model
+            memory_budget (int): Memory in bytes the models of one worker may use together
+            healthcheck_interval (float): Seconds between worker liveness checks
+
+        Raises:
+            ValueError: If size is not positive
+        """
+        if size < 1:
+            raise ValueError("Separator pool size must be positive")
+
+        self._log("Starting separator pool: size=%s, models=%s", size, models)
+
+        self._size = size
+        self._models = list(models)
+        self._model_path = str(model_path)
+        self._memory_budget = memory_budget
+        self._healthcheck_interval = healthcheck_interval
+        self._result_queue = self._context.Queue()
+        self._running.set()
+
+        for index in range(size):
+            self._start_worker(index)
+
+        self._threads = [
+            threading.Thread(target=self._listen_results, name="separator-pool-results", daemon=True),
+            threading.Thread(target=self._monitor_workers, name="separator-pool-monitor", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """
+        Stop all workers and fail any jobs that have not finished yet.
+
+        Parameters:
+            timeout (float): Seconds to wait for each worker to exit gracefully
+        """
+        if not self._running.is_set():
+            return
+
+        self._log("Shutting down separator pool")
+        self._running.clear()
+
+        with self._lock:
+            processes = dict(self._processes)
+            for index in processes:
+                self._task_queues[index].put(_STOP)
+
+            unfinished = list(self._pending) + list(self._assignments.values())
+            self._pending.clear()
+            self._assignments.clear()
+            self._idle.clear()
+
+        for job in unfinished:
+            self._fail_job(job, "Separator pool is shutting down")
+
+        for process in processes.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+
+        # Wake up the result listener so it can observe the stopped state
+        self._result_queue.put((_DONE, -1, 0, None, None, None))
+        for thread in self._threads:
+            thread.join(timeout)
+
+        self._processes.clear()
+        self._task_queues.clear()
+
+    def _start_worker(self, index: int) -> None:
+        """
+        Spawn a worker process for the given slot. Must be called with the lock held
+        or before the background threads are started.
+
+        Parameters:
+            index (int): Worker slot index
+        """
+        generation = self._generations.get(index, 0) + 1
+        task_queue = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(index, generation, self._models, self._model_path, self._memory_budget, task_queue, self._result_queue),
+            name=f"separator-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+
+        self._generations[index] = generation
+        self._task_queues[index] = task_queue
+        self._processes[index] = process
+        self._model_stats.pop(index, None)
+        self._log("Worker %s started with PID: %s", index, process.pid)
+
+    def _pick_worker(self, model: Optional[str]) -> int:
+        """
+        Choose an idle worker for a job, preferring one that has the model loaded.
+        Must be called with the lock held and at least one idle worker.
+
+        Parameters:
+            model (str, optional): Model the job needs
+
+        Returns:
+            int: Slot index of the chosen worker, removed from the idle set
+        """
+        for index in self._idle:
+            if model in self._model_stats.get(index, {}):
+                break
+        else:
+            index = next(iter(self._idle))
+
+        self._idle.remove(index)
+        return index
+
+    def _dispatch(self) -> None:
+        """Assign pending jobs to idle workers. Must be called with the lock held."""
+        while self._pending and self._idle:
+            job = self._pending.popleft()
+            if job.future.cancelled():
+                continue
+
+            index = self._pick_worker(job.params.get("model"))
+
+            self._assignments[index] = job
+            self._task_queues[index].put(job.to_message())
+            self._log(
+                "Job %s dispatched to worker %s",
+                job.job_id,
+                index,
+                level=LoggingLevelsEnum.DEBUG,
+            )
+
+    def _listen_results(self) -> None:
+        """Background thread resolving job futures from worker replies."""
+        while self._running.is_set():
+            kind, index, generation, job_id, payload, error = self._result_queue.get()
+            if index < 0:
+                continue
+
+            with self._lock:
+                if generation != self._generations.get(index):
+                    # Sent by a worker terminated or crashed since, its slot runs another process
+                    self._log(
+                        "Dropping %s reply of replaced worker %s (generation %s)",
+                        kind,
+                        index,
+                        generation,
+                        level=LoggingLevelsEnum.DEBUG,
+                    )
+                    continue
+
+                if kind == _READY:
+                    self._log("Worker %s loaded models and is ready", index)
+                    self._idle.add(index)
+                elif kind == _MODELS:
+                    self._model_stats[index] = payload
+                    if error:
+                        self._log("Worker %s failed to load models: %s", index, error, level=LoggingLevelsEnum.ERROR)
+                elif kind == _DONE:
+                    job = self._assignments.get(index)
+                    if job is None or job.job_id != job_id:
+                        self._log(
+                            "Ignoring reply of worker %s for job %s it is not running",
+                            index,
+                            job_id,
+                            level=LoggingLevelsEnum.WARNING,
+                        )
+                        continue
+
+                    del self._assignments[index]
+                    self._idle.add(index)
+                    if error:
+                        self._fail_job(job, f"Worker {index} error: {error}")
+                    elif not job.future.done():
+                        job.future.set_result(payload)
+                self._dispatch()
+
+    def _monitor_workers(self) -> None:
+        """Background thread restarting crashed workers and failing their jobs."""
+        while self._running.is_set():
+            time.sleep(self._healthcheck_interval)
+            if not self._running.is_set():
+                break
+
+            crashed_jobs = []
+            with self._lock:
+                for index, process in list(self._processes.items()):
+                    if process.is_alive():
+                        continue
+
+                    self._log(
+                        "Worker %s (PID %s) died with exit code %s, restarting",
+                        index,
+                        process.pid,
+                        process.exitcode,
+                        level=LoggingLevelsEnum.WARNING,
+                    )
+                    self._idle.discard(index)
+                    job = self._assignments.pop(index, None)
+                    if job is not None:
+                        crashed_jobs.append((job, process.exitcode))
+
+                    self._restarts[index] = self._restarts.get(index, 0) + 1
+                    self._start_worker(index)
+
+            for job, exitcode in crashed_jobs:
+                self._fail_job(job, f"Separator worker crashed with exit code {exitcode}")
+
+    def _cancel_job(self, job: _SeparationJob) -> None:
+        """
+        Stop a job whose caller is no longer waiting for it.
+
+        A pending job is dropped. A job that is already running is stopped by
+        terminating its worker, which is restarted right away with the same models.
+
+        Parameters:
+            job (_SeparationJob): Job to cancel
+        """
+        with self._lock:
+            if job in self._pending:
+                self._pending.remove(job)
+                self._log("Job %s cancelled before dispatch", job.job_id)
+                return
+
+            for index, assigned in list(self._assignments.items()):
+                if assigned is not job:
+                    continue
+
+                del self._assignments[index]
+                process = self._processes[index]
+                self._log(
+                    "Job %s cancelled, terminating worker %s (PID %s)",
+                    job.job_id,
+                    index,
+                    process.pid,
+                    level=LoggingLevelsEnum.WARNING,
+                )
+                process.terminate()
+                self._restarts[index] = self._restarts.get(index, 0) + 1
+                self._start_worker(index)
+                return
+
+    def _fail_job(self, job: _SeparationJob, reason: str) -> None:
+        """
+        Resolve a job future with a SeparationError.
+
+        Parameters:
+            job (_SeparationJob): Job to fail
+            reason (str): Human-readable failure reason for logging
+        """
+        self._log("Job %s failed: %s", job.job_id, reason, level=LoggingLevelsEnum.ERROR)
+        if not job.future.done():
+            job.future.set_exception(SeparationError(reason))
+
+    async def _submit(self, kind: str, params: Dict[str, Any]) -> Any:
+        """
+        Queue a job for the next idle worker and wait for its payload.
+
+        Parameters:
+            kind (str): Job kind understood by workers
+            params (Dict[str, Any]): Picklable job parameters
+
+        Returns:
+            Any: Payload produced by the worker
+
+        Raises:
+            RuntimeError: If the pool has not been started
+            SeparationError: If the worker failed or crashed while running the job
+
+        Note:
+            Cancelling the caller stops the job, terminating its worker if it is running
+        """
+        if not self._running.is_set():
+            raise RuntimeError("Separator pool is not initialized")
+
+        job = _SeparationJob(job_id=str(uuid4()), kind=kind, params=params)
+
+        with self._lock:
+            self._pending.append(job)
+            self._log("Job %s queued, pending jobs: %s", job.job_id, len(self._pending))
+            self._dispatch()
+
+        try:
+            return await asyncio.wrap_future(job.future)
+        except asyncio.CancelledError:
+            self._cancel_job(job)
+            raise
+
+    async def separate(
+        self,
+        input_path: Union[Path, str],
+        output_dir: Path,
+        model: str,
+        codec: str,
+        bitrate: str,
+        timings: Optional[StageTimings] = None,
+        stems: Optional[List[str]] = None,
+    ) -> int:
+        """
+        Separate a whole file in the pool and write the stems to the output directory.
+
+        The worker decodes the file once into memory, separates the waveform without
+        intermediate files and encodes all stems concurrently.
+
+        Parameters:
+            input_path (Union[Path, str]): Path or URL of the input audio
+            output_dir (Path): Directory to save output stems
+            model (str): Spleeter model to use
+            codec (str): Output audio codec
+            bitrate (str): Output audio bitrate
+            timings (StageTimings, optional): Receives the decode, inference and encode times
+            stems (List[str], optional): Stems to separate and write, optionally including the
+                residual. None writes every stem of the model.
+
+        Returns:
+            int: Job return code, 0 as failures are raised
+
+        Raises:
+            RuntimeError: If the pool has not been started
+            SeparationError: If the worker failed or crashed while running the job, with the reason
+        """
+        stage_timings = await self._submit(
+            _FILE_JOB,
+            {
+                "model": model,
+                "input_path": str(input_path),
+                "output_dir": str(output_dir),
+                "codec": codec,
+                "bitrate": bitrate,
+                "stems": stems,
+            },
+        )
+        if timings is not None:
+            timings.merge(stage_timings)
+        return 0
+
+    async def separate_packed(
+        self,
+        items: List[Tuple[Union[Path, str], Path]],
+        model: str,
+        codec: str,
+        bitrate: str,
+        stems: Optional[List[str]] = None,
+    ) -> List[Tuple[Optional[Dict[str, float]], Optional[str]]]:
+        """
+        Separate several short files in a single model run of one worker.
+
+        The worker decodes every file, runs the model once over the tracks laid end to end,
+        each starting on its own model chunk, and encodes each track's stems to its own
+        output directory.
+
+        Parameters:
+            items (List[Tuple[Union[Path, str], Path]]): Path or URL of the input audio and output
+                directory of every track
+            model (str): Spleeter model to use
+            codec (str): Output audio codec
+            bitrate (str): Output audio bitrate
+            stems (List[str], optional): Stems to separate and write, optionally including the
+                residual. None writes every stem of the model.
+
+        Returns:
+            List[Tuple[Optional[Dict[str, float]], Optional[str]]]: Per track, in order, its stage
+                timings on success or an error description on failure
+
+        Raises:
+            RuntimeError: If the pool has not been started
+            SeparationError: If the worker failed or crashed while running the job
+        """
+        return await self._submit(
+            _PACKED_JOB,
+            {
+                "model": model,
+                "items": [
+                    {"input_path": str(input_path), "output_dir": str(output_dir)}
+                    for input_path, output_dir in items
+                ],
+                "codec": codec,
+                "bitrate": bitrate,
+                "stems": stems,
+            },
+        )
+
+    async def separate_segment(
+        self,
+        source: str,
+        model: str,
+        offset: float,
+        duration: float,
+        samples: int,
+        timings: Optional[StageTimings] = None,
+        stems: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Decode a window of the input inside a worker and separate it in memory.
+
+        Parameters:
+            source (str): Local path or URL of the input audio
+            model (str): Spleeter model to use
+            offset (float): Window start in seconds
+            duration (float): Window length in seconds
+            samples (int): Exact number of samples the window must have
+            timings (StageTimings, optional): Receives the decode and inference times
+            stems (List[str], optional): Stems to separate, optionally including the residual.
+                None returns every stem of the model.
+
+        Returns:
+            Dict[str, np.ndarray]: Mapping of stem names to separated waveforms
+
+        Raises:
+            RuntimeError: If the pool has not been started
+            SeparationError: If the worker failed or crashed while running the job
+        """
+        stems, stage_timings = await self._submit(
+            _SEGMENT_JOB,
+            {
+                "model": model,
+                "source": source,
+                "offset": offset,
+                "duration": duration,
+                "samples": samples,
+                "stems": stems,
+            },
+        )
+        if timings is not None:
+            timings.merge(stage_timings)
+        return stems
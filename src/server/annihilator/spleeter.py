@@ -1,14 +1,40 @@
 import asyncio
 import tempfile
+import time
+from collections import deque
+from contextlib import aclosing
 from pathlib import Path
-from typing import Dict, AsyncGenerator, Optional
+from typing import Any, Awaitable, Deque, Dict, AsyncGenerator, List, Optional, Union
 
+from botocore.exceptions import ClientError  # type: ignore[import-untyped]
+
+from src.server.annihilator.audio import decode_audio, encode_stems, fit_length, probe_duration, source_name
+from src.server.annihilator.packing import SeparationPacker
 from src.server.annihilator.progress_tracker import ProgressTracker
+from src.server.annihilator.segmenter import SegmentedSeparator
+from src.server.annihilator.separator_pool import SeparationError, SeparatorPool
+from src.server.annihilator.stems import RESIDUAL_STEM
+from src.server.annihilator.streaming import HlsStemStreamer
+from src.server.annihilator.throughput import ThroughputEstimator, measured_eta
+from src.server.annihilator.timings import SEPARATION, UPLOAD, StageTimings
 from src.server.enums.logging import LoggingLevelsEnum
 from src.server.enums.progress import AnnihilationProgressEnum
 from src.server.logger import logger
+from src.server.metrics import observe_separation
 from src.server.schemas.annihilator_sse import ProgressSSESchema
-from src.server.services.s3.uploader import S3Uploader
+from src.server.services.cache.result_cache import ResultCache
+from src.server.services.logs.rate_limit import LogRateLimiter
+from src.server.services.s3.async_service import AsyncS3Service
+from src.server.tracing import start_span
+
+# Seconds between estimated progress events of separations without intermediate progress
+_ESTIMATE_INTERVAL = 1.0
+
+# Shortest expected separation time progress is estimated against, in seconds
+_MIN_EXPECTED_SECONDS = 1.0
+
+# Last lines of spleeter CLI error output reported when the CLI fails
+_OUTPUT_TAIL_LINES = 20
 
 
 class Spleeter:
@@ -19,40 +45,87 @@ class Spleeter:
     track progress through different stages, and upload results to S3 storage.
 
     Parameters:
-        s3_client: Initialized S3 client for file uploads
-        s3_bucket (str): Name of the S3 bucket for uploads
+        s3_service (AsyncS3Service): Non-blocking S3 service for uploads
         model (str): Spleeter model to use (default: "2stems")
         codec (str): Output audio codec (default: "mp3")
         bitrate (str): Output audio bitrate (default: "192k")
         enable_logging (bool): Whether to enable logging (default: True)
+        separator_pool (Union[SeparatorPool, SeparationPacker], optional): Warm worker pool used
+            for separation, or a packer in front of it. Falls back to the spleeter CLI when not
+            provided (default: None)
+        segmenter (SegmentedSeparator, optional): Windowed separator used for long tracks
+            (default: None)
+        result_cache (ResultCache, optional): Cache of previous results for identical inputs
+            (default: None)
+        progress_tracker (ProgressTracker, optional): Event log of the job being processed
+            (default: None, a tracker without event log)
+        throughput (ThroughputEstimator, optional): Shared separation speed estimate used to
+            report progress and ETA of separations without intermediate progress (default: None)
+        stream_segment_seconds (float): Length of the HLS segments published while a track is
+            separated in windows, 0 to disable progressive streaming (default: 0.0)
+        stream_bitrate (str): AAC bitrate of the streamed segments (default: "128k")
+        stems (List[str], optional): Stems to separate, encode and upload, optionally including
+            the residual of everything else. None keeps every stem of the model (default: None)
+        input_url_expires (int): Seconds the presigned URL of an S3 input stays valid, which
+            must cover the whole separation (default: 6 hours)
+        output_log_rate (float): Lines per second of spleeter CLI output written to the log
+            (default: 5.0)
+        output_log_burst (int): Lines of spleeter CLI output written back to back before rate
+            limiting starts (default: 50)
     """
 
     def __init__(
         self,
-        s3_client,
-        s3_bucket: str,
+        s3_service: AsyncS3Service,
         model: str = "2stems",
         codec: str = "mp3",
         bitrate: str = "192k",
         enable_logging: bool = True,
+        separator_pool: Optional[Union[SeparatorPool, SeparationPacker]] = None,
+        segmenter: Optional[SegmentedSeparator] = None,
+        result_cache: Optional[ResultCache] = None,
+        progress_tracker: Optional[ProgressTracker] = None,
+        throughput: Optional[ThroughputEstimator] = None,
+        stream_segment_seconds: float = 0.0,
+        stream_bitrate: str = "128k",
+        stems: Optional[List[str]] = None,
+        input_url_expires: int = 6 * 3600,
+        output_log_rate: float = 5.0,
+        output_log_burst: int = 50,
     ):
         """Initialize the Spleeter separator with configuration and dependencies."""
         self.model = model
         self.codec = codec
         self.bitrate = bitrate
         self.logger = logger if enable_logging else None
-        self.s3_uploader = S3Uploader(s3_client, s3_bucket, self.logger)
-        self.progress_tracker = ProgressTracker(self.logger)
+        self.separator_pool = separator_pool
+        self.segmenter = segmenter
+        self.result_cache = result_cache
+        self.s3_service = s3_service
+        self.progress_tracker = progress_tracker or ProgressTracker(self.logger)
+        self.throughput = throughput
+        self.stream_segment_seconds = stream_segment_seconds
+        self.stream_bitrate = stream_bitrate
+        self.stems = stems
+        self.input_url_expires = input_url_expires
+        self.output_log_rate = output_log_rate
+        self.output_log_burst = output_log_burst
+
+        # Duration of the separated input, once it has been read
+        self.duration: Optional[float] = None
 
         self._log(
-            f"Initialized SpleeterSeparator with model={model}, "
-            f"codec={codec}, bitrate={bitrate}"
+            "Initialized SpleeterSeparator with model=%s, codec=%s, bitrate=%s, stems=%s",
+            model,
+            codec,
+            bitrate,
+            stems or "all",
         )
 
     def _log(
         self,
         message: str,
-        *,
+        *args: Any,
         level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
         exc_info: bool = False,
     ) -> None:
@@ -61,13 +134,15 @@ class Spleeter:
 
         Parameters:
             message (str): Message to log
+            *args (Any): Values %-formatted into the message, only if the level is enabled
             level (LoggingLevelsEnum): Logging level (default: INFO)
             exc_info (bool): Whether to include exception info (default: False)
         """
-        if self.logger:
+        if self.logger and self.logger.isEnabledFor(level.levelno):
             getattr(self.logger, level.value)(
-                f"{self.__class__.__name__}: {message}",
+                f"{self.__class__.__name__}: {message % args if args else message}",
                 exc_info=exc_info,
+                stacklevel=2,
             )
 
     async def _run_spleeter_command(self, input_path: Path, output_dir: Path) -> Optional[int]:
@@ -101,53 +176,332 @@ class Spleeter:
             "--verbose"
         ]
 
-        self._log(f"Starting separation process")
-        self._log(f"Input file: {input_path}")
-        self._log(f"Output directory: {output_dir}")
-        self._log(f"Model: {self.model}")
-        self._log(f"Codec: {self.codec}")
-        self._log(f"Bitrate: {self.bitrate}")
-        self._log(f"Full command: {' '.join(cmd)}")
+        self._log("Starting separation process")
+        self._log("Input file: %s", input_path)
+        self._log("Output directory: %s", output_dir)
+        self._log("Model: %s", self.model)
+        self._log("Codec: %s", self.codec)
+        self._log("Bitrate: %s", self.bitrate)
+        self._log("Full command: %s", " ".join(cmd))
+
+        # Model loading, inference and encoding all happen in the CLI's process
+        with start_span(
+            "Spleeter._run_spleeter_command",
+            {"spleeter.model": self.model, "spleeter.codec": self.codec},
+        ) as span:
+            try:
+                # Create subprocess and run asynchronously
+                self._log("Creating subprocess...")
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                self._log("Subprocess created with PID: %s", process.pid)
+
+                # Verbose output runs to thousands of lines, so it is logged rate-limited in real-time
+                # and the last lines of stderr are kept for the error report
+                stderr_tail: Deque[bytes] = deque(maxlen=_OUTPUT_TAIL_LINES)
+
+                async def log_stream(stream, stream_name, tail=None):
+                    limiter = LogRateLimiter(self.output_log_rate, self.output_log_burst)
+                    while True:
+                        line = await stream.readline()
+                        if not line:
+                            break
+                        if tail is not None:
+                            tail.append(line)
+                        if limiter.allow():
+                            suppressed = limiter.take_suppressed()
+                            if suppressed:
+                                self._log("%s: %s lines not logged", stream_name, suppressed)
+                            self._log("%s: %s", stream_name, line.decode(errors="replace").strip())
+
+                    suppressed = limiter.take_suppressed()
+                    if suppressed:
+                        self._log("%s: %s lines not logged", stream_name, suppressed)
+
+                # Create tasks for logging both streams
+                stdout_task = asyncio.create_task(log_stream(process.stdout, "STDOUT"))
+                stderr_task = asyncio.create_task(log_stream(process.stderr, "STDERR", stderr_tail))
+
+                self._log("Waiting for process completion...")
+                try:
+                    return_code = await process.wait()
+                except asyncio.CancelledError:
+                    self._log(
+                        "Separation cancelled, killing subprocess %s",
+                        process.pid,
+                        level=LoggingLevelsEnum.WARNING,
+                    )
+                    process.kill()
+                    stdout_task.cancel()
+                    stderr_task.cancel()
+                    raise
+                self._log("Process completed with return code: %s", return_code)
+                span.set_attribute("process.exit_code", return_code)
+
+                # Wait for all output to be logged
+                await asyncio.wait([stdout_task, stderr_task])
+
+                if return_code != 0:
+                    self._log(
+                        "Process finished with exit code %s, last error output:\n%s",
+                        return_code,
+                        b"".join(stderr_tail).decode(errors="replace").rstrip(),
+                        level=LoggingLevelsEnum.ERROR,
+                    )
+                    span.set_error(f"spleeter exited with code {return_code}")
+                else:
+                    self._log("Separation completed successfully")
+
+                return return_code
+
+            except Exception as e:
+                self._log("Error during processing: %s", e)
+                raise
+
+    def _select_cli_stems(self, output_dir: Path) -> None:
+        """
+        Reduce the stems written by the spleeter CLI to the requested ones.
+
+        The CLI always writes every stem of the model. The residual is the sum of the
+        stems that were not requested, which equals the mixture minus the requested stems.
+
+        Parameters:
+            output_dir (Path): Directory holding the stems written by the CLI
+        """
+        unrequested = {
+            stem: path for stem, path in self._get_output_files(output_dir).items() if stem not in self.stems
+        }
+
+        if RESIDUAL_STEM in self.stems and unrequested:
+            waveforms = [decode_audio(path) for path in unrequested.values()]
+            length = max(waveform.shape[0] for waveform in waveforms)
+            remainder = sum(fit_length(waveform, length) for waveform in waveforms)
+            encode_stems({RESIDUAL_STEM: remainder}, output_dir, self.codec, self.bitrate)
+
+        for path in unrequested.values():
+            path.unlink()
+
+    async def _probe_duration(self, input_path: Union[Path, str]) -> Optional[float]:
+        """
+        Read the track duration, used to decide on segmentation and to estimate progress.
+
+        Parameters:
+            input_path (Union[Path, str]): Path or URL of the input audio
 
+        Returns:
+            Optional[float]: Duration in seconds, or None if it cannot be read
+        """
         try:
-            # Create subprocess and run asynchronously
-            self._log("Creating subprocess...")
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            return await asyncio.to_thread(probe_duration, input_path)
+        except Exception as e:
+            self._log(
+                "Could not read duration of %s: %s",
+                source_name(input_path),
+                e,
+                level=LoggingLevelsEnum.WARNING,
             )
-            self._log(f"Subprocess created with PID: {process.pid}")
+            return None
+
+    async def _resolve_s3_input(self, s3_key: str, spool_path: Path) -> Union[Path, str]:
+        """
+        Choose how the separation reads an input object from the bucket.
+
+        Pool workers decode the object through a presigned URL, so its bytes go from S3
+        straight to the worker's decoder, and windows of segmented separations fetch only
+        their range. The spleeter CLI needs a local file, so the object is then streamed
+        to the job's spool file unless an earlier attempt already fetched it.
+
+        Parameters:
+            s3_key (str): Key of the input object
+            spool_path (Path): Spool file of the job, used when a local copy is needed
+
+        Returns:
+            Union[Path, str]: Presigned URL or local path of the input audio
+        """
+        if self.separator_pool is not None:
+            self._log("Reading input from S3: %s", s3_key)
+            return self.s3_service.presigned_get_url(s3_key, expires_in=self.input_url_expires)
+
+        if not spool_path.exists():
+            self._log("Downloading input from S3: %s", s3_key)
+            partial_path = spool_path.with_name(f"{spool_path.name}.part")
+            try:
+                await self.s3_service.download_file(s3_key, partial_path)
+            except BaseException:
+                partial_path.unlink(missing_ok=True)
+                raise
+            partial_path.replace(spool_path)
+        return spool_path
+
+    async def _run_with_estimated_progress(
+        self,
+        separation: Awaitable[Optional[int]],
+        duration: float,
+    ) -> Optional[int]:
+        """
+        Await a separation that reports no progress, emitting progress estimated from throughput.
 
-            # Log stdout and stderr in real-time
-            async def log_stream(stream, stream_name):
-                while True:
-                    line = await stream.readline()
-                    if not line:
-                        break
-                    self._log(f"{stream_name}: {line.decode().strip()}")
+        The estimate is capped below completion, and the measured speed of successful
+        separations refines the shared throughput estimate. Without a known duration
+        nothing is estimated.
 
-            # Create tasks for logging both streams
-            stdout_task = asyncio.create_task(log_stream(process.stdout, "STDOUT"))
-            stderr_task = asyncio.create_task(log_stream(process.stderr, "STDERR"))
+        Parameters:
+            separation (Awaitable[Optional[int]]): Running separation returning its exit code
+            duration (float): Track duration in seconds
 
-            self._log("Waiting for process completion...")
-            return_code = await process.wait()
-            self._log(f"Process completed with return code: {return_code}")
+        Returns:
+            int: Separation return code (0 for success)
+        """
+        if duration <= 0:
+            return await separation
+
+        started = time.monotonic()
+        expected = max(self.throughput.expected_seconds(duration), _MIN_EXPECTED_SECONDS)
+
+        async def report() -> None:
+            while True:
+                await asyncio.sleep(_ESTIMATE_INTERVAL)
+                elapsed = time.monotonic() - started
+                self.progress_tracker.separation_update(
+                    fraction=min(elapsed / expected, 0.99),
+                    eta_seconds=expected - elapsed if elapsed < expected else None,
+                )
 
-            # Wait for all output to be logged
-            await asyncio.wait([stdout_task, stderr_task])
+        reporter = asyncio.create_task(report())
+        try:
+            return_code = await separation
+        finally:
+            reporter.cancel()
 
-            if return_code != 0:
-                self._log("Warning: Process finished with non-zero exit code")
-            else:
-                self._log("Separation completed successfully")
+        if return_code == 0:
+            self.throughput.update(duration, time.monotonic() - started)
+        return return_code
 
+    async def _separate_whole(
+        self,
+        input_path: Union[Path, str],
+        output_dir: Path,
+        timings: StageTimings,
+    ) -> Optional[int]:
+        """
+        Separate the input file in one piece using the warm worker pool, or the spleeter CLI if no pool is set.
+
+        Parameters:
+            input_path (Union[Path, str]): Path to input audio file, or its URL when a pool is set
+            output_dir (Path): Directory to save output stems
+            timings (StageTimings): Receives the separation stage times
+
+        Returns:
+            int: Separation return code (0 for success)
+        """
+        if self.separator_pool is None:
+            # The CLI runs every stage in its own process, so it is timed as a whole
+            with timings.stage(SEPARATION):
+                return_code = await self._run_spleeter_command(input_path, output_dir)
+                if return_code == 0 and self.stems is not None:
+                    await asyncio.to_thread(self._select_cli_stems, output_dir)
             return return_code
 
-        except Exception as e:
-            self._log(f"Error during processing: {str(e)}")
-            raise
+        self._log("Submitting separation job to pool: %s", source_name(input_path))
+        # Decoding, inference and encoding happen in the worker, their times are added to the job's span
+        with start_span("SeparatorPool.separate", {"spleeter.model": self.model, "spleeter.codec": self.codec}):
+            return await self.separator_pool.separate(
+                input_path=input_path,
+                output_dir=output_dir,
+                model=self.model,
+                codec=self.codec,
+                bitrate=self.bitrate,
+                timings=timings,
+                stems=self.stems,
+            )
+
+    async def _run_separation(
+        self,
+        input_path: Union[Path, str],
+        output_dir: Path,
+        timings: StageTimings,
+        streamer: Optional[HlsStemStreamer] = None,
+    ) -> Optional[int]:
+        """
+        Separate the input file and report fractional progress while it runs.
+
+        Tracks longer than the segmenter threshold are split into overlapping windows
+        that are separated in parallel and stitched back together; their progress and ETA
+        are measured per window. Other tracks report progress estimated from throughput.
+        With a streamer, every track longer than one window is segmented and its stems
+        are published as HLS segments while the separation continues.
+
+        Parameters:
+            input_path (Union[Path, str]): Path to input audio file, or its URL when a pool is set
+            output_dir (Path): Directory to save output stems
+            timings (StageTimings): Receives the decode, inference and encode times
+            streamer (HlsStemStreamer, optional): Publishes stem segments as they are stitched
+
+        Returns:
+            int: Separation return code (0 for success)
+        """
+        duration = self.duration = await self._probe_duration(input_path)
+
+        if (
+            self.separator_pool is not None
+            and self.segmenter is not None
+            and duration is not None
+            and self.segmenter.should_segment(duration, streaming=streamer is not None)
+        ):
+            self._log("Track is %.1fs long, using segmented separation", duration)
+            started = time.monotonic()
+
+            def on_progress(separated_seconds: float) -> None:
+                self.progress_tracker.separation_update(
+                    fraction=separated_seconds / duration,
+                    eta_seconds=measured_eta(separated_seconds, duration, time.monotonic() - started),
+                )
+
+            try:
+                return_code = await self.segmenter.separate_to_files(
+                    input_path=input_path,
+                    output_dir=output_dir,
+                    model=self.model,
+                    codec=self.codec,
+                    bitrate=self.bitrate,
+                    duration=duration,
+                    on_progress=on_progress,
+                    timings=timings,
+                    on_piece=streamer.write if streamer is not None else None,
+                    stems=self.stems,
+                )
+                if streamer is not None and return_code == 0:
+                    await streamer.close()
+                return return_code
+            finally:
+                if streamer is not None:
+                    await streamer.abort()
+
+        separation = self._separate_whole(input_path, output_dir, timings)
+        if duration is None or self.throughput is None:
+            return await separation
+        return await self._run_with_estimated_progress(separation, duration)
+
+    async def _discard_result(self, result_prefix: str) -> None:
+        """
+        Remove the stems and stream segments a cancelled separation already stored.
+
+        Parameters:
+            result_prefix (str): S3 prefix of the result
+        """
+        try:
+            deleted = await self.s3_service.delete_prefix(result_prefix)
+        except ClientError as e:
+            self._log(
+                "Failed to remove the partial result %s: %s", result_prefix, e,
+                level=LoggingLevelsEnum.WARNING,
+            )
+            return
+        if deleted:
+            self._log("Removed %d objects of the cancelled result %s", deleted, result_prefix)
 
     @staticmethod
     def _get_output_files(output_dir: Path) -> Dict[str, Path]:
@@ -167,17 +521,21 @@ class Spleeter:
 
     async def separate_with_progress(
         self,
-        audio_bytes: bytes,
+        input_path: Path,
         filename: str,
         s3_output_prefix: str = "",
+        s3_input_key: Optional[str] = None,
     ) -> AsyncGenerator[ProgressSSESchema, None]:
         """
         Separate audio file with progress updates via Server-Sent Events (SSE).
 
         Parameters:
-            audio_bytes (bytes): Audio file content as bytes
-            filename (str): Original filename (used for naming outputs)
+            input_path (Path): Spooled input audio file. It is read in place and not modified.
+                With an S3 input, the file the object is downloaded to if a local copy is needed.
+            filename (str): Unique result name (used for naming outputs)
             s3_output_prefix (str): Prefix for S3 upload paths (default: "")
+            s3_input_key (str, optional): Key of an input object in the bucket, read instead of
+                an uploaded file (default: None)
 
         Yields:
             Union[ProgressSSESchema, ErrorSSESchema, ResultSSESchema]: SSE events for:
@@ -188,14 +546,46 @@ class Spleeter:
         Raises:
             Exception: For any unexpected processing errors
         """
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with start_span(
+            "Spleeter.separate_with_progress",
+            {
+                "job.result": filename,
+                "spleeter.model": self.model,
+                "spleeter.codec": self.codec,
+                "spleeter.stems": self.stems,
+                "s3.input_key": s3_input_key,
+            },
+        ) as span, tempfile.TemporaryDirectory() as temp_dir:
+            result_prefix = f"{s3_output_prefix}{filename}/"
             try:
                 temp_dir_path = Path(temp_dir)
-                input_path = temp_dir_path / filename
 
-                # Save input file
-                with open(input_path, "wb") as f:
-                    f.write(audio_bytes)
+                # Reuse the result of an identical earlier upload
+                cache_key = None
+                if self.result_cache is not None:
+                    if s3_input_key is not None:
+                        # The ETag identifies the object's content without reading it
+                        head = await self.s3_service.head_object(s3_input_key)
+                        cache_key = self.result_cache.compute_object_key(
+                            head["ETag"], self.model, self.codec, self.bitrate, self.stems,
+                        )
+                    else:
+                        cache_key = await asyncio.to_thread(
+                            self.result_cache.compute_key, input_path, self.model, self.codec, self.bitrate,
+                            self.stems,
+                        )
+                    cached_result = await asyncio.to_thread(self.result_cache.lookup, cache_key)
+                    if cached_result is not None:
+                        span.set_attribute("cache.hit", True)
+                        yield self.progress_tracker.result_update(
+                            message="Processing complete (cached result)",
+                            result=cached_result,
+                        )
+                        return
+
+                source: Union[Path, str] = input_path
+                if s3_input_key is not None:
+                    source = await self._resolve_s3_input(s3_input_key, input_path)
 
                 # Process with Spleeter
                 output_dir = temp_dir_path / "output"
@@ -211,8 +601,24 @@ class Spleeter:
                     message="Processing in progress",
                 )
 
-                # Run command asynchronously
-                return_code = await self._run_spleeter_command(input_path, output_dir)
+                # Publish the stems for playback while they are separated
+                streamer = None
+                if self.stream_segment_seconds > 0:
+                    streamer = HlsStemStreamer(
+                        s3_service=self.s3_service,
+                        s3_prefix=f"{result_prefix}stream/",
+                        work_dir=temp_dir_path / "stream",
+                        segment_seconds=self.stream_segment_seconds,
+                        bitrate=self.stream_bitrate,
+                        on_segment=lambda stem, segment, duration: self.progress_tracker.segment_update(
+                            stem=stem, segment=segment, duration=duration,
+                        ),
+                        logger=self.logger,
+                    )
+
+                # Run separation asynchronously
+                timings = StageTimings()
+                return_code = await self._run_separation(source, output_dir, timings, streamer)
                 if return_code != 0:
                     yield self.progress_tracker.error_update(
                         error="Spleeter processing failed",
@@ -237,23 +643,63 @@ class Spleeter:
                     message="Files found",
                 )
 
-                # Upload to S3
-                for stem, file_path in output_files.items():
-                    s3_key = f"{s3_output_prefix}{input_path.stem}/{stem}.{self.codec}"
-                    if not self.s3_uploader.upload_file(file_path, s3_key):
-                        yield self.progress_tracker.error_update(
-                            error=f"Upload failed for {stem}",
-                        )
-                        return
+                # Upload all stems to S3 concurrently
+                s3_keys = {stem: f"{result_prefix}{stem}.{self.codec}" for stem in output_files}
+                failed_stems = []
+                completed = 0
+                with timings.stage(UPLOAD):
+                    async with aclosing(self.s3_service.upload_files_iter(output_files, s3_keys)) as uploads:
+                        async for stem, success in uploads:
+                            completed += 1
+                            if not success:
+                                failed_stems.append(stem)
+                            yield self.progress_tracker.upload_update(
+                                stem=stem,
+                                success=success,
+                                completed=completed,
+                                total=len(output_files),
+                            )
+
+                if failed_stems:
+                    yield self.progress_tracker.error_update(
+                        error=f"Upload failed for {', '.join(sorted(failed_stems))}",
+                    )
+                    return
 
+                if cache_key is not None:
+                    await asyncio.to_thread(
+                        self.result_cache.add,
+                        cache_key,
+                        filename,
+                        result_prefix,
+                    )
+
+                self._log("Stage timings for %s: %s", filename, timings.summary())
+                observe_separation(timings.as_dict(), self.duration)
+                span.set_attribute("audio.duration_seconds", self.duration)
+                for stage, seconds in timings.as_dict().items():
+                    span.set_attribute(f"stage.{stage}_seconds", seconds)
                 yield self.progress_tracker.result_update(
                     message="Processing complete",
-                    result=input_path.stem,
+                    result=filename,
+                    timings=timings.as_dict(),
+                )
+
+            except asyncio.CancelledError:
+                # A cancelled job keeps nothing, the cleanup runs to the end even if cancelled again
+                await asyncio.shield(self._discard_result(result_prefix))
+                raise
+
+            except SeparationError as e:
+                self._log("Separation failed: %s", e, level=LoggingLevelsEnum.ERROR)
+                yield self.progress_tracker.error_update(
+                    error=f"Spleeter processing failed: {e}",
                 )
 
             except Exception as e:
                 self._log(
-                    message=f"Error during processing: {str(e)}",
+                    "Error during processing: %s",
+                    e,
                     level=LoggingLevelsEnum.ERROR,
                     exc_info=True,
                 )
@@ -0,0 +1,95 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.server.annihilator.audio import fit_length
+
+# Name of the stem holding everything the requested stems leave out, mixture minus those stems
+RESIDUAL_STEM = "residual"
+
+
+def residual(mixture: np.ndarray, stems: Iterable[np.ndarray]) -> np.ndarray:
+    """
+    Compute what remains of a mixture once some stems are taken out.
+
+    Spleeter's soft masks sum to one over all instruments, so subtracting the requested
+    stems from the mixture yields the sum of the stems that were not requested without
+    computing them.
+
+    Parameters:
+        mixture (np.ndarray): Input waveform with shape (samples, 2)
+        stems (Iterable[np.ndarray]): Stem waveforms separated from the mixture
+
+    Returns:
+        np.ndarray: Residual waveform with the shape of the mixture
+    """
+    remainder = np.array(mixture, dtype=np.float32)
+    for waveform in stems:
+        remainder -= fit_length(np.asarray(waveform, dtype=np.float32), remainder.shape[0])
+    return remainder
+
+
+def _separate_librosa(separator: Any, waveform: np.ndarray, instruments: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Separate only some instruments with spleeter's CPU (librosa) STFT backend.
+
+    Mirrors `Separator._separate_librosa` of spleeter 2.4, but fetches and inverts the
+    masked spectrograms of the requested instruments only. The masks still need every
+    instrument's network output, so the saving is the inverse STFT of the other stems.
+
+    Parameters:
+        separator (Separator): Loaded spleeter separator using the librosa backend
+        waveform (np.ndarray): Stereo input waveform with shape (samples, 2)
+        instruments (List[str]): Instruments to separate
+
+    Returns:
+        Dict[str, np.ndarray]: Mapping of instrument names to waveforms
+    """
+    with separator._tf_graph.as_default():
+        features = separator._get_features()
+        outputs = separator._get_builder().outputs
+        spectrograms = separator._get_session().run(
+            {instrument: outputs[instrument] for instrument in instruments},
+            feed_dict=separator._get_input_provider().get_feed_dict(features, separator._stft(waveform), ""),
+        )
+
+    return {
+        instrument: separator._stft(spectrograms[instrument], inverse=True, length=waveform.shape[0])
+        for instrument in instruments
+    }
+
+
+def separate_stems(separator: Any, waveform: np.ndarray, stems: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Separate a waveform into the requested stems only.
+
+    Parameters:
+        separator (Separator): Loaded spleeter separator
+        waveform (np.ndarray): Stereo input waveform with shape (samples, 2)
+        stems (List[str], optional): Stems to return, optionally including the residual.
+            None returns every stem of the model.
+
+    Returns:
+        Dict[str, np.ndarray]: Mapping of stem names to waveforms
+    """
+    if stems is None:
+        return separator.separate(waveform)
+
+    instruments = [stem for stem in stems if stem != RESIDUAL_STEM]
+    separated = None
+    if getattr(separator, "_params", {}).get("stft_backend") == "librosa":
+        try:
+            separated = _separate_librosa(separator, waveform, instruments)
+        except AttributeError:
+            # Private spleeter API of another version, separate everything instead
+            pass
+    if separated is None:
+        separated = {
+            instrument: stem
+            for instrument, stem in separator.separate(waveform).items()
+            if instrument in instruments
+        }
+
+    if RESIDUAL_STEM in stems:
+        separated[RESIDUAL_STEM] = residual(waveform, separated.values())
+    return separated
@@ -0,0 +1,200 @@
+import asyncio
+from logging import Logger
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.server.annihilator.audio import HlsEncoder
+from src.server.enums.logging import LoggingLevelsEnum
+from src.server.services.s3.async_service import AsyncS3Service
+
+# Tag closing an HLS playlist that will not grow anymore
+_END_LIST = "#EXT-X-ENDLIST"
+
+
+def parse_hls_playlist(text: str) -> Tuple[List[Tuple[str, float]], bool]:
+    """
+    Read the segments of a media playlist.
+
+    Parameters:
+        text (str): Playlist contents
+
+    Returns:
+        Tuple[List[Tuple[str, float]], bool]: (segment URI, duration) pairs in order, and
+            whether the playlist is complete
+    """
+    segments = []
+    duration = 0.0
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("#EXTINF:"):
+            duration = float(line[len("#EXTINF:"):].split(",", 1)[0])
+        elif line and not line.startswith("#"):
+            segments.append((line, duration))
+    return segments, _END_LIST in text
+
+
+class HlsStemStreamer:
+    """
+    Publish stems as growing HLS playlists while a track is still being separated.
+
+    Stitched stem pieces are fed to one ffmpeg HLS muxer per stem. A watcher uploads
+    every segment the muxers complete to S3, followed by a snapshot of the playlist
+    that lists only uploaded segments, and reports each new segment so clients can
+    start playback long before the separation finishes.
+
+    Parameters:
+        s3_service (AsyncS3Service): Non-blocking S3 service for segment uploads
+        s3_prefix (str): S3 prefix of the playlists and segments, ending with "/"
+        work_dir (Path): Local directory for the muxer output
+        segment_seconds (float): Target segment length in seconds
+        bitrate (str): AAC bitrate of the segments
+        on_segment (Callable[[str, int, float], None]): Called with the stem, segment index
+            and segment duration once a segment can be fetched
+        poll_interval (float): Seconds between checks for completed segments (default: 0.5)
+        logger (Logger, optional): Python logger instance for operation tracking
+    """
+
+    def __init__(
+        self,
+        s3_service: AsyncS3Service,
+        s3_prefix: str,
+        work_dir: Path,
+        segment_seconds: float,
+        bitrate: str,
+        on_segment: Callable[[str, int, float], None],
+        poll_interval: float = 0.5,
+        logger: Optional[Logger] = None,
+    ):
+        """Initialize the streamer; muxers are started with the first piece."""
+        self.s3_service = s3_service
+        self.s3_prefix = s3_prefix
+        self.work_dir = work_dir
+        self.segment_seconds = segment_seconds
+        self.bitrate = bitrate
+        self.on_segment = on_segment
+        self.poll_interval = poll_interval
+        self.logger = logger
+        self._encoders: Dict[str, HlsEncoder] = {}
+        self._published: Dict[str, int] = {}
+        self._ended: Set[str] = set()
+        self._lock = asyncio.Lock()
+        self._watcher: Optional[asyncio.Task] = None
+
+    def _log(
+        self,
+        message: str,
+        *args: Any,
+        level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
+        exc_info: bool = False,
+    ) -> None:
+        """
+        Internal logging helper with class name prefix.
+
+        Parameters:
+            message (str): Message to log
+            *args (Any): Values %-formatted into the message, only if the level is enabled
+            level (LoggingLevelsEnum): Logging level (default: INFO)
+            exc_info (bool): Whether to include exception info (default: False)
+        """
+        if self.logger and self.logger.isEnabledFor(level.levelno):
+            getattr(self.logger, level.value)(
+                f"{self.__class__.__name__}: {message % args if args else message}",
+                exc_info=exc_info,
+                stacklevel=2,
+            )
+
+    async def write(self, piece: Dict[str, np.ndarray]) -> None:
+        """
+        Stream the next stitched piece of every stem to its muxer.
+
+        Parameters:
+            piece (Dict[str, np.ndarray]): Final stem samples in track order
+        """
+        for stem in piece:
+            if stem not in self._encoders:
+                self.work_dir.mkdir(parents=True, exist_ok=True)
+                self._encoders[stem] = HlsEncoder(
+                    self.work_dir / f"{stem}.m3u8",
+                    segment_seconds=self.segment_seconds,
+                    bitrate=self.bitrate,
+                )
+        await asyncio.gather(
+            *(asyncio.to_thread(self._encoders[stem].write, waveform) for stem, waveform in piece.items())
+        )
+
+        if self._watcher is None:
+            self._watcher = asyncio.create_task(self._watch())
+
+    async def close(self) -> None:
+        """Finish the playlists and publish the remaining segments."""
+        await self._stop_watcher()
+        return_codes = await asyncio.gather(
+            *(asyncio.to_thread(encoder.close) for encoder in self._encoders.values())
+        )
+        for stem, return_code in zip(self._encoders, return_codes):
+            if return_code != 0:
+                self._log("HLS muxer for %s exited with code %s", stem, return_code, level=LoggingLevelsEnum.WARNING)
+        await self._sync()
+
+    async def abort(self) -> None:
+        """Abort streaming without publishing anything further, once a running upload has ended."""
+        for encoder in self._encoders.values():
+            encoder.kill()
+        await self._stop_watcher()
+
+    async def _stop_watcher(self) -> None:
+        """Stop the background watcher and wait for a running sync to finish."""
+        if self._watcher is not None:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+
+    async def _watch(self) -> None:
+        """Publish completed segments until cancelled."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await self._sync()
+
+    async def _sync(self) -> None:
+        """Publish the segments completed since the last sync, for every stem."""
+        async with self._lock:
+            for stem, encoder in self._encoders.items():
+                try:
+                    await self._publish(stem, encoder.output_path)
+                except Exception as e:
+                    # Streaming is best effort, the separation result does not depend on it
+                    self._log("Failed to publish segments of %s: %s", stem, e, level=LoggingLevelsEnum.WARNING)
+
+    async def _publish(self, stem: str, playlist_path: Path) -> None:
+        """
+        Upload new segments of a stem and then a playlist listing them.
+
+        Parameters:
+            stem (str): Stem name
+            playlist_path (Path): Playlist written by the stem's muxer
+        """
+        if not playlist_path.exists() or stem in self._ended:
+            return
+
+        # Snapshot, ffmpeg replaces the playlist as it completes more segments
+        text = playlist_path.read_text()
+        segments, ended = parse_hls_playlist(text)
+        published = self._published.get(stem, 0)
+        if len(segments) == published and not ended:
+            return
+
+        for name, _ in segments[published:]:
+            if not await self.s3_service.upload_file(playlist_path.parent / name, f"{self.s3_prefix}{name}"):
+                raise RuntimeError(f"Upload of segment {name} failed")
+
+        snapshot_path = playlist_path.with_name(f"{stem}.published.m3u8")
+        snapshot_path.write_text(text)
+        if not await self.s3_service.upload_file(snapshot_path, f"{self.s3_prefix}{stem}.m3u8"):
+            raise RuntimeError(f"Upload of playlist {stem}.m3u8 failed")
+
+        self._published[stem] = len(segments)
+        if ended:
+            self._ended.add(stem)
+        for index in range(published, len(segments)):
+            self.on_segment(stem, index, segments[index][1])
@@ -0,0 +1,77 @@
+import threading
+from typing import Optional
+
+
+class ThroughputEstimator:
+    """
+    Running estimate of separation throughput in audio seconds per wall second.
+
+    Separations that report no intermediate progress use it to estimate their progress
+    and ETA from the duration of the track. The estimate is an exponential moving
+    average of completed separations, so it follows the speed of the current host.
+
+    Parameters:
+        initial_rate (float): Throughput assumed before any separation finished (default: 5.0)
+        smoothing (float): Weight of the newest measurement, between 0 and 1 (default: 0.3)
+    """
+
+    def __init__(self, initial_rate: float = 5.0, smoothing: float = 0.3):
+        """Initialize the estimator with the assumed throughput."""
+        self.smoothing = smoothing
+        self._rate = initial_rate
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """
+        Current throughput estimate.
+
+        Returns:
+            float: Audio seconds separated per wall second
+        """
+        with self._lock:
+            return self._rate
+
+    def update(self, audio_seconds: float, wall_seconds: float) -> None:
+        """
+        Blend a finished separation into the estimate.
+
+        Parameters:
+            audio_seconds (float): Duration of the separated audio
+            wall_seconds (float): Time the separation took
+        """
+        if audio_seconds <= 0 or wall_seconds <= 0:
+            return
+
+        with self._lock:
+            self._rate += self.smoothing * (audio_seconds / wall_seconds - self._rate)
+
+    def expected_seconds(self, audio_seconds: float) -> float:
+        """
+        Expected wall time to separate a track.
+
+        Parameters:
+            audio_seconds (float): Duration of the track
+
+        Returns:
+            float: Estimated separation time in seconds
+        """
+        return audio_seconds / self.rate
+
+
+def measured_eta(done_seconds: float, total_seconds: float, elapsed: float) -> Optional[float]:
+    """
+    Remaining time of a separation from its own measured throughput.
+
+    Parameters:
+        done_seconds (float): Audio seconds separated so far
+        total_seconds (float): Duration of the track
+        elapsed (float): Wall seconds since the separation started
+
+    Returns:
+        Optional[float]: Estimated remaining seconds, or None before anything was measured
+    """
+    if done_seconds <= 0 or elapsed <= 0:
+        return None
+
+    return max(total_seconds - done_seconds, 0.0) * elapsed / done_seconds
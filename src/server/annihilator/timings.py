@@ -0,0 +1,82 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Mapping
+
+# Separation stages, in pipeline order
+DECODE = "decode"
+INFERENCE = "inference"
+ENCODE = "encode"
+UPLOAD = "upload"
+
+# Whole separation when its stages cannot be told apart (spleeter CLI)
+SEPARATION = "separation"
+
+
+class StageTimings:
+    """
+    Wall time spent in each stage of a separation.
+
+    Stages that run several times for one track, such as decoding and inference of
+    segmented windows, accumulate. Timings measured inside worker processes are
+    merged in from the plain mapping they send back.
+    """
+
+    def __init__(self):
+        """Initialize empty timings."""
+        self._seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        """
+        Add time spent in a stage.
+
+        Parameters:
+            stage (str): Stage name
+            seconds (float): Wall time in seconds
+        """
+        with self._lock:
+            self._seconds[stage] = self._seconds.get(stage, 0.0) + seconds
+
+    def merge(self, timings: Mapping[str, float]) -> None:
+        """
+        Add timings measured elsewhere, e.g. in a worker process.
+
+        Parameters:
+            timings (Mapping[str, float]): Seconds by stage name
+        """
+        for stage, seconds in timings.items():
+            self.add(stage, seconds)
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """
+        Time the enclosed block as part of a stage.
+
+        Parameters:
+            stage (str): Stage name
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Timings rounded to milliseconds.
+
+        Returns:
+            Dict[str, float]: Seconds by stage name, in the order stages were first timed
+        """
+        with self._lock:
+            return {stage: round(seconds, 3) for stage, seconds in self._seconds.items()}
+
+    def summary(self) -> str:
+        """
+        One-line description of the timings for logging.
+
+        Returns:
+            str: Stage timings such as "decode=0.412s inference=3.051s"
+        """
+        return " ".join(f"{stage}={seconds:.3f}s" for stage, seconds in self.as_dict().items())
@@ -1,11 +1,29 @@
-from botocore.client import BaseClient  # type: ignore[import-untyped]
-from fastapi import APIRouter, status, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import partial
+from typing import Any, AsyncGenerator, Dict, Optional, Union
+
+from botocore.exceptions import ClientError  # type: ignore[import-untyped]
+from fastapi import APIRouter, status, Depends, Header, HTTPException, Path, Query
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 
 from src.server.config import Settings
 from src.server.dependencies.settings import get_settings
-from src.server.dependencies.s3 import get_s3_client
+from src.server.dependencies.s3 import get_async_s3_service
+from src.server.dependencies.transcoding import get_stem_transcoder
+from src.server.enums.audio import AudioFormatEnum
+from src.server.enums.delivery import DeliveryEnum
+from src.server.enums.tracing import SpanKindEnum
 from src.server.logger import logger
+from src.server.schemas.presigned import PresignedUrlSchema
+from src.server.services.archive.zip_stream import ZipEntry, stream_zip
+from src.server.services.s3.async_service import AsyncS3Service
+from src.server.services.transcoding.transcoder import StemTranscoder
+from src.server.tracing import SpanContext, start_span
+
+# Playlist or segment names published by progressive streaming
+_STREAM_FILE_PATTERN = r"^\w+(\.m3u8|_\d+\.ts)$"
 
 router = APIRouter(
     prefix="/files",
@@ -13,61 +31,446 @@ router = APIRouter(
 )
 
 
-@router.get("/download-processed-file/")
+@dataclass
+class _ConditionalGet:
+    """
+    Range and validator headers of a download request.
+
+    Attributes:
+        range (Optional[str]): Requested byte range, e.g. "bytes=0-1023"
+        if_range (Optional[str]): ETag or date the range is only valid for
+        if_none_match (Optional[str]): ETags of copies the client already has
+        if_modified_since (Optional[str]): Date of the copy the client already has
+    """
+
+    range: Optional[str] = None
+    if_range: Optional[str] = None
+    if_none_match: Optional[str] = None
+    if_modified_since: Optional[str] = None
+
+
+def _conditional_get(
+    range_header: Optional[str] = Header(default=None, alias="Range"),
+    if_range: Optional[str] = Header(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+    if_modified_since: Optional[str] = Header(default=None),
+) -> _ConditionalGet:
+    """
+    Collect the range and validator headers of a download request.
+
+    Parameters:
+        range_header (Optional[str]): Range header
+        if_range (Optional[str]): If-Range header
+        if_none_match (Optional[str]): If-None-Match header
+        if_modified_since (Optional[str]): If-Modified-Since header
+
+    Returns:
+        _ConditionalGet: The headers
+    """
+    return _ConditionalGet(range_header, if_range, if_none_match, if_modified_since)
+
+
+def _http_date(value: datetime) -> str:
+    """
+    Format a timestamp as an HTTP date.
+
+    Parameters:
+        value (datetime): Timezone-aware timestamp, e.g. an object's LastModified
+
+    Returns:
+        str: The timestamp in IMF-fixdate format
+    """
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+async def _object_response(
+    s3_service: AsyncS3Service,
+    s3_key: str,
+    conditions: _ConditionalGet,
+    headers: Dict[str, str],
+    media_type: Optional[str] = None,
+) -> Response:
+    """
+    Stream an object, or the requested range of it, unless the client's copy is still current.
+
+    Ranges and validators are forwarded to S3, so a range is fetched with a ranged GET
+    and a current copy costs no object read.
+
+    Parameters:
+        s3_service (AsyncS3Service): Non-blocking S3 service
+        s3_key (str): Key of the object in the bucket
+        conditions (_ConditionalGet): Range and validator headers of the request
+        headers (Dict[str, str]): Response headers, including Cache-Control
+        media_type (str, optional): Content type of the response, instead of the stored one
+
+    Returns:
+        Response: 200 with the object, 206 with the range, or 304 without a body
+
+    Raises:
+        HTTPException: 416 if the range is outside of the object
+        NoSuchKey: If the object does not exist
+        ClientError: For other S3 failures
+    """
+    get_params: Dict[str, Any] = {}
+
+    # Validators take precedence over the date, as in RFC 9110
+    if conditions.if_none_match is not None:
+        get_params["IfNoneMatch"] = conditions.if_none_match
+    elif conditions.if_modified_since is not None:
+        try:
+            get_params["IfModifiedSince"] = parsedate_to_datetime(conditions.if_modified_since)
+        except (TypeError, ValueError):
+            pass
+
+    if conditions.range is not None:
+        get_params["Range"] = conditions.range
+        if conditions.if_range is not None:
+            # A range of another version of the object would corrupt the client's copy
+            head = await s3_service.head_object(s3_key)
+            if conditions.if_range not in (head["ETag"], _http_date(head["LastModified"])):
+                del get_params["Range"]
+
+    try:
+        response = await s3_service.get_object(s3_key, **get_params)
+    except ClientError as e:
+        error = e.response.get("Error", {})
+        if error.get("Code") in ("304", "NotModified"):
+            etag = e.response.get("ResponseMetadata", {}).get("HTTPHeaders", {}).get("etag")
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={**headers, **({"ETag": etag} if etag else {})},
+            )
+        if error.get("Code") == "InvalidRange":
+            raise HTTPException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                detail="Requested range not satisfiable",
+                headers={"Content-Range": f"bytes */{error.get('ActualObjectSize', '*')}"},
+            )
+        raise
+
+    headers = {
+        **headers,
+        "Accept-Ranges": "bytes",
+        "ETag": response["ETag"],
+        "Last-Modified": _http_date(response["LastModified"]),
+        "Content-Length": str(response["ContentLength"]),
+    }
+    status_code = status.HTTP_200_OK
+    if "ContentRange" in response:
+        headers["Content-Range"] = response["ContentRange"]
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+
+    return StreamingResponse(
+        s3_service.download_stream(response),
+        status_code=status_code,
+        media_type=media_type or response["ContentType"],
+        headers=headers,
+    )
+
+
+@router.get(
+    "/download-processed-file/",
+    response_model=None,
+    responses={
+        status.HTTP_200_OK: {"description": "The file, or its presigned URL with delivery=url"},
+        status.HTTP_206_PARTIAL_CONTENT: {"description": "The requested range of the file"},
+        status.HTTP_304_NOT_MODIFIED: {"description": "The client's copy of the file is current"},
+        status.HTTP_307_TEMPORARY_REDIRECT: {
+            "description": "Redirect to the file's presigned URL with delivery=redirect",
+        },
+    },
+)
 async def download_processed_file(
     processed_filename: str = Query(alias="processed-filename"),
     result_filename: str = Query(alias="result-filename"),
-    s3: BaseClient = Depends(get_s3_client(get_settings)),
+    audio_format: Optional[AudioFormatEnum] = Query(default=None, alias="format"),
+    bitrate: Optional[str] = Query(default=None, pattern=r"^\d{2,3}k$"),
+    delivery: DeliveryEnum = Query(default=DeliveryEnum.PROXY),
+    conditions: _ConditionalGet = Depends(_conditional_get),
+    traceparent: Optional[str] = Header(default=None),
+    s3_service: AsyncS3Service = Depends(get_async_s3_service(get_settings)),
+    transcoder: StemTranscoder = Depends(get_stem_transcoder(get_settings)),
     settings: Settings = Depends(get_settings),
-) -> StreamingResponse:
+) -> Union[Response, PresignedUrlSchema]:
     """
     Download a processed file from S3 bucket.
 
     This endpoint streams a file from S3 storage that was previously processed.
     The file is located in the 'processed/' prefix followed by the processed filename directory.
+    The object body is read in chunks on the S3 thread pool, so the download never blocks the event loop.
+
+    Stems are stored as lossless masters. A stem requested in another format or bitrate
+    is transcoded from its master on the first request and the result is kept in S3,
+    so later downloads of the same variant are served directly.
+
+    Streamed files support range requests, answered with ranged S3 reads, and conditional
+    requests on their ETag and modification date. The stems of a result never change,
+    so they are sent as cacheable by browsers and shared caches.
+
+    Instead of streaming the file through the API, the client can be redirected to a
+    presigned URL of it, or be given that URL, and download it from the storage directly.
 
     Parameters:
         processed_filename (str): The name of the processing job/directory (from query parameter 'processed-filename').
-        result_filename (str): The name of the result file to download (from query parameter 'result-filename').
-        s3 (BaseClient): Authenticated S3 client (injected dependency).
-        settings (Settings): Application settings (injected dependency).
+        result_filename (str): The stem to download, e.g. "vocals" or "vocals.mp3"
+            (from query parameter 'result-filename'). The extension selects the format if 'format' is not given.
+        audio_format (Optional[AudioFormatEnum]): Download format (from query parameter 'format').
+        bitrate (Optional[str]): Bitrate of lossy formats such as "320k" (from query parameter 'bitrate').
+        delivery (DeliveryEnum): Stream the file through the API ("proxy"), redirect to its presigned
+            URL ("redirect") or return that URL ("url") (from query parameter 'delivery').
+        conditions (_ConditionalGet): Range, If-Range, If-None-Match and If-Modified-Since headers.
+        traceparent (Optional[str]): W3C traceparent header; with tracing enabled, the download's span
+            joins that trace, e.g. the one named by the job's result event.
+        s3_service (AsyncS3Service): Non-blocking S3 service (injected dependency).
+        transcoder (StemTranscoder): Creates missing format variants from the masters (injected dependency).
+        settings (Settings): Application configuration (injected dependency).
 
     Returns:
-        StreamingResponse: A streaming response containing the file data with appropriate headers.
+        Response | PresignedUrlSchema: The file data or its requested range with appropriate headers,
+            304 if the client's copy is current, a redirect to its presigned URL, or the presigned URL.
 
     Raises:
+        HTTPException: 400 if the file extension is not a supported format.
         HTTPException: 404 if file not found in S3.
+        HTTPException: 416 if the requested range is outside of the file.
         HTTPException: 500 for any other errors.
     """
+    # The span ends once the response is set up, the body is streamed afterwards
+    with start_span(
+        "download_processed_file",
+        {
+            "job.result": processed_filename,
+            "download.file": result_filename,
+            "download.format": audio_format.value if audio_format is not None else None,
+            "download.delivery": delivery.value,
+        },
+        parent=SpanContext.from_traceparent(traceparent),
+        kind=SpanKindEnum.SERVER,
+    ):
+        result_prefix = f"processed/{processed_filename}/"
+        stem, _, extension = result_filename.partition(".")
+
+        headers = {"Cache-Control": f"public, max-age={settings.DOWNLOAD_CACHE_MAX_AGE}"}
+
+        try:
+            media_type = None
+
+            # Results stored before lossless masters only have their encoded stems, kept under the requested name
+            legacy_key = None
+            if audio_format is None and bitrate is None and extension:
+                legacy_key = f"{result_prefix}{result_filename}"
+
+            requested_format = audio_format
+            if requested_format is None:
+                try:
+                    requested_format = AudioFormatEnum(extension) if extension else settings.DOWNLOAD_DEFAULT_FORMAT
+                except ValueError:
+                    if legacy_key is None:
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Unsupported format: {extension}",
+                        )
+
+            s3_key = legacy_key
+            if requested_format is not None:
+                try:
+                    s3_key = await transcoder.ensure_variant(
+                        result_prefix=result_prefix,
+                        stem=stem,
+                        audio_format=requested_format,
+                        bitrate=bitrate or settings.DOWNLOAD_DEFAULT_BITRATE,
+                    )
+                    media_type = requested_format.media_type
+                    extension = requested_format.value
+                except FileNotFoundError:
+                    if legacy_key is None:
+                        raise
+                    s3_key = legacy_key
+                logger.debug("Resolved S3 key: %s", s3_key)
+
+            if delivery is not DeliveryEnum.PROXY:
+                url = s3_service.public_download_url(
+                    s3_key,
+                    expires_in=settings.S3_PRESIGNED_URL_EXPIRES,
+                    filename=f"{processed_filename}.{extension}",
+                    media_type=media_type,
+                )
+                logger.info("Presigned download URL issued for %s", s3_key)
+                if delivery is DeliveryEnum.REDIRECT:
+                    return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+                return PresignedUrlSchema(url=url, expires_in=settings.S3_PRESIGNED_URL_EXPIRES)
+
+            response = await _object_response(
+                s3_service,
+                s3_key,
+                conditions,
+                headers={**headers, "Content-Disposition": f"attachment; filename={processed_filename}.{extension}"},
+                media_type=media_type,
+            )
+            logger.info("File successfully retrieved from S3")
+            return response
+        except HTTPException:
+            raise
+        except (s3_service.s3_client.exceptions.NoSuchKey, FileNotFoundError):
+            logger.error("File not found in S3: %s/%s", processed_filename, result_filename)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="File not found in S3",
+            )
+        except Exception as e:
+            logger.error(
+                "Error downloading file %s/%s: %s",
+                processed_filename,
+                result_filename,
+                e,
+                exc_info=True,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e),
+            )
+
+
+async def _read_object(s3_service: AsyncS3Service, s3_key: str) -> AsyncGenerator[bytes, None]:
+    """
+    Read an object in chunks.
+
+    Parameters:
+        s3_service (AsyncS3Service): Non-blocking S3 service
+        s3_key (str): Key of the object in the bucket
+
+    Yields:
+        bytes: Consecutive chunks of the object body
+    """
+    response = await s3_service.get_object(s3_key)
+    async for chunk in s3_service.download_stream(response):
+        yield chunk
+
+
+@router.get("/download-bundle/")
+async def download_bundle(
+    processed_filename: str = Query(alias="processed-filename"),
+    s3_service: AsyncS3Service = Depends(get_async_s3_service(get_settings)),
+    settings: Settings = Depends(get_settings),
+) -> StreamingResponse:
+    """
+    Download every stem of a processed file as one ZIP archive.
+
+    The archive is assembled while it is sent: each stem is read from S3 in chunks and
+    copied into the archive without compression, so the stored audio is not recompressed
+    and memory use does not grow with the number or size of the stems.
+
+    Parameters:
+        processed_filename (str): The name of the processing job/directory (from query parameter 'processed-filename').
+        s3_service (AsyncS3Service): Non-blocking S3 service (injected dependency).
+        settings (Settings): Application configuration (injected dependency).
+
+    Returns:
+        StreamingResponse: ZIP archive with the stems in a directory named after the processed file.
+
+    Raises:
+        HTTPException: 404 if the processed file has no stems in S3.
+        HTTPException: 500 if the stems cannot be listed.
+
+    Notes:
+        - The stems are archived as stored: lossless masters, or the encoded stems of older results
+        - Format variants and stream segments are not included
+        - The response has no Content-Length, it is sent in chunks as the archive is built
+    """
+    result_prefix = f"processed/{processed_filename}/"
+
     try:
-        s3_key = f"processed/{processed_filename}/{result_filename}"
-
-        logger.debug(f"Constructed S3 key: {s3_key}")
-
-        response = s3.get_object(Bucket=settings.S3_BUCKET, Key=s3_key)
-        logger.info("File successfully retrieved from S3")
-
-        return StreamingResponse(
-            response["Body"],
-            media_type=response["ContentType"],
-            headers={
-                "Content-Disposition":
-                    f"attachment; "
-                    f"filename={processed_filename}.{result_filename.split('.')[-1]}",
-                "Content-Length": str(response["ContentLength"]),
-            },
+        objects = await s3_service.list_objects(result_prefix)
+    except Exception as e:
+        logger.error("Error listing stems of %s: %s", processed_filename, e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
         )
-    except s3.exceptions.NoSuchKey:
-        logger.error(f"File not found in S3: {processed_filename}/{result_filename}")
+
+    if not objects:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found in S3",
         )
-    except Exception as e:
-        logger.error(
-            f"Error downloading file {processed_filename}/{result_filename}: {str(e)}",
-            exc_info=True,
+
+    entries = [
+        ZipEntry(
+            name=f"{processed_filename}/{item['Key'][len(result_prefix):]}",
+            size=item["Size"],
+            modified=item["LastModified"],
+            read=partial(_read_object, s3_service, item["Key"]),
+        )
+        for item in objects
+    ]
+    logger.info("Streaming bundle of %s stems of %s", len(entries), processed_filename)
+
+    async def bundle() -> AsyncGenerator[bytes, None]:
+        try:
+            async for data in stream_zip(entries):
+                yield data
+        except Exception as e:
+            # The response has started, the client sees a truncated archive
+            logger.error("Error streaming bundle of %s: %s", processed_filename, e, exc_info=True)
+            raise
+
+    return StreamingResponse(
+        bundle(),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename={processed_filename}.zip",
+            "Cache-Control": f"public, max-age={settings.DOWNLOAD_CACHE_MAX_AGE}",
+        },
+    )
+
+
+@router.get("/stream/{processed_filename}/{name}")
+async def stream_processed_file(
+    processed_filename: str,
+    name: str = Path(pattern=_STREAM_FILE_PATTERN),
+    conditions: _ConditionalGet = Depends(_conditional_get),
+    s3_service: AsyncS3Service = Depends(get_async_s3_service(get_settings)),
+) -> Response:
+    """
+    Serve the HLS playlist of a stem, or one of its segments, for progressive playback.
+
+    Playlists are published while the separation is running and grow as more of the
+    stem is separated, so they must be revalidated on every request. Segments never
+    change once published.
+
+    Parameters:
+        processed_filename (str): The name of the processing job/directory.
+        name (str): Playlist such as "vocals.m3u8", or segment such as "vocals_00000.ts".
+        conditions (_ConditionalGet): Range, If-Range, If-None-Match and If-Modified-Since headers.
+        s3_service (AsyncS3Service): Non-blocking S3 service (injected dependency).
+
+    Returns:
+        Response: The playlist or segment, its requested range, or 304 if the client's copy is current.
+
+    Raises:
+        HTTPException: 404 if the playlist or segment has not been published.
+        HTTPException: 416 if the requested range is outside of the file.
+        HTTPException: 500 for any other errors.
+    """
+    is_playlist = name.endswith(".m3u8")
+
+    try:
+        return await _object_response(
+            s3_service,
+            f"processed/{processed_filename}/stream/{name}",
+            conditions,
+            headers={"Cache-Control": "no-cache" if is_playlist else "public, max-age=31536000, immutable"},
+            media_type="application/vnd.apple.mpegurl" if is_playlist else "video/mp2t",
+        )
+    except HTTPException:
+        raise
+    except s3_service.s3_client.exceptions.NoSuchKey:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Stream not found",
         )
+    except Exception as e:
+        logger.error("Error streaming %s/%s: %s", processed_filename, name, e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
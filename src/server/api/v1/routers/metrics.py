@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from src.server.metrics import render_metrics
+
+router = APIRouter(
+    tags=["Metrics"],
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """
+    Expose the pipeline metrics for Prometheus to scrape.
+
+    With PROMETHEUS_MULTIPROC_DIR set, the metrics of all worker processes are aggregated,
+    so any worker can answer the scrape.
+
+    Returns:
+        Response: Metrics in the Prometheus text exposition format.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
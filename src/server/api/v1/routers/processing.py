@@ -1,14 +1,38 @@
+import asyncio
+import shutil
+from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
-from botocore.client import BaseClient  # type: ignore[import-untyped]
-from fastapi import APIRouter, status, Depends, UploadFile, File, HTTPException
+from botocore.exceptions import BotoCoreError, ClientError  # type: ignore[import-untyped]
+from fastapi import APIRouter, status, Depends, Header, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
-from src.server.annihilator.spleeter_sse import SpleeterSSE
+from src.server.annihilator.separator_pool import SeparatorPool
+from src.server.annihilator.stems import RESIDUAL_STEM
 from src.server.config import Settings
+from src.server.dependencies.jobs import get_job_scheduler
+from src.server.dependencies.s3 import get_async_s3_service
+from src.server.dependencies.separator import get_separator_pool
 from src.server.dependencies.settings import get_settings
-from src.server.dependencies.s3 import get_s3_client
+from src.server.dependencies.upload import get_batch_upload_spooler, get_upload_spooler
+from src.server.enums.models import SeparationModelEnum
+from src.server.enums.tracing import SpanKindEnum
 from src.server.logger import logger
+from src.server.schemas.batches import BatchManifestSchema
+from src.server.schemas.jobs import JobSchema, S3InputSchema
+from src.server.schemas.presigned import PresignedUploadSchema
+from src.server.services.jobs.scheduler import JobScheduler, QueueFullError
+from src.server.services.jobs.sse import ndjson_stream, sse_stream
+from src.server.services.jobs.store import JobRecord
+from src.server.services.s3.async_service import AsyncS3Service
+from src.server.services.upload.spooler import (
+    InvalidUploadError,
+    SpooledUpload,
+    UploadSpooler,
+    UploadTooLargeError,
+)
+from src.server.tracing import SpanContext, start_span
 
 router = APIRouter(
     prefix="/processing",
@@ -16,63 +40,789 @@ router = APIRouter(
 )
 
 
-@router.post("/spleeter-sse")
+# Prefix of the inputs clients upload to the bucket through presigned URLs
+_UPLOAD_PREFIX = "uploads/"
+
+# OpenAPI description of the request body: a multipart upload parsed by UploadSpooler rather than
+# FastAPI, or JSON naming an input object in the bucket
+_UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "model": {
+                            "type": "string",
+                            "enum": [model.value for model in SeparationModelEnum],
+                            "description": "Spleeter model, defaults to SEPARATOR_DEFAULT_MODEL",
+                        },
+                        "stems": {
+                            "type": "string",
+                            "description": "Comma-separated stems to keep, e.g. \"vocals,residual\". "
+                                           f"\"{RESIDUAL_STEM}\" is everything the other stems leave out. "
+                                           "Defaults to every stem of the model",
+                        },
+                    },
+                },
+            },
+            "application/json": {"schema": S3InputSchema.model_json_schema()},
+        },
+    },
+}
+
+
+# OpenAPI description of the multipart body of batch requests
+_BATCH_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "file": {"type": "array", "items": {"type": "string", "format": "binary"}},
+                        "manifest": {
+                            "type": "string",
+                            "description": "JSON object with optional 'model' and 'stems' defaults and 'items', "
+                                           "each naming an uploaded 'file' or an 's3_key' with optional "
+                                           "'model' and 'stems'",
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+
+def _queue_full_error(settings: Settings, detail: str) -> HTTPException:
+    """
+    Build the 429 response sent when the job queue is full.
+
+    Parameters:
+        settings (Settings): Application configuration.
+        detail (str): Error description.
+
+    Returns:
+        HTTPException: 429 error with a Retry-After header.
+    """
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(settings.JOB_RETRY_AFTER_SECONDS)},
+    )
+
+
+def _check_input_key(s3_key: str) -> None:
+    """
+    Make sure an S3 input is an upload, so results and streams cannot be fed back as inputs.
+
+    Parameters:
+        s3_key (str): Key of the input object in the bucket.
+
+    Raises:
+        ValueError: If the key is outside of the prefix presigned uploads are stored under.
+    """
+    if not s3_key.startswith(_UPLOAD_PREFIX) or len(s3_key) == len(_UPLOAD_PREFIX):
+        raise ValueError(f"S3 inputs must be uploads under {_UPLOAD_PREFIX}, got {s3_key}")
+
+
+def _storage_error(error: Exception) -> HTTPException:
+    """
+    Build the response sent when an S3 input cannot be checked.
+
+    Parameters:
+        error (Exception): ClientError of the check, or BotoCoreError if S3 could not be reached.
+
+    Returns:
+        HTTPException: 403 if the service may not read the object, 400 for other request
+            errors of S3, and 503 if S3 failed or could not be reached.
+    """
+    status_code = 0
+    if isinstance(error, ClientError):
+        status_code = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+    if status_code == status.HTTP_403_FORBIDDEN:
+        return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="S3 input is not readable")
+    if 400 <= status_code < 500:
+        return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"S3 input rejected: {error}")
+    return HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Storage unavailable, retry later")
+
+
+def _separation_options(
+    model: Optional[str],
+    stems: Optional[List[str]],
+    settings: Settings,
+) -> Dict[str, Any]:
+    """
+    Validate the requested model and stems and build the job options from them.
+
+    Parameters:
+        model (Optional[str]): Requested Spleeter model, None for the default model.
+        stems (Optional[List[str]]): Requested stem names, None to keep every stem.
+        settings (Settings): Application configuration.
+
+    Returns:
+        Dict[str, Any]: Job options with the model and, if requested, the stems without duplicates.
+
+    Raises:
+        ValueError: If the model is unknown, a stem is not produced by the model or no model stem is requested
+    """
+    try:
+        separation_model = SeparationModelEnum(model or settings.SEPARATOR_DEFAULT_MODEL.value)
+    except ValueError:
+        raise ValueError(
+            f"Unknown model {model}, expected one of: {', '.join(member.value for member in SeparationModelEnum)}"
+        )
+
+    options: Dict[str, Any] = {"model": separation_model.value}
+    if stems is None:
+        return options
+
+    stems = list(dict.fromkeys(stem.strip() for stem in stems if stem.strip()))
+    unknown = [stem for stem in stems if stem not in separation_model.stems and stem != RESIDUAL_STEM]
+    if unknown:
+        raise ValueError(
+            f"Unknown stems for model {separation_model.value}: {', '.join(unknown)}, "
+            f"expected some of: {', '.join(separation_model.stems + [RESIDUAL_STEM])}"
+        )
+    if not any(stem in separation_model.stems for stem in stems):
+        raise ValueError(f"At least one stem of model {separation_model.value} must be requested")
+
+    options["stems"] = stems
+    return options
+
+
+async def _submit_upload(
+    request: Request,
+    spooler: UploadSpooler,
+    scheduler: JobScheduler,
+    settings: Settings,
+) -> JobRecord:
+    """
+    Spool the uploaded audio and queue a separation job for it.
+
+    Parameters:
+        request (Request): Incoming multipart/form-data request with the audio in the 'file' field,
+            optionally the Spleeter model in the 'model' field and the stems to keep in the 'stems' field.
+        spooler (UploadSpooler): Streams the upload to a spool file on disk.
+        scheduler (JobScheduler): Job queue.
+        settings (Settings): Application configuration.
+
+    Returns:
+        JobRecord: The queued job.
+
+    Raises:
+        HTTPException: 400 if the request is not a multipart upload with a file, or names an unknown model or stem
+        HTTPException: 413 if the upload exceeds the configured maximum size
+        HTTPException: 429 if the job queue is full
+    """
+    # Reject before reading the body when there is no room anyway
+    if scheduler.is_full:
+        logger.warning("Rejected upload: job queue is full")
+        raise _queue_full_error(settings, "Job queue is full, retry later")
+
+    job_id = str(uuid4())
+    logger.info("Generated job id: %s", job_id)
+
+    try:
+        upload = await spooler.spool(request, name=job_id)
+    except UploadTooLargeError as e:
+        logger.warning("Rejected upload %s: %s", job_id, e)
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except InvalidUploadError as e:
+        logger.warning("Invalid upload %s: %s", job_id, e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    stems = upload.fields.get("stems")
+    try:
+        options = _separation_options(
+            model=upload.fields.get("model"),
+            stems=stems.split(",") if stems is not None else None,
+            settings=settings,
+        )
+    except ValueError as e:
+        upload.path.unlink(missing_ok=True)
+        logger.warning("Invalid upload %s: %s", job_id, e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    logger.info(
+        "Queueing audio processing for file: %s, size: %s bytes, model: %s, stems: %s",
+        upload.filename,
+        upload.size,
+        options["model"],
+        ", ".join(options.get("stems", ["all"])),
+    )
+
+    try:
+        return scheduler.submit(job_id=job_id, input_path=upload.path, options=options)
+    except QueueFullError as e:
+        upload.path.unlink(missing_ok=True)
+        logger.warning("Rejected upload %s: %s", job_id, e)
+        raise _queue_full_error(settings, str(e))
+    except Exception as e:
+        upload.path.unlink(missing_ok=True)
+        logger.error(
+            "Initial processing error for file %s: %s",
+            upload.filename,
+            e,
+            exc_info=True,
+        )
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+async def _submit_s3_object(
+    request: Request,
+    spooler: UploadSpooler,
+    scheduler: JobScheduler,
+    s3_service: AsyncS3Service,
+    settings: Settings,
+) -> JobRecord:
+    """
+    Queue a separation job reading its input from an object in the bucket.
+
+    The object is not read here: pool workers decode it from S3 directly, and only the
+    spleeter CLI fallback streams it to the job's spool file first. Only uploads stored
+    through presigned URLs are accepted as inputs.
+
+    Parameters:
+        request (Request): Incoming request with an `S3InputSchema` JSON body.
+        spooler (UploadSpooler): Provides the spool file the object is downloaded to if needed.
+        scheduler (JobScheduler): Job queue.
+        s3_service (AsyncS3Service): Non-blocking S3 service used to check the input object.
+        settings (Settings): Application configuration.
+
+    Returns:
+        JobRecord: The queued job.
+
+    Raises:
+        HTTPException: 400 if the body is invalid, names an unknown model or stem, or an object that is
+            not an upload or does not exist
+        HTTPException: 403 if the service may not read the object
+        HTTPException: 413 if the object exceeds the maximum upload size
+        HTTPException: 429 if the job queue is full
+        HTTPException: 503 if S3 failed or could not be reached
+    """
+    if scheduler.is_full:
+        logger.warning("Rejected S3 input: job queue is full")
+        raise _queue_full_error(settings, "Job queue is full, retry later")
+
+    job_id = str(uuid4())
+    logger.info("Generated job id: %s", job_id)
+
+    try:
+        body = S3InputSchema.model_validate_json(await request.body())
+        options = _separation_options(model=body.model, stems=body.stems, settings=settings)
+        _check_input_key(body.s3_key)
+        size = await s3_service.object_size(body.s3_key)
+        if size is None:
+            raise ValueError(f"S3 input not found: {body.s3_key}")
+    except (ValidationError, ValueError) as e:
+        logger.warning("Invalid S3 input %s: %s", job_id, e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except (ClientError, BotoCoreError) as e:
+        logger.error("Could not check S3 input %s: %s", job_id, e)
+        raise _storage_error(e)
+
+    # Presigned PUT URLs cannot limit the size of what is uploaded to them
+    if size > settings.MAX_UPLOAD_SIZE:
+        logger.warning("Rejected S3 input %s: %s bytes uploaded", job_id, size)
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Upload exceeds the maximum size of {settings.MAX_UPLOAD_SIZE} bytes",
+        )
+
+    options["s3_key"] = body.s3_key
+    logger.info(
+        "Queueing audio processing for S3 object: %s, model: %s, stems: %s",
+        body.s3_key,
+        options["model"],
+        ", ".join(options.get("stems", ["all"])),
+    )
+
+    try:
+        return scheduler.submit(job_id=job_id, input_path=spooler.spool_dir / job_id, options=options)
+    except QueueFullError as e:
+        logger.warning("Rejected S3 input %s: %s", job_id, e)
+        raise _queue_full_error(settings, str(e))
+
+
+async def _submit(
+    request: Request,
+    spooler: UploadSpooler,
+    scheduler: JobScheduler,
+    s3_service: AsyncS3Service,
+    settings: Settings,
+) -> JobRecord:
+    """
+    Queue a separation job for an upload, or for an S3 object named in a JSON body.
+
+    Parameters:
+        request (Request): Incoming multipart/form-data upload, or JSON request naming an S3 object.
+        spooler (UploadSpooler): Streams uploads to spool files on disk.
+        scheduler (JobScheduler): Job queue.
+        s3_service (AsyncS3Service): Non-blocking S3 service used to check S3 inputs.
+        settings (Settings): Application configuration.
+
+    Returns:
+        JobRecord: The queued job.
+    """
+    if request.headers.get("content-type", "").startswith("application/json"):
+        return await _submit_s3_object(request, spooler, scheduler, s3_service, settings)
+    return await _submit_upload(request, spooler, scheduler, settings)
+
+
+async def _batch_items(
+    uploads: List[SpooledUpload],
+    manifest: BatchManifestSchema,
+    s3_service: AsyncS3Service,
+    settings: Settings,
+) -> List[Dict[str, Any]]:
+    """
+    Combine the uploaded files and the manifest into the items of a batch job.
+
+    Every uploaded file is an item, with the options of the manifest item naming its
+    filename if there is one. Manifest items with an S3 key add the object as an item, which
+    must be an upload stored through a presigned URL.
+
+    Parameters:
+        uploads (List[SpooledUpload]): Files spooled into the batch directory, in request order.
+        manifest (BatchManifestSchema): Batch defaults and per-item options.
+        s3_service (AsyncS3Service): Non-blocking S3 service used to check S3 inputs.
+        settings (Settings): Application configuration.
+
+    Returns:
+        List[Dict[str, Any]]: Item id, name, spool file name, optional S3 key and options of every item.
+
+    Raises:
+        ValueError: If the batch is empty or too large, a manifest item names a file that was
+            not uploaded or an S3 input that is not an upload or does not exist, or options are invalid
+        ClientError: If S3 fails to check the S3 inputs
+    """
+    by_filename = {item.file: item for item in manifest.items if item.file is not None}
+    uploaded = {upload.filename for upload in uploads}
+    missing_files = sorted(set(by_filename) - uploaded)
+    if missing_files:
+        raise ValueError(f"Manifest items name files that were not uploaded: {', '.join(missing_files)}")
+
+    inputs = [(upload.filename, by_filename.get(upload.filename)) for upload in uploads]
+    inputs += [(item.s3_key, item) for item in manifest.items if item.s3_key is not None]
+    if not inputs:
+        raise ValueError("A batch needs at least one uploaded file or S3 input")
+    if len(inputs) > settings.BATCH_MAX_ITEMS:
+        raise ValueError(f"A batch may have at most {settings.BATCH_MAX_ITEMS} items, got {len(inputs)}")
+
+    s3_keys = [item.s3_key for _, item in inputs if item is not None and item.s3_key is not None]
+    for s3_key in s3_keys:
+        _check_input_key(s3_key)
+    exists = await asyncio.gather(*(s3_service.object_exists(s3_key) for s3_key in s3_keys))
+    missing_keys = [s3_key for s3_key, found in zip(s3_keys, exists) if not found]
+    if missing_keys:
+        raise ValueError(f"S3 inputs not found: {', '.join(missing_keys[:10])}")
+
+    items = []
+    for index, (name, item) in enumerate(inputs):
+        options = _separation_options(
+            model=item.model if item is not None and item.model is not None else manifest.model,
+            stems=item.stems if item is not None and item.stems is not None else manifest.stems,
+            settings=settings,
+        )
+        entry: Dict[str, Any] = {
+            "id": str(uuid4()), "name": name or f"{index:05d}", "file": f"{index:05d}", **options,
+        }
+        if item is not None and item.s3_key is not None:
+            entry["s3_key"] = item.s3_key
+        items.append(entry)
+    return items
+
+
+def _job_schema(scheduler: JobScheduler, job: JobRecord) -> JobSchema:
+    """
+    Describe a job for API responses.
+
+    Parameters:
+        scheduler (JobScheduler): Job queue.
+        job (JobRecord): Job to describe.
+
+    Returns:
+        JobSchema: Job status with its queue position.
+    """
+    return JobSchema(
+        job_id=job.job_id,
+        status=job.status,
+        position=scheduler.position(job.job_id),
+        result=job.result,
+        error=job.error,
+    )
+
+
+@router.post("/spleeter-sse", openapi_extra=_UPLOAD_REQUEST_BODY)
 async def process_with_sse(
-    file: UploadFile = File(...),
-    s3: BaseClient = Depends(get_s3_client(get_settings)),
+    request: Request,
+    spooler: UploadSpooler = Depends(get_upload_spooler(get_settings)),
+    scheduler: JobScheduler = Depends(get_job_scheduler(get_settings)),
+    s3_service: AsyncS3Service = Depends(get_async_s3_service(get_settings)),
     settings: Settings = Depends(get_settings),
 ) -> StreamingResponse:
     """
     Process audio file with Spleeter separation using Server-Sent Events (SSE) for real-time progress updates.
 
-    This endpoint accepts an audio file, processes it using Spleeter,
+    This endpoint accepts an audio file, queues a separation job for it,
     and returns a Server-Sent Events stream with progress updates and final results.
     The processed files are stored in S3 bucket with a unique identifier.
 
     Parameters:
-        file (UploadFile): Audio file to process (required, multipart/form-data).
-        s3 (BaseClient): Authenticated S3 client (injected dependency).
+        request (Request): Incoming multipart/form-data request with the audio in the 'file' field,
+            optionally the Spleeter model in the 'model' field and the stems to keep in the 'stems' field.
+            Alternatively a JSON request naming an input object in the bucket, see `S3InputSchema`.
+        spooler (UploadSpooler): Streams the upload to a spool file on disk (injected dependency).
+        scheduler (JobScheduler): Job queue running separations with bounded concurrency (injected dependency).
+        s3_service (AsyncS3Service): Non-blocking S3 service used to check S3 inputs (injected dependency).
         settings (Settings): Application configuration (injected dependency).
 
     Returns:
         StreamingResponse: SSE stream with events containing:
+        - Queue position while the job waits for a free slot
         - Progress updates during processing
         - Success/failure status
         - UUID of the processed audio files
 
     Raises:
+        HTTPException: 400 if the request is not a multipart upload with a file or a valid S3 input, or names
+            an unknown model or stem
+        HTTPException: 403 if the service may not read the S3 input
+        HTTPException: 413 if the upload exceeds the configured maximum size
+        HTTPException: 429 with Retry-After if the job queue is full
+        HTTPException: 503 if S3 failed or could not be reached while checking the S3 input
         HTTPException: 500 if any error occurs during processing
 
     Notes:
-        - Uses Spleeter for audio source separation
+        - The upload is streamed to disk in chunks and never held in memory as a whole
+        - S3 inputs are read by the separator workers, their bytes never pass through the API process
+        - At most JOB_MAX_CONCURRENCY separations run at once, other jobs wait in a persistent queue
         - Generates unique UUID for each processing job
+        - Identical uploads reuse the stems of an earlier job when the result cache is enabled
+        - Only the requested stems are separated, encoded and stored
         - Stores results in configured S3 bucket
         - Stream format follows Server-Sent Events specification
+        - If the client disconnects before the stream ends, the job is cancelled unless the client
+          resumes its events at /processing/jobs/{job_id}/events within JOB_DISCONNECT_GRACE_SECONDS
+        - With tracing enabled, the job's spans continue the trace of a traceparent header,
+          and the result event carries the trace id
     """
-    logger.info(f"Starting audio processing for file: {file.filename}")
-    logger.debug(f"Initializing SpleeterSeparator")
+    with start_span(
+        "process_with_sse",
+        parent=SpanContext.from_traceparent(request.headers.get("traceparent")),
+        kind=SpanKindEnum.SERVER,
+    ) as span:
+        job = await _submit(request, spooler, scheduler, s3_service, settings)
+        span.set_attribute("job.id", job.job_id)
 
-    try:
-        file_content = await file.read()
-        logger.debug(f"Read file content, size: {len(file_content)} bytes")
+    return StreamingResponse(
+        sse_stream(
+            scheduler.subscribe(job.job_id),
+            logger=logger,
+            on_disconnect=lambda: scheduler.cancel_unless_resumed(job.job_id),
+        ),
+        media_type="text/event-stream",
+    )
 
-        annihilator = SpleeterSSE(
-            s3_client=s3,
-            s3_bucket=settings.S3_BUCKET,
-        )
-        logger.info(f"Processing audio... {file.filename}")
 
-        unique_filename = str(uuid4())
-        logger.info(f"Generated unique filename: {unique_filename}")
+@router.post(
+    "/jobs",
+    openapi_extra=_UPLOAD_REQUEST_BODY,
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=JobSchema,
+)
+async def submit_job(
+    request: Request,
+    spooler: UploadSpooler = Depends(get_upload_spooler(get_settings)),
+    scheduler: JobScheduler = Depends(get_job_scheduler(get_settings)),
+    s3_service: AsyncS3Service = Depends(get_async_s3_service(get_settings)),
+    settings: Settings = Depends(get_settings),
+) -> JobSchema:
+    """
+    Queue an audio file for Spleeter separation and return the job id immediately.
+
+    Parameters:
+        request (Request): Incoming multipart/form-data request with the audio in the 'file' field,
+            optionally the Spleeter model in the 'model' field and the stems to keep in the 'stems' field.
+            Alternatively a JSON request naming an input object in the bucket, see `S3InputSchema`.
+        spooler (UploadSpooler): Streams the upload to a spool file on disk (injected dependency).
+        scheduler (JobScheduler): Job queue running separations with bounded concurrency (injected dependency).
+        s3_service (AsyncS3Service): Non-blocking S3 service used to check S3 inputs (injected dependency).
+        settings (Settings): Application configuration (injected dependency).
+
+    Returns:
+        JobSchema: The queued job with its queue position.
+
+    Raises:
+        HTTPException: 400 if the request is not a multipart upload with a file or a valid S3 input, or names
+            an unknown model or stem
+        HTTPException: 403 if the service may not read the S3 input
+        HTTPException: 413 if the upload exceeds the configured maximum size
+        HTTPException: 429 with Retry-After if the job queue is full
+        HTTPException: 503 if S3 failed or could not be reached while checking the S3 input
+    """
+    job = await _submit(request, spooler, scheduler, s3_service, settings)
+    return _job_schema(scheduler, job)
+
+
+@router.post(
+    "/batches",
+    openapi_extra=_BATCH_REQUEST_BODY,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={status.HTTP_202_ACCEPTED: {"model": JobSchema}},
+)
+async def submit_batch(
+    request: Request,
+    stream: str = Query(default="sse", pattern=r"^(sse|ndjson|none)$"),
+    spooler: UploadSpooler = Depends(get_batch_upload_spooler(get_settings)),
+    scheduler: JobScheduler = Depends(get_job_scheduler(get_settings)),
+    s3_service: AsyncS3Service = Depends(get_async_s3_service(get_settings)),
+    settings: Settings = Depends(get_settings),
+):
+    """
+    Queue many audio files for Spleeter separation as one batch.
 
-        return StreamingResponse(
-            annihilator.sse_generator(audio_bytes=file_content, filename=unique_filename),
-            media_type="text/event-stream",
+    The batch takes uploaded files in repeated 'file' fields and S3 inputs listed in the
+    JSON 'manifest' field, which also sets the model and stems of the whole batch or of
+    single items. The batch runs as one job: its items are separated concurrently, short
+    tracks are packed into shared model runs, and every item's progress, result and errors
+    are reported on the batch's single event stream. The stream ends with a summary of
+    the batch's throughput. Each item's stems are stored under its own result id.
+
+    Parameters:
+        request (Request): Incoming multipart/form-data request with the files and the manifest.
+        stream (str): "sse" for a Server-Sent Events stream, "ndjson" for newline-delimited JSON,
+            or "none" to return the job at once and follow it at /processing/jobs/{job_id}/events.
+        spooler (UploadSpooler): Streams the files to a spool directory on disk (injected dependency).
+        scheduler (JobScheduler): Job queue running separations with bounded concurrency (injected dependency).
+        s3_service (AsyncS3Service): Non-blocking S3 service used to check S3 inputs (injected dependency).
+        settings (Settings): Application configuration (injected dependency).
+
+    Returns:
+        StreamingResponse | JobSchema: The batch's event stream, or the queued batch job.
+
+    Raises:
+        HTTPException: 400 if the request or manifest is invalid, or an S3 input is not an upload or does not exist
+        HTTPException: 403 if the service may not read an S3 input
+        HTTPException: 413 if the request exceeds the configured maximum batch size
+        HTTPException: 429 with Retry-After if the job queue is full
+        HTTPException: 503 if S3 failed or could not be reached
+
+    Notes:
+        - Item events carry the item's index and name next to the fields of a single job's events
+        - Item results are downloaded like single job results, by the item's result id
+        - When streaming, the batch is cancelled if the client disconnects before the stream ends and
+          does not resume its events within JOB_DISCONNECT_GRACE_SECONDS
+    """
+    if scheduler.is_full:
+        logger.warning("Rejected batch: job queue is full")
+        raise _queue_full_error(settings, "Job queue is full, retry later")
+
+    batch_id = str(uuid4())
+    logger.info("Generated batch id: %s", batch_id)
+
+    try:
+        directory, uploads, fields = await spooler.spool_batch(
+            request, name=batch_id, max_files=settings.BATCH_MAX_ITEMS,
         )
+    except UploadTooLargeError as e:
+        logger.warning("Rejected batch %s: %s", batch_id, e)
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except InvalidUploadError as e:
+        logger.warning("Invalid batch %s: %s", batch_id, e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    except Exception as e:
-        logger.error(
-            f"Initial processing error for file {file.filename}: {str(e)}",
-            exc_info=True,
+    try:
+        manifest = BatchManifestSchema.model_validate_json(fields.get("manifest") or "{}")
+        items = await _batch_items(uploads, manifest, s3_service, settings)
+        job = scheduler.submit(job_id=batch_id, input_path=directory, options={"items": items})
+    except (ValidationError, ValueError) as e:
+        shutil.rmtree(directory, ignore_errors=True)
+        logger.warning("Invalid batch %s: %s", batch_id, e)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except (ClientError, BotoCoreError) as e:
+        shutil.rmtree(directory, ignore_errors=True)
+        logger.error("Could not check S3 inputs of batch %s: %s", batch_id, e)
+        raise _storage_error(e)
+    except QueueFullError as e:
+        shutil.rmtree(directory, ignore_errors=True)
+        logger.warning("Rejected batch %s: %s", batch_id, e)
+        raise _queue_full_error(settings, str(e))
+
+    logger.info("Queued batch %s with %s items", batch_id, len(items))
+
+    if stream == "none":
+        return _job_schema(scheduler, job)
+
+    format_stream, media_type = (sse_stream, "text/event-stream") if stream == "sse" else (
+        ndjson_stream, "application/x-ndjson"
+    )
+    return StreamingResponse(
+        format_stream(
+            scheduler.subscribe(job.job_id),
+            logger=logger,
+            on_disconnect=lambda: scheduler.cancel_unless_resumed(job.job_id),
+        ),
+        media_type=media_type,
+    )
+
+
+@router.post("/uploads", response_model=PresignedUploadSchema)
+async def create_upload_url(
+    s3_service: AsyncS3Service = Depends(get_async_s3_service(get_settings)),
+    settings: Settings = Depends(get_settings),
+) -> PresignedUploadSchema:
+    """
+    Issue a presigned URL to upload an input file to the storage directly, bypassing the API.
+
+    The client PUTs the audio to the returned URL, then submits it for separation to
+    /processing/jobs or /processing/spleeter-sse with a JSON body naming the returned
+    `s3_key`, so the audio never passes through the API.
+
+    Parameters:
+        s3_service (AsyncS3Service): Non-blocking S3 service signing the URL (injected dependency).
+        settings (Settings): Application configuration (injected dependency).
+
+    Returns:
+        PresignedUploadSchema: Upload URL, its method and expiry, and the key of the uploaded object.
+
+    Notes:
+        - The URL is signed for S3_PUBLIC_ENDPOINT_URL, or S3_ENDPOINT_URL if it is not set
+        - The upload size is checked against MAX_UPLOAD_SIZE when the job is submitted
+        - Uploaded inputs are kept under the uploads/ prefix, which a bucket lifecycle rule should expire
+    """
+    s3_key = f"{_UPLOAD_PREFIX}{uuid4()}"
+    url = s3_service.public_upload_url(s3_key, expires_in=settings.S3_PRESIGNED_URL_EXPIRES)
+    logger.info("Presigned upload URL issued for %s", s3_key)
+    return PresignedUploadSchema(url=url, expires_in=settings.S3_PRESIGNED_URL_EXPIRES, s3_key=s3_key)
+
+
+@router.get("/jobs/{job_id}", response_model=JobSchema)
+async def get_job(
+    job_id: str,
+    scheduler: JobScheduler = Depends(get_job_scheduler(get_settings)),
+) -> JobSchema:
+    """
+    Get the status of a separation job.
+
+    Parameters:
+        job_id (str): Job identifier returned on submission.
+        scheduler (JobScheduler): Job queue (injected dependency).
+
+    Returns:
+        JobSchema: Job status, queue position, and result or error once finished.
+
+    Raises:
+        HTTPException: 404 if the job is unknown
+    """
+    job = scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+
+    return _job_schema(scheduler, job)
+
+
+@router.delete("/jobs/{job_id}", response_model=JobSchema)
+async def cancel_job(
+    job_id: str,
+    scheduler: JobScheduler = Depends(get_job_scheduler(get_settings)),
+) -> JobSchema:
+    """
+    Cancel a queued or running separation job.
+
+    A queued job is removed from the queue. A running job has its separation stopped,
+    its worker process or subprocess killed and its remaining uploads skipped.
+
+    Parameters:
+        job_id (str): Job identifier returned on submission.
+        scheduler (JobScheduler): Job queue (injected dependency).
+
+    Returns:
+        JobSchema: The cancelled job.
+
+    Raises:
+        HTTPException: 404 if the job is unknown
+        HTTPException: 409 if the job has already finished
+    """
+    job = scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+    if job.status.is_finished:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job {job_id} has already finished: {job.status!r}",
         )
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    job = await scheduler.cancel(job_id)
+    return _job_schema(scheduler, job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    scheduler: JobScheduler = Depends(get_job_scheduler(get_settings)),
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """
+    Stream the progress events of a job using Server-Sent Events (SSE).
+
+    The job runs independently of this connection. Every event carries an id, and a
+    client that reconnects with the Last-Event-ID header (sent automatically by
+    EventSource) receives the events it missed before the live stream continues.
+    For a finished job the stored events are replayed and the stream is closed.
+
+    Parameters:
+        job_id (str): Job identifier returned on submission.
+        scheduler (JobScheduler): Job queue (injected dependency).
+        last_event_id (Optional[str]): Id of the last event the client received.
+
+    Returns:
+        StreamingResponse: SSE stream of the job's progress, result or error events.
+
+    Raises:
+        HTTPException: 400 if Last-Event-ID is not an event id
+        HTTPException: 404 if the job is unknown
+    """
+    if scheduler.get(job_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+
+    after_id = 0
+    if last_event_id:
+        if not last_event_id.isdigit():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Last-Event-ID")
+        after_id = int(last_event_id)
+
+    return StreamingResponse(
+        sse_stream(scheduler.subscribe(job_id, last_event_id=after_id), logger=logger),
+        media_type="text/event-stream",
+    )
+
+
+@router.get("/models")
+async def list_models(
+    settings: Settings = Depends(get_settings),
+    separator_pool: Optional[SeparatorPool] = Depends(get_separator_pool(get_settings)),
+) -> Dict[str, Any]:
+    """
+    List the selectable separation models and what the separator workers have loaded.
+
+    Parameters:
+        settings (Settings): Application configuration (injected dependency).
+        separator_pool (Optional[SeparatorPool]): Running separator pool, None if disabled (injected dependency).
+
+    Returns:
+        Dict[str, Any]: Available models with their stems, the default and warm models, and
+        the load time, memory footprint and use count of the models loaded by each worker.
+    """
+    return {
+        "models": {model.value: model.stems for model in SeparationModelEnum},
+        "default": settings.SEPARATOR_DEFAULT_MODEL.value,
+        "warm": [model.value for model in settings.SEPARATOR_MODELS],
+        "workers": separator_pool.health()["loaded_models"] if separator_pool is not None else {},
+    }
@@ -0,0 +1,500 @@
+"""
+Benchmark the whole service end to end: upload, queue, separation, S3 upload and stem download.
+
+Synthetic tracks of several durations and formats are generated reproducibly, then
+submitted through the ASGI application in-process to /api/v1/processing/spleeter-sse
+by concurrent clients. Every client reads the job's event stream to the result and
+downloads every stem through /api/v1/files/download-processed-file/. S3 is an
+in-process moto server by default, or LocalStack when --endpoint-url is given.
+
+The separation backend is pluggable:
+- "synthetic" separates nothing, it copies the input to every stem after waiting as long
+  as a model running at --realtime-factor would take. It needs neither TensorFlow nor
+  model weights, so the HTTP, queue and S3 plumbing can be measured on its own.
+- "spleeter" runs the real separator pool with --workers processes. Models are loaded
+  before the measurement starts.
+
+Reported values are latency percentiles of whole jobs and of stem downloads, overall
+and per track; jobs per minute and audio seconds separated per second; the CPU time per
+job of this process and of the separator workers, the peak RSS of this process and of
+the largest worker. The CPU time of an in-process moto server is counted to this
+process, and worker CPU time includes loading the models. The job latency runs from
+the upload to the end of the event stream, which the in-process transport delivers as
+a whole. Tracks in formats other than WAV are encoded with ffmpeg and skipped when it
+is not installed. Logging is raised to ERROR.
+
+Results are printed as JSON and written to --output, so runs can be compared: with
+--compare, the relative change of the main metrics against an earlier result is added.
+Result caching and HLS streaming are disabled, so every job runs the full pipeline.
+The other required settings are read from the environment or the .env file, as in the
+application.
+
+Usage:
+    python -m src.server.benchmarks.end_to_end [--backend synthetic] [--durations 10,60,240] \\
+        [--formats wav,flac,mp3] [--repeat 3] [--concurrency 2] [--realtime-factor 0] \\
+        [--output results.json] [--compare baseline.json] [--endpoint-url http://localhost:4566]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import mimetypes
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+_BUCKET = "benchmark"
+
+# Metrics compared with --compare, as paths into the result
+_COMPARED_METRICS = [
+    ("summary", "jobs_per_minute"),
+    ("summary", "audio_seconds_per_second"),
+    ("summary", "job_latency_ms", "p50"),
+    ("summary", "job_latency_ms", "p95"),
+    ("summary", "job_latency_ms", "p99"),
+    ("summary", "download_latency_ms", "p50"),
+    ("summary", "download_latency_ms", "p95"),
+    ("summary", "download_latency_ms", "p99"),
+    ("resources", "cpu_seconds_per_job"),
+    ("resources", "peak_rss_mib", "api"),
+    ("resources", "peak_rss_mib", "workers"),
+]
+
+
+@dataclass
+class _Track:
+    """A synthetic input track."""
+
+    path: Path
+    duration: float
+    audio_format: str
+
+    @property
+    def name(self) -> str:
+        """Label of the track in the results, e.g. "60s.flac"."""
+        return f"{self.duration:g}s.{self.audio_format}"
+
+
+@dataclass
+class _JobResult:
+    """Measurements of one submitted job."""
+
+    track: _Track
+    latency: float = 0.0
+    downloads: List[float] = field(default_factory=list)
+    downloaded_bytes: int = 0
+    error: Optional[str] = None
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    """
+    Summarize latencies given in seconds.
+
+    Parameters:
+        values (List[float]): Measured latencies in seconds
+
+    Returns:
+        Dict[str, float]: p50, p95, p99 and max in milliseconds, empty without values
+    """
+    if not values:
+        return {}
+    values_ms = sorted(value * 1000 for value in values)
+    return {
+        "p50": round(statistics.median(values_ms), 2),
+        "p95": round(values_ms[min(len(values_ms) - 1, int(len(values_ms) * 0.95))], 2),
+        "p99": round(values_ms[min(len(values_ms) - 1, int(len(values_ms) * 0.99))], 2),
+        "max": round(values_ms[-1], 2),
+    }
+
+
+def _cpu_seconds(who: int) -> float:
+    """
+    Read the CPU time used so far.
+
+    Parameters:
+        who (int): resource.RUSAGE_SELF, or resource.RUSAGE_CHILDREN for exited child processes
+
+    Returns:
+        float: User and system CPU seconds
+    """
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _peak_rss_mib(pid: int) -> Optional[float]:
+    """
+    Read the peak resident memory of a running process.
+
+    Parameters:
+        pid (int): Process id
+
+    Returns:
+        Optional[float]: Peak RSS in MiB, None where /proc is not available
+    """
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def _git_commit() -> Optional[str]:
+    """
+    Read the commit of the benchmarked tree.
+
+    Returns:
+        Optional[str]: Commit hash, None outside of a git checkout
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _generate_tracks(args: argparse.Namespace, directory: Path) -> Tuple[List[_Track], List[str]]:
+    """
+    Generate a synthetic track for every duration and format.
+
+    Parameters:
+        args (argparse.Namespace): Parsed command line arguments
+        directory (Path): Directory of the tracks
+
+    Returns:
+        Tuple[List[_Track], List[str]]: The tracks, and the formats skipped because
+            they cannot be encoded here
+    """
+    from src.server.benchmarks.synthetic_audio import write_synthetic_track
+
+    tracks: List[_Track] = []
+    skipped: List[str] = []
+    for audio_format in args.formats:
+        try:
+            tracks.extend(
+                _Track(write_synthetic_track(directory, duration, audio_format, seed=args.seed), duration, audio_format)
+                for duration in args.durations
+            )
+        except RuntimeError as e:
+            print(f"Skipping {audio_format} tracks: {str(e)}", file=sys.stderr)
+            skipped.append(audio_format)
+    return tracks, skipped
+
+
+async def _run_job(client, track: _Track, model: str, stem_format: str) -> _JobResult:
+    """
+    Submit a track, follow its event stream to the result and download every stem.
+
+    Parameters:
+        client (httpx.AsyncClient): Client of the application under test
+        track (_Track): Track to separate
+        model (str): Spleeter model
+        stem_format (str): Format the stems are stored in
+
+    Returns:
+        _JobResult: Latencies of the job and its downloads, or the error it failed with
+    """
+    result = _JobResult(track)
+    mime_type = mimetypes.guess_type(track.path.name)[0] or "application/octet-stream"
+    stems: List[str] = []
+    processed: Optional[str] = None
+
+    started = time.perf_counter()
+    with open(track.path, "rb") as file:
+        async with client.stream(
+            "POST",
+            "/api/v1/processing/spleeter-sse",
+            files={"file": (track.path.name, file, mime_type)},
+            data={"model": model},
+        ) as response:
+            if response.status_code != 200:
+                result.error = f"HTTP {response.status_code}: {(await response.aread()).decode(errors='replace')}"
+                return result
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                event = json.loads(line[len("data: "):])
+                if event.get("error"):
+                    result.error = event["error"]
+                elif event.get("stem") and event.get("success"):
+                    stems.append(event["stem"])
+                elif event.get("result"):
+                    processed = event["result"]
+    result.latency = time.perf_counter() - started
+
+    if result.error is None and processed is None:
+        result.error = "Event stream ended without a result"
+    if result.error is not None:
+        return result
+
+    for stem in stems:
+        download_started = time.perf_counter()
+        response = await client.get(
+            "/api/v1/files/download-processed-file/",
+            params={"processed-filename": processed, "result-filename": f"{stem}.{stem_format}"},
+        )
+        result.downloads.append(time.perf_counter() - download_started)
+        if response.status_code != 200:
+            result.error = f"Download of {stem} failed with HTTP {response.status_code}"
+            return result
+        result.downloaded_bytes += len(response.content)
+
+    return result
+
+
+async def _run(args: argparse.Namespace, app, tracks: List[_Track]) -> Dict[str, Any]:
+    """
+    Run the warm-up and the measured jobs, then stop the job scheduler and the separator pool.
+
+    Parameters:
+        args (argparse.Namespace): Parsed command line arguments
+        app: ASGI application under test
+        tracks (List[_Track]): Tracks to submit, each `args.repeat` times
+
+    Returns:
+        Dict[str, Any]: Summary, per-track results and resource use
+    """
+    import httpx
+
+    from src.server.dependencies.jobs import stop_job_scheduler
+    from src.server.dependencies.separator import stop_separator_pool
+    from src.server.services.transcoding.transcoder import MASTER_FORMAT
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def run_limited(track: _Track) -> _JobResult:
+        async with semaphore:
+            return await _run_job(client, track, args.model, MASTER_FORMAT.value)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        # Warm up imports, connections and the lazily started services
+        for _ in range(args.warmup):
+            warmup = await _run_job(client, tracks[0], args.model, MASTER_FORMAT.value)
+            if warmup.error is not None:
+                raise RuntimeError(f"Warm-up job failed: {warmup.error}")
+
+        cpu_started = _cpu_seconds(resource.RUSAGE_SELF)
+        children_cpu_started = _cpu_seconds(resource.RUSAGE_CHILDREN)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(run_limited(track) for _ in range(args.repeat) for track in tracks))
+        elapsed = time.perf_counter() - started
+        api_cpu = _cpu_seconds(resource.RUSAGE_SELF) - cpu_started
+
+    # Read before the workers exit. Forked helpers such as ffprobe inherit the parent's
+    # peak in ru_maxrss of the children, so the workers are read one by one
+    workers_rss = [_peak_rss_mib(process.pid) for process in multiprocessing.active_children()]
+    api_rss = _peak_rss_mib(os.getpid())
+
+    # Worker CPU time is only accounted to this process once the workers have exited
+    await stop_job_scheduler()
+    stop_separator_pool()
+    worker_cpu = _cpu_seconds(resource.RUSAGE_CHILDREN) - children_cpu_started
+
+    succeeded = [result for result in results if result.error is None]
+    by_track: Dict[str, List[_JobResult]] = defaultdict(list)
+    for result in succeeded:
+        by_track[result.track.name].append(result)
+
+    jobs = max(len(succeeded), 1)
+    return {
+        "summary": {
+            "jobs": len(results),
+            "failed": len(results) - len(succeeded),
+            "errors": sorted({result.error for result in results if result.error is not None})[:5],
+            "wall_seconds": round(elapsed, 3),
+            "jobs_per_minute": round(len(succeeded) / elapsed * 60, 2),
+            "audio_seconds_per_second": round(sum(result.track.duration for result in succeeded) / elapsed, 2),
+            "job_latency_ms": _percentiles([result.latency for result in succeeded]),
+            "download_latency_ms": _percentiles([latency for result in succeeded for latency in result.downloads]),
+        },
+        "tracks": [
+            {
+                "track": name,
+                "input_bytes": track_results[0].track.path.stat().st_size,
+                "jobs": len(track_results),
+                "job_latency_ms": _percentiles([result.latency for result in track_results]),
+                "download_latency_ms": _percentiles([
+                    latency for result in track_results for latency in result.downloads
+                ]),
+                "downloaded_bytes_per_job": track_results[0].downloaded_bytes,
+            }
+            for name, track_results in by_track.items()
+        ],
+        "resources": {
+            "cpu_seconds_per_job": round((api_cpu + worker_cpu) / jobs, 4),
+            "api_cpu_seconds_per_job": round(api_cpu / jobs, 4),
+            "worker_cpu_seconds_per_job": round(worker_cpu / jobs, 4),
+            "peak_rss_mib": {
+                "api": api_rss,
+                "workers": max((rss for rss in workers_rss if rss is not None), default=None),
+            },
+        },
+    }
+
+
+def _compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compare the main metrics of two results.
+
+    Parameters:
+        current (Dict[str, Any]): Result of this run
+        baseline (Dict[str, Any]): Earlier result, as written with --output
+
+    Returns:
+        Dict[str, Any]: Baseline and current value and change in percent by metric,
+            and whether both runs used the same configuration
+    """
+    metrics: Dict[str, Any] = {}
+    for path in _COMPARED_METRICS:
+        values = []
+        for result in (baseline, current):
+            for key in path:
+                result = result.get(key, {}) if isinstance(result, dict) else {}
+            values.append(result if isinstance(result, (int, float)) else None)
+
+        before, after = values
+        metrics[".".join(path)] = {
+            "baseline": before,
+            "current": after,
+            "change_percent": round((after - before) / before * 100, 1) if before and after is not None else None,
+        }
+
+    return {
+        "baseline_commit": baseline.get("commit"),
+        "same_config": baseline.get("config") == current["config"],
+        "metrics": metrics,
+    }
+
+
+def main() -> None:
+    """Parse arguments, generate the tracks, run the benchmark and print and save the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["synthetic", "spleeter"], default="synthetic", help="Separation backend")
+    parser.add_argument(
+        "--durations", type=lambda value: [float(item) for item in value.split(",")], default=[10.0, 60.0, 240.0],
+        help="Comma-separated track durations in seconds",
+    )
+    parser.add_argument(
+        "--formats", type=lambda value: value.split(","), default=["wav", "flac", "mp3"],
+        help="Comma-separated track formats",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Jobs per track")
+    parser.add_argument("--concurrency", type=int, default=2, help="Concurrent clients, and jobs run at once")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured jobs run first")
+    parser.add_argument("--model", default="2stems", help="Spleeter model")
+    parser.add_argument("--workers", type=int, default=1, help="Separator pool workers of the spleeter backend")
+    parser.add_argument(
+        "--realtime-factor", type=float, default=0.0,
+        help="Audio seconds the synthetic backend separates per second, 0 for no inference time",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic tracks")
+    parser.add_argument("--output", type=Path, help="File the JSON result is written to")
+    parser.add_argument("--compare", type=Path, help="Earlier JSON result to compare with")
+    parser.add_argument("--endpoint-url", help="S3 endpoint, e.g. LocalStack. Defaults to a moto server")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+
+    server = None
+    endpoint_url = args.endpoint_url
+    if endpoint_url is None:
+        from moto.server import ThreadedMotoServer
+
+        server = ThreadedMotoServer(port=0)
+        server.start()
+        host, port = server.get_host_and_port()
+        endpoint_url = f"http://{host}:{port}"
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        tracks_dir = temp_path / "tracks"
+        tracks_dir.mkdir()
+
+        # Settings are read on first use, point them at the stand-ins first
+        os.environ.update({
+            "S3_ENDPOINT_URL": endpoint_url,
+            "S3_ACCESS_KEY": os.environ.get("S3_ACCESS_KEY", "test"),
+            "S3_SECRET_KEY": os.environ.get("S3_SECRET_KEY", "test"),
+            "S3_REGION": os.environ.get("S3_REGION", "us-east-1"),
+            "S3_BUCKET": _BUCKET,
+            "JOB_STORE_PATH": str(temp_path / "jobs.sqlite3"),
+            "UPLOAD_SPOOL_DIR": str(temp_path / "spool"),
+            "JOB_MAX_CONCURRENCY": str(args.concurrency),
+            "SEPARATOR_POOL_SIZE": str(args.workers),
+            "SEPARATOR_MODELS": json.dumps([args.model]),
+            "RESULT_CACHE_BACKEND": "none",
+            "STREAM_SEGMENT_SECONDS": "0",
+        })
+
+        from src.server.dependencies.separator import set_separator_pool, start_separator_pool
+        from src.server.dependencies.settings import get_settings
+        from src.server.logger import logger
+        from src.server.main import app
+
+        # The console handler writes to stdout, keep it free for the result
+        for name in (None, "werkzeug", logger.name):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+        tracks, skipped_formats = _generate_tracks(args, tracks_dir)
+        if not tracks:
+            parser.error("No track could be generated")
+
+        settings = get_settings()
+        if args.backend == "synthetic":
+            from src.server.benchmarks.synthetic_separator import SyntheticSeparatorPool
+
+            set_separator_pool(SyntheticSeparatorPool(realtime_factor=args.realtime_factor, logger=logger))
+        start_separator_pool(settings).wait_until_ready()
+
+        try:
+            measured = asyncio.run(_run(args, app, tracks))
+        finally:
+            if server is not None:
+                server.stop()
+
+    result: Dict[str, Any] = {
+        "benchmark": "end_to_end",
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "host": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "config": {
+            "backend": args.backend,
+            "model": args.model,
+            "durations": args.durations,
+            "formats": [audio_format for audio_format in args.formats if audio_format not in skipped_formats],
+            "repeat": args.repeat,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "realtime_factor": args.realtime_factor if args.backend == "synthetic" else None,
+            "storage": "moto" if server is not None else endpoint_url,
+        },
+        "skipped_formats": skipped_formats,
+        **measured,
+    }
+    if baseline is not None:
+        result["comparison"] = _compare(result, baseline)
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Benchmark how much logging slows the event loop while many jobs write spleeter CLI output.
+
+A probe coroutine sleeps for a fixed interval in a loop and records how late it wakes
+up. Concurrent jobs emulate a separation through the CLI: every job reads lines of
+verbose output and reports separation progress at DEBUG level. The workload runs in
+three modes:
+- "blocking", as logging used to be set up: DEBUG level, text format, a console and
+  a rotating file handler written synchronously, and every output line logged.
+- "queued", the current setup: INFO level, JSON format, the same two handlers behind
+  a queue written by a background thread, and output lines rate-limited per job.
+- "queued-unlimited", the current setup with every output line logged, which shows
+  the share of the queue alone.
+
+Reported values are the probe's lag percentiles, the wall time of the workload, the
+time to flush the queue afterwards, and the number of log lines written. The console
+handler writes to a file in a temporary directory, so the terminal speed does not
+skew the result.
+
+Usage:
+    python -m src.server.benchmarks.logging_event_loop [--jobs 16] [--lines 2000] [--progress 200]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.server.services.logs.rate_limit import LogRateLimiter
+from src.server.services.logs.structured import JsonFormatter, current_job_id, start_queue_logging
+
+_PROBE_INTERVAL = 0.005
+_TEXT_FORMAT = "[%(asctime)s] - [%(levelname)s] - [%(name)s] - [%(funcName)s] - [%(message)s]"
+_OUTPUT_LINE = (
+    b"I0101 00:00:00.000000 140000000000000 session.cc:123] Successfully opened dynamic library "
+    b"libcudart.so.11.0 (step %d)\n"
+)
+
+
+async def _probe(lags: List[float], stop: asyncio.Event) -> None:
+    """
+    Measure how late the event loop wakes up a sleeping coroutine.
+
+    Parameters:
+        lags (List[float]): Receives one lag value in seconds per wake-up
+        stop (asyncio.Event): Set when the workload is finished
+    """
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(_PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - _PROBE_INTERVAL)
+
+
+async def _blocking_job(logger: logging.Logger, job: int, lines: int, progress: int) -> None:
+    """
+    Log a job's output the way it used to be logged: eagerly formatted, every line.
+
+    Parameters:
+        logger (logging.Logger): Logger under test
+        job (int): Job number
+        lines (int): Lines of CLI output
+        progress (int): Progress updates
+    """
+    every = max(lines // max(progress, 1), 1)
+    for index in range(lines):
+        line = _OUTPUT_LINE % index
+        logger.info(f"Spleeter: STDOUT: {line.decode().strip()}")
+        if index % every == 0:
+            logger.debug(f"ProgressTracker: Job {job}: separation progress: {index / lines:.1%}")
+        await asyncio.sleep(0)
+
+
+async def _queued_job(logger: logging.Logger, job: int, lines: int, progress: int, rate: float, burst: int) -> None:
+    """
+    Log a job's output the way it is logged now: level-gated, lazily formatted, rate-limited.
+
+    Parameters:
+        logger (logging.Logger): Logger under test
+        job (int): Job number
+        lines (int): Lines of CLI output
+        progress (int): Progress updates
+        rate (float): Output lines per second let through
+        burst (int): Output lines let through back to back
+    """
+    current_job_id.set(f"job-{job}")
+    limiter = LogRateLimiter(rate, burst)
+    every = max(lines // max(progress, 1), 1)
+    for index in range(lines):
+        line = _OUTPUT_LINE % index
+        if limiter.allow():
+            suppressed = limiter.take_suppressed()
+            if suppressed:
+                logger.info("Spleeter: %s: %s lines not logged", "STDOUT", suppressed)
+            logger.info("Spleeter: %s: %s", "STDOUT", line.decode(errors="replace").strip())
+        if index % every == 0 and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("ProgressTracker: separation progress: %.1f%%", 100 * index / lines)
+        await asyncio.sleep(0)
+
+
+def _logger(mode: str, directory: Path) -> logging.Logger:
+    """
+    Build an isolated logger with a console-like and a rotating file handler.
+
+    Parameters:
+        mode (str): "blocking", "queued" or "queued-unlimited"
+        directory (Path): Directory of the log files
+
+    Returns:
+        logging.Logger: Logger not propagating to the root logger
+    """
+    logger = logging.getLogger(f"benchmark.{mode}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG if mode == "blocking" else logging.INFO)
+
+    formatter = logging.Formatter(_TEXT_FORMAT) if mode == "blocking" else JsonFormatter()
+    console = logging.StreamHandler(open(directory / f"{mode}.console.log", "w"))
+    rotating = RotatingFileHandler(directory / f"{mode}.log", "a", 128000000, 99)
+    for handler in (console, rotating):
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    return logger
+
+
+async def _run(mode: str, args: argparse.Namespace, directory: Path) -> Dict[str, Any]:
+    """
+    Run the concurrent workload in one mode while probing event-loop lag.
+
+    Parameters:
+        mode (str): "blocking", "queued" or "queued-unlimited"
+        args (argparse.Namespace): Parsed command line arguments
+        directory (Path): Directory of the log files
+
+    Returns:
+        Dict[str, Any]: Lag percentiles in milliseconds, timings and lines written
+    """
+    logger = _logger(mode, directory)
+    handlers = list(logger.handlers)
+    listener = start_queue_logging(logger) if mode != "blocking" else None
+    # A burst as long as the output lets every line through
+    burst = args.lines if mode == "queued-unlimited" else args.burst
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(lags, stop))
+
+    started = time.perf_counter()
+    if mode == "blocking":
+        await asyncio.gather(*(_blocking_job(logger, job, args.lines, args.progress) for job in range(args.jobs)))
+    else:
+        await asyncio.gather(*(
+            _queued_job(logger, job, args.lines, args.progress, args.rate, burst) for job in range(args.jobs)
+        ))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe
+
+    flush_started = time.perf_counter()
+    if listener is not None:
+        listener.stop()
+    flush_seconds = time.perf_counter() - flush_started
+    for handler in handlers:
+        handler.close()
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "mode": mode,
+        "wall_seconds": round(elapsed, 3),
+        "flush_seconds": round(flush_seconds, 3),
+        "lag_p50_ms": round(statistics.median(lags_ms), 2),
+        "lag_p99_ms": round(lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))], 2),
+        "lag_max_ms": round(lags_ms[-1], 2),
+        "log_lines": sum(1 for _ in open(directory / f"{mode}.log")),
+    }
+
+
+def main() -> None:
+    """Parse arguments, run both modes and print the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=16, help="Concurrent jobs")
+    parser.add_argument("--lines", type=int, default=2000, help="Lines of CLI output per job")
+    parser.add_argument("--progress", type=int, default=200, help="DEBUG progress updates per job")
+    parser.add_argument("--rate", type=float, default=5.0, help="Output lines per second logged per job when queued")
+    parser.add_argument("--burst", type=int, default=50, help="Output lines logged back to back per job when queued")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        runs = [asyncio.run(_run(mode, args, Path(temp_dir))) for mode in ("blocking", "queued", "queued-unlimited")]
+
+    print(json.dumps({"jobs": args.jobs, "lines": args.lines, "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark the fixed per-request cost of the dependency chain on the stem download endpoint.
+
+The same small stem is downloaded sequentially through the ASGI application in two
+modes. "per-request" reproduces the work the dependency chain used to do on every
+request: building Settings from the environment and .env file, and checking the S3
+connection with a list_buckets round-trip. "cached" is the current chain, with cached
+settings and the S3 connection state read from the background health monitor.
+Reported values are latency percentiles and sequential requests per second. Logging is
+raised to WARNING, so that only the request handling is measured.
+
+The S3 settings are pointed at an in-process moto server by default, or at LocalStack
+when --endpoint-url is given. The other required settings are read from the
+environment or the .env file, as in the application.
+
+Usage:
+    python -m src.server.benchmarks.request_overhead [--requests 500] [--stem-kib 64] \\
+        [--endpoint-url http://localhost:4566]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import time
+from typing import Any, Dict, List
+
+_BUCKET = "benchmark"
+_RESULT = "request-overhead"
+
+
+async def _run(mode: str, app, requests: int) -> Dict[str, Any]:
+    """
+    Download the benchmark stem sequentially and measure every request.
+
+    Parameters:
+        mode (str): "per-request" or "cached"
+        app: ASGI application under test
+        requests (int): Number of measured requests
+
+    Returns:
+        Dict[str, Any]: Latency percentiles in milliseconds and requests per second
+    """
+    import httpx
+
+    url = f"/api/latest/files/download-processed-file/?processed-filename={_RESULT}&result-filename=vocals.flac"
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        # Warm up connections, imports and the lazily created services
+        for _ in range(10):
+            (await client.get(url)).raise_for_status()
+
+        latencies: List[float] = []
+        started = time.perf_counter()
+        for _ in range(requests):
+            request_started = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - request_started)
+            response.raise_for_status()
+        elapsed = time.perf_counter() - started
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    return {
+        "mode": mode,
+        "requests": requests,
+        "mean_ms": round(statistics.fmean(latencies_ms), 3),
+        "p50_ms": round(statistics.median(latencies_ms), 3),
+        "p95_ms": round(latencies_ms[int(len(latencies_ms) * 0.95)], 3),
+        "p99_ms": round(latencies_ms[min(len(latencies_ms) - 1, int(len(latencies_ms) * 0.99))], 3),
+        "requests_per_second": round(requests / elapsed, 1),
+    }
+
+
+def main() -> None:
+    """Parse arguments, benchmark both modes and print the results and savings as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per mode")
+    parser.add_argument("--stem-kib", type=int, default=64, help="Size of the downloaded stem in KiB")
+    parser.add_argument("--endpoint-url", help="S3 endpoint, e.g. LocalStack. Defaults to a moto server")
+    args = parser.parse_args()
+
+    server = None
+    endpoint_url = args.endpoint_url
+    if endpoint_url is None:
+        from moto.server import ThreadedMotoServer
+
+        server = ThreadedMotoServer(port=0)
+        server.start()
+        host, port = server.get_host_and_port()
+        endpoint_url = f"http://{host}:{port}"
+
+    # Settings are read on import of the application, point them at the stand-in first
+    os.environ.update({
+        "S3_ENDPOINT_URL": endpoint_url,
+        "S3_ACCESS_KEY": os.environ.get("S3_ACCESS_KEY", "test"),
+        "S3_SECRET_KEY": os.environ.get("S3_SECRET_KEY", "test"),
+        "S3_REGION": os.environ.get("S3_REGION", "us-east-1"),
+        "S3_BUCKET": _BUCKET,
+    })
+
+    from src.server.config import Settings
+    from src.server.dependencies.s3 import _s3_client, start_s3_health_monitor, stop_s3_health_monitor
+    from src.server.dependencies.settings import get_settings
+    from src.server.main import app
+
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("src.server.logger").setLevel(logging.WARNING)
+
+    settings = get_settings()
+    _s3_client.initialize(settings)
+    _s3_client.get_client().put_object(
+        Bucket=_BUCKET, Key=f"processed/{_RESULT}/vocals.flac", Body=os.urandom(args.stem_kib * 1024),
+    )
+
+    def per_request_settings() -> Settings:
+        """Build settings and check the S3 connection, as every request used to."""
+        uncached = Settings()  # type: ignore[call-arg]
+        if not _s3_client.check_connection():
+            _s3_client.reconnect()
+        return uncached
+
+    try:
+        app.dependency_overrides[get_settings] = per_request_settings
+        before = asyncio.run(_run("per-request", app, args.requests))
+        app.dependency_overrides.clear()
+
+        start_s3_health_monitor(settings)
+        after = asyncio.run(_run("cached", app, args.requests))
+        stop_s3_health_monitor()
+    finally:
+        if server is not None:
+            server.stop()
+
+    print(json.dumps({
+        "stem_kib": args.stem_kib,
+        "runs": [before, after],
+        "saved": {
+            "mean_ms": round(before["mean_ms"] - after["mean_ms"], 3),
+            "p50_ms": round(before["p50_ms"] - after["p50_ms"], 3),
+            "speedup": round(after["requests_per_second"] / max(before["requests_per_second"], 1e-9), 2),
+        },
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Load test of event-loop latency while many jobs upload and download stems from S3.
+
+A probe coroutine sleeps for a fixed interval in a loop and records how late it wakes
+up. The same concurrent workload (upload a stem, then stream it back) is run twice:
+once calling the blocking S3Uploader and botocore body directly on the event loop, as
+the pipeline used to, and once through AsyncS3Service. Lag percentiles show how long
+other SSE streams would have been stalled.
+
+The test runs against an in-process moto S3 server by default, or against LocalStack
+when --endpoint-url is given.
+
+Usage:
+    python -m src.server.benchmarks.s3_event_loop_latency [--jobs 32] [--size-mb 8] \\
+        [--endpoint-url http://localhost:4566]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+import boto3  # type: ignore[import-untyped]
+
+from src.server.services.s3.async_service import AsyncS3Service
+from src.server.services.s3.uploader import S3Uploader
+
+_BUCKET = "benchmark"
+_PROBE_INTERVAL = 0.01
+
+
+async def _probe(lags: List[float], stop: asyncio.Event) -> None:
+    """
+    Measure how late the event loop wakes up a sleeping coroutine.
+
+    Parameters:
+        lags (List[float]): Receives one lag value in seconds per wake-up
+        stop (asyncio.Event): Set when the workload is finished
+    """
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(_PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - _PROBE_INTERVAL)
+
+
+async def _blocking_job(s3_client, stem: Path, key: str) -> None:
+    """
+    Upload and download a stem with blocking calls on the event loop thread.
+
+    Parameters:
+        s3_client: boto3 S3 client
+        stem (Path): Local file to upload
+        key (str): Destination key
+    """
+    S3Uploader(s3_client, _BUCKET).upload_file(stem, key)
+    await asyncio.sleep(0)
+    body = s3_client.get_object(Bucket=_BUCKET, Key=key)["Body"]
+    for _ in iter(lambda: body.read(1024 * 1024), b""):
+        await asyncio.sleep(0)
+
+
+async def _async_job(service: AsyncS3Service, stem: Path, key: str) -> None:
+    """
+    Upload and download a stem through the non-blocking S3 service.
+
+    Parameters:
+        service (AsyncS3Service): Service under test
+        stem (Path): Local file to upload
+        key (str): Destination key
+    """
+    await service.upload_file(stem, key)
+    async for _ in service.download_stream(await service.get_object(key)):
+        pass
+
+
+async def _run(mode: str, s3_client, stem: Path, jobs: int, workers: int) -> Dict[str, Any]:
+    """
+    Run the concurrent workload in one mode while probing event-loop lag.
+
+    Parameters:
+        mode (str): "blocking" or "async"
+        s3_client: boto3 S3 client
+        stem (Path): Local file uploaded by every job
+        jobs (int): Number of concurrent jobs
+        workers (int): Size of the S3 thread pool in async mode
+
+    Returns:
+        Dict[str, Any]: Lag percentiles in milliseconds and total wall time
+    """
+    lags: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(lags, stop))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        service = AsyncS3Service(s3_client, _BUCKET, executor)
+        started = time.perf_counter()
+        if mode == "blocking":
+            await asyncio.gather(*(_blocking_job(s3_client, stem, f"{mode}/{i}") for i in range(jobs)))
+        else:
+            await asyncio.gather(*(_async_job(service, stem, f"{mode}/{i}") for i in range(jobs)))
+        elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "mode": mode,
+        "wall_seconds": round(elapsed, 3),
+        "lag_p50_ms": round(statistics.median(lags_ms), 2),
+        "lag_p99_ms": round(lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))], 2),
+        "lag_max_ms": round(lags_ms[-1], 2),
+    }
+
+
+def main() -> None:
+    """Parse arguments, run both modes and print the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=32, help="Concurrent upload/download jobs")
+    parser.add_argument("--size-mb", type=int, default=8, help="Size of each stem in MiB")
+    parser.add_argument("--workers", type=int, default=16, help="S3 thread pool size")
+    parser.add_argument("--endpoint-url", help="S3 endpoint, e.g. LocalStack. Defaults to a moto server")
+    args = parser.parse_args()
+
+    server = None
+    endpoint_url = args.endpoint_url
+    if endpoint_url is None:
+        from moto.server import ThreadedMotoServer
+
+        server = ThreadedMotoServer(port=0)
+        server.start()
+        host, port = server.get_host_and_port()
+        endpoint_url = f"http://{host}:{port}"
+
+    s3_client = boto3.client(
+        "s3",
+        endpoint_url=endpoint_url,
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+        region_name="us-east-1",
+    )
+    s3_client.create_bucket(Bucket=_BUCKET)
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stem = Path(temp_dir) / "stem.mp3"
+            stem.write_bytes(os.urandom(args.size_mb * 1024 * 1024))
+
+            runs = [
+                asyncio.run(_run(mode, s3_client, stem, args.jobs, args.workers))
+                for mode in ("blocking", "async")
+            ]
+    finally:
+        if server is not None:
+            server.stop()
+
+    print(json.dumps({"jobs": args.jobs, "size_mb": args.size_mb, "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
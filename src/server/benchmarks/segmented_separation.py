@@ -0,0 +1,131 @@
+"""
+Benchmark single-shot separation against segmented overlap-add separation.
+
+Each mode runs in a fresh process with its own separator pool, so TensorFlow state
+and memory from one mode do not leak into the other. Reported values are the wall-clock
+time of the separation itself (model loading excluded) and the peak RSS of the
+benchmark process and of its worker processes.
+
+Note that the single-shot path separates at most the first 600 seconds of a track,
+which is the Spleeter default duration limit.
+
+Usage:
+    python -m src.server.benchmarks.segmented_separation path/to/track.mp3 \\
+        [--workers 4] [--window 60] [--overlap 2] [--parallelism 4] [--model 2stems] \\
+        [--model-path pretrained_models]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import resource
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from src.server.annihilator.audio import probe_duration
+from src.server.annihilator.segmenter import SegmentedSeparator
+from src.server.annihilator.separator_pool import SeparatorPool
+
+
+async def _separate(mode: str, args: argparse.Namespace, pool: SeparatorPool, output_dir: Path) -> int:
+    """
+    Run one separation in the requested mode.
+
+    Parameters:
+        mode (str): "single-shot" or "segmented"
+        args (argparse.Namespace): Parsed command line arguments
+        pool (SeparatorPool): Running separator pool
+        output_dir (Path): Directory for the encoded stems
+
+    Returns:
+        int: Separation return code (0 for success)
+    """
+    if mode == "single-shot":
+        return await pool.separate(args.input, output_dir, args.model, "mp3", "192k")
+
+    segmenter = SegmentedSeparator(
+        separator_pool=pool,
+        window_seconds=args.window,
+        overlap_seconds=args.overlap,
+        parallelism=args.parallelism,
+        min_duration=0,
+    )
+    return await segmenter.separate_to_files(
+        input_path=args.input,
+        output_dir=output_dir,
+        model=args.model,
+        codec="mp3",
+        bitrate="192k",
+        duration=probe_duration(args.input),
+    )
+
+
+def _run_mode(mode: str, args: argparse.Namespace, results) -> None:
+    """
+    Benchmark one mode inside a dedicated process and report through a queue.
+
+    Parameters:
+        mode (str): "single-shot" or "segmented"
+        args (argparse.Namespace): Parsed command line arguments
+        results: Queue receiving the measurement dictionary
+    """
+    pool = SeparatorPool()
+    pool.initialize(
+        size=args.workers,
+        models=[args.model],
+        model_path=args.model_path,
+        memory_budget=4 * 1024 ** 3,
+    )
+    pool.wait_until_ready()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        started = time.perf_counter()
+        return_code = asyncio.run(_separate(mode, args, pool, Path(temp_dir)))
+        elapsed = time.perf_counter() - started
+
+    pool.shutdown()
+
+    results.put({
+        "mode": mode,
+        "return_code": return_code,
+        "wall_seconds": round(elapsed, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_worker_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    })
+
+
+def main() -> None:
+    """Parse arguments, benchmark both modes and print the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", type=Path, help="Audio file to separate")
+    parser.add_argument("--workers", type=int, default=4, help="Separator pool size")
+    parser.add_argument("--window", type=float, default=60.0, help="Window length in seconds")
+    parser.add_argument("--overlap", type=float, default=2.0, help="Window overlap in seconds")
+    parser.add_argument("--parallelism", type=int, default=4, help="Windows separated at once")
+    parser.add_argument("--model", default="2stems", help="Spleeter model")
+    parser.add_argument(
+        "--model-path", type=Path, default=Path("pretrained_models"), help="Directory with the model weights",
+    )
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    report: Dict[str, Any] = {
+        "input": str(args.input),
+        "duration_seconds": probe_duration(args.input),
+        "runs": [],
+    }
+
+    for mode in ("single-shot", "segmented"):
+        results = context.Queue()
+        process = context.Process(target=_run_mode, args=(mode, args, results))
+        process.start()
+        report["runs"].append(results.get())
+        process.join()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark separating every stem of a model against separating only the requested stems.
+
+Each mode runs in a fresh process with a single-worker separator pool, so the worker's
+CPU time can be read once it exits. Reported values are the wall-clock time of the
+separation (model loading excluded), the CPU time of the worker including model loading,
+and the number and size of the encoded stems that would be uploaded and stored.
+
+Usage:
+    python -m src.server.benchmarks.stem_selection path/to/track.mp3 \\
+        [--model 4stems] [--stems vocals,residual] [--codec flac] [--model-path pretrained_models]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import resource
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.server.annihilator.audio import probe_duration
+from src.server.annihilator.separator_pool import SeparatorPool
+
+
+def _run_mode(mode: str, stems: Optional[List[str]], args: argparse.Namespace, results) -> None:
+    """
+    Benchmark one mode inside a dedicated process and report through a queue.
+
+    Parameters:
+        mode (str): "all" or "selected"
+        stems (List[str], optional): Stems to separate, None for every stem of the model
+        args (argparse.Namespace): Parsed command line arguments
+        results: Queue receiving the measurement dictionary
+    """
+    pool = SeparatorPool()
+    pool.initialize(size=1, models=[args.model], model_path=args.model_path, memory_budget=4 * 1024 ** 3)
+    pool.wait_until_ready()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dir = Path(temp_dir)
+        started = time.perf_counter()
+        return_code = asyncio.run(
+            pool.separate(args.input, output_dir, args.model, args.codec, "192k", stems=stems)
+        )
+        elapsed = time.perf_counter() - started
+        outputs = {file.stem: file.stat().st_size for file in output_dir.iterdir()}
+
+    # Worker CPU time is only accounted to this process once the worker has exited
+    pool.shutdown()
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    results.put({
+        "mode": mode,
+        "return_code": return_code,
+        "wall_seconds": round(elapsed, 3),
+        "worker_cpu_seconds": round(usage.ru_utime + usage.ru_stime, 3),
+        "stems": sorted(outputs),
+        "output_bytes": sum(outputs.values()),
+    })
+
+
+def main() -> None:
+    """Parse arguments, benchmark both modes and print the results and savings as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", type=Path, help="Audio file to separate")
+    parser.add_argument("--model", default="4stems", help="Spleeter model")
+    parser.add_argument("--stems", default="vocals,residual", help="Comma-separated stems to keep")
+    parser.add_argument("--codec", default="flac", help="Output audio codec")
+    parser.add_argument(
+        "--model-path", type=Path, default=Path("pretrained_models"), help="Directory with the model weights",
+    )
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    report: Dict[str, Any] = {
+        "input": str(args.input),
+        "duration_seconds": probe_duration(args.input),
+        "model": args.model,
+        "runs": [],
+    }
+
+    for mode, stems in (("all", None), ("selected", args.stems.split(","))):
+        results = context.Queue()
+        process = context.Process(target=_run_mode, args=(mode, stems, args, results))
+        process.start()
+        report["runs"].append(results.get())
+        process.join()
+
+    full, selected = report["runs"]
+    report["saved"] = {
+        "wall_seconds": round(full["wall_seconds"] - selected["wall_seconds"], 3),
+        "worker_cpu_seconds": round(full["worker_cpu_seconds"] - selected["worker_cpu_seconds"], 3),
+        "output_bytes": full["output_bytes"] - selected["output_bytes"],
+        "output_bytes_ratio": round(1 - selected["output_bytes"] / max(full["output_bytes"], 1), 3),
+    }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import shutil
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from src.server.annihilator.audio import transcode
+
+SAMPLE_RATE = 44100
+
+# Seconds of audio generated at once, bounds memory for long tracks
+_CHUNK_SECONDS = 10
+
+
+def write_synthetic_wav(path: Path, duration: float, seed: int = 0, sample_rate: int = SAMPLE_RATE) -> None:
+    """
+    Write a reproducible stereo track of tones and noise as 16-bit WAV.
+
+    The track mixes a bass line, a vibrato lead and gated noise, so that lossy and
+    lossless encoders produce files of realistic size, unlike for silence or a pure tone.
+    The same duration and seed always give the same bytes.
+
+    Parameters:
+        path (Path): Destination file
+        duration (float): Track length in seconds
+        seed (int): Seed of the noise generator (default: 0)
+        sample_rate (int): Samples per second (default: 44100)
+    """
+    rng = np.random.default_rng(seed)
+    frames = int(duration * sample_rate)
+    chunk = _CHUNK_SECONDS * sample_rate
+
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(2)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+
+        for start in range(0, frames, chunk):
+            t = np.arange(start, min(start + chunk, frames)) / sample_rate
+            bass = 0.3 * np.sin(2 * np.pi * 55 * t * (1 + (t.astype(int) % 4) / 4))
+            lead = 0.2 * np.sin(2 * np.pi * 440 * t + 3 * np.sin(2 * np.pi * 5 * t))
+            gate = (t * 4 % 1) < 0.25
+            noise = 0.1 * rng.standard_normal((2, t.size)) * gate
+            left = bass + lead + noise[0]
+            right = bass + 0.8 * lead + noise[1]
+            samples = np.stack([left, right], axis=1).clip(-1, 1)
+            writer.writeframes((samples * 32767).astype("<i2").tobytes())
+
+
+def write_synthetic_track(directory: Path, duration: float, audio_format: str, seed: int = 0) -> Path:
+    """
+    Write a synthetic track in the given format.
+
+    Parameters:
+        directory (Path): Directory of the track
+        duration (float): Track length in seconds
+        audio_format (str): File format, e.g. "wav", "flac" or "mp3"
+        seed (int): Seed of the noise generator (default: 0)
+
+    Returns:
+        Path: The written file, named after its duration and format
+
+    Raises:
+        RuntimeError: If the format is not WAV and ffmpeg is not installed
+    """
+    wav_path = directory / f"{duration:g}s-{seed}.wav"
+    if not wav_path.exists():
+        write_synthetic_wav(wav_path, duration, seed)
+    if audio_format == "wav":
+        return wav_path
+
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError(f"ffmpeg is needed to encode {audio_format} tracks")
+
+    path = wav_path.with_suffix(f".{audio_format}")
+    transcode(wav_path, path, audio_format, bitrate="192k")
+    return path
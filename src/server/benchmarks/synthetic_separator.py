@@ -0,0 +1,171 @@
+import asyncio
+import shutil
+import time
+import wave
+from logging import Logger
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from src.server.annihilator.audio import probe_duration
+from src.server.annihilator.separator_pool import SeparatorPool
+from src.server.annihilator.timings import DECODE, ENCODE, INFERENCE, StageTimings
+from src.server.enums.models import SeparationModelEnum
+
+
+class SyntheticSeparatorPool(SeparatorPool):
+    """
+    Separator pool stand-in that writes stems without loading a model.
+
+    Every requested stem is a copy of the input file, written after waiting as long as
+    a model separating the track at the given speed would take. This lets the HTTP, job
+    queue and S3 plumbing around a separation be benchmarked without TensorFlow or model
+    weights. Only whole-file separations are supported: segmented and packed separations
+    need the waveforms the real workers return.
+
+    Parameters:
+        realtime_factor (float): Seconds of audio separated per second of waiting,
+            0 to write the stems at once (default: 0.0)
+        logger (Logger, optional): Python logger instance for operation tracking.
+                                  Defaults to None.
+    """
+
+    def __init__(self, realtime_factor: float = 0.0, logger: Optional[Logger] = None):
+        """Initialize the pool in unconfigured state."""
+        super().__init__(logger=logger)
+        self.realtime_factor = realtime_factor
+
+    @property
+    def is_healthy(self) -> bool:
+        """
+        Check if the pool accepts jobs.
+
+        Returns:
+            bool: True once the pool has been started
+        """
+        return self.is_initialized
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Check if the pool has been started, there are no models to wait for.
+
+        Parameters:
+            timeout (float, optional): Unused
+
+        Returns:
+            bool: True once the pool has been started
+        """
+        return self.is_initialized
+
+    def initialize(
+        self,
+        size: int,
+        models: List[str],
+        model_path: Path,
+        memory_budget: int,
+        healthcheck_interval: float = 5.0,
+    ) -> None:
+        """
+        Mark the pool as started, without starting any worker process.
+
+        Parameters:
+            size (int): Reported number of workers
+            models (List[str]): Reported models
+            model_path (Path): Unused
+            memory_budget (int): Unused
+            healthcheck_interval (float): Unused
+        """
+        self._log(f"Starting synthetic separator pool: realtime_factor={self.realtime_factor}")
+        self._size = size
+        self._models = list(models)
+        self._running.set()
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """
+        Mark the pool as stopped.
+
+        Parameters:
+            timeout (float): Unused
+        """
+        self._running.clear()
+
+    @staticmethod
+    def _duration(input_path: str) -> float:
+        """
+        Read the duration of the input, from its header if it is a WAV file.
+
+        Parameters:
+            input_path (str): Path or URL of the input audio
+
+        Returns:
+            float: Duration in seconds, 0 if it cannot be read
+        """
+        try:
+            with wave.open(input_path, "rb") as reader:
+                return reader.getnframes() / reader.getframerate()
+        except (wave.Error, EOFError, OSError):
+            pass
+        try:
+            return probe_duration(input_path)
+        except Exception:
+            return 0.0
+
+    async def separate(
+        self,
+        input_path: Union[Path, str],
+        output_dir: Path,
+        model: str,
+        codec: str,
+        bitrate: str,
+        timings: Optional[StageTimings] = None,
+        stems: Optional[List[str]] = None,
+    ) -> int:
+        """
+        Write a copy of the input for every stem, after the simulated inference time.
+
+        Parameters:
+            input_path (Union[Path, str]): Path of the input audio
+            output_dir (Path): Directory to save output stems
+            model (str): Spleeter model whose stems are written
+            codec (str): Extension of the stem files
+            bitrate (str): Unused
+            timings (StageTimings, optional): Receives the decode, inference and encode times
+            stems (List[str], optional): Stems to write, None writes every stem of the model
+
+        Returns:
+            int: Job return code (0 for success)
+
+        Raises:
+            RuntimeError: If the pool has not been started
+        """
+        if not self.is_initialized:
+            raise RuntimeError("Separator pool is not running")
+
+        stage_timings: Dict[str, float] = {}
+
+        started = time.perf_counter()
+        duration = await asyncio.to_thread(self._duration, str(input_path))
+        stage_timings[DECODE] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if self.realtime_factor > 0:
+            await asyncio.sleep(duration / self.realtime_factor)
+        stage_timings[INFERENCE] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for stem in stems or SeparationModelEnum(model).stems:
+            await asyncio.to_thread(shutil.copyfile, input_path, output_dir / f"{stem}.{codec}")
+        stage_timings[ENCODE] = time.perf_counter() - started
+
+        if timings is not None:
+            timings.merge(stage_timings)
+        return 0
+
+    async def _submit(self, kind: str, params: Dict[str, Any]) -> Any:
+        """
+        Reject the job kinds that need separated waveforms.
+
+        Raises:
+            NotImplementedError: Always
+        """
+        raise NotImplementedError(f"Synthetic separator pool cannot run {kind} jobs")
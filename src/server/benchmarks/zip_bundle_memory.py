@@ -0,0 +1,106 @@
+"""
+Check that streaming a ZIP bundle of stems uses constant memory, whatever the stem size.
+
+Bundles of synthetic stems are streamed through `stream_zip` and discarded, once per
+stem size. The stems are served from one preallocated chunk, so the traced allocations
+are those of the archive writer alone. Reported values are the peak traced memory and
+the throughput of every run. The largest bundle's peak must stay within a small margin
+of the smallest one's, otherwise the check fails with exit code 1.
+
+Sizes over 4096 MiB also exercise the ZIP64 records. The test suite runs the same
+check on small bundles, this script is meant for large ones.
+
+Usage:
+    python -m src.server.benchmarks.zip_bundle_memory [--sizes-mib 16,256,1024] [--stems 4] [--chunk-kib 1024]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List
+
+from src.server.services.archive.zip_stream import ZipEntry, stream_zip
+
+# Peak memory growth from the smallest to the largest bundle tolerated as flat, in chunks
+_TOLERATED_CHUNKS = 2
+
+
+def _synthetic_stem(name: str, size: int, chunk: bytes) -> ZipEntry:
+    """
+    Build a stem whose content is the same chunk repeated.
+
+    Parameters:
+        name (str): Path of the stem inside the archive
+        size (int): Stem size in bytes
+        chunk (bytes): Preallocated content chunk
+
+    Returns:
+        ZipEntry: The stem
+    """
+    async def read() -> AsyncIterator[bytes]:
+        view = memoryview(chunk)
+        for offset in range(0, size, len(chunk)):
+            yield view[:min(len(chunk), size - offset)]
+
+    return ZipEntry(name=name, size=size, modified=datetime.now(timezone.utc), read=read)
+
+
+async def _measure(stems: int, size: int, chunk: bytes) -> Dict[str, Any]:
+    """
+    Stream one bundle and measure its peak traced memory.
+
+    Parameters:
+        stems (int): Number of stems in the bundle
+        size (int): Size of every stem in bytes
+        chunk (bytes): Preallocated content chunk
+
+    Returns:
+        Dict[str, Any]: Measurements of the run
+    """
+    entries = [_synthetic_stem(f"result/stem{index}.flac", size, chunk) for index in range(stems)]
+
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    archive_bytes = 0
+    async for data in stream_zip(entries):
+        archive_bytes += len(data)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+
+    return {
+        "stem_mib": size // 1024 ** 2,
+        "stems": stems,
+        "archive_bytes": archive_bytes,
+        "peak_traced_kib": round((peak - baseline) / 1024, 1),
+        "seconds": round(elapsed, 3),
+        "mib_per_second": round(archive_bytes / 1024 ** 2 / max(elapsed, 1e-9), 1),
+    }
+
+
+def main() -> None:
+    """Parse arguments, stream a bundle per stem size and print the measurements as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes-mib", default="16,256,1024", help="Comma-separated stem sizes in MiB")
+    parser.add_argument("--stems", type=int, default=4, help="Number of stems per bundle")
+    parser.add_argument("--chunk-kib", type=int, default=1024, help="Size of the chunks stems are read in")
+    args = parser.parse_args()
+
+    chunk = bytes(range(256)) * (args.chunk_kib * 4)
+    sizes = sorted(int(size) * 1024 ** 2 for size in args.sizes_mib.split(","))
+
+    tracemalloc.start()
+    runs: List[Dict[str, Any]] = [asyncio.run(_measure(args.stems, size, chunk)) for size in sizes]
+    tracemalloc.stop()
+
+    growth_kib = runs[-1]["peak_traced_kib"] - runs[0]["peak_traced_kib"]
+    flat = growth_kib <= _TOLERATED_CHUNKS * args.chunk_kib
+    print(json.dumps({"runs": runs, "peak_growth_kib": round(growth_kib, 1), "flat": flat}, indent=2))
+    sys.exit(0 if flat else 1)
+
+
+if __name__ == "__main__":
+    main()
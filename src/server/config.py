@@ -1,11 +1,16 @@
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from dotenv import load_dotenv
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
+from src.server.enums.audio import AudioFormatEnum
+from src.server.enums.cache import ResultCacheBackendEnum
+from src.server.enums.logging import LoggingLevelsEnum
+from src.server.enums.models import SeparationModelEnum
+
 load_dotenv()
 
 
@@ -76,12 +81,178 @@ class Settings(BaseSettings):
     S3_BUCKET: str
     """Default bucket name for S3 operations."""
 
+    S3_PUBLIC_ENDPOINT_URL: Optional[str] = None
+    """Endpoint URL clients reach the storage at, used in the presigned URLs handed out by the API. Defaults to S3_ENDPOINT_URL."""
+
+    S3_PRESIGNED_URL_EXPIRES: int = 3600
+    """Seconds the presigned download and upload URLs handed out by the API stay valid. Defaults to 1 hour."""
+
+    S3_MAX_WORKERS: int = 16
+    """Size of the thread pool running blocking S3 calls off the event loop. Defaults to 16."""
+
+    S3_DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024
+    """Size of the chunks streamed to clients from S3 downloads in bytes. Defaults to 1 MiB."""
+
+    S3_MULTIPART_THRESHOLD: int = 8 * 1024 ** 2
+    """Size above which stems are uploaded as multipart uploads in bytes. Defaults to 8 MiB."""
+
+    S3_MULTIPART_CHUNKSIZE: int = 8 * 1024 ** 2
+    """Size of each part of a multipart upload in bytes. Defaults to 8 MiB."""
+
+    S3_MAX_CONCURRENCY: int = 10
+    """Number of parts of a single multipart upload sent concurrently. Defaults to 10."""
+
+    S3_MAX_POOL_CONNECTIONS: int = 50
+    """Maximum number of pooled HTTP connections of the S3 client. Defaults to 50."""
+
+    S3_MAX_ATTEMPTS: int = 5
+    """Attempts per S3 request, including each multipart part, before it fails. Defaults to 5."""
+
+    S3_UPLOAD_ATTEMPTS: int = 3
+    """Attempts to upload a whole stem before reporting it as failed. Defaults to 3."""
+
+    S3_INPUT_URL_EXPIRES: int = 6 * 3600
+    """Seconds a presigned URL given to separator workers to read an S3 input stays valid. Defaults to 6 hours."""
+
+    S3_HEALTHCHECK_INTERVAL: float = 10.0
+    """Seconds between background checks of the S3 connection. Defaults to 10.0."""
+
+    S3_CIRCUIT_FAILURE_THRESHOLD: int = 3
+    """Consecutive failed S3 connection checks after which requests needing S3 are rejected. Defaults to 3."""
+
+    S3_CIRCUIT_RESET_TIMEOUT: float = 30.0
+    """Seconds requests are rejected before the S3 connection is checked again. Defaults to 30.0."""
+
+    # Upload settings
+    MAX_UPLOAD_SIZE: int = 200 * 1024 ** 2
+    """Maximum size of an upload request in bytes, enforced while streaming. Defaults to 200 MiB."""
+
+    UPLOAD_SPOOL_DIR: Optional[Path] = None
+    """Directory where uploads are spooled to disk. Defaults to APP_FILES_PATH / "spool"."""
+
+    # Separation settings
+    SEPARATOR_POOL_SIZE: int = 2
+    """Number of separator worker processes kept warm. 0 falls back to the spleeter CLI. Defaults to 2."""
+
+    SEPARATOR_MODELS: List[SeparationModelEnum] = [SeparationModelEnum.TWO_STEMS]
+    """Spleeter models every worker keeps warm from startup on (parsed from JSON string). Defaults to ["2stems"]."""
+
+    SEPARATOR_DEFAULT_MODEL: SeparationModelEnum = SeparationModelEnum.TWO_STEMS
+    """Spleeter model of jobs that do not choose one. Defaults to "2stems"."""
+
+    SEPARATOR_MODEL_PATH: Optional[Path] = None
+    """Directory with the pretrained weights, one subdirectory per model. Defaults to APP_FILES_PATH / "pretrained_models"."""
+
+    SEPARATOR_MODEL_MEMORY_BUDGET: int = 4 * 1024 ** 3
+    """Memory the models of one worker may use before idle models are evicted, in bytes. Defaults to 4 GiB."""
+
+    SEPARATOR_HEALTHCHECK_INTERVAL: float = 5.0
+    """Seconds between separator worker liveness checks. Defaults to 5.0."""
+
+    SEGMENT_MIN_DURATION: float = 600.0
+    """Tracks longer than this many seconds are separated in overlapping windows. Defaults to 600.0."""
+
+    SEGMENT_WINDOW_SECONDS: float = 60.0
+    """Length of each separation window in seconds. Defaults to 60.0."""
+
+    SEGMENT_OVERLAP_SECONDS: float = 2.0
+    """Crossfaded overlap between consecutive windows in seconds. Defaults to 2.0."""
+
+    SEGMENT_PARALLELISM: int = 4
+    """Maximum number of windows of one track separated at once. Defaults to 4."""
+
+    STREAM_SEGMENT_SECONDS: float = 0.0
+    """Length of HLS segments published while separating, 0 disables streaming. Enabling it forces windowed separation for every track longer than one window. Defaults to 0.0."""
+
+    STREAM_BITRATE: str = "128k"
+    """AAC bitrate of the streamed HLS segments. Defaults to "128k"."""
+
+    # Batch settings
+    BATCH_MAX_ITEMS: int = 500
+    """Maximum number of uploads and S3 inputs in one batch request. Defaults to 500."""
+
+    BATCH_MAX_UPLOAD_SIZE: int = 4 * 1024 ** 3
+    """Maximum size of a batch request in bytes, enforced while streaming. Defaults to 4 GiB."""
+
+    BATCH_PARALLELISM: int = 8
+    """Maximum number of items of one batch processed at once. Defaults to 8."""
+
+    BATCH_PACK_SECONDS: float = 300.0
+    """Maximum summed duration of short tracks separated together in one model run, 0 disables packing. Defaults to 300.0."""
+
+    # Download settings
+    DOWNLOAD_DEFAULT_FORMAT: AudioFormatEnum = AudioFormatEnum.MP3
+    """Format of stems downloaded without a format or file extension. Defaults to "mp3"."""
+
+    DOWNLOAD_DEFAULT_BITRATE: str = "192k"
+    """Bitrate of lossy stem downloads that do not request one. Defaults to "192k"."""
+
+    DOWNLOAD_CACHE_MAX_AGE: int = 7 * 24 * 3600
+    """Seconds clients and shared caches may reuse a downloaded stem without revalidating it. Defaults to 7 days."""
+
+    # Job queue settings
+    JOB_MAX_CONCURRENCY: int = 2
+    """Maximum number of separation jobs running at once. Defaults to 2."""
+
+    JOB_QUEUE_MAX_SIZE: int = 50
+    """Maximum number of queued jobs before new submissions are rejected with 429. Defaults to 50."""
+
+    JOB_STORE_PATH: Optional[Path] = None
+    """SQLite file of the persistent job queue. Defaults to APP_FILES_PATH / "jobs.sqlite3"."""
+
+    JOB_RETRY_AFTER_SECONDS: int = 30
+    """Retry-After value sent with 429 responses when the job queue is full. Defaults to 30."""
+
+    JOB_RETENTION_SECONDS: float = 24 * 60 * 60
+    """How long finished jobs and their replayable events are kept. Defaults to 1 day."""
+
+    JOB_DISCONNECT_GRACE_SECONDS: float = 60.0
+    """Seconds a job whose streaming client disconnected keeps running for the client to resume its events, 0 cancels it at once. Defaults to 60.0."""
+
+    PROGRESS_MIN_INTERVAL: float = 1.0
+    """Minimum seconds between two separation progress events of a job. Defaults to 1.0."""
+
+    # Result cache settings
+    RESULT_CACHE_BACKEND: ResultCacheBackendEnum = ResultCacheBackendEnum.MEMORY
+    """Index backend of the separation result cache: "none", "memory" or "sqlite". Defaults to "memory"."""
+
+    RESULT_CACHE_PATH: Optional[Path] = None
+    """SQLite file of the result cache index. Defaults to APP_FILES_PATH / "result_cache.sqlite3"."""
+
+    RESULT_CACHE_MAX_BYTES: int = 10 * 1024 ** 3
+    """Total size of cached stems before least recently used results are evicted. Defaults to 10 GiB."""
+
+    RESULT_CACHE_PCM_HASH: bool = False
+    """Key the cache on a hash of the decoded samples, so re-muxes and lossless conversions also match. Defaults to False."""
+
+    # Logging settings
+    LOG_LEVEL: LoggingLevelsEnum = LoggingLevelsEnum.INFO
+    """Level of the root logger, overriding logger.ini; messages below it are not even formatted. Defaults to "info"."""
+
+    LOG_SUBPROCESS_LINES_PER_SECOND: float = 5.0
+    """Lines per second of spleeter CLI output written to the log, the rest is counted and dropped. Defaults to 5.0."""
+
+    LOG_SUBPROCESS_BURST: int = 50
+    """Lines of spleeter CLI output written back to back before rate limiting starts. Defaults to 50."""
+
+    # Metrics settings
+    METRICS_ENABLED: bool = True
+    """Expose the pipeline metrics at /metrics for Prometheus. Defaults to True."""
+
+    # Tracing settings
+    TRACE_EXPORT_PATH: Optional[Path] = None
+    """File the spans of requests and jobs are appended to as OTLP JSON lines; tracing is off if not set. Defaults to None."""
+
+    TRACE_SERVICE_NAME: str = "music-annihilator"
+    """Service name the spans are reported under. Defaults to "music-annihilator"."""
+
     @field_validator(
         "CONTACT",
         "LICENSE_INFO",
         "ALLOW_ORIGINS",
         "ALLOW_METHODS",
         "ALLOW_HEADERS",
+        "SEPARATOR_MODELS",
         mode="before",
     )
     def parse_json(cls, value: Any) -> Any:
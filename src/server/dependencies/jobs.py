@@ -0,0 +1,170 @@
+from typing import Any, AsyncIterator, Callable, Coroutine, Dict, Optional, Union
+
+from fastapi import Depends
+
+from src.server.annihilator.packing import SeparationPacker
+from src.server.annihilator.progress_tracker import ProgressTracker
+from src.server.annihilator.separator_pool import SeparatorPool
+from src.server.annihilator.spleeter import Spleeter
+from src.server.annihilator.throughput import ThroughputEstimator
+from src.server.config import Settings
+from src.server.dependencies.result_cache import get_result_cache
+from src.server.dependencies.s3 import get_async_s3_service, get_s3_client
+from src.server.dependencies.separator import get_segmented_separator, get_separator_pool
+from src.server.dependencies.settings import get_settings
+from src.server.logger import logger
+from src.server.schemas.annihilator_sse import ProgressSSESchema
+from src.server.services.jobs.batch import BatchProcessor
+from src.server.services.jobs.scheduler import JobRunner, JobScheduler
+from src.server.services.jobs.store import JobRecord, JobStore
+from src.server.services.transcoding.transcoder import MASTER_FORMAT
+
+# Global job scheduler instance with lazy initialization
+_job_scheduler: Optional[JobScheduler] = None
+
+# Separation speed shared by all jobs, used to estimate progress and ETA
+_throughput = ThroughputEstimator()
+
+
+def _create_job_runner(settings: Settings) -> JobRunner:
+    """
+    Create the function that separates one job and uploads a lossless master of each stem.
+
+    Jobs run outside of any request, so the services are resolved here from settings
+    with the same dependency functions the routers use. Batch jobs run their items
+    through a batch processor, packing short tracks into shared worker jobs.
+
+    Parameters:
+        settings (Settings): Application settings.
+
+    Returns:
+        JobRunner: Coroutine generator yielding the progress events of a job.
+    """
+
+    async def run_job(job: JobRecord, progress_tracker: ProgressTracker) -> AsyncIterator[ProgressSSESchema]:
+        s3_client = get_s3_client(get_settings)(settings)
+        s3_service = get_async_s3_service(get_settings)(settings, s3_client)
+        separator_pool = get_separator_pool(get_settings)(settings)
+        segmenter = get_segmented_separator(get_settings)(settings, separator_pool)
+        result_cache = get_result_cache(get_settings)(settings, s3_client)
+
+        def create_spleeter(
+            options: Dict[str, Any],
+            tracker: ProgressTracker,
+            separator: Optional[Union[SeparatorPool, SeparationPacker]] = separator_pool,
+            stream_segment_seconds: float = settings.STREAM_SEGMENT_SECONDS,
+        ) -> Spleeter:
+            return Spleeter(
+                s3_service=s3_service,
+                separator_pool=separator,
+                segmenter=segmenter,
+                result_cache=result_cache,
+                model=options.get("model", settings.SEPARATOR_DEFAULT_MODEL.value),
+                codec=MASTER_FORMAT.value,
+                progress_tracker=tracker,
+                throughput=_throughput,
+                stream_segment_seconds=stream_segment_seconds,
+                stream_bitrate=settings.STREAM_BITRATE,
+                stems=options.get("stems"),
+                input_url_expires=settings.S3_INPUT_URL_EXPIRES,
+                output_log_rate=settings.LOG_SUBPROCESS_LINES_PER_SECOND,
+                output_log_burst=settings.LOG_SUBPROCESS_BURST,
+            )
+
+        if "items" in job.options:
+            packer = None
+            if separator_pool is not None and settings.BATCH_PACK_SECONDS > 0:
+                packer = SeparationPacker(separator_pool, max_seconds=settings.BATCH_PACK_SECONDS, logger=logger)
+
+            batch_processor = BatchProcessor(
+                # Batch items are not streamed for playback
+                create_spleeter=lambda item, tracker: create_spleeter(
+                    item, tracker, separator=packer or separator_pool, stream_segment_seconds=0.0,
+                ),
+                parallelism=settings.BATCH_PARALLELISM,
+                s3_output_prefix="processed/",
+                progress_min_interval=settings.PROGRESS_MIN_INTERVAL,
+                logger=logger,
+            )
+            async for event in batch_processor.process(job, progress_tracker):
+                yield event
+            return
+
+        spleeter = create_spleeter(job.options, progress_tracker)
+        async for event in spleeter.separate_with_progress(
+            input_path=job.input_path,
+            filename=job.job_id,
+            s3_output_prefix="processed/",
+            s3_input_key=job.options.get("s3_key"),
+        ):
+            yield event
+
+    return run_job
+
+
+def start_job_scheduler(settings: Settings) -> JobScheduler:
+    """
+    Start the global job scheduler if it is not running yet.
+
+    Must be called from the event loop. Jobs left queued or running by a previous
+    run of the service are resumed.
+
+    Parameters:
+        settings (Settings): Application settings containing job queue configuration.
+
+    Returns:
+        JobScheduler: The running scheduler.
+    """
+    global _job_scheduler
+
+    if _job_scheduler is None:
+        path = settings.JOB_STORE_PATH or settings.APP_FILES_PATH / "jobs.sqlite3"
+        logger.info("Using job store at %s", path)
+        _job_scheduler = JobScheduler(
+            store=JobStore(path),
+            runner=_create_job_runner(settings),
+            max_concurrency=settings.JOB_MAX_CONCURRENCY,
+            max_queue_size=settings.JOB_QUEUE_MAX_SIZE,
+            retention_seconds=settings.JOB_RETENTION_SECONDS,
+            progress_min_interval=settings.PROGRESS_MIN_INTERVAL,
+            disconnect_grace_seconds=settings.JOB_DISCONNECT_GRACE_SECONDS,
+            logger=logger,
+        )
+
+    _job_scheduler.start()
+    return _job_scheduler
+
+
+async def stop_job_scheduler() -> None:
+    """Stop the global job scheduler. Running jobs are resumed on the next start."""
+    if _job_scheduler is not None:
+        await _job_scheduler.stop()
+
+
+def get_job_scheduler(get_settings) -> Callable[[Settings], Coroutine[Any, Any, JobScheduler]]:
+    """
+    Factory function to create a dependency for obtaining the job scheduler.
+
+    The scheduler is normally started with the application, but is started lazily here
+    if it is not running yet.
+
+    Parameters:
+        get_settings: Dependency function to retrieve application settings.
+
+    Returns:
+        A FastAPI dependency function that yields the running job scheduler.
+    """
+
+    async def _get_job_scheduler(settings: Settings = Depends(get_settings)) -> JobScheduler:
+        """
+        Inner dependency function that returns the running job scheduler.
+
+        Parameters:
+            settings (Settings): Application settings containing job queue configuration.
+
+        Returns:
+            JobScheduler: The running scheduler.
+        """
+        return start_job_scheduler(settings)
+
+    return _get_job_scheduler
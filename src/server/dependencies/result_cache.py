@@ -0,0 +1,84 @@
+from typing import Callable, Optional
+
+from botocore.client import BaseClient  # type: ignore[import-untyped]
+from fastapi import Depends
+
+from src.server.config import Settings
+from src.server.dependencies.s3 import get_s3_client
+from src.server.enums.cache import ResultCacheBackendEnum
+from src.server.logger import logger
+from src.server.services.cache.result_cache import ResultCache
+from src.server.services.cache.store import (
+    MemoryResultCacheStore,
+    ResultCacheStore,
+    SQLiteResultCacheStore,
+)
+
+# Global result cache instance with lazy initialization
+_result_cache: Optional[ResultCache] = None
+
+
+def _create_store(settings: Settings) -> ResultCacheStore:
+    """
+    Create the result cache index backend selected in settings.
+
+    Parameters:
+        settings (Settings): Application settings containing cache configuration.
+
+    Returns:
+        ResultCacheStore: Configured index backend.
+    """
+    if settings.RESULT_CACHE_BACKEND is ResultCacheBackendEnum.SQLITE:
+        path = settings.RESULT_CACHE_PATH or settings.APP_FILES_PATH / "result_cache.sqlite3"
+        logger.info("Using SQLite result cache index at %s", path)
+        return SQLiteResultCacheStore(path)
+
+    logger.info("Using in-memory result cache index")
+    return MemoryResultCacheStore()
+
+
+def get_result_cache(get_settings) -> Callable[[Settings, BaseClient], Optional[ResultCache]]:
+    """
+    Factory function to create a dependency for obtaining the result cache.
+
+    Parameters:
+        get_settings: Dependency function to retrieve application settings.
+
+    Returns:
+        A FastAPI dependency function that yields the result cache, or None if caching is disabled.
+    """
+
+    def _get_result_cache(
+        settings: Settings = Depends(get_settings),
+        s3: BaseClient = Depends(get_s3_client(get_settings)),
+    ) -> Optional[ResultCache]:
+        """
+        Inner dependency function that manages the result cache lifecycle.
+
+        Parameters:
+            settings (Settings): Application settings containing cache configuration.
+            s3 (BaseClient): Authenticated S3 client.
+
+        Returns:
+            Optional[ResultCache]: Shared result cache, or None if caching is disabled.
+        """
+        global _result_cache
+
+        if settings.RESULT_CACHE_BACKEND is ResultCacheBackendEnum.NONE:
+            return None
+
+        if _result_cache is None:
+            _result_cache = ResultCache(
+                store=_create_store(settings),
+                s3_client=s3,
+                s3_bucket=settings.S3_BUCKET,
+                max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+                use_pcm_hash=settings.RESULT_CACHE_PCM_HASH,
+                logger=logger,
+            )
+
+        # Keep the client current after S3 reconnects
+        _result_cache.s3_client = s3
+        return _result_cache
+
+    return _get_result_cache
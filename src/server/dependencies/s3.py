@@ -1,15 +1,45 @@
-from typing import Callable
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 
+from boto3.s3.transfer import TransferConfig  # type: ignore[import-untyped]
 from botocore.client import BaseClient  # type: ignore[import-untyped]
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
 
 from src.server.config import Settings
 from src.server.logger import logger
+from src.server.services.s3.async_service import AsyncS3Service
 from src.server.services.s3.client import S3Client
+from src.server.services.s3.health import S3HealthMonitor
 
 # Global S3 client instance with lazy initialization
 _s3_client = S3Client(logger=logger)
 
+# Global S3 connection monitor, started with the application
+_s3_health = S3HealthMonitor(_s3_client, logger=logger)
+
+# Global bounded thread pool for blocking S3 calls with lazy initialization
+_s3_executor: Optional[ThreadPoolExecutor] = None
+
+
+def start_s3_health_monitor(settings: Settings) -> S3HealthMonitor:
+    """
+    Start checking the global S3 client's connection in the background if not running yet.
+
+    Parameters:
+        settings (Settings): Application settings containing S3 configuration.
+
+    Returns:
+        S3HealthMonitor: The running monitor.
+    """
+    _s3_health.start(settings)
+    return _s3_health
+
+
+def stop_s3_health_monitor() -> None:
+    """Stop checking the S3 connection."""
+    _s3_health.stop()
+
 
 def get_s3_client(get_settings) -> Callable[[Settings], BaseClient]:
     """
@@ -17,7 +47,9 @@ def get_s3_client(get_settings) -> Callable[[Settings], BaseClient]:
 
     This function returns a dependency that provides a configured and authenticated
     S3 client instance. The client is initialized lazily and maintains a single
-    global instance with automatic reconnection capabilities.
+    global instance. Its connection is not checked here: the health monitor checks
+    it in the background and reconnects it, and requests are rejected while the
+    monitor's circuit is open.
 
     Parameters:
         get_settings: Dependency function to retrieve application settings.
@@ -38,14 +70,73 @@ def get_s3_client(get_settings) -> Callable[[Settings], BaseClient]:
 
         Raises:
             RuntimeError: If S3 client initialization fails.
+            HTTPException: 503 if S3 has been unreachable for the last health checks.
         """
         global _s3_client
 
         if not _s3_client.is_initialized:
             _s3_client.initialize(settings)
-        else:
-            _s3_client.reconnect_if_needed()
+        elif not _s3_health.is_available:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="S3 storage is unavailable",
+                headers={"Retry-After": str(math.ceil(settings.S3_CIRCUIT_RESET_TIMEOUT))},
+            )
 
         return _s3_client.get_client()
 
     return _get_s3_client
+
+
+def get_async_s3_service(get_settings) -> Callable[[Settings, BaseClient], AsyncS3Service]:
+    """
+    Factory function to create a dependency for obtaining the non-blocking S3 service.
+
+    All services share one bounded thread pool, so the number of concurrent S3 calls
+    is capped for the whole process.
+
+    Parameters:
+        get_settings: Dependency function to retrieve application settings.
+
+    Returns:
+        A FastAPI dependency function that yields an AsyncS3Service.
+    """
+
+    def _get_async_s3_service(
+        settings: Settings = Depends(get_settings),
+        s3: BaseClient = Depends(get_s3_client(get_settings)),
+    ) -> AsyncS3Service:
+        """
+        Inner dependency function that wraps the S3 client with the shared thread pool.
+
+        Parameters:
+            settings (Settings): Application settings containing S3 configuration.
+            s3 (BaseClient): Authenticated S3 client.
+
+        Returns:
+            AsyncS3Service: Service running S3 calls off the event loop.
+        """
+        global _s3_executor
+
+        if _s3_executor is None:
+            _s3_executor = ThreadPoolExecutor(
+                max_workers=settings.S3_MAX_WORKERS,
+                thread_name_prefix="s3",
+            )
+
+        return AsyncS3Service(
+            s3_client=s3,
+            s3_bucket=settings.S3_BUCKET,
+            executor=_s3_executor,
+            download_chunk_size=settings.S3_DOWNLOAD_CHUNK_SIZE,
+            logger=logger,
+            transfer_config=TransferConfig(
+                multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+                multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+                max_concurrency=settings.S3_MAX_CONCURRENCY,
+            ),
+            max_attempts=settings.S3_UPLOAD_ATTEMPTS,
+            presign_client=_s3_client.get_presign_client(),
+        )
+
+    return _get_async_s3_service
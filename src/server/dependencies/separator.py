@@ -0,0 +1,146 @@
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+from fastapi import Depends
+
+from src.server.annihilator.segmenter import SegmentedSeparator
+from src.server.annihilator.separator_pool import SeparatorPool
+from src.server.config import Settings
+from src.server.logger import logger
+
+# Global separator pool instance with lazy initialization
+_separator_pool = SeparatorPool(logger=logger)
+
+
+def get_model_path(settings: Settings) -> Path:
+    """
+    Resolve the directory with the pretrained model weights.
+
+    Parameters:
+        settings (Settings): Application settings containing separator configuration.
+
+    Returns:
+        Path: Directory with one subdirectory of weights per model.
+    """
+    return settings.SEPARATOR_MODEL_PATH or settings.APP_FILES_PATH / "pretrained_models"
+
+
+def start_separator_pool(settings: Settings) -> Optional[SeparatorPool]:
+    """
+    Start the global separator pool if it is enabled and not running yet.
+
+    Parameters:
+        settings (Settings): Application settings containing separator configuration.
+
+    Returns:
+        Optional[SeparatorPool]: The running pool, or None if the pool is disabled.
+    """
+    if settings.SEPARATOR_POOL_SIZE < 1:
+        # The spleeter CLI inherits the environment, point it at the local weights as well
+        os.environ.setdefault("MODEL_PATH", str(get_model_path(settings)))
+        return None
+
+    if not _separator_pool.is_initialized:
+        _separator_pool.initialize(
+            size=settings.SEPARATOR_POOL_SIZE,
+            models=[model.value for model in settings.SEPARATOR_MODELS],
+            model_path=get_model_path(settings),
+            memory_budget=settings.SEPARATOR_MODEL_MEMORY_BUDGET,
+            healthcheck_interval=settings.SEPARATOR_HEALTHCHECK_INTERVAL,
+        )
+
+    return _separator_pool
+
+
+def stop_separator_pool() -> None:
+    """Stop the global separator pool and its worker processes."""
+    _separator_pool.shutdown()
+
+
+def set_separator_pool(separator_pool: SeparatorPool) -> None:
+    """
+    Replace the global separator pool with another separation backend.
+
+    Must be called before the pool is first used. The replacement is started and used
+    like the default pool, so SEPARATOR_POOL_SIZE must be positive. Benchmarks use this
+    to run the service with a backend that separates without the models.
+
+    Parameters:
+        separator_pool (SeparatorPool): Pool to use for all separations.
+    """
+    global _separator_pool
+
+    _separator_pool = separator_pool
+
+
+def get_separator_pool(get_settings) -> Callable[[Settings], Optional[SeparatorPool]]:
+    """
+    Factory function to create a dependency for obtaining the separator pool.
+
+    The pool is normally started with the application, but is started lazily here
+    if it is not running yet.
+
+    Parameters:
+        get_settings: Dependency function to retrieve application settings.
+
+    Returns:
+        A FastAPI dependency function that yields the separator pool, or None if disabled.
+    """
+
+    def _get_separator_pool(settings: Settings = Depends(get_settings)) -> Optional[SeparatorPool]:
+        """
+        Inner dependency function that returns the running separator pool.
+
+        Parameters:
+            settings (Settings): Application settings containing separator configuration.
+
+        Returns:
+            Optional[SeparatorPool]: The running pool, or None if the pool is disabled.
+        """
+        return start_separator_pool(settings)
+
+    return _get_separator_pool
+
+
+def get_segmented_separator(get_settings) -> Callable[[Settings], Optional[SegmentedSeparator]]:
+    """
+    Factory function to create a dependency for obtaining a segmented separator.
+
+    Segmented separation runs windows on the separator pool, so it is only available
+    when the pool is enabled.
+
+    Parameters:
+        get_settings: Dependency function to retrieve application settings.
+
+    Returns:
+        A FastAPI dependency function that yields a segmented separator, or None if disabled.
+    """
+
+    def _get_segmented_separator(
+        settings: Settings = Depends(get_settings),
+        separator_pool: Optional[SeparatorPool] = Depends(get_separator_pool(get_settings)),
+    ) -> Optional[SegmentedSeparator]:
+        """
+        Inner dependency function that configures a segmented separator from settings.
+
+        Parameters:
+            settings (Settings): Application settings containing segmentation configuration.
+            separator_pool (SeparatorPool, optional): Running separator pool.
+
+        Returns:
+            Optional[SegmentedSeparator]: Configured separator, or None if the pool is disabled.
+        """
+        if separator_pool is None:
+            return None
+
+        return SegmentedSeparator(
+            separator_pool=separator_pool,
+            window_seconds=settings.SEGMENT_WINDOW_SECONDS,
+            overlap_seconds=settings.SEGMENT_OVERLAP_SECONDS,
+            parallelism=settings.SEGMENT_PARALLELISM,
+            min_duration=settings.SEGMENT_MIN_DURATION,
+            logger=logger,
+        )
+
+    return _get_segmented_separator
@@ -1,12 +1,16 @@
+from functools import lru_cache
+
 from src.server.config import Settings
 
 
+@lru_cache
 def get_settings() -> Settings:
     """
     Dependency function to retrieve application settings.
 
     This function provides a FastAPI dependency that returns a singleton instance
-    of the application settings.
+    of the application settings. The environment and .env files are read on the
+    first call only, later calls return the cached instance.
 
     Returns:
         Settings: An instance of the application Settings class containing all
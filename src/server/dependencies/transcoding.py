@@ -0,0 +1,51 @@
+from typing import Callable, Optional
+
+from fastapi import Depends
+
+from src.server.config import Settings
+from src.server.dependencies.result_cache import get_result_cache
+from src.server.dependencies.s3 import get_async_s3_service
+from src.server.logger import logger
+from src.server.services.cache.result_cache import ResultCache
+from src.server.services.s3.async_service import AsyncS3Service
+from src.server.services.transcoding.transcoder import StemTranscoder
+
+# Global stem transcoder instance with lazy initialization, shared so concurrent requests share transcodes
+_stem_transcoder: Optional[StemTranscoder] = None
+
+
+def get_stem_transcoder(get_settings) -> Callable[[AsyncS3Service, Optional[ResultCache]], StemTranscoder]:
+    """
+    Factory function to create a dependency for obtaining the stem transcoder.
+
+    Parameters:
+        get_settings: Dependency function to retrieve application settings.
+
+    Returns:
+        A FastAPI dependency function that yields the shared stem transcoder.
+    """
+
+    def _get_stem_transcoder(
+        s3_service: AsyncS3Service = Depends(get_async_s3_service(get_settings)),
+        result_cache: Optional[ResultCache] = Depends(get_result_cache(get_settings)),
+    ) -> StemTranscoder:
+        """
+        Inner dependency function that manages the stem transcoder lifecycle.
+
+        Parameters:
+            s3_service (AsyncS3Service): Non-blocking S3 service.
+            result_cache (Optional[ResultCache]): Result cache counting the stored variants, None if disabled.
+
+        Returns:
+            StemTranscoder: Shared stem transcoder.
+        """
+        global _stem_transcoder
+
+        if _stem_transcoder is None:
+            _stem_transcoder = StemTranscoder(s3_service=s3_service, result_cache=result_cache, logger=logger)
+
+        # Keep the client current after S3 reconnects
+        _stem_transcoder.s3_service = s3_service
+        return _stem_transcoder
+
+    return _get_stem_transcoder
@@ -0,0 +1,67 @@
+from typing import Callable
+
+from fastapi import Depends
+
+from src.server.config import Settings
+from src.server.logger import logger
+from src.server.services.upload.spooler import UploadSpooler
+
+
+def get_upload_spooler(get_settings) -> Callable[[Settings], UploadSpooler]:
+    """
+    Factory function to create a dependency for obtaining an upload spooler.
+
+    Parameters:
+        get_settings: Dependency function to retrieve application settings.
+
+    Returns:
+        A FastAPI dependency function that yields an upload spooler configured from settings.
+    """
+
+    def _get_upload_spooler(settings: Settings = Depends(get_settings)) -> UploadSpooler:
+        """
+        Inner dependency function that configures the upload spooler.
+
+        Parameters:
+            settings (Settings): Application settings containing upload configuration.
+
+        Returns:
+            UploadSpooler: Spooler writing uploads to the configured spool directory.
+        """
+        return UploadSpooler(
+            spool_dir=settings.UPLOAD_SPOOL_DIR or settings.APP_FILES_PATH / "spool",
+            max_bytes=settings.MAX_UPLOAD_SIZE,
+            logger=logger,
+        )
+
+    return _get_upload_spooler
+
+
+def get_batch_upload_spooler(get_settings) -> Callable[[Settings], UploadSpooler]:
+    """
+    Factory function to create a dependency for obtaining an upload spooler for batch requests.
+
+    Parameters:
+        get_settings: Dependency function to retrieve application settings.
+
+    Returns:
+        A FastAPI dependency function that yields an upload spooler accepting batch-sized requests.
+    """
+
+    def _get_batch_upload_spooler(settings: Settings = Depends(get_settings)) -> UploadSpooler:
+        """
+        Inner dependency function that configures the batch upload spooler.
+
+        Parameters:
+            settings (Settings): Application settings containing upload configuration.
+
+        Returns:
+            UploadSpooler: Spooler writing batch uploads to the configured spool directory.
+        """
+        return UploadSpooler(
+            spool_dir=settings.UPLOAD_SPOOL_DIR or settings.APP_FILES_PATH / "spool",
+            max_bytes=settings.BATCH_MAX_UPLOAD_SIZE,
+            logger=logger,
+        )
+
+    return _get_batch_upload_spooler
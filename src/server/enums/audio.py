@@ -0,0 +1,55 @@
+from enum import Enum
+
+
+class AudioFormatEnum(Enum):
+    """
+    Enumeration of audio formats stems can be stored and downloaded in.
+
+    Parameters:
+        MP3: MPEG-1 Layer III, lossy
+        OGG: Ogg Vorbis, lossy
+        M4A: AAC in an MPEG-4 container, lossy
+        FLAC: Free Lossless Audio Codec, used for the separation masters
+        WAV: Uncompressed PCM
+    """
+
+    MP3 = "mp3"
+    OGG = "ogg"
+    M4A = "m4a"
+    FLAC = "flac"
+    WAV = "wav"
+
+    @property
+    def is_lossless(self) -> bool:
+        """
+        Whether the format keeps the audio bit-exact, so a bitrate does not apply.
+
+        Returns:
+            bool: True for FLAC and WAV
+        """
+        return self in (AudioFormatEnum.FLAC, AudioFormatEnum.WAV)
+
+    @property
+    def media_type(self) -> str:
+        """
+        MIME type of files in this format.
+
+        Returns:
+            str: Media type for Content-Type headers
+        """
+        return {
+            AudioFormatEnum.MP3: "audio/mpeg",
+            AudioFormatEnum.OGG: "audio/ogg",
+            AudioFormatEnum.M4A: "audio/mp4",
+            AudioFormatEnum.FLAC: "audio/flac",
+            AudioFormatEnum.WAV: "audio/wav",
+        }[self]
+
+    def __repr__(self) -> str:
+        """
+        Returns the string representation of the format.
+
+        Returns:
+            str: The string value of the enum member.
+        """
+        return self.value
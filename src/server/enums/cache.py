@@ -0,0 +1,25 @@
+from enum import Enum
+
+
+class ResultCacheBackendEnum(Enum):
+    """
+    Enumeration of storage backends for the separation result cache index.
+
+    Parameters:
+        NONE: Result caching is disabled
+        MEMORY: In-process LRU index, lost on restart
+        SQLITE: SQLite file index, shared between processes and kept across restarts
+    """
+
+    NONE = "none"
+    MEMORY = "memory"
+    SQLITE = "sqlite"
+
+    def __repr__(self) -> str:
+        """
+        Returns the string representation of the backend.
+
+        Returns:
+            str: The string value of the enum member.
+        """
+        return self.value
@@ -0,0 +1,25 @@
+from enum import Enum
+
+
+class CircuitStateEnum(Enum):
+    """
+    Enumeration of the states of a circuit breaker guarding an external service.
+
+    Parameters:
+        CLOSED: The service is healthy and requests are let through
+        OPEN: The service failed repeatedly and requests are rejected
+        HALF_OPEN: A trial check decides whether the service has recovered
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __repr__(self) -> str:
+        """
+        Returns the string representation of the circuit state.
+
+        Returns:
+            str: The string value of the enum member.
+        """
+        return self.value
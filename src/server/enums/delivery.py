@@ -0,0 +1,25 @@
+from enum import Enum
+
+
+class DeliveryEnum(Enum):
+    """
+    Enumeration of the ways a stored file is delivered to a client.
+
+    Parameters:
+        PROXY: The API streams the file from the storage to the client
+        REDIRECT: The API redirects the client to a presigned URL of the file
+        URL: The API returns a presigned URL of the file as JSON
+    """
+
+    PROXY = "proxy"
+    REDIRECT = "redirect"
+    URL = "url"
+
+    def __repr__(self) -> str:
+        """
+        Returns the string representation of the delivery mode.
+
+        Returns:
+            str: The string value of the enum member.
+        """
+        return self.value
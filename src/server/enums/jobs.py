@@ -0,0 +1,39 @@
+from enum import Enum
+
+
+class JobStatusEnum(Enum):
+    """
+    Enumeration of the lifecycle states of a separation job.
+
+    Parameters:
+        QUEUED: Waiting for a free separation slot
+        RUNNING: Being separated and uploaded
+        DONE: Finished successfully
+        FAILED: Finished with an error
+        CANCELLED: Stopped on the client's request before finishing
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def is_finished(self) -> bool:
+        """
+        Whether the job has reached a final state.
+
+        Returns:
+            bool: True for DONE, FAILED and CANCELLED
+        """
+        return self in (JobStatusEnum.DONE, JobStatusEnum.FAILED, JobStatusEnum.CANCELLED)
+
+    def __repr__(self) -> str:
+        """
+        Returns the string representation of the status.
+
+        Returns:
+            str: The string value of the enum member.
+        """
+        return self.value
@@ -1,3 +1,4 @@
+import logging
 from enum import Enum
 
 
@@ -40,3 +41,13 @@ class LoggingLevelsEnum(Enum):
             str: The string value of the enum member.
         """
         return self.value
+
+    @property
+    def levelno(self) -> int:
+        """
+        Returns the numeric level used by the logging module.
+
+        Returns:
+            int: The numeric value of the level, e.g. 10 for DEBUG.
+        """
+        return logging.getLevelName(self.value.upper())
@@ -0,0 +1,60 @@
+from enum import Enum
+from typing import List
+
+
+class SeparationModelEnum(Enum):
+    """
+    Enumeration of the pretrained Spleeter models a separation can use.
+
+    The default models separate frequencies up to 11 kHz. The "-16kHz" variants
+    cover the band up to 16 kHz at a higher processing cost.
+
+    Parameters:
+        TWO_STEMS: Vocals and accompaniment
+        FOUR_STEMS: Vocals, drums, bass and other
+        FIVE_STEMS: Vocals, drums, bass, piano and other
+        TWO_STEMS_16KHZ: Two stems up to 16 kHz
+        FOUR_STEMS_16KHZ: Four stems up to 16 kHz
+        FIVE_STEMS_16KHZ: Five stems up to 16 kHz
+    """
+
+    TWO_STEMS = "2stems"
+    FOUR_STEMS = "4stems"
+    FIVE_STEMS = "5stems"
+    TWO_STEMS_16KHZ = "2stems-16kHz"
+    FOUR_STEMS_16KHZ = "4stems-16kHz"
+    FIVE_STEMS_16KHZ = "5stems-16kHz"
+
+    @property
+    def stems(self) -> List[str]:
+        """
+        Names of the stems the model produces.
+
+        Returns:
+            List[str]: Stem names, as used for output file names
+        """
+        count = self.value.split("stems", 1)[0]
+        return {
+            "2": ["vocals", "accompaniment"],
+            "4": ["vocals", "drums", "bass", "other"],
+            "5": ["vocals", "drums", "bass", "piano", "other"],
+        }[count]
+
+    @property
+    def is_full_band(self) -> bool:
+        """
+        Whether the model separates the band up to 16 kHz.
+
+        Returns:
+            bool: True for the "-16kHz" models
+        """
+        return self.value.endswith("-16kHz")
+
+    def __repr__(self) -> str:
+        """
+        Returns the string representation of the model.
+
+        Returns:
+            str: The string value of the enum member.
+        """
+        return self.value
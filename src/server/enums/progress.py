@@ -16,6 +16,7 @@ class AnnihilationProgressEnum(Enum):
 
     Parameters:
         NOT_STARTED (0): Process has not yet begun
+        QUEUED (5): Waiting in the job queue for a free separation slot
         PREPARE_WORK (15): Initial preparation phase
         STARTING_WORK (30): Process initialization
         WORK_STARTED (50): Main work has begun
@@ -26,6 +27,7 @@ class AnnihilationProgressEnum(Enum):
     """
 
     NOT_STARTED = 0
+    QUEUED = 5
     PREPARE_WORK = 15
     STARTING_WORK = 30
     WORK_STARTED = 50
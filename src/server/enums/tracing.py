@@ -0,0 +1,25 @@
+from enum import Enum
+
+
+class SpanKindEnum(Enum):
+    """
+    Enumeration of the roles a traced span plays, with their OTLP values.
+
+    Parameters:
+        INTERNAL: Work inside the service, such as a separation
+        SERVER: Handling of an incoming request
+        CLIENT: A call to another service, such as S3
+    """
+
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+    def __repr__(self) -> str:
+        """
+        Returns the string representation of the span kind.
+
+        Returns:
+            str: The name of the enum member.
+        """
+        return self.name
@@ -1,11 +1,13 @@
+import atexit
 import logging.config
-from src.server.config import Settings
+from src.server.dependencies.settings import get_settings
+from src.server.services.logs.structured import start_queue_logging
 import re
 from pathlib import Path
 import configparser
 
 # Load application settings
-settings = Settings()  # type: ignore[call-arg]
+settings = get_settings()
 
 # Initialize and read logging configuration
 config = configparser.ConfigParser()
@@ -59,5 +61,12 @@ logging.config.fileConfig(
     disable_existing_loggers=False,  # Preserve any existing loggers
 )
 
+# Messages below the configured level are dropped before they are formatted
+logging.getLogger().setLevel(settings.LOG_LEVEL.levelno)
+
+# Handlers write from a background thread, so logging calls never block on I/O
+listener = start_queue_logging(logging.getLogger())
+atexit.register(listener.stop)
+
 # Create module logger
 logger = logging.getLogger(__name__)
@@ -1,3 +1,6 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI, status, Request
 from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,12 +8,45 @@ from fastapi.responses import JSONResponse
 
 from pydantic import ValidationError
 
-from src.server.config import Settings
 from src.server.api.v1.routers.processing import router as processing_router_v1
 from src.server.api.v1.routers.files import router as files_router_v1
+from src.server.api.v1.routers.metrics import router as metrics_router
+from src.server.dependencies.jobs import start_job_scheduler, stop_job_scheduler
+from src.server.dependencies.s3 import start_s3_health_monitor, stop_s3_health_monitor
+from src.server.dependencies.separator import start_separator_pool, stop_separator_pool
+from src.server.dependencies.settings import get_settings
+from src.server.metrics import mark_process_dead
+from src.server.tracing import start_tracing, stop_tracing
 
 # Load application configuration
-settings = Settings()  # type: ignore[call-arg]
+settings = get_settings()
+
+
+# noinspection PyUnusedLocal
+@asynccontextmanager
+async def lifespan(application: FastAPI) -> AsyncIterator[None]:
+    """
+    Application lifespan handler.
+
+    Starts the separator worker pool so models are loaded before the first request,
+    the job scheduler so jobs queued before a restart are resumed, the S3 health
+    monitor, and the span exporter if tracing is enabled. All are stopped on shutdown,
+    the remaining spans are written and the process's live metrics are dropped.
+
+    Parameters:
+        application: The FastAPI application (unused)
+    """
+    start_tracing(settings)
+    start_separator_pool(settings)
+    start_s3_health_monitor(settings)
+    start_job_scheduler(settings)
+    yield
+    await stop_job_scheduler()
+    stop_s3_health_monitor()
+    stop_separator_pool()
+    stop_tracing()
+    mark_process_dead()
+
 
 # Initialize main FastAPI application with metadata from settings
 app = FastAPI(
@@ -20,6 +56,7 @@ app = FastAPI(
     summary=settings.SUMMARY,
     contact=settings.CONTACT,
     license_info=settings.LICENSE_INFO,
+    lifespan=lifespan,
 )
 
 # Initialize API v1 application
@@ -38,6 +75,10 @@ app.add_middleware(
 app.include_router(processing_router_v1, prefix="/api/latest")
 app.include_router(files_router_v1, prefix="/api/latest")
 
+# Expose the pipeline metrics unversioned, where Prometheus expects them
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
+
 # Include routers for v1 API
 v1.include_router(processing_router_v1)
 v1.include_router(files_router_v1)
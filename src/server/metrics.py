@@ -0,0 +1,139 @@
+import os
+import time
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from botocore.client import BaseClient  # type: ignore[import-untyped]
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+# Pipeline stages timed outside of a separation's StageTimings
+UPLOAD_RECEIVE = "upload_receive"
+QUEUE_WAIT = "queue_wait"
+
+# Metrics are shared by all uvicorn or gunicorn worker processes if PROMETHEUS_MULTIPROC_DIR
+# is set: every process writes its values to files in that directory, aggregated on scrape.
+# Gauges of processes that have exited are dropped ("live" modes).
+
+STAGE_SECONDS = Histogram(
+    "annihilator_stage_seconds",
+    "Wall time of pipeline stages: upload_receive, queue_wait, decode, inference, encode, "
+    "separation (spleeter CLI) and upload.",
+    ["stage"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0),
+)
+
+JOBS_IN_FLIGHT = Gauge(
+    "annihilator_jobs_in_flight",
+    "Jobs being processed.",
+    multiprocess_mode="livesum",
+)
+
+# Every process reads the same job store, so the processes' values are equal
+JOBS_QUEUED = Gauge(
+    "annihilator_jobs_queued",
+    "Jobs waiting for a processing slot.",
+    multiprocess_mode="livemax",
+)
+
+SEPARATED_AUDIO_SECONDS = Counter(
+    "annihilator_separated_audio_seconds",
+    "Seconds of audio separated; its rate is the separation throughput in audio-seconds per second.",
+)
+
+S3_REQUEST_SECONDS = Histogram(
+    "annihilator_s3_request_seconds",
+    "Latency of S3 API calls including retries, by operation.",
+    ["operation"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+S3_ERRORS = Counter(
+    "annihilator_s3_errors",
+    "Failed S3 API calls, by operation and error code or exception.",
+    ["operation", "code"],
+)
+
+EVENT_STREAMS = Gauge(
+    "annihilator_event_streams",
+    "Open job event streams, by format.",
+    ["format"],
+    multiprocess_mode="livesum",
+)
+
+EVENT_STREAMS_OPENED = Counter(
+    "annihilator_event_streams_opened",
+    "Job event streams opened, by format.",
+    ["format"],
+)
+
+
+def observe_separation(timings: Mapping[str, float], audio_seconds: Optional[float]) -> None:
+    """
+    Record the stage times and the audio of a finished separation.
+
+    Parameters:
+        timings (Mapping[str, float]): Seconds by stage name, from `StageTimings.as_dict`
+        audio_seconds (Optional[float]): Duration of the separated audio, None if unknown
+    """
+    for stage, seconds in timings.items():
+        STAGE_SECONDS.labels(stage).observe(seconds)
+    if audio_seconds:
+        SEPARATED_AUDIO_SECONDS.inc(audio_seconds)
+
+
+def _before_s3_call(context: Dict[str, Any], **kwargs) -> None:
+    """Start timing an S3 API call. Must return None, or botocore skips the request."""
+    context["metrics_started"] = time.perf_counter()
+
+
+def _after_s3_call(http_response: Any, parsed: Dict[str, Any], model: Any, context: Dict[str, Any], **kwargs) -> None:
+    """Record the latency of an S3 API call that got a response, and its error code if it failed."""
+    started = context.get("metrics_started")
+    if started is not None:
+        S3_REQUEST_SECONDS.labels(model.name).observe(time.perf_counter() - started)
+    if http_response.status_code >= 400:
+        S3_ERRORS.labels(model.name, parsed.get("Error", {}).get("Code") or str(http_response.status_code)).inc()
+
+
+def _after_s3_call_error(exception: Exception, context: Dict[str, Any], **kwargs) -> None:
+    """Record an S3 API call that failed without a response, e.g. on a connection error."""
+    operation = kwargs.get("event_name", "").rpartition(".")[2] or "unknown"
+    started = context.get("metrics_started")
+    if started is not None:
+        S3_REQUEST_SECONDS.labels(operation).observe(time.perf_counter() - started)
+    S3_ERRORS.labels(operation, type(exception).__name__).inc()
+
+
+def instrument_s3_client(client: BaseClient) -> None:
+    """
+    Record latency and errors of every API call of an S3 client.
+
+    Calls are timed through botocore's event hooks, so uploads, downloads and
+    connection checks are all covered without wrapping the client.
+
+    Parameters:
+        client (BaseClient): boto3 S3 client
+    """
+    client.meta.events.register("before-call.s3", _before_s3_call)
+    client.meta.events.register("after-call.s3", _after_s3_call)
+    client.meta.events.register("after-call-error.s3", _after_s3_call_error)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+
+    Returns:
+        Tuple[bytes, str]: Exposition body, and its content type
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop the live gauges of this process from the shared metrics, on shutdown."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
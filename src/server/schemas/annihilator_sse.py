@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import Dict, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from src.server.enums.progress import AnnihilationProgressEnum
 
@@ -12,10 +12,15 @@ class ProgressSSESchema(BaseModel):
     Attributes:
         progress (AnnihilationProgressEnum): Current progress state enum value
         message (Optional[str]): Optional human-readable progress message.
+        percent (Optional[float]): Overall completion in percent, finer grained than `progress`
+            while the separation is running.
+        eta_seconds (Optional[float]): Estimated seconds until the separation finishes.
     """
 
     progress: AnnihilationProgressEnum
     message: Optional[str] = None
+    percent: Optional[float] = None
+    eta_seconds: Optional[float] = None
 
 
 class ErrorSSESchema(ProgressSSESchema):
@@ -46,8 +51,117 @@ class ResultSSESchema(ProgressSSESchema):
     Attributes:
         progress (AnnihilationProgressEnum): Always set to DONE state.
         result (str): The final result data.
+        timings (Optional[Dict[str, float]]): Seconds spent in each processing stage
+            (decode, inference, encode, upload). Not set for cached results.
+        trace_id (Optional[str]): Trace of the job's spans, to look up where a slow job spent
+            its time. Only set while tracing is enabled.
         message (Optional[str]): Optional completion message.
             Inherited from ProgressSSESchema.
     """
     progress: AnnihilationProgressEnum = AnnihilationProgressEnum.DONE
     result: str
+    timings: Optional[Dict[str, float]] = None
+    trace_id: Optional[str] = None
+
+
+class UploadSSESchema(ProgressSSESchema):
+    """
+    SSE schema for the upload result of a single stem.
+
+    Sent once per stem while the stems are uploaded concurrently.
+
+    Attributes:
+        progress (AnnihilationProgressEnum): Always set to FINALIZING_WORK state.
+        stem (str): Name of the uploaded stem.
+        success (bool): Whether the stem was uploaded.
+        completed (int): Number of stems whose upload has finished so far.
+        total (int): Number of stems being uploaded.
+        message (Optional[str]): Optional human-readable message.
+            Inherited from ProgressSSESchema.
+    """
+    progress: AnnihilationProgressEnum = AnnihilationProgressEnum.FINALIZING_WORK
+    stem: str
+    success: bool
+    completed: int
+    total: int
+
+
+class QueuedSSESchema(ProgressSSESchema):
+    """
+    SSE schema for jobs waiting in the queue.
+
+    Sent when a job is queued and again whenever its position changes.
+
+    Attributes:
+        progress (AnnihilationProgressEnum): Always set to QUEUED state.
+        job_id (str): Identifier of the queued job.
+        position (int): 1-based position of the job in the queue.
+        message (Optional[str]): Optional human-readable message.
+            Inherited from ProgressSSESchema.
+    """
+    progress: AnnihilationProgressEnum = AnnihilationProgressEnum.QUEUED
+    job_id: str
+    position: int
+
+
+class SegmentSSESchema(ProgressSSESchema):
+    """
+    SSE schema announcing a stem segment that can be played while separation continues.
+
+    Attributes:
+        progress (AnnihilationProgressEnum): Always set to WORK_STARTED state.
+        stem (str): Name of the stem the segment belongs to.
+        segment (int): 0-based index of the segment in the stem.
+        duration (float): Length of the segment in seconds.
+        playlist (str): Name of the stem's HLS playlist, which now lists the segment.
+        message (Optional[str]): Optional human-readable message.
+            Inherited from ProgressSSESchema.
+    """
+    progress: AnnihilationProgressEnum = AnnihilationProgressEnum.WORK_STARTED
+    stem: str
+    segment: int
+    duration: float
+    playlist: str
+
+
+class BatchItemSSESchema(ProgressSSESchema):
+    """
+    SSE schema for an event of one item of a batch, sent on the batch's event stream.
+
+    The fields of the item's own event (e.g. `result`, `error`, `stem`) are included
+    unchanged next to the item's position and name.
+
+    Attributes:
+        item (int): 0-based index of the item in the batch.
+        name (str): Uploaded filename or S3 key of the item.
+        progress (AnnihilationProgressEnum): Progress state of the item.
+            Inherited from ProgressSSESchema.
+    """
+    model_config = ConfigDict(extra="allow")
+
+    item: int
+    name: str
+
+
+class BatchSummarySSESchema(ResultSSESchema):
+    """
+    SSE schema for the final result of a batch, with its overall throughput.
+
+    Attributes:
+        progress (AnnihilationProgressEnum): Always set to DONE state.
+        result (str): Identifier of the batch job.
+        items (int): Number of items in the batch.
+        succeeded (int): Number of items separated and stored.
+        failed (int): Number of items that failed.
+        audio_seconds (float): Summed duration of the separated items.
+        wall_seconds (float): Time from the start of the batch to its end.
+        realtime_factor (float): Seconds of audio separated per second of wall time.
+        items_per_hour (float): Items separated per hour at the batch's pace.
+    """
+    items: int
+    succeeded: int
+    failed: int
+    audio_seconds: float
+    wall_seconds: float
+    realtime_factor: float
+    items_per_hour: float
@@ -0,0 +1,53 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, model_validator
+
+
+class BatchItemSchema(BaseModel):
+    """
+    One input of a batch manifest.
+
+    An item either names one of the files uploaded with the batch, to set its options,
+    or adds an object of the S3 bucket as input.
+
+    Attributes:
+        file (Optional[str]): Filename of an uploaded file
+        s3_key (Optional[str]): Key of an input object in the bucket
+        model (Optional[str]): Spleeter model, defaults to the manifest's model
+        stems (Optional[List[str]]): Stems to keep, defaults to the manifest's stems
+    """
+
+    file: Optional[str] = None
+    s3_key: Optional[str] = None
+    model: Optional[str] = None
+    stems: Optional[List[str]] = None
+
+    @model_validator(mode="after")
+    def check_input(self) -> "BatchItemSchema":
+        """
+        Require exactly one input reference.
+
+        Returns:
+            BatchItemSchema: The validated item
+
+        Raises:
+            ValueError: If neither or both of `file` and `s3_key` are set
+        """
+        if (self.file is None) == (self.s3_key is None):
+            raise ValueError("Each item needs exactly one of 'file' or 's3_key'")
+        return self
+
+
+class BatchManifestSchema(BaseModel):
+    """
+    Manifest of a batch request, sent as JSON in the 'manifest' form field.
+
+    Attributes:
+        model (Optional[str]): Spleeter model of every item that does not choose one
+        stems (Optional[List[str]]): Stems to keep of every item that does not choose them
+        items (List[BatchItemSchema]): Options of uploaded files and S3 inputs
+    """
+
+    model: Optional[str] = None
+    stems: Optional[List[str]] = None
+    items: List[BatchItemSchema] = []
@@ -0,0 +1,39 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from src.server.enums.jobs import JobStatusEnum
+
+
+class JobSchema(BaseModel):
+    """
+    Status of a separation job.
+
+    Attributes:
+        job_id (str): Job identifier
+        status (JobStatusEnum): Current lifecycle state
+        position (Optional[int]): 1-based queue position while the job is queued
+        result (Optional[str]): Result identifier once the job is done
+        error (Optional[str]): Error description if the job failed
+    """
+
+    job_id: str
+    status: JobStatusEnum
+    position: Optional[int] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+
+
+class S3InputSchema(BaseModel):
+    """
+    Request body of a job reading its input from an object in the bucket instead of an upload.
+
+    Attributes:
+        s3_key (str): Key of the input object in the bucket
+        model (Optional[str]): Spleeter model, defaults to the configured default model
+        stems (Optional[List[str]]): Stems to keep, defaults to every stem of the model
+    """
+
+    s3_key: str = Field(min_length=1)
+    model: Optional[str] = None
+    stems: Optional[List[str]] = None
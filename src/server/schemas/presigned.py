@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+
+
+class PresignedUrlSchema(BaseModel):
+    """
+    A presigned URL giving temporary access to an object in the storage.
+
+    Attributes:
+        url (str): Presigned URL on the public storage endpoint
+        expires_in (int): Seconds the URL stays valid after it was issued
+    """
+
+    url: str
+    expires_in: int
+
+
+class PresignedUploadSchema(PresignedUrlSchema):
+    """
+    A presigned URL the client uploads an input file to, bypassing the API.
+
+    The uploaded object is then separated by submitting a job with its `s3_key`.
+
+    Attributes:
+        s3_key (str): Key the upload is stored at
+        method (str): HTTP method of the upload
+    """
+
+    s3_key: str
+    method: str = "PUT"
@@ -0,0 +1,94 @@
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncGenerator, AsyncIterator, Callable, Iterable, List
+
+
+@dataclass
+class ZipEntry:
+    """
+    A file added to a streamed ZIP archive.
+
+    Attributes:
+        name (str): Path of the file inside the archive
+        size (int): Size of the file in bytes, used to decide on ZIP64 headers
+        modified (datetime): Modification time recorded in the archive
+        read (Callable[[], AsyncIterator[bytes]]): Opens the file and yields its content in chunks,
+            called only when the file is written
+    """
+
+    name: str
+    size: int
+    modified: datetime
+    read: Callable[[], AsyncIterator[bytes]]
+
+
+class _ChunkSink:
+    """Write-only file collecting what `zipfile` writes until it is drained."""
+
+    def __init__(self):
+        """Initialize an empty sink."""
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        """
+        Collect written bytes.
+
+        Parameters:
+            data (bytes): Bytes written by `zipfile`
+
+        Returns:
+            int: Number of bytes written
+        """
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        """Nothing to flush, the collected bytes are drained by the stream."""
+
+    def drain(self) -> bytes:
+        """
+        Take the bytes collected since the last drain.
+
+        Returns:
+            bytes: Collected bytes, empty if nothing was written
+        """
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_zip(entries: Iterable[ZipEntry]) -> AsyncGenerator[bytes, None]:
+    """
+    Stream a ZIP archive of files as it is assembled, without temporary files.
+
+    Files are stored without compression, so their content is copied as is and already
+    compressed audio is not compressed again. The archive cannot be sought back into,
+    so every file's CRC and sizes follow its content in a data descriptor. Memory use
+    is bounded by the chunk size of the files, whatever their number and size. Files and
+    archives over 4 GiB get ZIP64 records.
+
+    Parameters:
+        entries (Iterable[ZipEntry]): Files to add, in archive order
+
+    Yields:
+        bytes: Consecutive parts of the archive
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for entry in entries:
+            info = zipfile.ZipInfo(entry.name, date_time=entry.modified.timetuple()[:6])
+            info.compress_type = zipfile.ZIP_STORED
+            info.file_size = entry.size
+
+            with archive.open(info, mode="w") as member:
+                # Send the local header before the file is opened
+                yield sink.drain()
+                async for chunk in entry.read():
+                    member.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            yield sink.drain()
+
+    yield sink.drain()
@@ -0,0 +1,67 @@
+import hashlib
+from pathlib import Path
+
+import ffmpeg  # type: ignore[import-untyped]
+
+from src.server.annihilator.audio import CHANNELS, SAMPLE_RATE
+
+# Size of the blocks read while hashing files
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def content_hash(path: Path) -> str:
+    """
+    Compute the SHA-256 of a file without reading it into memory at once.
+
+    Parameters:
+        path (Path): File to hash
+
+    Returns:
+        str: Hex digest of the file content
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def pcm_hash(path: Path) -> str:
+    """
+    Compute the SHA-256 of the decoded audio instead of the container bytes.
+
+    The audio is decoded to the float32 stereo samples the model separates and hashed
+    as it streams out of ffmpeg. Files that decode to exactly the same samples, such as
+    re-muxes into another container, files with edited tags, and lossless conversions
+    like WAV to FLAC, produce the same hash while their file hashes differ. Any change
+    of the samples, including gain, EQ or a lossy re-encode, produces another hash.
+
+    Parameters:
+        path (Path): Audio file to hash
+
+    Returns:
+        str: Hex digest of the decoded samples
+
+    Raises:
+        ffmpeg.Error: If ffmpeg fails to decode the input
+    """
+    process = (
+        ffmpeg
+        .input(str(path))
+        .output("pipe:", format="f32le", ac=CHANNELS, ar=SAMPLE_RATE)
+        .global_args("-loglevel", "error")
+        .run_async(pipe_stdout=True)
+    )
+
+    digest = hashlib.sha256()
+    try:
+        for chunk in iter(lambda: process.stdout.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    finally:
+        process.stdout.close()
+        return_code = process.wait()
+
+    if return_code != 0:
+        raise ffmpeg.Error("ffmpeg", None, None)
+
+    return digest.hexdigest()
@@ -0,0 +1,292 @@
+import hashlib
+from logging import Logger
+from pathlib import Path
+from typing import Any, List, Optional
+
+from botocore.client import BaseClient  # type: ignore[import-untyped]
+from botocore.exceptions import ClientError  # type: ignore[import-untyped]
+
+from src.server.enums.logging import LoggingLevelsEnum
+from src.server.services.cache.fingerprint import content_hash, pcm_hash
+from src.server.services.cache.store import CacheEntry, ResultCacheStore
+
+
+class ResultCache:
+    """
+    Content-addressed cache of separation results stored in S3.
+
+    The cache key is derived from the uploaded audio (its file hash, or a hash of
+    the decoded samples, or the ETag of an input object in the bucket) together with
+    the model, codec, bitrate and stems, so identical uploads are separated only once.
+    Entries point at the existing stems under the processed S3 prefix. The size of an
+    entry counts every object under the prefix, including stream segments and download
+    variants stored later, since eviction deletes them all. When the cached results grow
+    over the size budget, the least recently used results are evicted from the index
+    and their S3 objects are deleted.
+
+    Parameters:
+        store (ResultCacheStore): Index backend
+        s3_client (BaseClient): Initialized boto3 S3 client
+        s3_bucket (str): Bucket holding the processed results
+        max_bytes (int): Maximum total size of cached results
+        use_pcm_hash (bool): Key on the decoded samples instead of file bytes (default: False)
+        logger (Logger, optional): Python logger instance for operation tracking
+    """
+
+    def __init__(
+        self,
+        store: ResultCacheStore,
+        s3_client: BaseClient,
+        s3_bucket: str,
+        max_bytes: int,
+        use_pcm_hash: bool = False,
+        logger: Optional[Logger] = None,
+    ):
+        """Initialize the result cache with its index store and S3 location."""
+        self.store = store
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        self.max_bytes = max_bytes
+        self.use_pcm_hash = use_pcm_hash
+        self.logger = logger
+
+    def _log(
+        self,
+        message: str,
+        *args: Any,
+        level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
+        exc_info: bool = False,
+    ) -> None:
+        """
+        Internal logging helper with class name prefix.
+
+        Parameters:
+            message (str): Message to log
+            *args (Any): Values %-formatted into the message, only if the level is enabled
+            level (LoggingLevelsEnum): Logging level (default: INFO)
+            exc_info (bool): Whether to include exception info (default: False)
+        """
+        if self.logger and self.logger.isEnabledFor(level.levelno):
+            getattr(self.logger, level.value)(
+                f"{self.__class__.__name__}: {message % args if args else message}",
+                exc_info=exc_info,
+                stacklevel=2,
+            )
+
+    def _parameters_key(
+        self,
+        audio_id: str,
+        model: str,
+        codec: str,
+        bitrate: str,
+        stems: Optional[List[str]],
+    ) -> str:
+        """
+        Combine an audio identity and separation parameters into a cache key.
+
+        Parameters:
+            audio_id (str): Identity of the input audio
+            model (str): Spleeter model
+            codec (str): Output audio codec
+            bitrate (str): Output audio bitrate
+            stems (List[str], optional): Requested stems, None for every stem of the model
+
+        Returns:
+            str: Hex cache key
+        """
+        parameters = f"{audio_id}|{model}|{codec}|{bitrate}"
+        if stems is not None:
+            parameters += f"|{','.join(sorted(stems))}"
+        return hashlib.sha256(parameters.encode()).hexdigest()
+
+    def compute_key(
+        self,
+        input_path: Path,
+        model: str,
+        codec: str,
+        bitrate: str,
+        stems: Optional[List[str]] = None,
+    ) -> str:
+        """
+        Build the cache key of an input file and separation parameters.
+
+        Parameters:
+            input_path (Path): Uploaded audio file
+            model (str): Spleeter model
+            codec (str): Output audio codec
+            bitrate (str): Output audio bitrate
+            stems (List[str], optional): Requested stems, None for every stem of the model
+
+        Returns:
+            str: Hex cache key
+        """
+        if self.use_pcm_hash:
+            audio_id = f"pcm-sha256:{pcm_hash(input_path)}"
+        else:
+            audio_id = f"sha256:{content_hash(input_path)}"
+
+        key = self._parameters_key(audio_id, model, codec, bitrate, stems)
+        self._log("Computed cache key %s for %s", key, input_path, level=LoggingLevelsEnum.DEBUG)
+        return key
+
+    def compute_object_key(
+        self,
+        etag: str,
+        model: str,
+        codec: str,
+        bitrate: str,
+        stems: Optional[List[str]] = None,
+    ) -> str:
+        """
+        Build the cache key of an input object in the bucket and separation parameters.
+
+        The object's ETag identifies its content, so the key is known without reading
+        the object. Objects with the same bytes uploaded in different multipart layouts
+        have different ETags and are cached separately.
+
+        Parameters:
+            etag (str): ETag of the input object
+            model (str): Spleeter model
+            codec (str): Output audio codec
+            bitrate (str): Output audio bitrate
+            stems (List[str], optional): Requested stems, None for every stem of the model
+
+        Returns:
+            str: Hex cache key
+        """
+        audio_id = "etag:" + etag.strip('"')
+        key = self._parameters_key(audio_id, model, codec, bitrate, stems)
+        self._log("Computed cache key %s for ETag %s", key, etag, level=LoggingLevelsEnum.DEBUG)
+        return key
+
+    def _prefix_exists(self, s3_prefix: str) -> bool:
+        """
+        Check that at least one object still exists under a result prefix.
+
+        Parameters:
+            s3_prefix (str): Result prefix in the bucket
+
+        Returns:
+            bool: True if the result objects are present
+        """
+        response = self.s3_client.list_objects_v2(Bucket=self.s3_bucket, Prefix=s3_prefix, MaxKeys=1)
+        return response.get("KeyCount", 0) > 0
+
+    def _prefix_size(self, s3_prefix: str) -> int:
+        """
+        Sum the sizes of every object under a result prefix.
+
+        Parameters:
+            s3_prefix (str): Result prefix in the bucket
+
+        Returns:
+            int: Total size in bytes
+        """
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        return sum(
+            item["Size"]
+            for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=s3_prefix)
+            for item in page.get("Contents", [])
+        )
+
+    def _delete_prefix(self, s3_prefix: str) -> None:
+        """
+        Delete every object under a result prefix.
+
+        Parameters:
+            s3_prefix (str): Result prefix in the bucket
+        """
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=s3_prefix):
+            objects = [{"Key": item["Key"]} for item in page.get("Contents", [])]
+            if objects:
+                self.s3_client.delete_objects(Bucket=self.s3_bucket, Delete={"Objects": objects})
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Find the result of a previous identical separation.
+
+        Entries whose S3 objects have disappeared are dropped from the index.
+
+        Parameters:
+            key (str): Cache key from `compute_key`
+
+        Returns:
+            Optional[str]: Result identifier, or None on a miss
+        """
+        entry = self.store.get(key)
+        if entry is None:
+            self._log("Cache miss for key %s", key)
+            return None
+
+        try:
+            if not self._prefix_exists(entry.s3_prefix):
+                self._log(
+                    "Cached result %s is missing from S3, dropping entry",
+                    entry.result,
+                    level=LoggingLevelsEnum.WARNING,
+                )
+                self.store.delete(key)
+                return None
+        except ClientError as e:
+            self._log("Could not verify cached result %s: %s", entry.result, e, level=LoggingLevelsEnum.WARNING)
+            return None
+
+        self._log("Cache hit for key %s: %s", key, entry.result)
+        return entry.result
+
+    def add(self, key: str, result: str, s3_prefix: str) -> None:
+        """
+        Record a new result and evict old results if the cache is over budget.
+
+        The result is not cached if the size of its objects cannot be read.
+
+        Parameters:
+            key (str): Cache key from `compute_key`
+            result (str): Result identifier returned to clients
+            s3_prefix (str): S3 prefix holding the result stems and stream segments
+        """
+        try:
+            size_bytes = self._prefix_size(s3_prefix)
+        except ClientError as e:
+            self._log("Could not measure result %s, not caching it: %s", result, e, level=LoggingLevelsEnum.WARNING)
+            return
+
+        self.store.put(CacheEntry(key=key, result=result, s3_prefix=s3_prefix, size_bytes=size_bytes))
+        self._log("Cached result %s (%s bytes) for key %s", result, size_bytes, key)
+        self._evict()
+
+    def add_object(self, s3_prefix: str, size_bytes: int) -> None:
+        """
+        Count an object stored under a result after it was cached, such as a download variant.
+
+        Parameters:
+            s3_prefix (str): S3 prefix of the result
+            size_bytes (int): Size of the new object
+        """
+        if self.store.grow(s3_prefix, size_bytes):
+            self._log("Added %s bytes to cached result %s", size_bytes, s3_prefix, level=LoggingLevelsEnum.DEBUG)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used results until the total size fits the budget."""
+        while self.store.total_size() > self.max_bytes:
+            candidates = self.store.least_recently_used(limit=16)
+            if not candidates:
+                return
+
+            for entry in candidates:
+                if self.store.total_size() <= self.max_bytes:
+                    return
+
+                self._log("Evicting cached result %s (%s bytes)", entry.result, entry.size_bytes)
+                self.store.delete(entry.key)
+                try:
+                    self._delete_prefix(entry.s3_prefix)
+                except ClientError as e:
+                    self._log(
+                        "Failed to delete evicted result %s: %s",
+                        entry.s3_prefix,
+                        e,
+                        level=LoggingLevelsEnum.ERROR,
+                    )
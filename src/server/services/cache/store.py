@@ -0,0 +1,236 @@
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+
+@dataclass
+class CacheEntry:
+    """
+    A cached separation result.
+
+    Attributes:
+        key (str): Content-addressed cache key
+        result (str): Result identifier returned to clients in ResultSSESchema
+        s3_prefix (str): S3 prefix holding the result stems, e.g. "processed/{result}/"
+        size_bytes (int): Total size of the objects under the prefix
+        last_access (float): Unix timestamp of the last hit or insert
+    """
+
+    key: str
+    result: str
+    s3_prefix: str
+    size_bytes: int
+    last_access: float = field(default_factory=time.time)
+
+
+class ResultCacheStore(ABC):
+    """
+    Interface of the result cache index.
+
+    Stores map cache keys to result entries and track the total size of cached results,
+    so the cache can evict least recently used results when it grows over its budget.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Look up an entry and mark it as recently used.
+
+        Parameters:
+            key (str): Cache key
+
+        Returns:
+            Optional[CacheEntry]: The entry, or None if not cached
+        """
+
+    @abstractmethod
+    def put(self, entry: CacheEntry) -> None:
+        """
+        Insert or replace an entry.
+
+        Parameters:
+            entry (CacheEntry): Entry to store
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Remove an entry if present.
+
+        Parameters:
+            key (str): Cache key
+        """
+
+    @abstractmethod
+    def grow(self, s3_prefix: str, size_bytes: int) -> bool:
+        """
+        Add the size of an object stored under a cached result after it was cached.
+
+        Parameters:
+            s3_prefix (str): S3 prefix of the result
+            size_bytes (int): Size of the new object
+
+        Returns:
+            bool: True if a cached result has the prefix
+        """
+
+    @abstractmethod
+    def total_size(self) -> int:
+        """
+        Sum of the sizes of all cached results.
+
+        Returns:
+            int: Total size in bytes
+        """
+
+    @abstractmethod
+    def least_recently_used(self, limit: int) -> List[CacheEntry]:
+        """
+        Return the oldest entries, least recently used first.
+
+        Parameters:
+            limit (int): Maximum number of entries to return
+
+        Returns:
+            List[CacheEntry]: Eviction candidates
+        """
+
+
+class MemoryResultCacheStore(ResultCacheStore):
+    """
+    In-process LRU index of cached results.
+
+    The index is lost on restart, while the S3 objects it points to are kept until
+    evicted by another process or by an operator.
+    """
+
+    def __init__(self):
+        """Initialize an empty LRU index."""
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.last_access = time.time()
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, entry: CacheEntry) -> None:
+        with self._lock:
+            previous = self._entries.pop(entry.key, None)
+            if previous is not None:
+                self._size -= previous.size_bytes
+            self._entries[entry.key] = entry
+            self._size += entry.size_bytes
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= entry.size_bytes
+
+    def grow(self, s3_prefix: str, size_bytes: int) -> bool:
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.s3_prefix == s3_prefix:
+                    entry.size_bytes += size_bytes
+                    self._size += size_bytes
+                    return True
+            return False
+
+    def total_size(self) -> int:
+        with self._lock:
+            return self._size
+
+    def least_recently_used(self, limit: int) -> List[CacheEntry]:
+        with self._lock:
+            return [entry for _, entry in zip(range(limit), self._entries.values())]
+
+
+class SQLiteResultCacheStore(ResultCacheStore):
+    """
+    SQLite-backed index of cached results.
+
+    The index survives restarts and can be shared by several worker processes
+    of the same host.
+
+    Parameters:
+        path (Path): SQLite database file
+    """
+
+    def __init__(self, path: Path):
+        """Open the database and create the schema if needed."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS result_cache ("
+            "key TEXT PRIMARY KEY, "
+            "result TEXT NOT NULL, "
+            "s3_prefix TEXT NOT NULL, "
+            "size_bytes INTEGER NOT NULL, "
+            "last_access REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS result_cache_last_access ON result_cache (last_access)"
+        )
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT key, result, s3_prefix, size_bytes, last_access FROM result_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            entry = CacheEntry(*row)
+            entry.last_access = time.time()
+            self._connection.execute(
+                "UPDATE result_cache SET last_access = ? WHERE key = ?",
+                (entry.last_access, key),
+            )
+            return entry
+
+    def put(self, entry: CacheEntry) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO result_cache (key, result, s3_prefix, size_bytes, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (entry.key, entry.result, entry.s3_prefix, entry.size_bytes, entry.last_access),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM result_cache WHERE key = ?", (key,))
+
+    def grow(self, s3_prefix: str, size_bytes: int) -> bool:
+        with self._lock:
+            return self._connection.execute(
+                "UPDATE result_cache SET size_bytes = size_bytes + ? WHERE s3_prefix = ?",
+                (size_bytes, s3_prefix),
+            ).rowcount > 0
+
+    def total_size(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM result_cache"
+            ).fetchone()[0]
+
+    def least_recently_used(self, limit: int) -> List[CacheEntry]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, result, s3_prefix, size_bytes, last_access FROM result_cache "
+                "ORDER BY last_access LIMIT ?",
+                (limit,),
+            ).fetchall()
+            return [CacheEntry(*row) for row in rows]
@@ -0,0 +1,148 @@
+import asyncio
+import time
+from logging import Logger
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+from src.server.annihilator.progress_tracker import BatchItemTracker, ProgressTracker
+from src.server.annihilator.spleeter import Spleeter
+from src.server.enums.logging import LoggingLevelsEnum
+from src.server.schemas.annihilator_sse import ProgressSSESchema, ResultSSESchema
+from src.server.services.jobs.store import JobRecord
+
+# Builds the separator of one batch item from its manifest entry and its progress tracker
+SpleeterFactory = Callable[[Dict[str, Any], ProgressTracker], Spleeter]
+
+
+class BatchProcessor:
+    """
+    Separate the items of a batch job concurrently and report them on the batch's event stream.
+
+    A batch is one job whose input is a spool directory and whose options list the items:
+    files spooled into that directory or objects in the S3 bucket. Items run with bounded
+    parallelism, so short tracks are separated at the same time and can be packed into
+    shared worker jobs. S3 inputs are read by the separation itself, as in single jobs.
+    Every item event is tagged with the item and appended to the batch's event log, and
+    the batch ends with a summary of its throughput.
+
+    Parameters:
+        create_spleeter (SpleeterFactory): Builds the separator of an item
+        parallelism (int): Maximum number of items processed at once
+        s3_output_prefix (str): Prefix of the result directories in the bucket (default: "processed/")
+        progress_min_interval (float): Minimum seconds between separation progress events of an
+            item (default: 0.0)
+        logger (Logger, optional): Python logger instance for operation tracking
+    """
+
+    def __init__(
+        self,
+        create_spleeter: SpleeterFactory,
+        parallelism: int,
+        s3_output_prefix: str = "processed/",
+        progress_min_interval: float = 0.0,
+        logger: Optional[Logger] = None,
+    ):
+        """Initialize the batch processor."""
+        self.create_spleeter = create_spleeter
+        self.parallelism = max(parallelism, 1)
+        self.s3_output_prefix = s3_output_prefix
+        self.progress_min_interval = progress_min_interval
+        self.logger = logger
+
+    def _log(
+        self,
+        message: str,
+        *args: Any,
+        level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
+        exc_info: bool = False,
+    ) -> None:
+        """
+        Internal logging helper with class name prefix.
+
+        Parameters:
+            message (str): Message to log
+            *args (Any): Values %-formatted into the message, only if the level is enabled
+            level (LoggingLevelsEnum): Logging level (default: INFO)
+            exc_info (bool): Whether to include exception info (default: False)
+        """
+        if self.logger and self.logger.isEnabledFor(level.levelno):
+            getattr(self.logger, level.value)(
+                f"{self.__class__.__name__}: {message % args if args else message}",
+                exc_info=exc_info,
+                stacklevel=2,
+            )
+
+    async def _process_item(
+        self,
+        job: JobRecord,
+        batch_tracker: ProgressTracker,
+        index: int,
+        item: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+    ) -> Tuple[bool, float]:
+        """
+        Separate and store one item once a parallelism slot is free.
+
+        Parameters:
+            job (JobRecord): Batch job
+            batch_tracker (ProgressTracker): Event log of the batch
+            index (int): 0-based index of the item
+            item (Dict[str, Any]): Manifest entry of the item
+            semaphore (asyncio.Semaphore): Limits items in flight
+
+        Returns:
+            Tuple[bool, float]: Whether the item succeeded, and the seconds of audio it separated
+        """
+        async with semaphore:
+            tracker = BatchItemTracker(
+                batch_tracker,
+                item=index,
+                name=item["name"],
+                min_interval=self.progress_min_interval,
+            )
+            spleeter = self.create_spleeter(item, tracker)
+            succeeded = False
+            async for event in spleeter.separate_with_progress(
+                input_path=job.input_path / item["file"],
+                filename=item["id"],
+                s3_output_prefix=self.s3_output_prefix,
+                s3_input_key=item.get("s3_key"),
+            ):
+                if isinstance(event, ResultSSESchema):
+                    succeeded = True
+
+            # Cached results took no separation and count no audio
+            return succeeded, spleeter.duration if succeeded and spleeter.duration is not None else 0.0
+
+    async def process(self, job: JobRecord, tracker: ProgressTracker) -> AsyncIterator[ProgressSSESchema]:
+        """
+        Process every item of a batch job.
+
+        Parameters:
+            job (JobRecord): Batch job, with the items in `options["items"]`
+            tracker (ProgressTracker): Event log of the batch job
+
+        Yields:
+            ProgressSSESchema: The batch summary, or an error if no item succeeded
+        """
+        items = job.options["items"]
+        self._log("Processing batch %s: %s items, parallelism=%s", job.job_id, len(items), self.parallelism)
+        started = time.monotonic()
+
+        semaphore = asyncio.Semaphore(self.parallelism)
+        outcomes = await asyncio.gather(*(
+            self._process_item(job, tracker, index, item, semaphore)
+            for index, item in enumerate(items)
+        ))
+
+        succeeded = sum(1 for success, _ in outcomes if success)
+        if not succeeded:
+            yield tracker.error_update(error=f"All {len(items)} batch items failed")
+            return
+
+        yield tracker.batch_summary_update(
+            result=job.job_id,
+            items=len(items),
+            succeeded=succeeded,
+            audio_seconds=sum(duration for success, duration in outcomes if success),
+            wall_seconds=time.monotonic() - started,
+        )
@@ -0,0 +1,176 @@
+import asyncio
+from logging import Logger
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from src.server.annihilator.progress_tracker import JobEvent
+from src.server.enums.logging import LoggingLevelsEnum
+from src.server.services.jobs.store import JobStore
+
+
+class _JobChannel:
+    """In-memory event log of an active job that subscribers follow."""
+
+    def __init__(self):
+        """Initialize an open channel with no events."""
+        self.events: List[JobEvent] = []
+        self.closed = False
+        self._changed = asyncio.Event()
+
+    def append(self, event: JobEvent) -> None:
+        """Add an event and wake the subscribers."""
+        self.events.append(event)
+        self._notify()
+
+    def close(self) -> None:
+        """Mark the job as finished and wake the subscribers."""
+        self.closed = True
+        self._notify()
+
+    def _notify(self) -> None:
+        """Wake every waiting subscriber at once; later waiters use a fresh event."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self) -> None:
+        """Wait for the next event or for the channel to close."""
+        await self._changed.wait()
+
+
+class JobEventBroadcaster:
+    """
+    Fan out job events to any number of subscribers.
+
+    Every event is serialized once, persisted in the job store and appended to an
+    in-memory log of the job. Subscribers keep a cursor into that shared log and are
+    all woken by a single notification, so watching a job costs no per-subscriber
+    copies. A subscriber that passes the id of the last event it received replays
+    the missed events from the store first, including after a restart.
+
+    Parameters:
+        store (JobStore): Persistent event log
+        logger (Logger, optional): Python logger instance for operation tracking
+    """
+
+    def __init__(self, store: JobStore, logger: Optional[Logger] = None):
+        """Initialize the broadcaster with no active jobs."""
+        self.store = store
+        self.logger = logger
+        self._channels: Dict[str, _JobChannel] = {}
+
+    def _log(
+        self,
+        message: str,
+        *args: Any,
+        level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
+        exc_info: bool = False,
+    ) -> None:
+        """
+        Internal logging helper with class name prefix.
+
+        Parameters:
+            message (str): Message to log
+            *args (Any): Values %-formatted into the message, only if the level is enabled
+            level (LoggingLevelsEnum): Logging level (default: INFO)
+            exc_info (bool): Whether to include exception info (default: False)
+        """
+        if self.logger and self.logger.isEnabledFor(level.levelno):
+            getattr(self.logger, level.value)(
+                f"{self.__class__.__name__}: {message % args if args else message}",
+                exc_info=exc_info,
+                stacklevel=2,
+            )
+
+    def open(self, job_id: str) -> None:
+        """
+        Start following a job that has not finished yet.
+
+        Parameters:
+            job_id (str): Job identifier
+        """
+        self._channels.setdefault(job_id, _JobChannel())
+
+    def publish(self, event: JobEvent) -> None:
+        """
+        Persist an event and deliver it to the job's subscribers.
+
+        Parameters:
+            event (JobEvent): Numbered event
+        """
+        self.store.add_event(event)
+        channel = self._channels.get(event.job_id)
+        if channel is not None:
+            channel.append(event)
+
+    def close(self, job_id: str) -> None:
+        """
+        End the streams of a finished job's subscribers once they have read every event.
+
+        Parameters:
+            job_id (str): Job identifier
+        """
+        channel = self._channels.pop(job_id, None)
+        if channel is not None:
+            channel.close()
+
+    def subscribe(self, job_id: str, last_event_id: int = 0) -> AsyncIterator[JobEvent]:
+        """
+        Follow a job's events.
+
+        The subscription is attached immediately, so events published after this call
+        are never missed even before iteration starts.
+
+        Parameters:
+            job_id (str): Job identifier
+            last_event_id (int): Id of the last event the client received (default: 0, replay all)
+
+        Returns:
+            AsyncIterator[JobEvent]: Missed events followed by live events until the job finishes
+        """
+        channel = self._channels.get(job_id)
+        backlog = self.store.events(job_id, after_id=last_event_id)
+        self._log(
+            "Subscribed to job %s after event %s, replaying %s events",
+            job_id,
+            last_event_id,
+            len(backlog),
+            level=LoggingLevelsEnum.DEBUG,
+        )
+        return self._follow(channel, backlog, last_event_id)
+
+    @staticmethod
+    async def _follow(
+        channel: Optional[_JobChannel],
+        backlog: List[JobEvent],
+        cursor: int,
+    ) -> AsyncIterator[JobEvent]:
+        """
+        Yield the replayed events, then live events of the job's channel.
+
+        Parameters:
+            channel (Optional[_JobChannel]): Channel of the job, None if it has finished
+            backlog (List[JobEvent]): Persisted events after the client's cursor
+            cursor (int): Id of the last event the client received
+
+        Yields:
+            JobEvent: Events in order, each at most once
+        """
+        for event in backlog:
+            cursor = event.event_id
+            yield event
+
+        if channel is None:
+            return
+
+        index = 0
+        while True:
+            while index < len(channel.events):
+                event = channel.events[index]
+                index += 1
+                if event.event_id > cursor:
+                    cursor = event.event_id
+                    yield event
+
+            if channel.closed:
+                return
+
+            await channel.wait()
@@ -0,0 +1,475 @@
+import asyncio
+import shutil
+import time
+from logging import Logger
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set
+
+from src.server.annihilator.progress_tracker import JobEvent, ProgressTracker
+from src.server.enums.jobs import JobStatusEnum
+from src.server.enums.logging import LoggingLevelsEnum
+from src.server.metrics import JOBS_IN_FLIGHT, JOBS_QUEUED, QUEUE_WAIT, STAGE_SECONDS
+from src.server.schemas.annihilator_sse import ErrorSSESchema, ProgressSSESchema, ResultSSESchema
+from src.server.services.jobs.broadcaster import JobEventBroadcaster
+from src.server.services.jobs.store import JobRecord, JobStore
+from src.server.services.logs.structured import current_job_id
+from src.server.tracing import SpanContext, current_span, start_span
+
+_CANCELLED_ERROR = "Job cancelled"
+
+# Runs one job, reporting through the job's progress tracker, and yields the generated events
+JobRunner = Callable[[JobRecord, ProgressTracker], AsyncIterator[ProgressSSESchema]]
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another job."""
+
+
+class JobScheduler:
+    """
+    Run queued separation jobs with bounded concurrency.
+
+    Submitted jobs are persisted in the job store and started in submission order,
+    at most `max_concurrency` at a time, as background tasks independent of the
+    request that submitted them, so a job keeps running when its client disconnects.
+    Jobs that were running when the service stopped are queued again on start.
+    Every job has its own progress tracker whose numbered events are persisted and
+    fanned out to subscribers by the broadcaster; queued jobs get a "queued, position N"
+    event whenever their position changes. A cancelled job is removed from the queue
+    or, if it is running, its task is cancelled, which stops its separation work.
+    A job whose client disconnected is only cancelled if no client subscribes to its
+    events again within the grace period, so clients can resume with Last-Event-ID.
+
+    Parameters:
+        store (JobStore): Persistent job queue
+        runner (JobRunner): Coroutine generator that processes one job
+        max_concurrency (int): Maximum number of jobs running at once
+        max_queue_size (int): Maximum number of queued jobs before submissions are rejected
+        retention_seconds (float): How long finished jobs and their events are kept (default: 1 day)
+        progress_min_interval (float): Minimum seconds between separation progress events of a job
+            (default: 0.0)
+        disconnect_grace_seconds (float): Seconds a job whose client disconnected waits for a client
+            to resubscribe before it is cancelled, 0 cancels it at once (default: 60.0)
+        logger (Logger, optional): Python logger instance for operation tracking
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        runner: JobRunner,
+        max_concurrency: int,
+        max_queue_size: int,
+        retention_seconds: float = 24 * 60 * 60,
+        progress_min_interval: float = 0.0,
+        disconnect_grace_seconds: float = 60.0,
+        logger: Optional[Logger] = None,
+    ):
+        """Initialize the scheduler in stopped state."""
+        self.store = store
+        self.runner = runner
+        self.max_concurrency = max(max_concurrency, 1)
+        self.max_queue_size = max_queue_size
+        self.retention_seconds = retention_seconds
+        self.progress_min_interval = progress_min_interval
+        self.disconnect_grace_seconds = disconnect_grace_seconds
+        self.logger = logger
+        self.broadcaster = JobEventBroadcaster(store, logger)
+        self._trackers: Dict[str, ProgressTracker] = {}
+        self._positions: Dict[str, int] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancelled: Set[str] = set()
+        self._abandoned: Dict[str, asyncio.TimerHandle] = {}
+        self._wakeup = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _log(
+        self,
+        message: str,
+        *args: Any,
+        level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
+        exc_info: bool = False,
+    ) -> None:
+        """
+        Internal logging helper with class name prefix.
+
+        Parameters:
+            message (str): Message to log
+            *args (Any): Values %-formatted into the message, only if the level is enabled
+            level (LoggingLevelsEnum): Logging level (default: INFO)
+            exc_info (bool): Whether to include exception info (default: False)
+        """
+        if self.logger and self.logger.isEnabledFor(level.levelno):
+            getattr(self.logger, level.value)(
+                f"{self.__class__.__name__}: {message % args if args else message}",
+                exc_info=exc_info,
+                stacklevel=2,
+            )
+
+    @property
+    def is_started(self) -> bool:
+        """
+        Check if the dispatcher is running.
+
+        Returns:
+            bool: True if jobs are being dispatched
+        """
+        return self._dispatcher is not None and not self._dispatcher.done()
+
+    @property
+    def is_full(self) -> bool:
+        """
+        Check if the queue has reached its maximum size.
+
+        Returns:
+            bool: True if new submissions would be rejected
+        """
+        return self.store.count(JobStatusEnum.QUEUED) >= self.max_queue_size
+
+    def start(self) -> None:
+        """Requeue interrupted jobs and start dispatching. Must be called from the event loop."""
+        if self.is_started:
+            return
+
+        requeued = self.store.requeue_running()
+        if requeued:
+            self._log("Requeued %s interrupted jobs", requeued)
+
+        pruned = self.store.prune(finished_before=time.time() - self.retention_seconds)
+        if pruned:
+            self._log("Pruned %s finished jobs", pruned)
+
+        for job_id in self.store.queued():
+            self._tracker(job_id)
+
+        self._wakeup.set()
+        self._dispatcher = asyncio.create_task(self._dispatch_loop())
+        self._log(
+            "Started with max_concurrency=%s, max_queue_size=%s",
+            self.max_concurrency,
+            self.max_queue_size,
+        )
+
+    async def stop(self) -> None:
+        """
+        Stop dispatching and interrupt running jobs.
+
+        Interrupted jobs stay marked as running and are queued again on the next start.
+        """
+        tasks = list(self._running.values())
+        if self._dispatcher is not None:
+            tasks.append(self._dispatcher)
+            self._dispatcher = None
+
+        for handle in self._abandoned.values():
+            handle.cancel()
+        self._abandoned.clear()
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._log("Stopped")
+
+    def submit(self, job_id: str, input_path: Path, options: Optional[Dict[str, Any]] = None) -> JobRecord:
+        """
+        Add a job to the queue.
+
+        The job takes ownership of the input file and removes it when it finishes.
+        The current span is kept with the job, so its run continues the submitter's trace,
+        also when it is resumed after a restart.
+
+        Parameters:
+            job_id (str): Unique job identifier
+            input_path (Path): Spooled input audio, or spool directory of a batch
+            options (Dict[str, Any], optional): Separation options
+
+        Returns:
+            JobRecord: The queued job
+
+        Raises:
+            QueueFullError: If the queue is full
+        """
+        if self.is_full:
+            raise QueueFullError(f"Job queue is full ({self.max_queue_size} jobs waiting)")
+
+        options = dict(options or {})
+        span_context = current_span().context
+        if span_context is not None:
+            options["traceparent"] = span_context.traceparent
+
+        job = JobRecord(job_id=job_id, input_path=input_path, options=options)
+        self.store.add(job)
+        self._log("Queued job %s", job_id)
+
+        position = self.position(job_id)
+        self._tracker(job_id).queued_update(job_id=job_id, position=position)
+        self._positions[job_id] = position
+        self._wakeup.set()
+        return job
+
+    def request_cancel(self, job_id: str) -> bool:
+        """
+        Start cancelling a job without waiting for it to stop.
+
+        A queued job is finished as cancelled at once. A running job is interrupted
+        and recorded as cancelled once its task has stopped.
+
+        Parameters:
+            job_id (str): Job identifier
+
+        Returns:
+            bool: True if the job was queued or running
+        """
+        task = self._running.get(job_id)
+        if task is not None:
+            if job_id not in self._cancelled:
+                self._log("Cancelling running job %s", job_id)
+                self._cancelled.add(job_id)
+                task.cancel()
+            return True
+
+        job = self.store.get(job_id)
+        if job is None or job.status is not JobStatusEnum.QUEUED:
+            return False
+
+        self._log("Cancelling queued job %s", job_id)
+        self._tracker(job_id).error_update(error=_CANCELLED_ERROR)
+        self._finish(job, JobStatusEnum.CANCELLED, error=_CANCELLED_ERROR)
+        return True
+
+    def cancel_unless_resumed(self, job_id: str) -> None:
+        """
+        Cancel a job whose client disconnected, unless a client subscribes to it again in time.
+
+        Must be called from the event loop.
+
+        Parameters:
+            job_id (str): Job identifier
+        """
+        if self.disconnect_grace_seconds <= 0:
+            self.request_cancel(job_id)
+            return
+
+        previous = self._abandoned.pop(job_id, None)
+        if previous is not None:
+            previous.cancel()
+
+        self._log(
+            "Client of job %s disconnected, cancelling it unless it resumes within %ss",
+            job_id,
+            self.disconnect_grace_seconds,
+        )
+        self._abandoned[job_id] = asyncio.get_running_loop().call_later(
+            self.disconnect_grace_seconds, self._cancel_abandoned, job_id,
+        )
+
+    def _cancel_abandoned(self, job_id: str) -> None:
+        """
+        Cancel a job no client resubscribed to within the grace period.
+
+        Parameters:
+            job_id (str): Job identifier
+        """
+        if self._abandoned.pop(job_id, None) is not None:
+            self._log("No client resumed job %s", job_id)
+            self.request_cancel(job_id)
+
+    async def cancel(self, job_id: str) -> Optional[JobRecord]:
+        """
+        Cancel a queued or running job and wait until it has stopped.
+
+        Parameters:
+            job_id (str): Job identifier
+
+        Returns:
+            Optional[JobRecord]: The job in its final state, or None if unknown
+        """
+        if self.request_cancel(job_id):
+            task = self._running.get(job_id)
+            if task is not None:
+                await asyncio.wait({task})
+        return self.store.get(job_id)
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        """
+        Look up a job.
+
+        Parameters:
+            job_id (str): Job identifier
+
+        Returns:
+            Optional[JobRecord]: The job, or None if unknown
+        """
+        return self.store.get(job_id)
+
+    def position(self, job_id: str) -> Optional[int]:
+        """
+        Position of a job in the queue.
+
+        Parameters:
+            job_id (str): Job identifier
+
+        Returns:
+            Optional[int]: 1-based queue position, or None if the job is not queued
+        """
+        queued = self.store.queued()
+        return queued.index(job_id) + 1 if job_id in queued else None
+
+    def subscribe(self, job_id: str, last_event_id: int = 0) -> AsyncIterator[JobEvent]:
+        """
+        Follow the progress events of a job.
+
+        Parameters:
+            job_id (str): Job identifier
+            last_event_id (int): Id of the last event the client received (default: 0, replay all)
+
+        Returns:
+            AsyncIterator[JobEvent]: Missed events followed by live events until the job finishes
+
+        Note:
+            Subscribing keeps a job whose client disconnected from being cancelled
+        """
+        handle = self._abandoned.pop(job_id, None)
+        if handle is not None:
+            handle.cancel()
+            self._log("Job %s resumed by a client after event %s", job_id, last_event_id)
+        return self.broadcaster.subscribe(job_id, last_event_id=last_event_id)
+
+    def _tracker(self, job_id: str) -> ProgressTracker:
+        """
+        Get the event log of an unfinished job, creating it if needed.
+
+        Parameters:
+            job_id (str): Job identifier
+
+        Returns:
+            ProgressTracker: Tracker publishing the job's events
+        """
+        tracker = self._trackers.get(job_id)
+        if tracker is None:
+            self.broadcaster.open(job_id)
+            tracker = ProgressTracker(
+                self.logger,
+                job_id=job_id,
+                on_event=self.broadcaster.publish,
+                last_event_id=self.store.last_event_id(job_id),
+                min_interval=self.progress_min_interval,
+            )
+            self._trackers[job_id] = tracker
+        return tracker
+
+    def _publish_positions(self) -> None:
+        """Send a queue position event for every queued job whose position changed."""
+        positions = {job_id: position for position, job_id in enumerate(self.store.queued(), start=1)}
+        JOBS_QUEUED.set(len(positions))
+        for job_id, position in positions.items():
+            if self._positions.get(job_id) != position:
+                self._tracker(job_id).queued_update(job_id=job_id, position=position)
+        self._positions = positions
+
+    async def _dispatch_loop(self) -> None:
+        """Start queued jobs whenever a slot is free."""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while len(self._running) < self.max_concurrency:
+                job = self.store.claim_next()
+                if job is None:
+                    break
+
+                self._log("Starting job %s (%s/%s slots)", job.job_id, len(self._running) + 1, self.max_concurrency)
+                self._running[job.job_id] = asyncio.create_task(self._run(job))
+                JOBS_IN_FLIGHT.set(len(self._running))
+
+            self._publish_positions()
+
+    async def _run(self, job: JobRecord) -> None:
+        """
+        Run one job and record its outcome.
+
+        Parameters:
+            job (JobRecord): Claimed job
+        """
+        # The job's task runs in its own context, so everything it logs carries its id
+        current_job_id.set(job.job_id)
+        queue_wait = max(time.time() - job.created_at, 0.0)
+        STAGE_SECONDS.labels(QUEUE_WAIT).observe(queue_wait)
+
+        with start_span(
+            "JobScheduler._run",
+            {"job.id": job.job_id, "job.queue_wait_seconds": queue_wait},
+            parent=SpanContext.from_traceparent(job.options.get("traceparent")),
+        ) as span:
+            tracker = self._tracker(job.job_id)
+            status = JobStatusEnum.FAILED
+            result = None
+            error = None
+
+            try:
+                async for event in self.runner(job, tracker):
+                    if isinstance(event, ResultSSESchema):
+                        status, result = JobStatusEnum.DONE, event.result
+                    elif isinstance(event, ErrorSSESchema):
+                        status, error = JobStatusEnum.FAILED, event.error
+
+            except asyncio.CancelledError:
+                if job.job_id not in self._cancelled:
+                    self._running.pop(job.job_id, None)
+                    JOBS_IN_FLIGHT.set(len(self._running))
+                    self._log("Job %s interrupted, it will be resumed on restart", job.job_id)
+                    raise
+
+                self._cancelled.discard(job.job_id)
+                status, error = JobStatusEnum.CANCELLED, _CANCELLED_ERROR
+                tracker.error_update(error=error)
+
+            except Exception as e:
+                self._log(
+                    "Job %s failed: %s",
+                    job.job_id,
+                    e,
+                    level=LoggingLevelsEnum.ERROR,
+                    exc_info=True,
+                )
+                status, error = JobStatusEnum.FAILED, str(e)
+                tracker.error_update(error=error)
+
+            if status is JobStatusEnum.FAILED and error is None:
+                error = "Processing finished without a result"
+                tracker.error_update(error=error)
+
+            span.set_attribute("job.status", status.value)
+            self._finish(job, status, result=result, error=error)
+
+    def _finish(
+        self,
+        job: JobRecord,
+        status: JobStatusEnum,
+        result: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Record the final state of a job, remove its input and end its event streams.
+
+        Parameters:
+            job (JobRecord): Finished job
+            status (JobStatusEnum): Final status
+            result (Optional[str]): Result identifier of a successful job
+            error (Optional[str]): Error description of a failed or cancelled job
+        """
+        self.store.finish(job.job_id, status, result=result, error=error)
+        self.store.prune(finished_before=time.time() - self.retention_seconds)
+        if job.input_path.is_dir():
+            shutil.rmtree(job.input_path, ignore_errors=True)
+        else:
+            job.input_path.unlink(missing_ok=True)
+        self._running.pop(job.job_id, None)
+        JOBS_IN_FLIGHT.set(len(self._running))
+        handle = self._abandoned.pop(job.job_id, None)
+        if handle is not None:
+            handle.cancel()
+        self._trackers.pop(job.job_id, None)
+        self._positions.pop(job.job_id, None)
+        self.broadcaster.close(job.job_id)
+        self._log("Job %s finished: %r", job.job_id, status)
+        self._wakeup.set()
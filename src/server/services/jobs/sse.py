@@ -0,0 +1,122 @@
+import json
+from logging import Logger
+from typing import AsyncGenerator, AsyncIterator, Callable, Optional
+
+from src.server.annihilator.progress_tracker import JobEvent
+from src.server.metrics import EVENT_STREAMS, EVENT_STREAMS_OPENED
+
+
+async def _format_stream(
+    stream_format: str,
+    events: AsyncIterator[JobEvent],
+    format_event: Callable[[JobEvent], str],
+    format_error: Callable[[str], str],
+    closing: Optional[str],
+    logger: Optional[Logger] = None,
+    on_disconnect: Optional[Callable[[], None]] = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Format job progress events as a stream of text messages.
+
+    Parameters:
+        stream_format (str): Name of the format, the label of the stream metrics
+        events (AsyncIterator[JobEvent]): Job events, e.g. from `JobScheduler.subscribe`
+        format_event (Callable[[JobEvent], str]): Formats one event
+        format_error (Callable[[str], str]): Formats a streaming error
+        closing (str, optional): Final message of the stream, if the format has one
+        logger (Logger, optional): Python logger instance for stream tracking
+        on_disconnect (Callable[[], None], optional): Called if the client goes away
+            before the stream has ended
+
+    Yields:
+        str: Formatted messages
+    """
+    EVENT_STREAMS_OPENED.labels(stream_format).inc()
+    EVENT_STREAMS.labels(stream_format).inc()
+    completed = False
+    try:
+        async for event in events:
+            if logger:
+                logger.debug("Yielding progress update: %s", event)
+            yield format_event(event)
+        completed = True
+
+    except Exception as exc:
+        completed = True
+        if logger:
+            logger.error("Error while streaming job events: %s", exc, exc_info=True)
+        yield format_error(str(exc))
+
+    finally:
+        EVENT_STREAMS.labels(stream_format).dec()
+        if not completed and on_disconnect is not None:
+            if logger:
+                logger.info("Client disconnected before the stream ended")
+            on_disconnect()
+
+    if logger:
+        logger.debug("Closing event stream")
+    if closing is not None:
+        yield closing
+
+
+def sse_stream(
+    events: AsyncIterator[JobEvent],
+    logger: Optional[Logger] = None,
+    on_disconnect: Optional[Callable[[], None]] = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Format job progress events as a Server-Sent Events stream.
+
+    Parameters:
+        events (AsyncIterator[JobEvent]): Job events, e.g. from `JobScheduler.subscribe`
+        logger (Logger, optional): Python logger instance for stream tracking
+        on_disconnect (Callable[[], None], optional): Called if the client goes away
+            before the stream has ended
+
+    Returns:
+        AsyncGenerator[str, None]: SSE-formatted messages with event ids, including:
+            - Progress updates
+            - Error notifications
+            - Final results
+            - Stream closure
+    """
+    return _format_stream(
+        "sse",
+        events,
+        format_event=JobEvent.to_sse,
+        format_error=lambda error: f"data: {json.dumps({'error': error})}\n\n",
+        closing="event: close\n\n",
+        logger=logger,
+        on_disconnect=on_disconnect,
+    )
+
+
+def ndjson_stream(
+    events: AsyncIterator[JobEvent],
+    logger: Optional[Logger] = None,
+    on_disconnect: Optional[Callable[[], None]] = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Format job progress events as newline-delimited JSON, one event per line.
+
+    Every line is the event's JSON object with its event id added as `event_id`.
+
+    Parameters:
+        events (AsyncIterator[JobEvent]): Job events, e.g. from `JobScheduler.subscribe`
+        logger (Logger, optional): Python logger instance for stream tracking
+        on_disconnect (Callable[[], None], optional): Called if the client goes away
+            before the stream has ended
+
+    Returns:
+        AsyncGenerator[str, None]: JSON lines of the progress, error and result events
+    """
+    return _format_stream(
+        "ndjson",
+        events,
+        format_event=lambda event: json.dumps({"event_id": event.event_id, **json.loads(event.data)}) + "\n",
+        format_error=lambda error: json.dumps({"error": error}) + "\n",
+        closing=None,
+        logger=logger,
+        on_disconnect=on_disconnect,
+    )
@@ -0,0 +1,293 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.server.annihilator.progress_tracker import JobEvent
+from src.server.enums.jobs import JobStatusEnum
+
+_COLUMNS = "job_id, input_path, status, options, result, error, created_at, updated_at"
+
+
+@dataclass
+class JobRecord:
+    """
+    A separation job as persisted in the job store.
+
+    Attributes:
+        job_id (str): Unique job identifier, also used as the result name in S3
+        input_path (Path): Spooled input audio owned by the job
+        status (JobStatusEnum): Current lifecycle state
+        options (Dict[str, Any]): Separation options requested by the client, and the traceparent of
+            the span that submitted the job while tracing is enabled
+        result (Optional[str]): Result identifier once the job is done
+        error (Optional[str]): Error description if the job failed
+        created_at (float): Unix timestamp of submission
+        updated_at (float): Unix timestamp of the last status change
+    """
+
+    job_id: str
+    input_path: Path
+    status: JobStatusEnum = JobStatusEnum.QUEUED
+    options: Dict[str, Any] = field(default_factory=dict)
+    result: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "JobRecord":
+        """
+        Build a record from a database row selected with the store's column list.
+
+        Parameters:
+            row (tuple): Row of the jobs table
+
+        Returns:
+            JobRecord: The decoded record
+        """
+        job_id, input_path, status, options, result, error, created_at, updated_at = row
+        return cls(
+            job_id=job_id,
+            input_path=Path(input_path),
+            status=JobStatusEnum(status),
+            options=json.loads(options),
+            result=result,
+            error=error,
+            created_at=created_at,
+            updated_at=updated_at,
+        )
+
+
+class JobStore:
+    """
+    SQLite-backed queue of separation jobs and their event logs.
+
+    Jobs are kept in submission order so queued jobs survive a restart and are
+    resumed in the order they were received. The progress events of every job are
+    kept too, so clients can replay a job's stream after reconnecting. Every call
+    is a short local transaction, so the store can be used directly from the event loop.
+
+    Parameters:
+        path (Path): SQLite database file
+    """
+
+    def __init__(self, path: Path):
+        """Open the database and create the schema if needed."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "job_id TEXT NOT NULL UNIQUE, "
+            "input_path TEXT NOT NULL, "
+            "status TEXT NOT NULL, "
+            "options TEXT NOT NULL, "
+            "result TEXT, "
+            "error TEXT, "
+            "created_at REAL NOT NULL, "
+            "updated_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, seq)")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS job_events ("
+            "job_id TEXT NOT NULL, "
+            "event_id INTEGER NOT NULL, "
+            "data TEXT NOT NULL, "
+            "PRIMARY KEY (job_id, event_id))"
+        )
+
+    def add(self, job: JobRecord) -> None:
+        """
+        Append a new job to the queue.
+
+        Parameters:
+            job (JobRecord): Job to store
+        """
+        with self._lock:
+            self._connection.execute(
+                f"INSERT INTO jobs ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.job_id,
+                    str(job.input_path),
+                    job.status.value,
+                    json.dumps(job.options),
+                    job.result,
+                    job.error,
+                    job.created_at,
+                    job.updated_at,
+                ),
+            )
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        """
+        Look up a job.
+
+        Parameters:
+            job_id (str): Job identifier
+
+        Returns:
+            Optional[JobRecord]: The job, or None if unknown
+        """
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+            return JobRecord.from_row(row) if row is not None else None
+
+    def claim_next(self) -> Optional[JobRecord]:
+        """
+        Mark the oldest queued job as running and return it.
+
+        Returns:
+            Optional[JobRecord]: The claimed job, or None if the queue is empty
+        """
+        with self._lock:
+            row = self._connection.execute(
+                f"UPDATE jobs SET status = ?, updated_at = ? "
+                f"WHERE seq = (SELECT seq FROM jobs WHERE status = ? ORDER BY seq LIMIT 1) "
+                f"RETURNING {_COLUMNS}",
+                (JobStatusEnum.RUNNING.value, time.time(), JobStatusEnum.QUEUED.value),
+            ).fetchone()
+            return JobRecord.from_row(row) if row is not None else None
+
+    def finish(
+        self,
+        job_id: str,
+        status: JobStatusEnum,
+        result: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Record the final state of a job.
+
+        Parameters:
+            job_id (str): Job identifier
+            status (JobStatusEnum): Final status
+            result (Optional[str]): Result identifier of a successful job
+            error (Optional[str]): Error description of a failed job
+        """
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                (status.value, result, error, time.time(), job_id),
+            )
+
+    def queued(self) -> List[str]:
+        """
+        Identifiers of all queued jobs in queue order.
+
+        Returns:
+            List[str]: Queued job identifiers, oldest first
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT job_id FROM jobs WHERE status = ? ORDER BY seq",
+                (JobStatusEnum.QUEUED.value,),
+            ).fetchall()
+            return [row[0] for row in rows]
+
+    def count(self, status: JobStatusEnum) -> int:
+        """
+        Number of jobs in a state.
+
+        Parameters:
+            status (JobStatusEnum): State to count
+
+        Returns:
+            int: Number of jobs
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ?",
+                (status.value,),
+            ).fetchone()[0]
+
+    def requeue_running(self) -> int:
+        """
+        Put jobs that were running when the service stopped back in the queue.
+
+        Returns:
+            int: Number of requeued jobs
+        """
+        with self._lock:
+            return self._connection.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (JobStatusEnum.QUEUED.value, time.time(), JobStatusEnum.RUNNING.value),
+            ).rowcount
+
+    def add_event(self, event: JobEvent) -> None:
+        """
+        Append an event to a job's event log.
+
+        Parameters:
+            event (JobEvent): Numbered event
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO job_events (job_id, event_id, data) VALUES (?, ?, ?)",
+                (event.job_id, event.event_id, event.data),
+            )
+
+    def events(self, job_id: str, after_id: int = 0) -> List[JobEvent]:
+        """
+        Read a job's events in order.
+
+        Parameters:
+            job_id (str): Job identifier
+            after_id (int): Only return events with a greater id (default: 0, all events)
+
+        Returns:
+            List[JobEvent]: Events of the job
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT job_id, event_id, data FROM job_events WHERE job_id = ? AND event_id > ? ORDER BY event_id",
+                (job_id, after_id),
+            ).fetchall()
+            return [JobEvent(*row) for row in rows]
+
+    def last_event_id(self, job_id: str) -> int:
+        """
+        Id of the latest event of a job.
+
+        Parameters:
+            job_id (str): Job identifier
+
+        Returns:
+            int: Latest event id, or 0 if the job has no events
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COALESCE(MAX(event_id), 0) FROM job_events WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()[0]
+
+    def prune(self, finished_before: float) -> int:
+        """
+        Delete finished jobs and their events.
+
+        Parameters:
+            finished_before (float): Unix timestamp; jobs finished earlier are deleted
+
+        Returns:
+            int: Number of deleted jobs
+        """
+        statuses = [status.value for status in JobStatusEnum if status.is_finished]
+        condition = f"status IN ({', '.join('?' * len(statuses))}) AND updated_at < ?"
+        finished = (*statuses, finished_before)
+        with self._lock:
+            self._connection.execute(
+                f"DELETE FROM job_events WHERE job_id IN (SELECT job_id FROM jobs WHERE {condition})",
+                finished,
+            )
+            return self._connection.execute(
+                f"DELETE FROM jobs WHERE {condition}",
+                finished,
+            ).rowcount
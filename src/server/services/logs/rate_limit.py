@@ -0,0 +1,54 @@
+import time
+
+
+class LogRateLimiter:
+    """
+    Token bucket deciding which messages of a high-volume source are logged.
+
+    Up to `burst` messages are logged at once, then `rate` messages per second.
+    Rejected messages are counted, so the next logged message can report how many
+    were dropped in between.
+
+    Parameters:
+        rate (float): Messages per second logged once the burst is used up
+        burst (int): Messages logged back to back before rate limiting starts
+
+    Attributes:
+        suppressed (int): Messages rejected since the last call to `take_suppressed`
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """Initialize the limiter with a full bucket."""
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.suppressed = 0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def allow(self) -> bool:
+        """
+        Decide whether the next message may be logged.
+
+        Returns:
+            bool: True if the message should be logged, False if it is dropped
+        """
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+
+        self.suppressed += 1
+        return False
+
+    def take_suppressed(self) -> int:
+        """
+        Return and reset the number of dropped messages.
+
+        Returns:
+            int: Messages rejected since the last call
+        """
+        suppressed, self.suppressed = self.suppressed, 0
+        return suppressed
@@ -0,0 +1,106 @@
+import copy
+import json
+import logging
+import queue
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+# Id of the job the current task works on, added to every record logged from it
+current_job_id: ContextVar[Optional[str]] = ContextVar("current_job_id", default=None)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as one JSON object per line.
+
+    Every object has the time in UTC, level, logger, function and message, the id of
+    the job the record was logged for if any, and the formatted exception if one was
+    logged. Meant to be referenced from logger.ini as a formatter class.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record as JSON.
+
+        Parameters:
+            record (logging.LogRecord): Record to format
+
+        Returns:
+            str: JSON object of the record, without trailing newline
+        """
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "function": record.funcName,
+            "message": record.getMessage(),
+        }
+
+        # Records from a queue were stamped in the logging thread, others are formatted there
+        job_id = record.__dict__.get("job_id", current_job_id.get())
+        if job_id is not None:
+            entry["job_id"] = job_id
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    Hand log records to a background thread, keeping their job id and exception.
+
+    The message is merged with its arguments and the exception is formatted in the
+    logging thread, so the record can cross to the writer thread safely. Unlike the
+    base handler, the message is not formatted with the target handlers' layout here,
+    so the formatters of those handlers still see the separate fields.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Prepare a record for the queue.
+
+        Parameters:
+            record (logging.LogRecord): Record being logged
+
+        Returns:
+            logging.LogRecord: Copy of the record with its message merged and job id set
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.job_id = current_job_id.get()
+        return record
+
+
+def start_queue_logging(logger: logging.Logger) -> QueueListener:
+    """
+    Move the handlers of a logger behind a queue written by a background thread.
+
+    Logging calls then only enqueue the record, and formatting and I/O of the
+    handlers happen in the listener's thread, off the event loop.
+
+    Parameters:
+        logger (logging.Logger): Logger whose handlers are moved, usually the root logger
+
+    Returns:
+        QueueListener: The started listener, to be stopped on exit to flush the queue
+    """
+    handlers = list(logger.handlers)
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(StructuredQueueHandler(records))
+
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,443 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from logging import Logger
+from pathlib import Path
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Tuple
+
+from boto3.s3.transfer import TransferConfig  # type: ignore[import-untyped]
+from botocore.client import BaseClient  # type: ignore[import-untyped]
+from botocore.exceptions import ClientError  # type: ignore[import-untyped]
+
+from src.server.enums.logging import LoggingLevelsEnum
+from src.server.services.s3.uploader import S3Uploader
+
+# Error codes of a missing object, HEAD responses have no body and only carry the status
+_MISSING_CODES = ("404", "NoSuchKey", "NotFound")
+
+
+class AsyncS3Service:
+    """
+    Non-blocking S3 operations for use from the event loop.
+
+    boto3 calls are blocking, so every call is run on a dedicated, bounded thread pool
+    instead of the event loop thread. This keeps SSE streams and other requests
+    responsive while uploads and downloads are in progress, and caps the number of
+    concurrent S3 connections.
+
+    Parameters:
+        s3_client (BaseClient): Initialized boto3 S3 client
+        s3_bucket (str): Target S3 bucket name
+        executor (ThreadPoolExecutor): Thread pool dedicated to S3 calls
+        download_chunk_size (int): Size of chunks yielded by `download_stream` (default: 1 MiB)
+        logger (Logger, optional): Python logger instance for operation tracking
+        transfer_config (TransferConfig, optional): Multipart transfer tuning for uploads
+        max_attempts (int): Attempts per uploaded file before giving up (default: 1)
+        presign_client (BaseClient, optional): Client signing the URLs handed out to API clients,
+            configured with the endpoint they reach the storage at (default: the S3 client)
+    """
+
+    def __init__(
+        self,
+        s3_client: BaseClient,
+        s3_bucket: str,
+        executor: ThreadPoolExecutor,
+        download_chunk_size: int = 1024 * 1024,
+        logger: Optional[Logger] = None,
+        transfer_config: Optional[TransferConfig] = None,
+        max_attempts: int = 1,
+        presign_client: Optional[BaseClient] = None,
+    ):
+        """Initialize the async S3 service with client, bucket and thread pool."""
+        self.s3_client = s3_client
+        self.presign_client = presign_client or s3_client
+        self.s3_bucket = s3_bucket
+        self.executor = executor
+        self.download_chunk_size = download_chunk_size
+        self.logger = logger
+        self.uploader = S3Uploader(
+            s3_client,
+            s3_bucket,
+            logger,
+            transfer_config=transfer_config,
+            max_attempts=max_attempts,
+        )
+
+    def _log(
+        self,
+        message: str,
+        *args: Any,
+        level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
+        exc_info: bool = False,
+    ) -> None:
+        """
+        Internal logging helper with class name prefix.
+
+        Parameters:
+            message (str): Message to log
+            *args (Any): Values %-formatted into the message, only if the level is enabled
+            level (LoggingLevelsEnum): Logging level (default: INFO)
+            exc_info (bool): Whether to include exception info (default: False)
+        """
+        if self.logger and self.logger.isEnabledFor(level.levelno):
+            getattr(self.logger, level.value)(
+                f"{self.__class__.__name__}: {message % args if args else message}",
+                exc_info=exc_info,
+                stacklevel=2,
+            )
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking call on the S3 thread pool.
+
+        The call runs in a copy of the caller's context, like `asyncio.to_thread`, so its
+        log records carry the job id and its spans join the caller's trace.
+
+        Parameters:
+            func (Callable): Blocking function to call
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            Any: The function's return value
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self.executor, partial(context.run, func, *args, **kwargs))
+
+    async def _run_to_end(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking call on the S3 thread pool that a cancelled caller waits for.
+
+        A running boto3 transfer cannot be interrupted. Cancelling the caller drops the
+        call if it has not started yet, and otherwise waits for it to end before the
+        cancellation goes on, so the caller can remove whatever the call stored.
+
+        Parameters:
+            func (Callable): Blocking function to call
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            Any: The function's return value
+        """
+        context = contextvars.copy_context()
+        future = self.executor.submit(context.run, func, *args, **kwargs)
+        waiter = asyncio.wrap_future(future)
+        try:
+            return await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            if not future.cancel():
+                await asyncio.wait({waiter})
+            raise
+
+    async def upload_file(self, file_path: Path, s3_key: str) -> bool:
+        """
+        Upload a single file to S3 storage without blocking the event loop.
+
+        Parameters:
+            file_path (Path): Local filesystem path to the source file
+            s3_key (str): Destination key/path in S3 bucket
+
+        Returns:
+            bool: True if upload succeeded, False if any error occurred
+
+        Note:
+            Cancelling the caller waits for an upload that has already started to end
+        """
+        return await self._run_to_end(self.uploader.upload_file, file_path, s3_key)
+
+    async def upload_files_iter(
+        self,
+        files: Dict[str, Path],
+        s3_keys: Dict[str, str],
+    ) -> AsyncGenerator[Tuple[str, bool], None]:
+        """
+        Upload multiple files concurrently, yielding each result as soon as it is known.
+
+        Parameters:
+            files (Dict[str, Path]): Mapping of names to local file paths
+            s3_keys (Dict[str, str]): Destination key for every name in `files`
+
+        Yields:
+            Tuple[str, bool]: Name of the file and whether its upload succeeded
+
+        Note:
+            Closing the generator early skips the uploads that have not started and
+            waits for the running ones to end
+        """
+        async def upload(name: str) -> Tuple[str, bool]:
+            return name, await self.upload_file(files[name], s3_keys[name])
+
+        tasks = [asyncio.create_task(upload(name)) for name in files]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def upload_files(self, files: Dict[str, Path], s3_prefix: str) -> Dict[str, bool]:
+        """
+        Upload multiple files to S3 under a common prefix concurrently.
+
+        Parameters:
+            files (Dict[str, Path]): Mapping of filename stems to local file paths
+            s3_prefix (str): Common prefix for all uploaded files in S3
+
+        Returns:
+            Dict[str, bool]: Upload result per filename stem
+
+        Note:
+            Every file is attempted, a failure does not stop the other uploads
+        """
+        s3_keys = {stem: f"{s3_prefix}/{stem}" for stem in files}
+        return {stem: success async for stem, success in self.upload_files_iter(files, s3_keys)}
+
+    async def get_object(self, s3_key: str, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Fetch an object's metadata and body handle without blocking the event loop.
+
+        Parameters:
+            s3_key (str): Key of the object in the bucket
+            **kwargs: Extra arguments passed to boto3 `get_object`
+
+        Returns:
+            Dict[str, Any]: boto3 `get_object` response
+
+        Raises:
+            ClientError: For AWS-specific S3 operation failures
+        """
+        self._log("Fetching object from S3: %s", s3_key, level=LoggingLevelsEnum.DEBUG)
+        return await self._run(self.s3_client.get_object, Bucket=self.s3_bucket, Key=s3_key, **kwargs)
+
+    def _list_objects(self, s3_prefix: str) -> List[Dict[str, Any]]:
+        """
+        List the objects directly under a prefix, page by page.
+
+        Parameters:
+            s3_prefix (str): Prefix ending with "/"
+
+        Returns:
+            List[Dict[str, Any]]: Listed objects
+        """
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        return [
+            item
+            for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=s3_prefix, Delimiter="/")
+            for item in page.get("Contents", [])
+        ]
+
+    async def list_objects(self, s3_prefix: str) -> List[Dict[str, Any]]:
+        """
+        List the objects directly under a prefix, without those in deeper "directories".
+
+        Parameters:
+            s3_prefix (str): Prefix ending with "/"
+
+        Returns:
+            List[Dict[str, Any]]: `Key`, `Size`, `LastModified` and `ETag` of every object, by key
+
+        Raises:
+            ClientError: For AWS-specific S3 operation failures
+        """
+        return await self._run(self._list_objects, s3_prefix)
+
+    def _delete_prefix(self, s3_prefix: str) -> int:
+        """
+        Delete every object under a prefix, page by page.
+
+        Parameters:
+            s3_prefix (str): Prefix ending with "/"
+
+        Returns:
+            int: Number of deleted objects
+        """
+        deleted = 0
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=s3_prefix):
+            objects = [{"Key": item["Key"]} for item in page.get("Contents", [])]
+            if objects:
+                self.s3_client.delete_objects(Bucket=self.s3_bucket, Delete={"Objects": objects})
+                deleted += len(objects)
+        return deleted
+
+    async def delete_prefix(self, s3_prefix: str) -> int:
+        """
+        Delete every object under a prefix, including those in deeper "directories".
+
+        Parameters:
+            s3_prefix (str): Prefix ending with "/"
+
+        Returns:
+            int: Number of deleted objects
+
+        Raises:
+            ClientError: For AWS-specific S3 operation failures
+        """
+        self._log("Deleting objects under %s", s3_prefix, level=LoggingLevelsEnum.DEBUG)
+        return await self._run_to_end(self._delete_prefix, s3_prefix)
+
+    async def object_size(self, s3_key: str) -> Optional[int]:
+        """
+        Read the size of an object without downloading it.
+
+        Parameters:
+            s3_key (str): Key of the object in the bucket
+
+        Returns:
+            Optional[int]: Size in bytes, or None if the object does not exist
+
+        Raises:
+            ClientError: For AWS-specific S3 operation failures other than a missing object
+        """
+        try:
+            response = await self._run(self.s3_client.head_object, Bucket=self.s3_bucket, Key=s3_key)
+            return response["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in _MISSING_CODES:
+                return None
+            raise
+
+    async def object_exists(self, s3_key: str) -> bool:
+        """
+        Check whether an object exists without downloading it.
+
+        Parameters:
+            s3_key (str): Key of the object in the bucket
+
+        Returns:
+            bool: True if the object exists
+
+        Raises:
+            ClientError: For AWS-specific S3 operation failures other than a missing object
+        """
+        return await self.object_size(s3_key) is not None
+
+    async def head_object(self, s3_key: str) -> Dict[str, Any]:
+        """
+        Fetch an object's metadata without its body.
+
+        Parameters:
+            s3_key (str): Key of the object in the bucket
+
+        Returns:
+            Dict[str, Any]: boto3 `head_object` response, including `ETag` and `ContentLength`
+
+        Raises:
+            NoSuchKey: If the object does not exist, as raised by `get_object`
+            ClientError: For other AWS-specific S3 operation failures
+        """
+        try:
+            return await self._run(self.s3_client.head_object, Bucket=self.s3_bucket, Key=s3_key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in _MISSING_CODES:
+                raise self.s3_client.exceptions.NoSuchKey(e.response, "HeadObject") from e
+            raise
+
+    def presigned_get_url(self, s3_key: str, expires_in: int) -> str:
+        """
+        Sign a GET URL of an object, so another process can read it without credentials.
+
+        Signing is computed locally and does not contact S3.
+
+        Parameters:
+            s3_key (str): Key of the object in the bucket
+            expires_in (int): Seconds the URL stays valid
+
+        Returns:
+            str: Presigned URL on the client's endpoint
+        """
+        return self.s3_client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.s3_bucket, "Key": s3_key},
+            ExpiresIn=expires_in,
+        )
+
+    def public_download_url(
+        self,
+        s3_key: str,
+        expires_in: int,
+        filename: Optional[str] = None,
+        media_type: Optional[str] = None,
+    ) -> str:
+        """
+        Sign a GET URL of an object for API clients, who then download it from the storage directly.
+
+        Parameters:
+            s3_key (str): Key of the object in the bucket
+            expires_in (int): Seconds the URL stays valid
+            filename (str, optional): Download filename sent in the Content-Disposition of the response
+            media_type (str, optional): Content-Type of the response, instead of the stored one
+
+        Returns:
+            str: Presigned URL on the public endpoint
+        """
+        params = {"Bucket": self.s3_bucket, "Key": s3_key}
+        if filename is not None:
+            params["ResponseContentDisposition"] = f"attachment; filename={filename}"
+        if media_type is not None:
+            params["ResponseContentType"] = media_type
+        return self.presign_client.generate_presigned_url("get_object", Params=params, ExpiresIn=expires_in)
+
+    def public_upload_url(self, s3_key: str, expires_in: int) -> str:
+        """
+        Sign a PUT URL of an object for API clients, who then upload it to the storage directly.
+
+        Parameters:
+            s3_key (str): Key the uploaded object is stored at
+            expires_in (int): Seconds the URL stays valid
+
+        Returns:
+            str: Presigned URL on the public endpoint
+        """
+        return self.presign_client.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": self.s3_bucket, "Key": s3_key},
+            ExpiresIn=expires_in,
+        )
+
+    async def download_file(self, s3_key: str, file_path: Path) -> None:
+        """
+        Download an object to a local file with multipart transfers, without blocking the event loop.
+
+        Parameters:
+            s3_key (str): Key of the object in the bucket
+            file_path (Path): Local destination path
+
+        Raises:
+            ClientError: For AWS-specific S3 operation failures
+
+        Note:
+            Cancelling the caller waits for a download that has already started to end
+        """
+        self._log("Downloading %s to %s", s3_key, file_path, level=LoggingLevelsEnum.DEBUG)
+        await self._run_to_end(
+            self.s3_client.download_file,
+            self.s3_bucket,
+            s3_key,
+            str(file_path),
+            Config=self.uploader.transfer_config,
+        )
+
+    async def download_stream(self, response: Dict[str, Any]) -> AsyncGenerator[bytes, None]:
+        """
+        Stream an object body in chunks, reading each chunk on the S3 thread pool.
+
+        Parameters:
+            response (Dict[str, Any]): Response of `get_object`
+
+        Yields:
+            bytes: Consecutive chunks of the object body
+        """
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await self._run(body.read, self.download_chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            await self._run(body.close)
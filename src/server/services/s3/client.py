@@ -1,12 +1,15 @@
+import threading
 from logging import Logger
-from typing import Optional
+from typing import Any, Optional
 
 import boto3  # type: ignore[import-untyped]
 from botocore.client import BaseClient  # type: ignore[import-untyped]
+from botocore.config import Config  # type: ignore[import-untyped]
 from botocore.exceptions import ClientError, EndpointConnectionError  # type: ignore[import-untyped]
 
 from src.server.config import Settings
 from src.server.enums.logging import LoggingLevelsEnum
+from src.server.metrics import instrument_s3_client
 
 
 class S3Client:
@@ -14,7 +17,9 @@ class S3Client:
     A managed client for interacting with S3 storage service.
 
     Provides connection management, automatic reconnection, and bucket verification.
-    Handles all S3 operations with proper error handling and logging.
+    Handles all S3 operations with proper error handling and logging. Initialization
+    and reconnection are serialized, so the health monitor thread and requests never
+    create clients concurrently.
 
     Parameters:
         logger (Logger, optional): Python logger instance for operation tracking.
@@ -22,15 +27,19 @@ class S3Client:
 
     Attributes:
         _client (Optional[BaseClient]): Internal boto3 S3 client instance
+        _presign_client (Optional[BaseClient]): Client signing URLs for the public endpoint, if one is set
         _settings (Optional[Settings]): Configuration settings for S3 connection
         _logger (Logger): Logger instance for operation tracking
+        _lock (threading.RLock): Serializes creating and replacing the client
     """
 
     def __init__(self, logger: Optional[Logger] = None):
         """Initialize the S3 client manager in unconfigured state."""
         self._client: Optional[BaseClient] = None
+        self._presign_client: Optional[BaseClient] = None
         self._settings: Optional[Settings] = None
         self._logger = logger
+        self._lock = threading.RLock()
         self._log(
             message="S3Client initialized with no settings and no client",
             level=LoggingLevelsEnum.DEBUG,
@@ -39,7 +48,7 @@ class S3Client:
     def _log(
         self,
         message: str,
-        *,
+        *args: Any,
         level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
         exc_info=False,
     ):
@@ -48,13 +57,15 @@ class S3Client:
 
         Parameters:
             message (str): Log message content
+            *args (Any): Values %-formatted into the message, only if the level is enabled
             level (LoggingLevelsEnum): Log severity level. Defaults to INFO.
             exc_info (bool): Whether to include exception info. Defaults to False.
         """
-        if self._logger:
+        if self._logger and self._logger.isEnabledFor(level.levelno):
             getattr(self._logger, level.value)(
-                f"{self.__class__.__name__}: {message}",
+                f"{self.__class__.__name__}: {message % args if args else message}",
                 exc_info=exc_info,
+                stacklevel=2,
             )
 
     @property
@@ -65,17 +76,15 @@ class S3Client:
         Returns:
             bool: True if client is ready for use, False otherwise
         """
-        initialized = self._client is not None
-        self._log(
-            f"Checking if client is initialized: {initialized}",
-            level=LoggingLevelsEnum.DEBUG,
-        )
-        return initialized
+        return self._client is not None
 
     def initialize(self, settings: Settings) -> None:
         """
         Configure and initialize the S3 client with application settings.
 
+        Does nothing if the client is already initialized, also when another thread
+        initialized it while this call waited for the lock.
+
         Parameters:
             settings (Settings): Application configuration containing S3 credentials
 
@@ -83,16 +92,22 @@ class S3Client:
             RuntimeError: If client creation fails
             ValueError: If settings are invalid
         """
-        self._log(
-            f"Initializing S3 client with settings: endpoint={settings.S3_ENDPOINT_URL}, "
-            f"region={settings.S3_REGION}, bucket={settings.S3_BUCKET}"
-        )
+        with self._lock:
+            if self.is_initialized:
+                return
 
-        self._settings = settings
-        self._reinitialize_client()
+            self._log(
+                "Initializing S3 client with settings: endpoint=%s, region=%s, bucket=%s",
+                settings.S3_ENDPOINT_URL,
+                settings.S3_REGION,
+                settings.S3_BUCKET,
+            )
 
-        self._ensure_bucket_exists()
-        self._log("S3 client initialized successfully")
+            self._settings = settings
+            self._reinitialize_client()
+
+            self._ensure_bucket_exists()
+            self._log("S3 client initialized successfully")
 
     def _reinitialize_client(self) -> None:
         """
@@ -108,7 +123,8 @@ class S3Client:
             raise ValueError(error_msg)
 
         self._log(
-            f"Creating new S3 client with endpoint: {self._settings.S3_ENDPOINT_URL}",
+            "Creating new S3 client with endpoint: %s",
+            self._settings.S3_ENDPOINT_URL,
             level=LoggingLevelsEnum.DEBUG,
         )
         try:
@@ -118,11 +134,28 @@ class S3Client:
                 aws_access_key_id=self._settings.S3_ACCESS_KEY,
                 aws_secret_access_key=self._settings.S3_SECRET_KEY,
                 region_name=self._settings.S3_REGION,
+                config=Config(
+                    retries={"max_attempts": self._settings.S3_MAX_ATTEMPTS, "mode": "standard"},
+                    max_pool_connections=self._settings.S3_MAX_POOL_CONNECTIONS,
+                ),
             )
+            instrument_s3_client(self._client)
             self._log("S3 client created successfully")
+
+            # Signing is local, so this client never connects to the public endpoint
+            if self._settings.S3_PUBLIC_ENDPOINT_URL:
+                self._presign_client = boto3.client(
+                    "s3",
+                    endpoint_url=self._settings.S3_PUBLIC_ENDPOINT_URL,
+                    aws_access_key_id=self._settings.S3_ACCESS_KEY,
+                    aws_secret_access_key=self._settings.S3_SECRET_KEY,
+                    region_name=self._settings.S3_REGION,
+                    config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+                )
         except Exception as e:
             self._log(
-                message=f"Failed to create S3 client: {str(e)}",
+                "Failed to create S3 client: %s",
+                e,
                 level=LoggingLevelsEnum.ERROR,
             )
             raise RuntimeError(f"Failed to create S3 client: {str(e)}")
@@ -141,29 +174,33 @@ class S3Client:
             raise ValueError(error_msg)
 
         bucket_name = self._settings.S3_BUCKET
-        self._log(f"Checking bucket existence: {bucket_name}")
+        self._log("Checking bucket existence: %s", bucket_name)
 
         try:
             existing_buckets = [
                 bucket["Name"] for bucket in self._client.list_buckets()["Buckets"]
             ]
             self._log(
-                message=f"Existing buckets: {existing_buckets}",
+                "Existing buckets: %s",
+                existing_buckets,
                 level=LoggingLevelsEnum.DEBUG,
             )
 
             if bucket_name not in existing_buckets:
-                self._log(f"Bucket {bucket_name} not found, creating new one")
+                self._log("Bucket %s not found, creating new one", bucket_name)
                 self._client.create_bucket(Bucket=bucket_name)
-                self._log(f"Bucket {bucket_name} created successfully")
+                self._log("Bucket %s created successfully", bucket_name)
             else:
                 self._log(
-                    message=f"Bucket {bucket_name} already exists",
+                    "Bucket %s already exists",
+                    bucket_name,
                     level=LoggingLevelsEnum.DEBUG,
                 )
         except (ClientError, EndpointConnectionError) as e:
             self._log(
-                message=f"Error checking/creating bucket {bucket_name}: {str(e)}",
+                "Error checking/creating bucket %s: %s",
+                bucket_name,
+                e,
                 level=LoggingLevelsEnum.ERROR,
             )
             raise RuntimeError(
@@ -171,7 +208,8 @@ class S3Client:
             )
         except Exception as e:
             self._log(
-                message=f"Unexpected error during bucket verification: {str(e)}",
+                "Unexpected error during bucket verification: %s",
+                e,
                 level=LoggingLevelsEnum.ERROR,
             )
             raise RuntimeError(f"Unexpected error during bucket verification: {str(e)}")
@@ -192,11 +230,27 @@ class S3Client:
                 self._log(error_msg, level=LoggingLevelsEnum.ERROR)
                 raise ValueError(error_msg)
 
-            self._log("Client is None, reinitializing...")
-            self._reinitialize_client()
+            with self._lock:
+                if self._client is None:
+                    self._log("Client is None, reinitializing...")
+                    self._reinitialize_client()
 
         return self._client
 
+    def get_presign_client(self) -> BaseClient:
+        """
+        Get the client that signs URLs handed out to API clients.
+
+        Returns:
+            BaseClient: Client configured with the public endpoint, or the S3 client if none is set
+
+        Raises:
+            ValueError: If client is not initialized
+        """
+        if self._presign_client is not None:
+            return self._presign_client
+        return self.get_client()
+
     def check_connection(self) -> bool:
         """
         Verify active connection to S3 service.
@@ -223,41 +277,27 @@ class S3Client:
             return True
         except (ClientError, EndpointConnectionError) as e:
             self._log(
-                message=f"S3 connection check failed: {str(e)}",
+                "S3 connection check failed: %s",
+                e,
                 level=LoggingLevelsEnum.WARNING,
             )
             return False
         except Exception as e:
             self._log(
-                f"Unexpected error during connection check: {str(e)}",
+                "Unexpected error during connection check: %s",
+                e,
                 level=LoggingLevelsEnum.ERROR,
             )
             return False
 
-    def reconnect_if_needed(self) -> bool:
+    def reconnect(self) -> None:
         """
-        Reconnect to S3 if connection is lost.
+        Replace the S3 client, dropping its pooled connections.
 
-        Returns:
-            bool: True if reconnection was performed, False otherwise
+        Raises:
+            ValueError: If settings are not configured
+            RuntimeError: If client creation fails
         """
-        if not self.check_connection():
-            self._log(
-                message="S3 connection lost, attempting to reconnect...",
-                level=LoggingLevelsEnum.WARNING,
-            )
-            try:
-                self._reinitialize_client()
-                self._log("Reconnection attempt completed")
-                return True
-            except Exception as e:
-                self._log(
-                    message=f"Failed to reconnect: {str(e)}",
-                    level=LoggingLevelsEnum.ERROR,
-                )
-                return False
-        self._log(
-            message="No reconnection needed",
-            level=LoggingLevelsEnum.DEBUG,
-        )
-        return False
+        with self._lock:
+            self._reinitialize_client()
+        self._log("Reconnection attempt completed")
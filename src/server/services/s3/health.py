@@ -0,0 +1,184 @@
+import threading
+import time
+from logging import Logger
+from typing import Any, Optional
+
+from src.server.config import Settings
+from src.server.enums.circuit import CircuitStateEnum
+from src.server.enums.logging import LoggingLevelsEnum
+from src.server.services.s3.client import S3Client
+
+
+class S3HealthMonitor:
+    """
+    Keep track of the S3 connection in a background thread, behind a circuit breaker.
+
+    Requests only read the cached state, so no request waits on a connection check.
+    The connection is checked every interval. After a number of consecutive failed
+    checks the circuit opens and requests needing S3 are rejected at once instead of
+    running into retries and timeouts. Once the reset timeout has passed, a trial
+    check (half-open) reconnects the client and closes the circuit, or opens it again.
+
+    Parameters:
+        s3_client (S3Client): Managed S3 client to check and reconnect
+        logger (Logger, optional): Python logger instance for operation tracking
+
+    Attributes:
+        state (CircuitStateEnum): Current state of the circuit
+        failures (int): Consecutive failed checks
+        last_checked (Optional[float]): Monotonic time of the last finished check
+    """
+
+    def __init__(self, s3_client: S3Client, logger: Optional[Logger] = None):
+        """Initialize the monitor with a closed circuit and no thread running."""
+        self.s3_client = s3_client
+        self.logger = logger
+        self.state = CircuitStateEnum.CLOSED
+        self.failures = 0
+        self.last_checked: Optional[float] = None
+        self._settings: Optional[Settings] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _log(
+        self,
+        message: str,
+        *args: Any,
+        level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
+        exc_info: bool = False,
+    ) -> None:
+        """
+        Internal logging helper with class name prefix.
+
+        Parameters:
+            message (str): Message to log
+            *args (Any): Values %-formatted into the message, only if the level is enabled
+            level (LoggingLevelsEnum): Logging level (default: INFO)
+            exc_info (bool): Whether to include exception info (default: False)
+        """
+        if self.logger and self.logger.isEnabledFor(level.levelno):
+            getattr(self.logger, level.value)(
+                f"{self.__class__.__name__}: {message % args if args else message}",
+                exc_info=exc_info,
+                stacklevel=2,
+            )
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Check if the background thread is running.
+
+        Returns:
+            bool: True if the connection is being monitored, False otherwise
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_available(self) -> bool:
+        """
+        Check if requests may use S3, without contacting it.
+
+        Returns:
+            bool: True unless the circuit is open or a trial check is running
+        """
+        return self.state is CircuitStateEnum.CLOSED
+
+    def start(self, settings: Settings) -> None:
+        """
+        Start checking the connection in the background.
+
+        The client is initialized by the first check if it is not yet, so the
+        application starts even while S3 is unreachable.
+
+        Parameters:
+            settings (Settings): Application settings containing S3 and circuit configuration
+        """
+        if self.is_running:
+            return
+
+        self._settings = settings
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._monitor, name="s3-health", daemon=True)
+        self._thread.start()
+        self._log(
+            "Started S3 health monitor: interval=%ss, threshold=%s, reset=%ss",
+            settings.S3_HEALTHCHECK_INTERVAL,
+            settings.S3_CIRCUIT_FAILURE_THRESHOLD,
+            settings.S3_CIRCUIT_RESET_TIMEOUT,
+        )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the background thread.
+
+        Parameters:
+            timeout (float): Seconds to wait for a running check to finish
+        """
+        if self._thread is None:
+            return
+
+        self._stopped.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self._log("Stopped S3 health monitor")
+
+    def _check(self) -> bool:
+        """
+        Check the connection once, initializing or reconnecting the client as needed.
+
+        Returns:
+            bool: True if S3 is reachable, False otherwise
+        """
+        try:
+            if not self.s3_client.is_initialized:
+                self.s3_client.initialize(self._settings)
+                return True
+            if not self.s3_client.check_connection():
+                return False
+            if self.state is CircuitStateEnum.HALF_OPEN:
+                # Pooled connections may be stale after an outage
+                self.s3_client.reconnect()
+            return True
+        except Exception as e:
+            self._log("S3 connection check failed: %s", e, level=LoggingLevelsEnum.WARNING)
+            return False
+
+    def _record(self, healthy: bool) -> None:
+        """
+        Move the circuit to the state following a check.
+
+        Parameters:
+            healthy (bool): Outcome of the check
+        """
+        if healthy:
+            if self.state is not CircuitStateEnum.CLOSED:
+                self._log("S3 connection recovered, closing circuit")
+            self.failures = 0
+            self.state = CircuitStateEnum.CLOSED
+            return
+
+        self.failures += 1
+        if self.state is CircuitStateEnum.HALF_OPEN or (
+            self.state is CircuitStateEnum.CLOSED and self.failures >= self._settings.S3_CIRCUIT_FAILURE_THRESHOLD
+        ):
+            self._log(
+                "S3 unreachable after %s checks, opening circuit",
+                self.failures,
+                level=LoggingLevelsEnum.ERROR,
+            )
+            self.state = CircuitStateEnum.OPEN
+
+    def _monitor(self) -> None:
+        """Background thread checking the connection until stopped."""
+        while not self._stopped.is_set():
+            if self.state is CircuitStateEnum.OPEN:
+                self.state = CircuitStateEnum.HALF_OPEN
+            self._record(self._check())
+            self.last_checked = time.monotonic()
+
+            interval = (
+                self._settings.S3_CIRCUIT_RESET_TIMEOUT
+                if self.state is CircuitStateEnum.OPEN
+                else self._settings.S3_HEALTHCHECK_INTERVAL
+            )
+            self._stopped.wait(interval)
@@ -1,11 +1,16 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 from logging import Logger
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
+from boto3.s3.transfer import TransferConfig  # type: ignore[import-untyped]
 from botocore.client import BaseClient  # type: ignore[import-untyped]
 from botocore.exceptions import ClientError  # type: ignore[import-untyped]
 
 from src.server.enums.logging import LoggingLevelsEnum
+from src.server.enums.tracing import SpanKindEnum
+from src.server.tracing import start_span
 
 
 class S3Uploader:
@@ -13,12 +18,17 @@ class S3Uploader:
     A utility class for uploading files to S3 storage.
 
     Provides methods for single and batch file uploads with consistent logging
-    and error handling.
+    and error handling. Large files are sent as multipart uploads tuned by the
+    transfer config; individual failed parts are retried by the client's retry
+    policy, and a failed file is retried as a whole with exponential backoff.
 
     Parameters:
         s3_client (BaseClient): Initialized boto3 S3 client
         s3_bucket (str): Target S3 bucket name
         logger (Logger, optional): Python logger instance for operation tracking
+        transfer_config (TransferConfig, optional): Multipart threshold, chunk size and concurrency
+        max_attempts (int): Attempts per file before giving up (default: 1)
+        retry_backoff (float): Delay before the first retry in seconds, doubled per retry (default: 0.5)
 
     Attributes:
         s3_client (BaseClient): Configured S3 client instance
@@ -26,16 +36,27 @@ class S3Uploader:
         logger (Logger): Optional logger for operation tracking
     """
 
-    def __init__(self, s3_client: BaseClient, s3_bucket: str, logger: Optional[Logger] = None):
+    def __init__(
+        self,
+        s3_client: BaseClient,
+        s3_bucket: str,
+        logger: Optional[Logger] = None,
+        transfer_config: Optional[TransferConfig] = None,
+        max_attempts: int = 1,
+        retry_backoff: float = 0.5,
+    ):
         """Initialize the S3 uploader with client, bucket and optional logger."""
         self.s3_client = s3_client
         self.s3_bucket = s3_bucket
         self.logger = logger
+        self.transfer_config = transfer_config
+        self.max_attempts = max(max_attempts, 1)
+        self.retry_backoff = retry_backoff
 
     def _log(
         self,
         message: str,
-        *,
+        *args: Any,
         level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
         exc_info: bool = False,
     ):
@@ -44,18 +65,20 @@ class S3Uploader:
 
         Parameters:
             message (str): Log message content
+            *args (Any): Values %-formatted into the message, only if the level is enabled
             level (LoggerLevelsEnum, optional): Log severity level. Defaults to INFO.
             exc_info (bool, optional): Whether to include exception info. Defaults to False.
         """
-        if self.logger:
+        if self.logger and self.logger.isEnabledFor(level.levelno):
             getattr(self.logger, level.value)(
-                f"{self.__class__.__name__}: {message}",
+                f"{self.__class__.__name__}: {message % args if args else message}",
                 exc_info=exc_info,
+                stacklevel=2,
             )
 
-    def upload_file(self, file_path: Path, s3_key: str) -> bool:
+    def _upload_once(self, file_path: Path, s3_key: str) -> bool:
         """
-        Upload a single file to S3 storage.
+        Make a single attempt to upload a file.
 
         Parameters:
             file_path (Path): Local filesystem path to the source file
@@ -63,20 +86,22 @@ class S3Uploader:
 
         Returns:
             bool: True if upload succeeded, False if any error occurred
-
-        Raises:
-            ClientError: For AWS-specific S3 operation failures
-            Exception: For unexpected upload errors
         """
-        self._log(f"Attempting to upload file to S3: {file_path} -> {s3_key}")
         try:
-            self.s3_client.upload_file(str(file_path), self.s3_bucket, s3_key)
-            self._log(f"Successfully uploaded file to S3: {s3_key}")
+            self.s3_client.upload_file(
+                str(file_path),
+                self.s3_bucket,
+                s3_key,
+                Config=self.transfer_config,
+            )
+            self._log("Successfully uploaded file to S3: %s", s3_key)
             return True
 
         except ClientError as e:
             self._log(
-                message=f"S3 upload error for {file_path}: {str(e)}",
+                "S3 upload error for %s: %s",
+                file_path,
+                e,
                 level=LoggingLevelsEnum.ERROR,
                 exc_info=True,
             )
@@ -84,29 +109,70 @@ class S3Uploader:
 
         except Exception as e:
             self._log(
-                message=f"Unexpected error during S3 upload: {str(e)}",
+                "Unexpected error during S3 upload: %s",
+                e,
                 level=LoggingLevelsEnum.ERROR,
                 exc_info=True,
             )
             return False
 
-    def upload_files(self, files: Dict[str, Path], s3_prefix: str) -> bool:
+    def upload_file(self, file_path: Path, s3_key: str) -> bool:
         """
-        Upload multiple files to S3 under a common prefix.
+        Upload a single file to S3 storage, retrying failed uploads with backoff.
+
+        Parameters:
+            file_path (Path): Local filesystem path to the source file
+            s3_key (str): Destination key/path in S3 bucket
+
+        Returns:
+            bool: True if upload succeeded, False if every attempt failed
+        """
+        self._log("Attempting to upload file to S3: %s -> %s", file_path, s3_key)
+        with start_span(
+            "S3Uploader.upload_file",
+            {"s3.key": s3_key, "file.size": file_path.stat().st_size if file_path.is_file() else None},
+            kind=SpanKindEnum.CLIENT,
+        ) as span:
+            for attempt in range(1, self.max_attempts + 1):
+                span.set_attribute("s3.attempts", attempt)
+                if self._upload_once(file_path, s3_key):
+                    return True
+
+                if attempt < self.max_attempts:
+                    delay = self.retry_backoff * 2 ** (attempt - 1)
+                    self._log(
+                        "Retrying upload of %s in %.1fs (attempt %s/%s)",
+                        s3_key,
+                        delay,
+                        attempt + 1,
+                        self.max_attempts,
+                        level=LoggingLevelsEnum.WARNING,
+                    )
+                    time.sleep(delay)
+
+            span.set_error(f"Upload failed after {self.max_attempts} attempts")
+        return False
+
+    def upload_files(self, files: Dict[str, Path], s3_prefix: str) -> Dict[str, bool]:
+        """
+        Upload multiple files to S3 under a common prefix concurrently.
 
         Parameters:
             files (Dict[str, Path]): Mapping of filename stems to local file paths
             s3_prefix (str): Common prefix for all uploaded files in S3
 
         Returns:
-            bool: True if all uploads succeeded, False if any failed
+            Dict[str, bool]: Upload result per filename stem
 
         Note:
-            Stops on first failure and returns False immediately
+            Every file is attempted, a failure does not stop the other uploads
         """
-        for stem, file_path in files.items():
-            s3_key = f"{s3_prefix}/{stem}"
-            if not self.upload_file(file_path, s3_key):
-                return False
-
-        return True
+        if not files:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=len(files)) as executor:
+            futures = {
+                stem: executor.submit(self.upload_file, file_path, f"{s3_prefix}/{stem}")
+                for stem, file_path in files.items()
+            }
+            return {stem: future.result() for stem, future in futures.items()}
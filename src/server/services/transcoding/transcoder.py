@@ -0,0 +1,181 @@
+import asyncio
+import tempfile
+from logging import Logger
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.server.annihilator.audio import transcode
+from src.server.enums.audio import AudioFormatEnum
+from src.server.enums.logging import LoggingLevelsEnum
+from src.server.services.cache.result_cache import ResultCache
+from src.server.services.s3.async_service import AsyncS3Service
+
+# Format of the stem kept for every separation, every download format is derived from it
+MASTER_FORMAT = AudioFormatEnum.FLAC
+
+
+class StemTranscoder:
+    """
+    Provide separated stems in any download format from their lossless masters.
+
+    A separation stores one lossless master per stem. The first download of a stem
+    in another format or bitrate transcodes the master and stores the result in S3
+    under a key derived from the format and bitrate, next to the master, so later
+    downloads of the same variant are a plain GET. Concurrent first requests for the
+    same variant share a single transcode. Stored variants count towards the size of
+    the cached result they belong to.
+
+    Parameters:
+        s3_service (AsyncS3Service): Non-blocking S3 service holding the stems
+        result_cache (ResultCache, optional): Cache the stored variants are counted in
+        logger (Logger, optional): Python logger instance for operation tracking
+    """
+
+    def __init__(
+        self,
+        s3_service: AsyncS3Service,
+        result_cache: Optional[ResultCache] = None,
+        logger: Optional[Logger] = None,
+    ):
+        """Initialize the transcoder with no transcodes in progress."""
+        self.s3_service = s3_service
+        self.result_cache = result_cache
+        self.logger = logger
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    def _log(
+        self,
+        message: str,
+        *args: Any,
+        level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
+        exc_info: bool = False,
+    ) -> None:
+        """
+        Internal logging helper with class name prefix.
+
+        Parameters:
+            message (str): Message to log
+            *args (Any): Values %-formatted into the message, only if the level is enabled
+            level (LoggingLevelsEnum): Logging level (default: INFO)
+            exc_info (bool): Whether to include exception info (default: False)
+        """
+        if self.logger and self.logger.isEnabledFor(level.levelno):
+            getattr(self.logger, level.value)(
+                f"{self.__class__.__name__}: {message % args if args else message}",
+                exc_info=exc_info,
+                stacklevel=2,
+            )
+
+    @staticmethod
+    def master_key(result_prefix: str, stem: str) -> str:
+        """
+        S3 key of a stem's lossless master.
+
+        Parameters:
+            result_prefix (str): S3 prefix of the separation result, ending with "/"
+            stem (str): Stem name, e.g. "vocals"
+
+        Returns:
+            str: Key of the master
+        """
+        return f"{result_prefix}{stem}.{MASTER_FORMAT.value}"
+
+    @staticmethod
+    def variant_key(result_prefix: str, stem: str, audio_format: AudioFormatEnum, bitrate: str) -> str:
+        """
+        S3 key of a stem in a download format.
+
+        Parameters:
+            result_prefix (str): S3 prefix of the separation result, ending with "/"
+            stem (str): Stem name, e.g. "vocals"
+            audio_format (AudioFormatEnum): Download format
+            bitrate (str): Download bitrate, ignored for lossless formats
+
+        Returns:
+            str: Key of the master for the master format, otherwise of the derived variant
+        """
+        if audio_format is MASTER_FORMAT:
+            return StemTranscoder.master_key(result_prefix, stem)
+
+        name = stem if audio_format.is_lossless else f"{stem}-{bitrate}"
+        return f"{result_prefix}variants/{name}.{audio_format.value}"
+
+    async def ensure_variant(
+        self,
+        result_prefix: str,
+        stem: str,
+        audio_format: AudioFormatEnum,
+        bitrate: str,
+    ) -> str:
+        """
+        Make sure a stem exists in S3 in the requested format, transcoding it if needed.
+
+        Parameters:
+            result_prefix (str): S3 prefix of the separation result, ending with "/"
+            stem (str): Stem name, e.g. "vocals"
+            audio_format (AudioFormatEnum): Download format
+            bitrate (str): Download bitrate, ignored for lossless formats
+
+        Returns:
+            str: S3 key of the stem in the requested format
+
+        Raises:
+            FileNotFoundError: If the result has no master for the stem
+            RuntimeError: If the transcoded variant cannot be stored
+        """
+        s3_key = self.variant_key(result_prefix, stem, audio_format, bitrate)
+        if s3_key == self.master_key(result_prefix, stem) or await self.s3_service.object_exists(s3_key):
+            return s3_key
+
+        task = self._in_flight.get(s3_key)
+        if task is None:
+            task = asyncio.create_task(
+                self._transcode(result_prefix, self.master_key(result_prefix, stem), s3_key, audio_format, bitrate)
+            )
+            self._in_flight[s3_key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(s3_key, None))
+
+        # Shielded so a disconnecting client does not abort a transcode others may be waiting for
+        await asyncio.shield(task)
+        return s3_key
+
+    async def _transcode(
+        self,
+        result_prefix: str,
+        master_key: str,
+        s3_key: str,
+        audio_format: AudioFormatEnum,
+        bitrate: str,
+    ) -> None:
+        """
+        Transcode a master and store the result.
+
+        Parameters:
+            result_prefix (str): S3 prefix of the separation result, ending with "/"
+            master_key (str): S3 key of the lossless master
+            s3_key (str): Destination S3 key of the variant
+            audio_format (AudioFormatEnum): Variant format
+            bitrate (str): Variant bitrate, ignored for lossless formats
+
+        Raises:
+            FileNotFoundError: If the master does not exist
+            RuntimeError: If the variant cannot be uploaded
+        """
+        if not await self.s3_service.object_exists(master_key):
+            raise FileNotFoundError(f"No lossless master at {master_key}")
+
+        self._log("Transcoding %s to %r %s", master_key, audio_format, bitrate)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            master_path = Path(temp_dir) / f"master.{MASTER_FORMAT.value}"
+            output_path = Path(temp_dir) / f"variant.{audio_format.value}"
+
+            await self.s3_service.download_file(master_key, master_path)
+            await asyncio.to_thread(transcode, master_path, output_path, audio_format.value, bitrate)
+
+            if not await self.s3_service.upload_file(output_path, s3_key):
+                raise RuntimeError(f"Failed to store transcoded variant {s3_key}")
+
+            if self.result_cache is not None:
+                await asyncio.to_thread(self.result_cache.add_object, result_prefix, output_path.stat().st_size)
+
+        self._log("Stored variant %s", s3_key)
@@ -0,0 +1,318 @@
+import asyncio
+import shutil
+import time
+from dataclasses import dataclass, field
+from logging import Logger
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.requests import Request
+
+from src.server.enums.logging import LoggingLevelsEnum
+from src.server.metrics import STAGE_SECONDS, UPLOAD_RECEIVE
+
+# Maximum size of a non-file form field
+_MAX_FIELD_SIZE = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured maximum size."""
+
+
+class InvalidUploadError(Exception):
+    """Raised when a request is not a valid multipart upload."""
+
+
+@dataclass
+class SpooledUpload:
+    """
+    An upload written to a spool file on disk.
+
+    Attributes:
+        path (Path): Spool file containing the uploaded audio
+        filename (Optional[str]): Original client-side filename
+        size (int): Number of bytes written to the spool file
+        fields (Dict[str, str]): Other text fields of the multipart form
+    """
+
+    path: Path
+    filename: Optional[str]
+    size: int
+    fields: Dict[str, str] = field(default_factory=dict)
+
+
+class _PartState:
+    """Headers and destination of the multipart part currently being parsed."""
+
+    def __init__(self):
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.header_field = b""
+        self.header_value = b""
+        self.name: Optional[str] = None
+        self.filename: Optional[str] = None
+        self.value = bytearray()
+        self.upload: Optional[SpooledUpload] = None
+        self.spool_file: Optional[BinaryIO] = None
+
+
+class UploadSpooler:
+    """
+    Stream a multipart upload straight to a spool file without buffering it in memory.
+
+    The request body is read chunk by chunk and the file part is written to disk as it
+    arrives. Batch requests may carry many file parts, each spooled to its own file.
+    The configured maximum size is checked against the Content-Length header up front
+    and against the bytes actually received while streaming, so oversized uploads are
+    rejected before they are fully received.
+
+    Parameters:
+        spool_dir (Path): Directory for spool files
+        max_bytes (int): Maximum accepted request body size
+        file_field (str): Name of the form field holding the audio (default: "file")
+        logger (Logger, optional): Python logger instance for operation tracking
+    """
+
+    def __init__(
+        self,
+        spool_dir: Path,
+        max_bytes: int,
+        file_field: str = "file",
+        logger: Optional[Logger] = None,
+    ):
+        """Initialize the spooler and make sure the spool directory exists."""
+        self.spool_dir = spool_dir
+        self.max_bytes = max_bytes
+        self.file_field = file_field
+        self.logger = logger
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+
+    def _log(
+        self,
+        message: str,
+        *args: Any,
+        level: LoggingLevelsEnum = LoggingLevelsEnum.INFO,
+        exc_info: bool = False,
+    ) -> None:
+        """
+        Internal logging helper with class name prefix.
+
+        Parameters:
+            message (str): Message to log
+            *args (Any): Values %-formatted into the message, only if the level is enabled
+            level (LoggingLevelsEnum): Logging level (default: INFO)
+            exc_info (bool): Whether to include exception info (default: False)
+        """
+        if self.logger and self.logger.isEnabledFor(level.levelno):
+            getattr(self.logger, level.value)(
+                f"{self.__class__.__name__}: {message % args if args else message}",
+                exc_info=exc_info,
+                stacklevel=2,
+            )
+
+    def _check_content_length(self, request: Request) -> None:
+        """
+        Reject requests that announce a body larger than the limit.
+
+        Parameters:
+            request (Request): Incoming request
+
+        Raises:
+            UploadTooLargeError: If Content-Length exceeds the maximum size
+        """
+        content_length = request.headers.get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            raise UploadTooLargeError(
+                f"Upload of {content_length} bytes exceeds the limit of {self.max_bytes} bytes"
+            )
+
+    @staticmethod
+    def _flush(writes: List[Tuple[BinaryIO, bytes]], finished: List[BinaryIO]) -> None:
+        """
+        Write received file data to the spool files and close files whose part has ended.
+
+        Parameters:
+            writes (List[Tuple[BinaryIO, bytes]]): Data to append, in arrival order
+            finished (List[BinaryIO]): Spool files that receive no more data
+        """
+        for spool_file, data in writes:
+            spool_file.write(data)
+        for spool_file in finished:
+            spool_file.close()
+
+    async def _receive(
+        self,
+        request: Request,
+        spool_path: Callable[[int], Path],
+        max_files: int,
+    ) -> Tuple[List[SpooledUpload], Dict[str, str]]:
+        """
+        Stream every file part of the request body into its own spool file.
+
+        Parameters:
+            request (Request): Incoming multipart/form-data request
+            spool_path (Callable[[int], Path]): Returns the spool file of the n-th file part
+            max_files (int): Maximum number of file parts accepted
+
+        Returns:
+            Tuple[List[SpooledUpload], Dict[str, str]]: Spooled files in request order,
+                and the other text fields of the form
+
+        Raises:
+            UploadTooLargeError: If the body exceeds the maximum size
+            InvalidUploadError: If the body is not multipart or has too many file parts
+        """
+        self._check_content_length(request)
+        started = time.perf_counter()
+
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        boundary = params.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise InvalidUploadError("Expected a multipart/form-data request")
+
+        part = _PartState()
+        fields: Dict[str, str] = {}
+        uploads: List[SpooledUpload] = []
+        spool_files: List[BinaryIO] = []
+        pending_data: List[Tuple[BinaryIO, bytes]] = []
+        finished_files: List[BinaryIO] = []
+
+        def on_part_begin() -> None:
+            nonlocal part
+            part = _PartState()
+
+        def on_header_field(data: bytes, start: int, end: int) -> None:
+            part.header_field += data[start:end]
+
+        def on_header_value(data: bytes, start: int, end: int) -> None:
+            part.header_value += data[start:end]
+
+        def on_header_end() -> None:
+            part.headers.append((part.header_field.lower(), part.header_value))
+            part.header_field = b""
+            part.header_value = b""
+
+        def on_headers_finished() -> None:
+            for header_field, header_value in part.headers:
+                if header_field == b"content-disposition":
+                    _, options = parse_options_header(header_value)
+                    part.name = options.get(b"name", b"").decode("latin-1")
+                    if b"filename" in options:
+                        part.filename = options[b"filename"].decode("utf-8", errors="replace")
+
+            if part.name == self.file_field and part.filename is not None:
+                if len(uploads) >= max_files:
+                    raise InvalidUploadError(f"At most {max_files} files are accepted per request")
+                path = spool_path(len(uploads))
+                spool_files.append(open(path, "wb"))
+                uploads.append(SpooledUpload(path=path, filename=part.filename, size=0))
+                part.upload = uploads[-1]
+                part.spool_file = spool_files[-1]
+
+        def on_part_data(data: bytes, start: int, end: int) -> None:
+            if part.upload is not None:
+                pending_data.append((part.spool_file, data[start:end]))
+                part.upload.size += end - start
+            elif part.name:
+                part.value += data[start:end]
+                if len(part.value) > _MAX_FIELD_SIZE:
+                    raise InvalidUploadError(f"Form field {part.name} is too large")
+
+        def on_part_end() -> None:
+            if part.upload is not None:
+                finished_files.append(part.spool_file)
+            elif part.name:
+                fields[part.name] = part.value.decode("utf-8", errors="replace")
+
+        parser = MultipartParser(
+            boundary,
+            callbacks={
+                "on_part_begin": on_part_begin,
+                "on_header_field": on_header_field,
+                "on_header_value": on_header_value,
+                "on_header_end": on_header_end,
+                "on_headers_finished": on_headers_finished,
+                "on_part_data": on_part_data,
+                "on_part_end": on_part_end,
+            },
+        )
+
+        received = 0
+        try:
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > self.max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds the limit of {self.max_bytes} bytes")
+
+                parser.write(chunk)
+                if pending_data or finished_files:
+                    writes, finished = list(pending_data), list(finished_files)
+                    pending_data.clear()
+                    finished_files.clear()
+                    await asyncio.to_thread(self._flush, writes, finished)
+
+            parser.finalize()
+        except BaseException:
+            for upload in uploads:
+                upload.path.unlink(missing_ok=True)
+            raise
+        finally:
+            for spool_file in spool_files:
+                spool_file.close()
+
+        STAGE_SECONDS.labels(UPLOAD_RECEIVE).observe(time.perf_counter() - started)
+        for upload in uploads:
+            upload.fields = fields
+            self._log("Spooled upload %s to %s: %s bytes", upload.filename, upload.path, upload.size)
+        return uploads, fields
+
+    async def spool(self, request: Request, name: str) -> SpooledUpload:
+        """
+        Stream the request body into a spool file.
+
+        Parameters:
+            request (Request): Incoming multipart/form-data request
+            name (str): Name of the spool file inside the spool directory
+
+        Returns:
+            SpooledUpload: Location and metadata of the spooled audio
+
+        Raises:
+            UploadTooLargeError: If the body exceeds the maximum size
+            InvalidUploadError: If the body is not multipart or has no file part
+        """
+        uploads, _ = await self._receive(request, lambda index: self.spool_dir / name, max_files=1)
+        if not uploads:
+            raise InvalidUploadError(f"Form field {self.file_field} with a file is required")
+        return uploads[0]
+
+    async def spool_batch(
+        self,
+        request: Request,
+        name: str,
+        max_files: int,
+    ) -> Tuple[Path, List[SpooledUpload], Dict[str, str]]:
+        """
+        Stream a request with any number of files into a spool directory, one file per part.
+
+        Parameters:
+            request (Request): Incoming multipart/form-data request
+            name (str): Name of the spool directory inside the spool directory
+            max_files (int): Maximum number of files accepted
+
+        Returns:
+            Tuple[Path, List[SpooledUpload], Dict[str, str]]: Spool directory, spooled files in
+                request order named by their index, and the other text fields of the form
+
+        Raises:
+            UploadTooLargeError: If the body exceeds the maximum size
+            InvalidUploadError: If the body is not multipart or has too many files
+        """
+        directory = self.spool_dir / name
+        directory.mkdir()
+        try:
+            uploads, fields = await self._receive(request, lambda index: directory / f"{index:05d}", max_files)
+        except BaseException:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+        return directory, uploads, fields
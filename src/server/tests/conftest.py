@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+import boto3
+import pytest
+from moto import mock_aws
+
+BUCKET = "annihilator-tests"
+
+# Settings are read when the server modules are imported, so they are provided before any test module loads
+_app_files = Path(tempfile.mkdtemp(prefix="app-files-"))
+shutil.copy(Path(__file__).parent.parent / "logger.ini", _app_files)
+
+for name, value in {
+    "APP_FILES_PATH": str(_app_files),
+    "TITLE": "Annihilator",
+    "DESCRIPTION": "Tests",
+    "SUMMARY": "Tests",
+    "VERSION": "0.0.0",
+    "CONTACT": "{}",
+    "LICENSE_INFO": "{}",
+    "S3_ENDPOINT_URL": "http://localhost:4566",
+    "S3_ACCESS_KEY": "testing",
+    "S3_SECRET_KEY": "testing",
+    "S3_REGION": "us-east-1",
+    "S3_BUCKET": BUCKET,
+}.items():
+    os.environ.setdefault(name, value)
+
+from src.server.services.s3.async_service import AsyncS3Service  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def s3_service() -> Iterator[AsyncS3Service]:
+    """Non-blocking S3 service on a mocked bucket."""
+    with mock_aws():
+        s3_client = boto3.client(
+            "s3", region_name="us-east-1", aws_access_key_id="testing", aws_secret_access_key="testing",
+        )
+        s3_client.create_bucket(Bucket=BUCKET)
+        executor = ThreadPoolExecutor(max_workers=4)
+        yield AsyncS3Service(s3_client, BUCKET, executor)
+        executor.shutdown(wait=True)
@@ -0,0 +1,411 @@
+"""
+Cancel a job at every stage and check that nothing of it is left behind, and fail one
+in its worker and check that the reason reaches the client.
+
+The jobs run through a real scheduler, S3 service and separator pool. S3 is mocked
+with moto, pool workers run a stand-in for the Spleeter worker, and the ffmpeg
+encoders are replaced, so no model or ffmpeg is needed.
+"""
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+import numpy as np
+import pytest
+
+from src.server.annihilator import packing as packing_module
+from src.server.annihilator import segmenter as segmenter_module
+from src.server.annihilator import separator_pool as separator_pool_module
+from src.server.annihilator import spleeter as spleeter_module
+from src.server.annihilator import streaming as streaming_module
+from src.server.annihilator.packing import SeparationPacker
+from src.server.annihilator.progress_tracker import ProgressTracker
+from src.server.annihilator.segmenter import SegmentedSeparator
+from src.server.annihilator.separator_pool import SeparatorPool
+from src.server.annihilator.spleeter import Spleeter
+from src.server.enums.jobs import JobStatusEnum
+from src.server.services.jobs.scheduler import JobScheduler
+from src.server.services.jobs.store import JobStore
+from src.server.services.s3.async_service import AsyncS3Service
+
+STEMS = ["vocals", "accompaniment"]
+
+# Input contents telling a stand-in worker to hang in a file job, as a long separation would,
+# or to fail it as an undecodable input would
+BLOCK = b"block"
+BROKEN = b"broken"
+AUDIO = b"audio"
+
+BROKEN_REASON = "Invalid data found when processing input"
+
+
+def _fake_worker_main(index, generation, models, model_path, memory_budget, task_queue, result_queue) -> None:
+    """
+    Stand-in for a separator worker process, run in place of the Spleeter worker.
+
+    File jobs write a small file per stem, hang if their input is BLOCK or fail if it is
+    BROKEN, and packed jobs do so for every track. Segment jobs return silence for the
+    first window and hang on every later one.
+    """
+    result_queue.put((separator_pool_module._READY, index, generation, None, None, None))
+    while True:
+        job = task_queue.get()
+        if job is separator_pool_module._STOP:
+            break
+
+        if job["kind"] == separator_pool_module._FILE_JOB:
+            content = Path(job["input_path"]).read_bytes()
+            if content == BLOCK:
+                threading.Event().wait()
+            if content == BROKEN:
+                result_queue.put((separator_pool_module._DONE, index, generation, job["job_id"], None, BROKEN_REASON))
+                continue
+            for stem in STEMS:
+                (Path(job["output_dir"]) / f"{stem}.{job['codec']}").write_bytes(b"stem")
+            payload = {}
+        elif job["kind"] == separator_pool_module._PACKED_JOB:
+            if any(Path(item["input_path"]).read_bytes() == BLOCK for item in job["items"]):
+                threading.Event().wait()
+            for item in job["items"]:
+                for stem in STEMS:
+                    (Path(item["output_dir"]) / f"{stem}.{job['codec']}").write_bytes(b"stem")
+            payload = [({}, None)] * len(job["items"])
+        else:
+            if job["offset"] > 0:
+                threading.Event().wait()
+            payload = ({stem: np.zeros((job["samples"], 2), dtype=np.float32) for stem in STEMS}, {})
+        result_queue.put((separator_pool_module._DONE, index, generation, job["job_id"], payload, None))
+
+
+class _FakeEncoder:
+    """Stand-in for the ffmpeg stem encoder, writing the raw samples."""
+
+    def __init__(self, output_path: Path, *args, **kwargs):
+        self.output_path = output_path
+        self._file = open(output_path, "wb")
+
+    def write(self, waveform: np.ndarray) -> None:
+        self._file.write(waveform.tobytes())
+
+    def close(self) -> int:
+        self._file.close()
+        return 0
+
+    def kill(self) -> None:
+        self._file.close()
+
+
+class _FakeHlsEncoder:
+    """Stand-in for the ffmpeg HLS muxer, completing one segment per written piece."""
+
+    def __init__(self, playlist_path: Path, *args, **kwargs):
+        self.output_path = playlist_path
+        self._segments: List[str] = []
+
+    def write(self, waveform: np.ndarray) -> None:
+        name = f"{self.output_path.stem}_{len(self._segments):05d}.ts"
+        (self.output_path.parent / name).write_bytes(waveform.tobytes())
+        self._segments.append(name)
+        entries = "".join(f"#EXTINF:1.0,\n{segment}\n" for segment in self._segments)
+        self.output_path.write_text(f"#EXTM3U\n{entries}")
+
+    def close(self) -> int:
+        return 0
+
+    def kill(self) -> None:
+        pass
+
+
+async def _wait_for(condition: Callable[[], bool], timeout: float = 30.0) -> None:
+    """Poll a condition until it holds, failing the test after the timeout."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for the condition"
+        await asyncio.sleep(0.05)
+
+
+@pytest.fixture
+def temp_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Directory receiving the temporary directories of the jobs."""
+    root = tmp_path / "tmp"
+    root.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(root))
+    return root
+
+
+@pytest.fixture
+def separator_pool(monkeypatch: pytest.MonkeyPatch) -> Iterator[SeparatorPool]:
+    """Pool of one worker running the stand-in worker."""
+    monkeypatch.setattr(separator_pool_module, "_worker_main", _fake_worker_main)
+    pool = SeparatorPool()
+    pool.initialize(size=1, models=["2stems"], model_path=Path("."), memory_budget=0, healthcheck_interval=0.2)
+    assert pool.wait_until_ready(timeout=60)
+    yield pool
+    pool.shutdown(timeout=1)
+
+
+@pytest.fixture
+def no_ffmpeg(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Replace every use of ffmpeg and ffprobe in the parent process."""
+    monkeypatch.setattr(spleeter_module, "probe_duration", lambda source: 3.0)
+    monkeypatch.setattr(segmenter_module, "AudioEncoder", _FakeEncoder)
+    monkeypatch.setattr(streaming_module, "HlsEncoder", _FakeHlsEncoder)
+
+
+def _create_scheduler(
+    tmp_path: Path,
+    create_spleeter: Callable[[ProgressTracker], Spleeter],
+    max_concurrency: int = 1,
+) -> JobScheduler:
+    """Create a scheduler running one job at a time by default, each separated by a new Spleeter."""
+
+    async def run_job(job, tracker):
+        spleeter = create_spleeter(tracker)
+        async for event in spleeter.separate_with_progress(
+            input_path=job.input_path,
+            filename=job.job_id,
+            s3_output_prefix="processed/",
+            s3_input_key=job.options.get("s3_key"),
+        ):
+            yield event
+
+    return JobScheduler(
+        store=JobStore(tmp_path / "jobs.sqlite3"), runner=run_job, max_concurrency=max_concurrency, max_queue_size=10,
+    )
+
+
+def _submit(scheduler: JobScheduler, tmp_path: Path, job_id: str, content: Optional[bytes], **options):
+    """Submit a job, with its input spooled unless it is read from S3."""
+    input_path = tmp_path / "spool" / job_id
+    input_path.parent.mkdir(exist_ok=True)
+    if content is not None:
+        input_path.write_bytes(content)
+    scheduler.submit(job_id, input_path, options)
+    return input_path
+
+
+def _status(scheduler: JobScheduler, job_id: str) -> JobStatusEnum:
+    return scheduler.store.get(job_id).status
+
+
+def _result_objects(s3_service: AsyncS3Service, job_id: str) -> List[str]:
+    response = s3_service.s3_client.list_objects_v2(Bucket=s3_service.s3_bucket, Prefix=f"processed/{job_id}/")
+    return [item["Key"] for item in response.get("Contents", [])]
+
+
+async def _cancel(scheduler: JobScheduler, job_id: str) -> None:
+    """Cancel a job and wait until it has finished."""
+    assert scheduler.request_cancel(job_id)
+    await _wait_for(lambda: _status(scheduler, job_id).is_finished)
+
+
+def _assert_cleaned_up(scheduler, s3_service, temp_root: Path, input_path: Path, job_id: str) -> None:
+    assert _status(scheduler, job_id) is JobStatusEnum.CANCELLED
+    assert not input_path.exists()
+    assert list(temp_root.iterdir()) == []
+    assert _result_objects(s3_service, job_id) == []
+
+
+async def _assert_worker_restarted(pool: SeparatorPool) -> None:
+    assert pool.health()["restarts"] == {0: 1}
+    await asyncio.to_thread(pool.wait_until_ready, 60)
+    assert pool.health()["idle"] == 1
+
+
+@pytest.mark.anyio
+async def test_cancel_queued_job(tmp_path, temp_root, s3_service, separator_pool):
+    scheduler = _create_scheduler(tmp_path, lambda tracker: Spleeter(
+        s3_service, codec="wav", separator_pool=separator_pool, progress_tracker=tracker,
+    ))
+    scheduler.start()
+    try:
+        blocker_path = _submit(scheduler, tmp_path, "blocker", BLOCK)
+        queued_path = _submit(scheduler, tmp_path, "queued", AUDIO)
+        await _wait_for(lambda: separator_pool.health()["busy"] == 1)
+
+        await _cancel(scheduler, "queued")
+        assert _status(scheduler, "queued") is JobStatusEnum.CANCELLED
+        assert not queued_path.exists()
+        assert _result_objects(s3_service, "queued") == []
+        # Only the running job has a temporary directory, the queued one never started
+        assert len(list(temp_root.iterdir())) == 1
+        assert separator_pool.health()["busy"] == 1
+
+        await _cancel(scheduler, "blocker")
+        _assert_cleaned_up(scheduler, s3_service, temp_root, blocker_path, "blocker")
+        await _assert_worker_restarted(separator_pool)
+    finally:
+        await scheduler.stop()
+
+
+@pytest.mark.anyio
+async def test_cancel_during_input_download(tmp_path, temp_root, s3_service, monkeypatch):
+    # The spleeter CLI needs a local copy of an S3 input, pool workers read it through a URL
+    s3_service.s3_client.put_object(Bucket=s3_service.s3_bucket, Key="uploads/input.wav", Body=AUDIO)
+    started, release = threading.Event(), threading.Event()
+    download_file = s3_service.s3_client.download_file
+
+    def blocking_download(bucket, key, filename, **kwargs):
+        Path(filename).write_bytes(b"partial")
+        started.set()
+        release.wait(30)
+        return download_file(bucket, key, filename, **kwargs)
+
+    async def separation_not_started(*args, **kwargs):
+        raise AssertionError("Separation started after the job was cancelled")
+
+    monkeypatch.setattr(s3_service.s3_client, "download_file", blocking_download)
+    monkeypatch.setattr(Spleeter, "_run_spleeter_command", separation_not_started)
+
+    scheduler = _create_scheduler(tmp_path, lambda tracker: Spleeter(s3_service, codec="wav", progress_tracker=tracker))
+    scheduler.start()
+    try:
+        input_path = _submit(scheduler, tmp_path, "download", None, s3_key="uploads/input.wav")
+        await _wait_for(started.is_set)
+
+        assert scheduler.request_cancel("download")
+        # The running download is waited for, so it cannot write the spool file after the cleanup
+        await asyncio.sleep(0.2)
+        assert _status(scheduler, "download") is JobStatusEnum.RUNNING
+        release.set()
+        await _wait_for(lambda: _status(scheduler, "download").is_finished)
+
+        _assert_cleaned_up(scheduler, s3_service, temp_root, input_path, "download")
+        assert list(input_path.parent.iterdir()) == []
+    finally:
+        release.set()
+        await scheduler.stop()
+
+
+@pytest.mark.anyio
+async def test_cancel_during_pool_separation(tmp_path, temp_root, s3_service, separator_pool):
+    scheduler = _create_scheduler(tmp_path, lambda tracker: Spleeter(
+        s3_service, codec="wav", separator_pool=separator_pool, progress_tracker=tracker,
+    ))
+    scheduler.start()
+    try:
+        input_path = _submit(scheduler, tmp_path, "separating", BLOCK)
+        await _wait_for(lambda: separator_pool.health()["busy"] == 1)
+
+        await _cancel(scheduler, "separating")
+
+        _assert_cleaned_up(scheduler, s3_service, temp_root, input_path, "separating")
+        await _assert_worker_restarted(separator_pool)
+    finally:
+        await scheduler.stop()
+
+
+@pytest.mark.anyio
+async def test_cancel_packed_separation(tmp_path, temp_root, s3_service, separator_pool, monkeypatch):
+    monkeypatch.setattr(packing_module, "probe_duration", lambda source: 3.0)
+    packer = SeparationPacker(separator_pool, max_seconds=300.0, linger_seconds=0.2)
+    scheduler = _create_scheduler(tmp_path, lambda tracker: Spleeter(
+        s3_service, codec="wav", separator_pool=packer, progress_tracker=tracker,
+    ), max_concurrency=2)
+    scheduler.start()
+    try:
+        first_path = _submit(scheduler, tmp_path, "first", BLOCK)
+        second_path = _submit(scheduler, tmp_path, "second", BLOCK)
+        await _wait_for(lambda: separator_pool.health()["busy"] == 1)
+
+        # The other track of the pack is still being separated
+        await _cancel(scheduler, "first")
+        assert _status(scheduler, "first") is JobStatusEnum.CANCELLED
+        assert not first_path.exists()
+        assert _result_objects(s3_service, "first") == []
+        assert len(list(temp_root.iterdir())) == 1
+        await asyncio.sleep(0.2)
+        assert separator_pool.health()["busy"] == 1
+        assert separator_pool.health()["restarts"] == {}
+
+        await _cancel(scheduler, "second")
+        _assert_cleaned_up(scheduler, s3_service, temp_root, second_path, "second")
+        await _assert_worker_restarted(separator_pool)
+    finally:
+        await scheduler.stop()
+
+
+@pytest.mark.anyio
+async def test_cancel_during_encoding_and_streaming(tmp_path, temp_root, s3_service, separator_pool, no_ffmpeg):
+    # A 3 s track in 2 s windows: the first window is encoded and streamed, the second one hangs
+    segmenter = SegmentedSeparator(
+        separator_pool, window_seconds=2.0, overlap_seconds=0.5, parallelism=2, min_duration=2.0,
+    )
+    scheduler = _create_scheduler(tmp_path, lambda tracker: Spleeter(
+        s3_service, codec="wav", separator_pool=separator_pool, segmenter=segmenter, progress_tracker=tracker,
+        stream_segment_seconds=1.0,
+    ))
+    scheduler.start()
+    try:
+        input_path = _submit(scheduler, tmp_path, "streaming", AUDIO)
+        await _wait_for(lambda: any("/stream/" in key for key in _result_objects(s3_service, "streaming")))
+
+        await _cancel(scheduler, "streaming")
+
+        _assert_cleaned_up(scheduler, s3_service, temp_root, input_path, "streaming")
+        await _assert_worker_restarted(separator_pool)
+    finally:
+        await scheduler.stop()
+
+
+@pytest.mark.anyio
+async def test_cancel_during_stem_upload(tmp_path, temp_root, s3_service, separator_pool, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    upload_file = s3_service.uploader.upload_file
+
+    def blocking_upload(file_path, s3_key):
+        started.set()
+        release.wait(30)
+        return upload_file(file_path, s3_key)
+
+    monkeypatch.setattr(s3_service.uploader, "upload_file", blocking_upload)
+
+    scheduler = _create_scheduler(tmp_path, lambda tracker: Spleeter(
+        s3_service, codec="wav", separator_pool=separator_pool, progress_tracker=tracker,
+    ))
+    scheduler.start()
+    try:
+        input_path = _submit(scheduler, tmp_path, "uploading", AUDIO)
+        await _wait_for(started.is_set)
+
+        assert scheduler.request_cancel("uploading")
+        # Running uploads are waited for, so their objects are stored before the result is removed
+        await asyncio.sleep(0.2)
+        assert _status(scheduler, "uploading") is JobStatusEnum.RUNNING
+        release.set()
+        await _wait_for(lambda: _status(scheduler, "uploading").is_finished)
+
+        _assert_cleaned_up(scheduler, s3_service, temp_root, input_path, "uploading")
+        # The worker had already finished, so its slot is free without a restart
+        assert separator_pool.health()["restarts"] == {}
+        assert separator_pool.health()["idle"] == 1
+    finally:
+        release.set()
+        await scheduler.stop()
+
+
+@pytest.mark.anyio
+async def test_worker_failure_reason_is_reported(tmp_path, temp_root, s3_service, separator_pool):
+    scheduler = _create_scheduler(tmp_path, lambda tracker: Spleeter(
+        s3_service, codec="wav", separator_pool=separator_pool, progress_tracker=tracker,
+    ))
+    scheduler.start()
+    try:
+        _submit(scheduler, tmp_path, "broken", BROKEN)
+        await _wait_for(lambda: _status(scheduler, "broken").is_finished)
+
+        errors = [
+            json.loads(event.data)["error"]
+            for event in scheduler.store.events("broken")
+            if "error" in json.loads(event.data)
+        ]
+        assert len(errors) == 1
+        assert errors[0].startswith("Spleeter processing failed: ")
+        assert errors[0].endswith(BROKEN_REASON)
+        assert _result_objects(s3_service, "broken") == []
+    finally:
+        await scheduler.stop()
@@ -0,0 +1,101 @@
+"""
+Download stems of stored results, as the download endpoint resolves and streams them.
+
+S3 is mocked with moto. Requested variants are stored beforehand, so no ffmpeg is needed.
+"""
+import pytest
+
+from src.server.api.v1.routers.files import _ConditionalGet, download_processed_file
+from src.server.dependencies.settings import get_settings
+from src.server.enums.audio import AudioFormatEnum
+from src.server.enums.delivery import DeliveryEnum
+from src.server.services.s3.async_service import AsyncS3Service
+from src.server.services.transcoding.transcoder import StemTranscoder
+
+RESULT_PREFIX = "processed/result/"
+VARIANT = b"0123456789" * 10
+
+
+def _store_result(s3_service: AsyncS3Service) -> str:
+    """Store a result with a lossless master and its default variant, returning the variant's ETag."""
+    settings = get_settings()
+    s3_client = s3_service.s3_client
+    s3_client.put_object(
+        Bucket=s3_service.s3_bucket, Key=StemTranscoder.master_key(RESULT_PREFIX, "vocals"), Body=b"master",
+    )
+    response = s3_client.put_object(
+        Bucket=s3_service.s3_bucket,
+        Key=StemTranscoder.variant_key(RESULT_PREFIX, "vocals", AudioFormatEnum.MP3, settings.DOWNLOAD_DEFAULT_BITRATE),
+        Body=VARIANT,
+    )
+    return response["ETag"]
+
+
+async def _download(s3_service: AsyncS3Service, result_filename: str, conditions: _ConditionalGet):
+    response = await download_processed_file(
+        processed_filename="result",
+        result_filename=result_filename,
+        audio_format=None,
+        bitrate=None,
+        delivery=DeliveryEnum.PROXY,
+        conditions=conditions,
+        traceparent=None,
+        s3_service=s3_service,
+        transcoder=StemTranscoder(s3_service),
+        settings=get_settings(),
+    )
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    return response, body
+
+
+@pytest.mark.anyio
+async def test_resumed_download_of_result_with_masters(s3_service: AsyncS3Service) -> None:
+    etag = _store_result(s3_service)
+
+    response, body = await _download(s3_service, "vocals.mp3", _ConditionalGet(range="bytes=10-19", if_range=etag))
+
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == f"bytes 10-19/{len(VARIANT)}"
+    assert body == VARIANT[10:20]
+
+
+@pytest.mark.anyio
+async def test_resumed_download_of_changed_variant(s3_service: AsyncS3Service) -> None:
+    _store_result(s3_service)
+
+    response, body = await _download(s3_service, "vocals.mp3", _ConditionalGet(range="bytes=10-19", if_range='"stale"'))
+
+    assert response.status_code == 200
+    assert body == VARIANT
+
+
+@pytest.mark.anyio
+async def test_download_of_result_with_masters_skips_legacy_key(
+    s3_service: AsyncS3Service, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _store_result(s3_service)
+    requested = []
+    for name in ("object_exists", "head_object", "get_object"):
+        method = getattr(s3_service, name)
+
+        async def record(s3_key, *args, _method=method, **kwargs):
+            requested.append(s3_key)
+            return await _method(s3_key, *args, **kwargs)
+
+        monkeypatch.setattr(s3_service, name, record)
+
+    response, body = await _download(s3_service, "vocals.mp3", _ConditionalGet())
+
+    assert response.status_code == 200
+    assert body == VARIANT
+    assert f"{RESULT_PREFIX}vocals.mp3" not in requested
+
+
+@pytest.mark.anyio
+async def test_download_of_result_without_masters(s3_service: AsyncS3Service) -> None:
+    s3_service.s3_client.put_object(Bucket=s3_service.s3_bucket, Key=f"{RESULT_PREFIX}vocals.mp3", Body=b"legacy")
+
+    response, body = await _download(s3_service, "vocals.mp3", _ConditionalGet())
+
+    assert response.status_code == 200
+    assert body == b"legacy"
@@ -0,0 +1,45 @@
+"""
+Pin, load and evict models in the registry, with a loader that builds plain objects.
+"""
+from typing import Any, Dict, List
+
+import pytest
+
+from src.server.annihilator.model_registry import ModelRegistry
+
+
+class _Model:
+    """Stand-in for a loaded separator."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+def test_failed_pin_keeps_the_loaded_models() -> None:
+    unloaded: List[Any] = []
+
+    def load(name: str) -> _Model:
+        if name == "broken":
+            raise FileNotFoundError(f"Weights of model {name} not found")
+        return _Model(name)
+
+    registry = ModelRegistry(load, memory_budget=0, unloader=unloaded.append)
+    errors: Dict[str, str] = {}
+    for name in ["2stems", "broken", "4stems"]:
+        try:
+            registry.pin(name)
+        except FileNotFoundError as e:
+            errors[name] = str(e)
+
+    assert list(errors) == ["broken"]
+    assert registry.loaded == ["2stems", "4stems"]
+    assert registry.pinned == {"2stems", "4stems"}
+    assert all(stats["pinned"] for stats in registry.stats().values())
+
+    # Pinned models survive loading another model over the budget
+    assert registry.get("5stems").name == "5stems"
+    assert registry.loaded == ["2stems", "4stems", "5stems"]
+    assert unloaded == []
+
+    with pytest.raises(FileNotFoundError):
+        registry.get("broken")
@@ -0,0 +1,42 @@
+"""
+Separate short tracks packed into one waveform and compare them with their solo separation.
+
+The model is replaced by a stand-in with Spleeter's context: every output sample depends
+on the whole model chunk it falls in, and on the frame reaching back before that chunk.
+"""
+from typing import Dict
+
+import numpy as np
+
+from src.server.annihilator.packing import MODEL_CHUNK_SAMPLES, MODEL_FRAME_SAMPLES, pack_waveforms, unpack_stems
+
+
+def _chunked_model(waveform: np.ndarray) -> Dict[str, np.ndarray]:
+    """Separate a waveform chunk by chunk, each scaled by the loudness of its context."""
+    chunks = -(-waveform.shape[0] // MODEL_CHUNK_SAMPLES)
+    padded = np.zeros((MODEL_FRAME_SAMPLES + chunks * MODEL_CHUNK_SAMPLES, waveform.shape[1]), dtype=np.float32)
+    padded[MODEL_FRAME_SAMPLES:MODEL_FRAME_SAMPLES + waveform.shape[0]] = waveform
+
+    vocals = np.empty_like(waveform)
+    for start in range(0, waveform.shape[0], MODEL_CHUNK_SAMPLES):
+        context = padded[start:start + MODEL_FRAME_SAMPLES + MODEL_CHUNK_SAMPLES]
+        end = start + MODEL_CHUNK_SAMPLES
+        vocals[start:end] = waveform[start:end] * np.abs(context).mean()
+    return {"vocals": vocals, "accompaniment": waveform - vocals}
+
+
+def test_packed_tracks_separate_as_alone() -> None:
+    rng = np.random.default_rng(0)
+    # A track of exactly one chunk, one ending just inside the frame before the next chunk, and a short one
+    lengths = [MODEL_CHUNK_SAMPLES, MODEL_CHUNK_SAMPLES - MODEL_FRAME_SAMPLES // 2, 44100]
+    waveforms = [rng.uniform(-1, 1, (length, 2)).astype(np.float32) for length in lengths]
+
+    mixture, offsets = pack_waveforms(waveforms)
+    pieces = unpack_stems(_chunked_model(mixture), offsets, lengths)
+
+    assert all(offset % MODEL_CHUNK_SAMPLES == 0 for offset in offsets)
+    for waveform, stems in zip(waveforms, pieces):
+        solo = _chunked_model(waveform)
+        assert stems.keys() == solo.keys()
+        for stem, separated in stems.items():
+            np.testing.assert_array_equal(separated, solo[stem])
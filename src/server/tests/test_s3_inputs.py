@@ -0,0 +1,85 @@
+"""
+Submit jobs reading their input from the bucket and check which objects are accepted.
+
+S3 is mocked with moto. Jobs are only queued, the scheduler is not started.
+"""
+import json
+from pathlib import Path
+
+import pytest
+from botocore.exceptions import ClientError  # type: ignore[import-untyped]
+from fastapi import HTTPException, Request
+
+from src.server.api.v1.routers.processing import _submit_s3_object
+from src.server.dependencies.settings import get_settings
+from src.server.services.jobs.scheduler import JobScheduler
+from src.server.services.jobs.store import JobStore
+from src.server.services.s3.async_service import AsyncS3Service
+from src.server.services.upload.spooler import UploadSpooler
+
+
+def _request(s3_key: str) -> Request:
+    """Build a JSON request naming an input object."""
+    body = json.dumps({"s3_key": s3_key}).encode()
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request({"type": "http", "method": "POST", "headers": []}, receive)
+
+
+async def _submit_input(tmp_path: Path, s3_service: AsyncS3Service, s3_key: str):
+    scheduler = JobScheduler(
+        store=JobStore(tmp_path / "jobs.sqlite3"), runner=None, max_concurrency=1, max_queue_size=10,
+    )
+    spooler = UploadSpooler(tmp_path / "spool", max_bytes=1024)
+    return await _submit_s3_object(_request(s3_key), spooler, scheduler, s3_service, get_settings())
+
+
+@pytest.mark.anyio
+async def test_upload_is_accepted(tmp_path, s3_service) -> None:
+    s3_service.s3_client.put_object(Bucket=s3_service.s3_bucket, Key="uploads/input", Body=b"audio")
+
+    job = await _submit_input(tmp_path, s3_service, "uploads/input")
+
+    assert job.options["s3_key"] == "uploads/input"
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("s3_key", ["processed/result/vocals.flac", "processed/result/stream/vocals.m3u8", "uploads/"])
+async def test_object_outside_uploads_is_rejected(tmp_path, s3_service, s3_key) -> None:
+    s3_service.s3_client.put_object(Bucket=s3_service.s3_bucket, Key=s3_key, Body=b"stem")
+
+    with pytest.raises(HTTPException) as raised:
+        await _submit_input(tmp_path, s3_service, s3_key)
+
+    assert raised.value.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_missing_upload_is_rejected(tmp_path, s3_service) -> None:
+    with pytest.raises(HTTPException) as raised:
+        await _submit_input(tmp_path, s3_service, "uploads/missing")
+
+    assert raised.value.status_code == 400
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(("code", "http_status", "expected"), [
+    ("403", 403, 403),
+    ("InvalidObjectState", 409, 400),
+    ("SlowDown", 503, 503),
+    ("InternalError", 500, 503),
+])
+async def test_storage_errors_are_not_server_errors(
+    tmp_path, s3_service, monkeypatch, code, http_status, expected,
+) -> None:
+    async def failing_object_size(s3_key):
+        raise ClientError({"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": http_status}}, "HeadObject")
+
+    monkeypatch.setattr(s3_service, "object_size", failing_object_size)
+
+    with pytest.raises(HTTPException) as raised:
+        await _submit_input(tmp_path, s3_service, "uploads/input")
+
+    assert raised.value.status_code == expected
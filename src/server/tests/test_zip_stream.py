@@ -0,0 +1,71 @@
+"""
+Stream ZIP bundles of synthetic stems and check their content and memory use.
+
+Stems are served from one preallocated chunk, so the traced allocations are those of
+the archive writer alone. Large bundles, including ZIP64 ones, are measured by the
+zip_bundle_memory benchmark.
+"""
+import io
+import tracemalloc
+import zipfile
+from datetime import datetime, timezone
+from typing import AsyncIterator, List
+
+import pytest
+
+from src.server.services.archive.zip_stream import ZipEntry, stream_zip
+
+CHUNK = bytes(range(256)) * 256
+STEMS = 4
+
+
+def _entries(size: int) -> List[ZipEntry]:
+    """Build the stems of a bundle, each of the given size in bytes."""
+
+    def read() -> AsyncIterator[bytes]:
+        async def chunks() -> AsyncIterator[bytes]:
+            view = memoryview(CHUNK)
+            for offset in range(0, size, len(CHUNK)):
+                yield view[:min(len(CHUNK), size - offset)]
+
+        return chunks()
+
+    modified = datetime.now(timezone.utc)
+    return [
+        ZipEntry(name=f"result/stem{index}.flac", size=size, modified=modified, read=read) for index in range(STEMS)
+    ]
+
+
+async def _peak_memory(size: int) -> int:
+    """Stream a bundle, discarding it, and return its peak traced memory in bytes."""
+    entries = _entries(size)
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    async for _ in stream_zip(entries):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    return peak - baseline
+
+
+@pytest.mark.anyio
+async def test_streamed_bundle_is_a_valid_archive() -> None:
+    size = len(CHUNK) * 3 + 100
+    archive = b"".join([data async for data in stream_zip(_entries(size))])
+
+    with zipfile.ZipFile(io.BytesIO(archive)) as bundle:
+        assert bundle.testzip() is None
+        assert [info.file_size for info in bundle.infolist()] == [size] * STEMS
+        assert bundle.read("result/stem0.flac")[:len(CHUNK)] == CHUNK
+
+
+@pytest.mark.anyio
+async def test_streamed_bundle_memory_is_flat() -> None:
+    tracemalloc.start()
+    try:
+        small = await _peak_memory(1024 ** 2)
+        large = await _peak_memory(32 * 1024 ** 2)
+    finally:
+        tracemalloc.stop()
+
+    # 32 times the content may only cost a couple of chunks more
+    assert large - small <= 2 * len(CHUNK)
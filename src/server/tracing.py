@@ -0,0 +1,404 @@
+import asyncio
+import json
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from src.server.config import Settings
+from src.server.enums.tracing import SpanKindEnum
+
+# Instrumentation scope of all spans
+_SCOPE = "src.server"
+
+# Most spans written in one export request, one line of the file
+_MAX_BATCH = 512
+
+_TRACEPARENT_PATTERN = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# OTLP status code of failed spans, the others are left unset
+_STATUS_ERROR = 2
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """
+    Identity of a span, as propagated to child spans, other services and queued jobs.
+
+    Attributes:
+        trace_id (str): 32 hex digits shared by every span of the trace
+        span_id (str): 16 hex digits of the span
+    """
+
+    trace_id: str
+    span_id: str
+
+    @property
+    def traceparent(self) -> str:
+        """
+        Format the context as a W3C traceparent header value.
+
+        Returns:
+            str: Version 00 traceparent of the span, flagged as sampled
+        """
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @classmethod
+    def from_traceparent(cls, value: Optional[str]) -> Optional["SpanContext"]:
+        """
+        Parse a W3C traceparent header value.
+
+        Parameters:
+            value (Optional[str]): Header value, e.g. "00-<trace id>-<span id>-01"
+
+        Returns:
+            Optional[SpanContext]: The context, None if the value is missing or invalid
+        """
+        match = _TRACEPARENT_PATTERN.match(value.strip().lower()) if value else None
+        if match is None or not int(match.group(1), 16) or not int(match.group(2), 16):
+            return None
+        return cls(trace_id=match.group(1), span_id=match.group(2))
+
+
+@dataclass
+class Span:
+    """
+    A timed operation within a trace.
+
+    Spans are only recorded while tracing is on. Otherwise a shared span without context
+    is handed out, and setting its attributes or error does nothing.
+
+    Attributes:
+        name (str): Operation name
+        context (Optional[SpanContext]): Identity of the span, None if it is not recorded
+        parent_id (Optional[str]): Span id of the parent, None for the root of a trace
+        kind (SpanKindEnum): Role of the span
+        start_ns (int): Start time in nanoseconds since the epoch
+        end_ns (int): End time in nanoseconds since the epoch, 0 while running
+        attributes (Dict[str, Any]): Attributes describing the operation
+        error (Optional[str]): Error the operation failed with
+    """
+
+    name: str
+    context: Optional[SpanContext]
+    parent_id: Optional[str] = None
+    kind: SpanKindEnum = SpanKindEnum.INTERNAL
+    start_ns: int = 0
+    end_ns: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def is_recording(self) -> bool:
+        """
+        Check if the span is exported when it ends.
+
+        Returns:
+            bool: True if tracing was on when the span started
+        """
+        return self.context is not None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """
+        Describe the operation, e.g. with the job id or an object key.
+
+        Parameters:
+            key (str): Attribute name
+            value (Any): Attribute value, None values are skipped
+        """
+        if self.is_recording and value is not None:
+            self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        """
+        Mark the operation as failed.
+
+        Parameters:
+            message (str): Error description
+        """
+        if self.is_recording:
+            self.error = message
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """
+        Encode the span in the OTLP JSON format.
+
+        Returns:
+            Dict[str, Any]: Span object of an OTLP/JSON export request
+        """
+        span: Dict[str, Any] = {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "name": self.name,
+            "kind": self.kind.value,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+        }
+        if self.parent_id is not None:
+            span["parentSpanId"] = self.parent_id
+        if self.error is not None:
+            span["status"] = {"code": _STATUS_ERROR, "message": self.error}
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """
+    Encode an attribute value in the OTLP JSON format.
+
+    Parameters:
+        value (Any): Boolean, number, string or list of them; other values are encoded as strings
+
+    Returns:
+        Dict[str, Any]: OTLP AnyValue object
+    """
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    """
+    Encode an attribute in the OTLP JSON format.
+
+    Parameters:
+        key (str): Attribute name
+        value (Any): Attribute value
+
+    Returns:
+        Dict[str, Any]: OTLP KeyValue object
+    """
+    return {"key": key, "value": _otlp_value(value)}
+
+
+class OtlpJsonFileExporter:
+    """
+    Append finished spans to a file as OTLP JSON, written by a background thread.
+
+    Every line is one OTLP/JSON export request holding the spans that ended since the
+    last line, the format read by the OpenTelemetry Collector's `otlpjsonfile` receiver,
+    so the spans can be forwarded to any tracing backend. Lines are written with a
+    single append each, so the worker processes of the service may share the file.
+
+    Parameters:
+        path (Path): File the spans are appended to
+        service_name (str): Name of the service the spans are reported for
+    """
+
+    def __init__(self, path: Path, service_name: str):
+        """Initialize the exporter with no thread running."""
+        self.path = path
+        self.service_name = service_name
+        self._spans: "queue.SimpleQueue[Optional[Span]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start writing exported spans to the file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._write, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        """
+        Queue a finished span for writing.
+
+        Parameters:
+            span (Span): Ended, recorded span
+        """
+        self._spans.put(span)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Write the queued spans and stop the background thread.
+
+        Parameters:
+            timeout (float): Seconds to wait for the queue to be written
+        """
+        if self._thread is None:
+            return
+
+        self._spans.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _request(self, spans: List[Span]) -> bytes:
+        """
+        Encode spans as one line holding an OTLP/JSON export request.
+
+        Parameters:
+            spans (List[Span]): Finished spans
+
+        Returns:
+            bytes: JSON line
+        """
+        request = {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [
+                        _otlp_attribute("service.name", self.service_name),
+                        _otlp_attribute("process.pid", os.getpid()),
+                    ],
+                },
+                "scopeSpans": [{"scope": {"name": _SCOPE}, "spans": [span.to_otlp() for span in spans]}],
+            }],
+        }
+        return (json.dumps(request, separators=(",", ":"), default=str) + "\n").encode()
+
+    def _write(self) -> None:
+        """Background thread writing queued spans in batches until stopped."""
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            while True:
+                batch = [self._spans.get()]
+                while batch[-1] is not None and len(batch) < _MAX_BATCH:
+                    try:
+                        batch.append(self._spans.get_nowait())
+                    except queue.Empty:
+                        break
+
+                spans = [span for span in batch if span is not None]
+                if spans:
+                    try:
+                        os.write(fd, self._request(spans))
+                    except OSError:
+                        # Traces are best effort, a full disk must not stop the exporter
+                        pass
+                if batch[-1] is None:
+                    return
+        finally:
+            os.close(fd)
+
+
+# Span of the operation the current task or thread is in
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+# Handed out while tracing is off
+_NON_RECORDING_SPAN = Span(name="", context=None)
+
+# Global span exporter, set while tracing is on
+_exporter: Optional[OtlpJsonFileExporter] = None
+
+
+def start_tracing(settings: Settings) -> Optional[OtlpJsonFileExporter]:
+    """
+    Start exporting spans if tracing is enabled and not running yet.
+
+    Parameters:
+        settings (Settings): Application settings containing tracing configuration
+
+    Returns:
+        Optional[OtlpJsonFileExporter]: The running exporter, or None if tracing is disabled
+    """
+    global _exporter
+
+    if settings.TRACE_EXPORT_PATH is None:
+        return None
+
+    if _exporter is None:
+        _exporter = OtlpJsonFileExporter(settings.TRACE_EXPORT_PATH, settings.TRACE_SERVICE_NAME)
+        _exporter.start()
+    return _exporter
+
+
+def stop_tracing() -> None:
+    """Stop recording spans and write the ones not exported yet."""
+    global _exporter
+
+    if _exporter is not None:
+        exporter, _exporter = _exporter, None
+        exporter.stop()
+
+
+def current_span() -> Span:
+    """
+    Get the span of the operation the current task or thread is in.
+
+    Returns:
+        Span: The innermost running span, or a non-recording span outside of any
+    """
+    return _current_span.get() or _NON_RECORDING_SPAN
+
+
+def current_trace_id() -> Optional[str]:
+    """
+    Get the trace the current task or thread belongs to.
+
+    Returns:
+        Optional[str]: Trace id, None if tracing is off or there is no running span
+    """
+    context = current_span().context
+    return context.trace_id if context is not None else None
+
+
+@contextmanager
+def start_span(
+    name: str,
+    attributes: Optional[Mapping[str, Any]] = None,
+    parent: Optional[SpanContext] = None,
+    kind: SpanKindEnum = SpanKindEnum.INTERNAL,
+) -> Iterator[Span]:
+    """
+    Time the enclosed operation as a span.
+
+    The span is a child of the given parent, e.g. from a traceparent header or a
+    queued job, or else of the current span, or else starts a new trace. It is the
+    current span inside the block, including in threads started with a copy of the
+    context, and is exported when the block is left. An exception leaving the block
+    marks it as failed. While tracing is off, a non-recording span is yielded.
+
+    Parameters:
+        name (str): Operation name
+        attributes (Mapping[str, Any], optional): Initial attributes of the span
+        parent (SpanContext, optional): Remote parent of the span
+        kind (SpanKindEnum): Role of the span (default: INTERNAL)
+
+    Yields:
+        Span: The running span
+    """
+    exporter = _exporter
+    if exporter is None:
+        yield _NON_RECORDING_SPAN
+        return
+
+    previous = _current_span.get()
+    if parent is None and previous is not None:
+        parent = previous.context
+    span = Span(
+        name=name,
+        context=SpanContext(
+            trace_id=parent.trace_id if parent is not None else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+        ),
+        parent_id=parent.span_id if parent is not None else None,
+        kind=kind,
+        start_ns=time.time_ns(),
+    )
+    for key, value in (attributes or {}).items():
+        span.set_attribute(key, value)
+
+    _current_span.set(span)
+    try:
+        yield span
+    except asyncio.CancelledError:
+        span.set_attribute("cancelled", True)
+        raise
+    except Exception as e:
+        span.set_error(str(e) or type(e).__name__)
+        raise
+    finally:
+        # Not reset by token, generators may be closed from another context
+        _current_span.set(previous)
+        span.end_ns = time.time_ns()
+        exporter.export(span)